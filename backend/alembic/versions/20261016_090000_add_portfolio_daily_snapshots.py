@@ -0,0 +1,55 @@
+"""Add portfolio_daily_snapshots table
+
+Materialized end-of-day NAV / cash / positions value / flows per portfolio,
+appended nightly and read by the analytics endpoints.
+
+Revision ID: 20261016_090000
+Revises: 20251218_180000
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20261016_090000'
+down_revision: Union[str, None] = '20251218_180000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create portfolio_daily_snapshots."""
+    op.create_table(
+        'portfolio_daily_snapshots',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('portfolio_id', sa.Integer(), nullable=False),
+        sa.Column('snapshot_date', sa.Date(), nullable=False),
+        sa.Column('nav', sa.Numeric(15, 2), nullable=False),
+        sa.Column('cash', sa.Numeric(15, 2), nullable=False),
+        sa.Column('positions_value', sa.Numeric(15, 2), nullable=False),
+        sa.Column('net_flow', sa.Numeric(15, 2), nullable=False),
+        sa.Column('daily_return', sa.Float(), nullable=True),
+        sa.Column('trade_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('holdings', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['portfolio_id'], ['portfolios.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('portfolio_id', 'snapshot_date', name='uq_portfolio_snapshots_day'),
+    )
+    op.create_index('ix_portfolio_daily_snapshots_id', 'portfolio_daily_snapshots', ['id'])
+    op.create_index(
+        'ix_portfolio_snapshots_portfolio_date',
+        'portfolio_daily_snapshots',
+        ['portfolio_id', 'snapshot_date'],
+    )
+
+
+def downgrade() -> None:
+    """Drop portfolio_daily_snapshots."""
+    op.drop_index('ix_portfolio_snapshots_portfolio_date', table_name='portfolio_daily_snapshots')
+    op.drop_index('ix_portfolio_daily_snapshots_id', table_name='portfolio_daily_snapshots')
+    op.drop_table('portfolio_daily_snapshots')
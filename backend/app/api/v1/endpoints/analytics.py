@@ -19,8 +19,12 @@ from app.core.analytics import (
     get_performance_analytics,
     get_risk_metrics,
     get_benchmark_service,
+    rolling_historical_var,
     VaRMethod,
 )
+from app.core.compute_executor import ComputeExecutorError, run_compute
+from app.db.database import async_session_maker
+from app.services.portfolio_snapshots import PortfolioSnapshotService
 
 
 router = APIRouter()
@@ -166,21 +170,19 @@ async def _get_portfolio_returns(
     end_date: datetime
 ) -> tuple[np.ndarray, List[datetime]]:
     """
-    Get portfolio returns for the given period.
-    In production, this would fetch from database.
+    Get daily portfolio returns for the given period.
+    Reads the materialized portfolio_daily_snapshots range.
     """
-    # Placeholder - generate sample data for demonstration
-    # In production, fetch from trades/positions database
-    logger.info(f"Fetching returns for portfolio {portfolio_id} from {start_date} to {end_date}")
-    
-    days = (end_date - start_date).days
-    if days <= 0:
-        days = 252
+    async with async_session_maker() as db:
+        returns, dates = await PortfolioSnapshotService(db).get_return_series(
+            portfolio_id, start_date, end_date
+        )
     
-    # Generate sample returns
-    np.random.seed(portfolio_id)  # Reproducible for same portfolio
-    returns = np.random.normal(0.0005, 0.015, days)
-    dates = [start_date + timedelta(days=i) for i in range(days)]
+    if len(returns) == 0:
+        raise ValueError(
+            f"No daily snapshots for portfolio {portfolio_id} in range; "
+            f"run scripts/backfill_portfolio_snapshots.py"
+        )
     
     return returns, dates
 
@@ -188,23 +190,33 @@ async def _get_portfolio_returns(
 async def _get_benchmark_returns(
     symbol: str,
     start_date: datetime,
-    end_date: datetime
+    end_date: datetime,
+    dates: Optional[List[datetime]] = None
 ) -> np.ndarray:
     """
-    Get benchmark returns for the given period.
-    In production, this would fetch from market data provider.
+    Get daily benchmark returns for the given period from price_bars.
+    When dates are given, the series is aligned to them.
     """
-    days = (end_date - start_date).days
-    if days <= 0:
-        days = 252
+    async with async_session_maker() as db:
+        returns = await PortfolioSnapshotService(db).get_benchmark_returns(
+            symbol, start_date, end_date, dates=dates
+        )
     
-    # Generate sample benchmark returns
-    np.random.seed(hash(symbol) % 10000)
-    returns = np.random.normal(0.0004, 0.012, days)
+    if len(returns) == 0:
+        raise ValueError(f"No price history for benchmark {symbol}")
     
     return returns
 
 
+async def _calculate_var(risk_calc, returns: np.ndarray, confidence: float, method: VaRMethod):
+    """VaR at one confidence level; Monte Carlo runs on the compute executor."""
+    if method == VaRMethod.MONTE_CARLO:
+        return await run_compute(
+            risk_calc.calculate_var, returns, confidence_level=confidence, method=method
+        )
+    return risk_calc.calculate_var(returns, confidence_level=confidence, method=method)
+
+
 # ==================== Performance Endpoints ====================
 
 @router.get("/performance/{portfolio_id}", response_model=PerformanceMetricsResponse)
@@ -299,10 +311,10 @@ async def get_detailed_performance(
             )
             result["rolling"] = {
                 "window": request.rolling_window,
-                "dates": [d.isoformat() for d in rolling.dates],
-                "returns": rolling.returns,
-                "volatility": rolling.volatility,
-                "sharpe": rolling.sharpe
+                "dates": [d.isoformat() for d in dates[request.rolling_window - 1:]],
+                "returns": rolling.get("return", np.empty(0)).tolist(),
+                "volatility": rolling.get("volatility", np.empty(0)).tolist(),
+                "sharpe": rolling.get("sharpe", np.empty(0)).tolist()
             }
         
         return result
@@ -356,15 +368,15 @@ async def get_risk_metrics(
     try:
         start_date, end_date = _get_date_range(time_range)
         returns, dates = await _get_portfolio_returns(portfolio_id, start_date, end_date)
-        benchmark_returns = await _get_benchmark_returns("SPY", start_date, end_date)
+        benchmark_returns = await _get_benchmark_returns("SPY", start_date, end_date, dates=dates)
         
         risk_calc = get_risk_metrics()
         
         # Calculate VaR
         method = VaRMethod(var_method) if var_method in ['historical', 'parametric', 'monte_carlo'] else VaRMethod.HISTORICAL
-        var_95 = risk_calc.calculate_var(returns, confidence=0.95, method=method)
-        var_99 = risk_calc.calculate_var(returns, confidence=0.99, method=method)
-        cvar_95 = risk_calc.calculate_cvar(returns, confidence=0.95)
+        var_95 = await _calculate_var(risk_calc, returns, 0.95, method)
+        var_99 = await _calculate_var(risk_calc, returns, 0.99, method)
+        cvar_95 = var_95.cvar_value
         
         # Calculate Beta
         beta_analysis = risk_calc.calculate_beta(returns, benchmark_returns)
@@ -387,6 +399,8 @@ async def get_risk_metrics(
             period_end=end_date
         )
     
+    except ComputeExecutorError:
+        raise
     except Exception as e:
         logger.error(f"Error calculating risk metrics: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -403,13 +417,13 @@ async def get_detailed_risk_metrics(
     try:
         start_date, end_date = _get_date_range(request.time_range)
         returns, dates = await _get_portfolio_returns(portfolio_id, start_date, end_date)
-        benchmark_returns = await _get_benchmark_returns("SPY", start_date, end_date)
+        benchmark_returns = await _get_benchmark_returns("SPY", start_date, end_date, dates=dates)
         
         risk_calc = get_risk_metrics()
         
         # Basic risk metrics
         method = VaRMethod(request.var_method) if request.var_method in ['historical', 'parametric', 'monte_carlo'] else VaRMethod.HISTORICAL
-        var_result = risk_calc.calculate_var(returns, confidence=request.var_confidence, method=method)
+        var_result = await _calculate_var(risk_calc, returns, request.var_confidence, method)
         
         result = {
             "portfolio_id": portfolio_id,
@@ -453,6 +467,8 @@ async def get_detailed_risk_metrics(
         
         return result
     
+    except ComputeExecutorError:
+        raise
     except Exception as e:
         logger.error(f"Error in detailed risk analysis: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -472,18 +488,9 @@ async def get_var_history(
         start_date, end_date = _get_date_range(time_range)
         returns, dates = await _get_portfolio_returns(portfolio_id, start_date, end_date)
         
-        risk_calc = get_risk_metrics()
-        
-        # Calculate rolling VaR
-        var_series = []
-        var_dates = []
-        
-        for i in range(window - 1, len(returns)):
-            window_returns = returns[i - window + 1:i + 1]
-            var_result = risk_calc.calculate_var(window_returns, confidence=confidence)
-            var_series.append(var_result.var_value)
-            if i < len(dates):
-                var_dates.append(dates[i].isoformat())
+        # Rolling historical VaR in one vectorized pass
+        var_series = rolling_historical_var(returns, window, confidence_level=confidence).tolist()
+        var_dates = [d.isoformat() for d in dates[window - 1:len(returns)]]
         
         return {
             "portfolio_id": portfolio_id,
@@ -512,7 +519,7 @@ async def compare_benchmark(
     try:
         start_date, end_date = _get_date_range(time_range)
         returns, dates = await _get_portfolio_returns(portfolio_id, start_date, end_date)
-        benchmark_returns = await _get_benchmark_returns(benchmark, start_date, end_date)
+        benchmark_returns = await _get_benchmark_returns(benchmark, start_date, end_date, dates=dates)
         
         benchmark_service = get_benchmark_service()
         comparison = benchmark_service.compare_to_benchmark(returns, benchmark_returns, dates=dates)
@@ -555,7 +562,7 @@ async def compare_multiple_benchmarks(
         # Fetch all benchmark returns
         benchmark_data = {}
         for symbol in request.benchmark_symbols:
-            benchmark_data[symbol] = await _get_benchmark_returns(symbol, start_date, end_date)
+            benchmark_data[symbol] = await _get_benchmark_returns(symbol, start_date, end_date, dates=dates)
         
         # Compare to all benchmarks
         comparisons = benchmark_service.compare_to_multiple_benchmarks(returns, benchmark_data, dates)
@@ -658,7 +665,7 @@ async def get_analytics_summary(
     try:
         start_date, end_date = _get_date_range(time_range)
         returns, dates = await _get_portfolio_returns(portfolio_id, start_date, end_date)
-        benchmark_returns = await _get_benchmark_returns(benchmark, start_date, end_date)
+        benchmark_returns = await _get_benchmark_returns(benchmark, start_date, end_date, dates=dates)
         
         analytics = get_performance_analytics()
         risk_calc = get_risk_metrics()
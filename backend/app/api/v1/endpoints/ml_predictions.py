@@ -30,7 +30,9 @@ from app.ml.models import (
     PortfolioConstraints,
     RiskParityOptimizer
 )
+from app.core.compute_executor import run_compute
 import numpy as np
+import pandas as pd
 
 
 router = APIRouter(prefix="/ml", tags=["ML Predictions"])
@@ -562,6 +564,58 @@ class AutoPredictionResponse(BaseModel):
     failed: int
 
 
+# Trained model scoring needs 1 year for SMA_200 and 52-week high/low calculations
+HISTORY_LOOKBACK_DAYS = 365
+MIN_HISTORY_BARS = 50
+
+
+def bars_to_frame(bars: List[Any]) -> pd.DataFrame:
+    """Convert OHLCV bars to the lowercase-column DataFrame the trained model expects."""
+    df = pd.DataFrame({
+        'open': [float(bar.open) for bar in bars],
+        'high': [float(bar.high) for bar in bars],
+        'low': [float(bar.low) for bar in bars],
+        'close': [float(bar.close) for bar in bars],
+        'volume': [int(bar.volume) for bar in bars]
+    })
+    df.index = pd.to_datetime([bar.timestamp for bar in bars])
+    return df
+
+
+async def fetch_history_frames(orchestrator: Any, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    Prefetch daily history for many symbols concurrently.
+    
+    Uses the orchestrator's batch fetch, which bounds the number of
+    in-flight provider requests. Symbols with fewer than MIN_HISTORY_BARS
+    bars are left out.
+    
+    Returns:
+        symbol (as requested) -> OHLCV DataFrame
+    """
+    if not symbols:
+        return {}
+    
+    end_date = datetime.utcnow().date()
+    start_date = end_date - timedelta(days=HISTORY_LOOKBACK_DAYS)
+    
+    history = await orchestrator.get_historical_batch(
+        symbols,
+        start_date=start_date,
+        end_date=end_date
+    )
+    
+    frames = {}
+    for symbol in symbols:
+        bars = history.get(symbol.upper())
+        if bars and len(bars) >= MIN_HISTORY_BARS:
+            frames[symbol] = bars_to_frame(bars)
+        else:
+            logger.debug(f"Not enough historical data for {symbol}: {len(bars) if bars else 0} bars")
+    
+    return frames
+
+
 def calculate_technical_features(quote: Dict[str, Any]) -> Dict[str, float]:
     """Calculate technical features from quote data."""
     price = quote.get('price', 0) or 0
@@ -741,9 +795,8 @@ async def auto_generate_predictions(
     analysis when models are not trained.
     """
     from app.data_providers import orchestrator
-    from app.ml.trained_service import get_trained_model_service
+    from app.ml.trained_service import get_trained_model_service, predict_batch_in_worker
     from datetime import timedelta
-    import pandas as pd
     
     # Try to load trained models
     trained_service = get_trained_model_service()
@@ -754,81 +807,69 @@ async def auto_generate_predictions(
     model_used = "Rule-Based Analysis"
     
     try:
+        # Fetch current market data for all symbols in one batch
+        quote_objs = await orchestrator.get_quotes(request.symbols)
+        
+        quotes: Dict[str, Dict[str, Any]] = {}
         for symbol in request.symbols:
+            quote_obj = quote_objs.get(symbol.upper())
+            if not quote_obj:
+                logger.warning(f"No quote data for {symbol}")
+                continue
+            # Convert Quote object to dict
+            quote = quote_obj.to_dict() if hasattr(quote_obj, 'to_dict') else quote_obj
+            if (quote.get('price', 0) or 0) <= 0:
+                logger.warning(f"Invalid price for {symbol}")
+                continue
+            quotes[symbol] = quote
+        
+        # Score every symbol with the trained model in one call
+        trained_preds = {}
+        if use_trained_model and quotes:
             try:
-                # Fetch current market data
-                quote_obj = await orchestrator.get_quote(symbol)
-                
-                if not quote_obj:
-                    logger.warning(f"No quote data for {symbol}")
+                frames = await fetch_history_frames(orchestrator, list(quotes))
+                trained_preds = await run_compute(
+                    predict_batch_in_worker,
+                    frames, {symbol: quotes[symbol]['price'] for symbol in frames}
+                )
+            except Exception as e:
+                logger.debug(f"Trained model failed for batch: {e}")
+        
+        for symbol in request.symbols:
+            try:
+                quote = quotes.get(symbol)
+                if quote is None:
                     failed_symbols.append(symbol)
                     continue
                 
-                # Convert Quote object to dict
-                quote = quote_obj.to_dict() if hasattr(quote_obj, 'to_dict') else quote_obj
-                
                 price = quote.get('price', 0) or 0
-                if price <= 0:
-                    logger.warning(f"Invalid price for {symbol}")
-                    failed_symbols.append(symbol)
-                    continue
-                
                 prediction = None
                 
-                # Try trained model first if available
-                if use_trained_model:
-                    try:
-                        # Fetch historical data using orchestrator
-                        # Need 1 year for SMA_200 and 52-week high/low calculations
-                        end_date = datetime.utcnow().date()
-                        start_date = end_date - timedelta(days=365)  # 1 year
-                        
-                        hist_data = await orchestrator.get_historical(
-                            symbol=symbol,
-                            start_date=start_date,
-                            end_date=end_date
-                        )
-                        
-                        if hist_data and len(hist_data) >= 50:
-                            # Convert to DataFrame format expected by trained model
-                            # Note: Use lowercase columns to match training pipeline
-                            df = pd.DataFrame([{
-                                'open': float(bar.open),
-                                'high': float(bar.high),
-                                'low': float(bar.low),
-                                'close': float(bar.close),
-                                'volume': int(bar.volume)
-                            } for bar in hist_data])
-                            df.index = pd.to_datetime([bar.timestamp for bar in hist_data])
-                            
-                            trained_pred = await trained_service.predict(df, symbol, price)
-                            if trained_pred:
-                                model_used = f"RandomForest (trained)"
-                                change_pct = quote.get('change_percent') or 0.0
-                                prediction = SymbolPrediction(
-                                    symbol=symbol,
-                                    signal=trained_pred.signal.lower(),
-                                    confidence=trained_pred.confidence,
-                                    price=trained_pred.price,
-                                    price_target=trained_pred.price_target,
-                                    stop_loss=trained_pred.stop_loss,
-                                    take_profit=trained_pred.take_profit,
-                                    change_percent=change_pct,
-                                    predicted_change=(trained_pred.probability_up - 0.5) * 10,
-                                    direction=1 if trained_pred.signal == "BUY" else (-1 if trained_pred.signal == "SELL" else 0),
-                                    source=f"Trained {trained_pred.model_type}",
-                                    features_used=[f"feature_{i}" for i in range(trained_pred.features_used)],
-                                    timestamp=datetime.utcnow().isoformat(),
-                                    metadata={
-                                        "probability_up": trained_pred.probability_up,
-                                        "probability_down": trained_pred.probability_down,
-                                        "model_type": trained_pred.model_type
-                                    }
-                                )
-                        else:
-                            logger.debug(f"Not enough historical data for {symbol}: {len(hist_data) if hist_data else 0} bars")
-                    except Exception as e:
-                        logger.debug(f"Trained model failed for {symbol}: {e}")
+                # Use trained model prediction if available
+                trained_pred = trained_preds.get(symbol)
+                if trained_pred:
+                    model_used = f"RandomForest (trained)"
+                    change_pct = quote.get('change_percent') or 0.0
+                    prediction = SymbolPrediction(
+                        symbol=symbol,
+                        signal=trained_pred.signal.lower(),
+                        confidence=trained_pred.confidence,
+                        price=trained_pred.price,
+                        price_target=trained_pred.price_target,
+                        stop_loss=trained_pred.stop_loss,
+                        take_profit=trained_pred.take_profit,
+                        change_percent=change_pct,
+                        predicted_change=(trained_pred.probability_up - 0.5) * 10,
+                        direction=1 if trained_pred.signal == "BUY" else (-1 if trained_pred.signal == "SELL" else 0),
+                        source=f"Trained {trained_pred.model_type}",
+                        features_used=[f"feature_{i}" for i in range(trained_pred.features_used)],
+                        timestamp=datetime.utcnow().isoformat(),
+                        metadata={
+                            "probability_up": trained_pred.probability_up,
+                            "probability_down": trained_pred.probability_down,
+                            "model_type": trained_pred.model_type
+                        }
+                    )
                 
                 # Fallback to rule-based if no trained prediction
                 if prediction is None:
@@ -950,9 +991,7 @@ async def get_trade_candidates(
     from app.db.database import async_session_maker
     from app.core.portfolio.service import PortfolioService
     from app.data_providers import orchestrator
-    from app.ml.trained_service import get_trained_model_service
-    from datetime import timedelta
-    import pandas as pd
+    from app.ml.trained_service import get_trained_model_service, predict_batch_in_worker
     
     try:
         # Get portfolio info
@@ -1005,71 +1044,64 @@ async def get_trade_candidates(
         
         candidates = []
         
-        for entry in universe_entries:
-            symbol = entry.symbol
-            symbol_region = get_region_from_symbol(symbol)
-            
-            # Filter by region if specified
-            if region.lower() != "all" and symbol_region != region.lower():
-                continue
-            
-            try:
-                # Get current quote
-                quote_obj = await orchestrator.get_quote(symbol)
+        # Filter by region if specified
+        regions = {entry.symbol: get_region_from_symbol(entry.symbol) for entry in universe_entries}
+        symbols = [
+            symbol for symbol, symbol_region in regions.items()
+            if region.lower() == "all" or symbol_region == region.lower()
+        ]
+        
+        # Get current quotes for all symbols in one batch
+        quotes: Dict[str, float] = {}
+        if symbols:
+            quote_objs = await orchestrator.get_quotes(symbols)
+            for symbol in symbols:
+                quote_obj = quote_objs.get(symbol.upper())
                 if not quote_obj:
                     continue
-                
                 quote = quote_obj.to_dict() if hasattr(quote_obj, 'to_dict') else quote_obj
-                current_price = float(quote.get("price", 0))
-                if current_price <= 0:
-                    continue
-                
-                # Generate ML prediction
-                signal_type = "HOLD"
-                confidence = 50.0
-                trend = "NEUTRAL"
-                
-                if trained_service.is_loaded:
-                    # Fetch historical data for ML prediction
-                    end_date = datetime.utcnow().date()
-                    start_date = end_date - timedelta(days=365)
-                    
-                    hist_data = await orchestrator.get_historical(
-                        symbol=symbol,
-                        start_date=start_date,
-                        end_date=end_date
-                    )
-                    
-                    if hist_data and len(hist_data) >= 50:
-                        df = pd.DataFrame([{
-                            'open': float(bar.open),
-                            'high': float(bar.high),
-                            'low': float(bar.low),
-                            'close': float(bar.close),
-                            'volume': int(bar.volume)
-                        } for bar in hist_data])
-                        df.index = pd.to_datetime([bar.timestamp for bar in hist_data])
-                        
-                        prediction = await trained_service.predict(df, symbol, current_price)
-                        if prediction:
-                            signal_type = prediction.signal
-                            confidence = prediction.confidence * 100
-                            # Determine trend from price change
-                            if len(hist_data) >= 5:
-                                recent_close = float(hist_data[-1].close)
-                                past_close = float(hist_data[-5].close)
-                                if recent_close > past_close * 1.01:
-                                    trend = "UP"
-                                elif recent_close < past_close * 0.99:
-                                    trend = "DOWN"
-                
-                # Only BUY signals with sufficient confidence
-                is_buy = signal_type in ["BUY", "STRONG_BUY"]
-                if not is_buy or confidence < min_confidence:
-                    continue
-            
+                current_price = float(quote.get("price", 0) or 0)
+                if current_price > 0:
+                    quotes[symbol] = current_price
+        
+        # Fetch history concurrently and score every symbol in one model call
+        frames: Dict[str, pd.DataFrame] = {}
+        predictions = {}
+        if trained_service.is_loaded and quotes:
+            try:
+                frames = await fetch_history_frames(orchestrator, list(quotes))
+                predictions = await run_compute(
+                    predict_batch_in_worker,
+                    frames, {symbol: quotes[symbol] for symbol in frames}
+                )
             except Exception as e:
-                logger.debug(f"Error processing {symbol}: {e}")
+                logger.debug(f"Error scoring trade candidates: {e}")
+        
+        for symbol, current_price in quotes.items():
+            symbol_region = regions[symbol]
+            
+            # Generate ML prediction
+            signal_type = "HOLD"
+            confidence = 50.0
+            trend = "NEUTRAL"
+            
+            prediction = predictions.get(symbol)
+            if prediction:
+                signal_type = prediction.signal
+                confidence = prediction.confidence * 100
+                # Determine trend from price change
+                close = frames[symbol]['close']
+                if len(close) >= 5:
+                    recent_close = float(close.iloc[-1])
+                    past_close = float(close.iloc[-5])
+                    if recent_close > past_close * 1.01:
+                        trend = "UP"
+                    elif recent_close < past_close * 0.99:
+                        trend = "DOWN"
+            
+            # Only BUY signals with sufficient confidence
+            is_buy = signal_type in ["BUY", "STRONG_BUY"]
+            if not is_buy or confidence < min_confidence:
                 continue
             
             # Get config for this symbol's region
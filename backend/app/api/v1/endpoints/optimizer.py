@@ -133,6 +133,7 @@ class OptimizationResponseSchema(BaseModel):
     screened_count: int
     execution_time_ms: float
     error: Optional[str]
+    screening_stats: Dict[str, Any] = Field(default_factory=dict, description="Screening stage timings (ms) and counts")
 
 
 class EfficientFrontierPointSchema(BaseModel):
@@ -298,7 +299,8 @@ async def request_optimization(
         proposal=ProposalSchema(**response.proposal.to_dict()) if response.proposal else None,
         screened_count=len(response.screened_assets),
         execution_time_ms=response.execution_time_ms,
-        error=response.error
+        error=response.error,
+        screening_stats=response.screening_stats
     )
 
 
@@ -891,7 +893,7 @@ async def check_rebalance(
 )
 async def get_efficient_frontier(
     portfolio_id: int,
-    n_points: int = Query(30, ge=10, le=100, description="Number of frontier points"),
+    n_points: int = Query(50, ge=10, le=200, description="Number of frontier points"),
     symbols: Optional[str] = Query(None, description="Comma-separated symbols"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -934,7 +936,7 @@ async def get_efficient_frontier(
                           'NVDA', 'JPM', 'V', 'JNJ', 'PG']
         returns = await optimizer._fetch_returns(default_symbols)
     
-    frontier = optimizer.get_efficient_frontier(returns, n_points)
+    frontier = await optimizer.get_efficient_frontier_async(returns, n_points)
     
     return [EfficientFrontierPointSchema(**point) for point in frontier]
 
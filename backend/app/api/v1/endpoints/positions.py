@@ -186,6 +186,19 @@ async def get_portfolio_daily_stats(
         except Exception as e:
             logger.warning(f"Failed to fetch quotes for {market_type.value}: {e}")
     
+    # Portfolio currency once; FX rates are in-memory matrix reads
+    from sqlalchemy import select as sql_select
+    from app.db.models.portfolio import Portfolio
+    from app.services.fx_rate_matrix import fx_rate_matrix
+    from app.utils.currency import lookup_exchange_rate
+    
+    result = await db.execute(
+        sql_select(Portfolio.currency).where(Portfolio.id == portfolio_id)
+    )
+    portfolio_currency = result.scalar() or "EUR"
+    
+    await fx_rate_matrix.ensure_loaded()
+    
     # Calculate daily changes
     total_daily_change = Decimal("0")
     total_prev_close_value = Decimal("0")
@@ -211,19 +224,7 @@ async def get_portfolio_daily_stats(
             pos_prev_value = prev_close * pos.quantity
             
             # Apply FX conversion to portfolio currency
-            native_currency = pos.native_currency or "USD"
-            from sqlalchemy import select as sql_select
-            from app.db.models.portfolio import Portfolio
-            
-            result = await db.execute(
-                sql_select(Portfolio.currency).where(Portfolio.id == portfolio_id)
-            )
-            portfolio_currency = result.scalar() or "EUR"
-            
-            fx_rate = Decimal("1.0")
-            if native_currency != portfolio_currency:
-                from app.utils.currency import get_exchange_rate
-                fx_rate = await get_exchange_rate(native_currency, portfolio_currency)
+            fx_rate = lookup_exchange_rate(pos.native_currency or "USD", portfolio_currency)
             
             total_daily_change += pos_daily_change * fx_rate
             total_prev_close_value += pos_prev_value * fx_rate
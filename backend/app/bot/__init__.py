@@ -221,6 +221,26 @@ async def initialize_bot() -> BotScheduler:
         minute=0
     )
     
+    # Portfolio daily snapshots (daily at 00:30 AM UTC - after EOD bars land
+    # and the UTC day is over). Appends one NAV row per portfolio for the
+    # closed day(s) from the previous snapshot; no replay
+    async def portfolio_snapshot_job():
+        from app.services.portfolio_snapshots import run_portfolio_snapshot_update
+        
+        async for db in get_db():
+            stats = await run_portfolio_snapshot_update(db)
+            logger.info(
+                f"Portfolio snapshots: {stats['rows_written']} rows for "
+                f"{stats['portfolios']} portfolios, {stats['failed']} failed"
+            )
+    
+    scheduler.add_cron_job(
+        job_id="portfolio_daily_snapshots",
+        func=portfolio_snapshot_job,
+        hour=0,
+        minute=30
+    )
+    
     # Symbol enrichment (daily at 1 AM UTC - fill in missing names)
     async def symbol_enrichment_job():
         from app.bot.services.universe_data_collector import run_symbol_enrichment
@@ -15,13 +15,16 @@ OPTIMIZATION (Dec 2024):
 - Batch quote fetching: Single HTTP request for all positions
 - Redis cache integration: Check cache before API calls
 - Group by market type: Efficient routing to correct providers
+- Universe-wide snapshot: one price per symbol and one rate per FX pair
+  across ALL portfolios, applied with a single bulk UPDATE
 """
+import time
 from datetime import datetime, date, timedelta
 from typing import Optional, Dict, Set, List, Tuple
 from decimal import Decimal
 from collections import defaultdict
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, update, and_
 from loguru import logger
 
 from app.db.models import Portfolio, Position
@@ -277,6 +280,84 @@ class GlobalPriceUpdater:
         
         return False
     
+    async def _resolve_prices(self, all_symbols: List[str], stats: Dict[str, int]) -> Dict[str, float]:
+        """
+        Resolve current prices for a set of (upper-case) symbols.
+        
+        Checks the Redis quote cache with one MGET, then fetches the misses
+        with one orchestrator batch per market type and caches them back in
+        one pipelined write. Updates the "cached", "fetched" and
+        "http_requests" counters in `stats`.
+        
+        Returns:
+            Dict mapping symbol -> price in native currency
+        """
+        # ==================== Check Redis cache ====================
+        prices: Dict[str, float] = {}
+        symbols_to_fetch: List[str] = []
+        
+        # Single batched MGET instead of one GET per position
+        try:
+            cached_quotes = await redis_client.get_quotes(all_symbols)
+        except Exception as e:
+            logger.debug(f"Cache check failed: {e}")
+            cached_quotes = {}
+        
+        for symbol in all_symbols:
+            cached_quote = cached_quotes.get(symbol)
+            if cached_quote and cached_quote.get("price"):
+                prices[symbol] = float(cached_quote["price"])
+                stats["cached"] += 1
+                logger.debug(f"Cache hit for {symbol}: ${cached_quote['price']}")
+            else:
+                symbols_to_fetch.append(symbol)
+        
+        # ==================== Group misses by market type ====================
+        if symbols_to_fetch:
+            by_market_type: Dict[MarketType, List[str]] = defaultdict(list)
+            
+            for symbol in symbols_to_fetch:
+                market_type = self._get_market_type_for_symbol(symbol)
+                by_market_type[market_type].append(symbol)
+            
+            # Fetched quotes are cached in one pipelined write at the end
+            quotes_to_cache: Dict[str, dict] = {}
+            
+            # ==================== Batch fetch per market type ====================
+            for market_type, symbols in by_market_type.items():
+                try:
+                    logger.debug(f"Batch fetching {len(symbols)} {market_type.value} symbols")
+                    
+                    # Single batch request for all symbols of this market type
+                    quotes = await orchestrator.get_quotes(
+                        symbols=symbols,
+                        market_type=market_type
+                    )
+                    stats["http_requests"] += 1  # One request per market type
+                    
+                    for symbol, quote in quotes.items():
+                        if quote and quote.price:
+                            prices[symbol.upper()] = float(quote.price)
+                            stats["fetched"] += 1
+                            quotes_to_cache[symbol] = {
+                                "price": float(quote.price),
+                                "change": float(quote.change) if quote.change else None,
+                                "change_percent": float(quote.change_percent) if quote.change_percent else None,
+                                "timestamp": datetime.utcnow().isoformat(),
+                            }
+                            
+                except Exception as e:
+                    logger.warning(f"Batch fetch failed for {market_type.value}: {e}")
+                    # Individual symbols in this batch won't have prices
+            
+            # Cache in Redis for next time (if available)
+            try:
+                await redis_client.set_quotes(quotes_to_cache)
+            except Exception:
+                pass  # Cache write failure is not critical
+        
+        return prices
+    
     async def update_portfolio_prices(self, portfolio: Portfolio) -> Dict[str, any]:
         """
         Update prices for all positions in a portfolio using BATCH fetching.
@@ -322,70 +403,16 @@ class GlobalPriceUpdater:
         position_map = {p.symbol.upper(): p for p in positions}
         all_symbols = list(position_map.keys())
         
-        # ==================== STEP 2: Check Redis cache ====================
-        prices: Dict[str, float] = {}
-        symbols_to_fetch: List[str] = []
+        # ==================== STEPS 2-4: Resolve prices ====================
+        prices = await self._resolve_prices(all_symbols, stats)
         
-        for symbol in all_symbols:
-            try:
-                # Check if redis client is initialized
-                if redis_client._client is None:
-                    symbols_to_fetch.append(symbol)
-                    continue
-                    
-                cached_quote = await redis_client.get_quote(symbol)
-                if cached_quote and cached_quote.get("price"):
-                    prices[symbol] = float(cached_quote["price"])
-                    stats["cached"] += 1
-                    logger.debug(f"Cache hit for {symbol}: ${cached_quote['price']}")
-                else:
-                    symbols_to_fetch.append(symbol)
-            except Exception as e:
-                logger.debug(f"Cache check failed for {symbol}: {e}")
-                symbols_to_fetch.append(symbol)
+        # ==================== STEP 5: Apply prices to positions ====================
+        from app.services.fx_rate_matrix import fx_rate_matrix
+        from app.utils.currency import lookup_exchange_rate
         
-        # ==================== STEP 3: Group by market type ====================
-        if symbols_to_fetch:
-            by_market_type: Dict[MarketType, List[str]] = defaultdict(list)
-            
-            for symbol in symbols_to_fetch:
-                market_type = self._get_market_type_for_symbol(symbol)
-                by_market_type[market_type].append(symbol)
-            
-            # ==================== STEP 4: Batch fetch per market type ====================
-            for market_type, symbols in by_market_type.items():
-                try:
-                    logger.debug(f"Batch fetching {len(symbols)} {market_type.value} symbols")
-                    
-                    # Single batch request for all symbols of this market type
-                    quotes = await orchestrator.get_quotes(
-                        symbols=symbols,
-                        market_type=market_type
-                    )
-                    stats["http_requests"] += 1  # One request per market type
-                    
-                    for symbol, quote in quotes.items():
-                        if quote and quote.price:
-                            prices[symbol.upper()] = float(quote.price)
-                            stats["fetched"] += 1
-                            
-                            # Cache in Redis for next time (if available)
-                            try:
-                                if redis_client._client is not None:
-                                    await redis_client.set_quote(symbol, {
-                                        "price": float(quote.price),
-                                        "change": float(quote.change) if quote.change else None,
-                                        "change_percent": float(quote.change_percent) if quote.change_percent else None,
-                                        "timestamp": datetime.utcnow().isoformat(),
-                                    })
-                            except Exception:
-                                pass  # Cache write failure is not critical
-                            
-                except Exception as e:
-                    logger.warning(f"Batch fetch failed for {market_type.value}: {e}")
-                    # Individual symbols in this batch won't have prices
+        # Refresh the FX matrix once; each rate below is a dictionary read
+        await fx_rate_matrix.ensure_loaded()
         
-        # ==================== STEP 5: Apply prices to positions ====================
         for symbol, position in position_map.items():
             price = prices.get(symbol)
             
@@ -397,13 +424,8 @@ class GlobalPriceUpdater:
                 # Update position price in NATIVE currency
                 position.current_price = Decimal(str(price))
                 
-                # Get current FX rate from database
                 native_currency = position.native_currency or "USD"
-                fx_rate = Decimal("1.0")
-                
-                if native_currency != portfolio_currency:
-                    from app.utils.currency import get_exchange_rate
-                    fx_rate = await get_exchange_rate(native_currency, portfolio_currency)
+                fx_rate = lookup_exchange_rate(native_currency, portfolio_currency)
                 
                 # Calculate market_value and unrealized_pnl in PORTFOLIO currency
                 market_value_native = position.quantity * position.current_price
@@ -438,6 +460,133 @@ class GlobalPriceUpdater:
         
         return stats
     
+    async def update_all_prices(self) -> Dict[str, any]:
+        """
+        Universe-wide price snapshot for every active portfolio in one pass.
+        
+        Instead of resolving prices portfolio by portfolio:
+        1. Load all open positions of active users/portfolios in ONE query
+        2. Resolve prices once per distinct symbol (one batch per market type)
+        3. Resolve each distinct FX pair once from the in-memory FX matrix
+        4. Write current_price/market_value/unrealized_pnl for all positions
+           in ONE bulk UPDATE and commit once
+        
+        Returns:
+            Dict with row counts and cycle wall time
+        """
+        from app.db.models import User
+        from app.services.fx_rate_matrix import fx_rate_matrix
+        from app.utils.currency import lookup_exchange_rate
+        
+        started = time.perf_counter()
+        stats = {
+            "users": 0,
+            "portfolios": 0,
+            "positions": 0,
+            "symbols": 0,
+            "fx_pairs": 0,
+            "updated": 0,
+            "failed": 0,
+            "cached": 0,
+            "fetched": 0,
+            "http_requests": 0,
+            "duration_ms": 0.0,
+        }
+        
+        # ==================== STEP 1: All open positions, one query ====================
+        result = await self.db.execute(
+            select(
+                Position.id,
+                Position.symbol,
+                Position.native_currency,
+                Position.quantity,
+                Position.avg_cost,
+                Portfolio.id,
+                Portfolio.currency,
+                Portfolio.user_id,
+            )
+            .join(Portfolio, Position.portfolio_id == Portfolio.id)
+            .join(User, Portfolio.user_id == User.id)
+            .where(
+                and_(
+                    User.is_active == True,
+                    Portfolio.is_active == True,
+                    Position.quantity != 0,
+                )
+            )
+        )
+        rows = result.all()
+        
+        stats["positions"] = len(rows)
+        stats["portfolios"] = len({row[5] for row in rows})
+        stats["users"] = len({row[7] for row in rows})
+        
+        if not rows:
+            stats["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            return stats
+        
+        # ==================== STEP 2: One price per distinct symbol ====================
+        symbols = sorted({row[1].upper() for row in rows})
+        stats["symbols"] = len(symbols)
+        prices = await self._resolve_prices(symbols, stats)
+        
+        # ==================== STEP 3: One rate per distinct FX pair ====================
+        await fx_rate_matrix.ensure_loaded()
+        pairs = {
+            (native or "USD", portfolio_currency or "EUR")
+            for _, _, native, _, _, _, portfolio_currency, _ in rows
+        }
+        fx_rates: Dict[Tuple[str, str], Decimal] = {
+            (native, portfolio_currency): lookup_exchange_rate(native, portfolio_currency)
+            for native, portfolio_currency in pairs
+        }
+        stats["fx_pairs"] = sum(1 for native, quote in pairs if native != quote)
+        
+        # ==================== STEP 4: Bulk UPDATE ====================
+        now = datetime.utcnow()
+        updates: List[Dict[str, any]] = []
+        
+        for position_id, symbol, native, quantity, avg_cost, _, portfolio_currency, _ in rows:
+            price = prices.get(symbol.upper())
+            if price is None:
+                stats["failed"] += 1
+                continue
+            
+            fx_rate = fx_rates[(native or "USD", portfolio_currency or "EUR")]
+            current_price = Decimal(str(price))
+            values = {
+                "id": position_id,
+                "current_price": current_price,
+                # market_value and unrealized_pnl in PORTFOLIO currency
+                "market_value": quantity * current_price * fx_rate,
+                "unrealized_pnl": (current_price - avg_cost) * quantity * fx_rate,
+                "updated_at": now,
+            }
+            # P&L percent is currency-agnostic (calculated in native)
+            if avg_cost > 0:
+                values["unrealized_pnl_percent"] = float(
+                    (current_price - avg_cost) / avg_cost * 100
+                )
+            updates.append(values)
+        
+        if updates:
+            # ORM bulk UPDATE by primary key: one executemany statement per
+            # distinct parameter set (with/without unrealized_pnl_percent)
+            await self.db.execute(update(Position), updates)
+            await self.db.commit()
+            stats["updated"] = len(updates)
+        
+        stats["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        
+        logger.info(
+            f"Price snapshot: {stats['updated']}/{stats['positions']} positions in "
+            f"{stats['portfolios']} portfolios ({stats['symbols']} symbols, "
+            f"{stats['fx_pairs']} FX pairs, {stats['http_requests']} HTTP requests) "
+            f"in {stats['duration_ms']}ms"
+        )
+        
+        return stats
+    
     async def get_market_overview(self) -> Dict[str, any]:
         """
         Get overview of all market statuses.
@@ -469,60 +618,38 @@ async def run_global_price_update(db: AsyncSession) -> Dict[str, any]:
     
     This is the main entry point called by the scheduler.
     
-    OPTIMIZED: Uses batch fetching to minimize HTTP requests.
-    Example: 10 positions across 2 market types = 2 HTTP requests (was 10)
+    OPTIMIZED: Takes a single universe-wide price snapshot instead of
+    updating portfolio by portfolio, so a symbol held in N portfolios is
+    priced once and all positions are written in one bulk UPDATE.
     """
-    from app.db.models import User
+    updater = GlobalPriceUpdater(db)
     
-    result = await db.execute(
-        select(User).where(User.is_active == True)
-    )
-    users = result.scalars().all()
+    try:
+        snapshot = await updater.update_all_prices()
+    except Exception as e:
+        logger.error(f"Global price update failed: {e}")
+        await db.rollback()
+        snapshot = defaultdict(int)
     
     total_stats = {
-        "users_processed": 0,
-        "positions_updated": 0,
+        "users_processed": snapshot["users"],
+        "portfolios_processed": snapshot["portfolios"],
+        "symbols": snapshot["symbols"],
+        "fx_pairs": snapshot["fx_pairs"],
+        "positions_updated": snapshot["updated"],
         "positions_skipped": 0,
-        "positions_failed": 0,
-        "positions_cached": 0,
-        "positions_fetched": 0,
-        "http_requests": 0,
+        "positions_failed": snapshot["failed"],
+        "positions_cached": snapshot["cached"],
+        "positions_fetched": snapshot["fetched"],
+        "http_requests": snapshot["http_requests"],
+        "duration_ms": snapshot["duration_ms"],
     }
     
-    for user in users:
-        try:
-            # Get user's portfolios
-            portfolios_result = await db.execute(
-                select(Portfolio).where(
-                    and_(
-                        Portfolio.user_id == user.id,
-                        Portfolio.is_active == True
-                    )
-                )
-            )
-            portfolios = portfolios_result.scalars().all()
-            
-            updater = GlobalPriceUpdater(db)
-            
-            for portfolio in portfolios:
-                stats = await updater.update_portfolio_prices(portfolio)
-                total_stats["positions_updated"] += stats["updated"]
-                total_stats["positions_skipped"] += stats.get("skipped", 0)
-                total_stats["positions_failed"] += stats["failed"]
-                total_stats["positions_cached"] += stats.get("cached", 0)
-                total_stats["positions_fetched"] += stats.get("fetched", 0)
-                total_stats["http_requests"] += stats.get("http_requests", 0)
-            
-            total_stats["users_processed"] += 1
-            
-        except Exception as e:
-            logger.error(f"Price update failed for user {user.id}: {e}")
-    
     if total_stats["positions_updated"] > 0:
         logger.info(
             f"Global price update: {total_stats['positions_updated']} updated "
             f"({total_stats['positions_cached']} cached, {total_stats['positions_fetched']} fetched), "
-            f"{total_stats['http_requests']} HTTP requests"
+            f"{total_stats['http_requests']} HTTP requests, {total_stats['duration_ms']}ms"
         )
     
     return total_stats
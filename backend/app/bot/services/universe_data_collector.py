@@ -22,7 +22,7 @@ from sqlalchemy import select, update, and_, or_
 from loguru import logger
 
 from app.db.models.market_universe import MarketUniverse, MarketRegion
-from app.db.models.price_bar import PriceBar, TimeFrame as DBTimeFrame
+from app.db.repositories.price_bar import PriceBarRepository, make_bar_row
 from app.data_providers.orchestrator import orchestrator
 from app.data_providers.adapters.base import TimeFrame as OrchestratorTimeFrame, MarketType
 from app.scheduler.market_hours import (
@@ -107,6 +107,7 @@ class UniverseDataCollector:
                 quotes = await self._fetch_quotes_batch(batch)
                 
                 # Update database
+                quotes_to_cache: Dict[str, Dict] = {}
                 for symbol_entry in batch:
                     symbol = symbol_entry.symbol
                     
@@ -117,13 +118,15 @@ class UniverseDataCollector:
                         symbol_entry.consecutive_failures = 0
                         symbol_entry.last_error = None
                         
-                        # Cache in Redis for fast access
-                        await redis_client.set_quote(symbol, quote)
+                        quotes_to_cache[symbol] = quote
                         stats["updated"] += 1
                     else:
                         symbol_entry.consecutive_failures += 1
                         stats["failed"] += 1
                 
+                # Cache in Redis for fast access (one pipelined write per batch)
+                await redis_client.set_quotes(quotes_to_cache)
+                
                 await db.commit()
                 
             except Exception as e:
@@ -255,6 +258,7 @@ class UniverseDataCollector:
         # Process in batches
         for i in range(0, len(symbols_to_update), self._batch_size):
             batch = symbols_to_update[i:i + self._batch_size]
+            batch_rows = []
             
             for symbol_entry in batch:
                 try:
@@ -264,11 +268,9 @@ class UniverseDataCollector:
                     )
                     
                     if bars:
-                        # Insert bars into database
-                        for bar in bars:
-                            price_bar = PriceBar(
+                        batch_rows.extend(
+                            make_bar_row(
                                 symbol=symbol_entry.symbol,
-                                timeframe=DBTimeFrame.D1,
                                 timestamp=bar["timestamp"],
                                 open=bar["open"],
                                 high=bar["high"],
@@ -276,10 +278,10 @@ class UniverseDataCollector:
                                 close=bar["close"],
                                 volume=bar.get("volume"),
                                 adjusted_close=bar.get("adjusted_close"),
-                                source=bar.get("source", "orchestrator"),
+                                source=bar.get("source") or "orchestrator",
                             )
-                            db.add(price_bar)
-                            stats["bars_inserted"] += 1
+                            for bar in bars
+                        )
                         
                         symbol_entry.last_ohlcv_update = datetime.utcnow()
                         symbol_entry.consecutive_failures = 0
@@ -295,6 +297,8 @@ class UniverseDataCollector:
                     stats["failed"] += 1
             
             try:
+                # One multi-row upsert per batch (re-runs overwrite, never duplicate)
+                stats["bars_inserted"] += await PriceBarRepository(db).bulk_upsert(batch_rows)
                 await db.commit()
             except Exception as e:
                 logger.error(f"Commit error: {e}")
@@ -436,28 +440,32 @@ async def run_universe_quote_update(db: AsyncSession) -> Dict:
     symbols_to_fetch: Dict[MarketType, List[MarketUniverse]] = defaultdict(list)
     now = datetime.utcnow()
     
+    open_entries = []
     for entry in all_symbols:
         # Skip if market is closed
         if not region_open.get(entry.region, False):
             stats["skipped_closed_market"] += 1
             continue
-        
-        # Check Redis cache freshness
-        try:
-            if redis_client._client is not None:
-                cached = await redis_client.get_quote(entry.symbol)
-                if cached and cached.get("timestamp"):
-                    # Parse timestamp and check freshness
-                    try:
-                        cached_time = datetime.fromisoformat(cached["timestamp"].replace("Z", "+00:00"))
-                        age_seconds = (now - cached_time.replace(tzinfo=None)).total_seconds()
-                        if age_seconds < CACHE_FRESHNESS_SECONDS:
-                            stats["skipped_fresh_cache"] += 1
-                            continue
-                    except (ValueError, TypeError):
-                        pass  # Invalid timestamp, proceed to fetch
-        except Exception:
-            pass  # Redis error, proceed to fetch
+        open_entries.append(entry)
+    
+    # Check Redis cache freshness with one batched MGET
+    try:
+        cached_quotes = await redis_client.get_quotes([e.symbol for e in open_entries])
+    except Exception:
+        cached_quotes = {}  # Redis error, proceed to fetch
+    
+    for entry in open_entries:
+        cached = cached_quotes.get(entry.symbol)
+        if cached and cached.get("timestamp"):
+            # Parse timestamp and check freshness
+            try:
+                cached_time = datetime.fromisoformat(cached["timestamp"].replace("Z", "+00:00"))
+                age_seconds = (now - cached_time.replace(tzinfo=None)).total_seconds()
+                if age_seconds < CACHE_FRESHNESS_SECONDS:
+                    stats["skipped_fresh_cache"] += 1
+                    continue
+            except (ValueError, TypeError, AttributeError):
+                pass  # Invalid timestamp, proceed to fetch
         
         # Determine market type
         if entry.asset_type and entry.asset_type.value == "etf":
@@ -491,6 +499,7 @@ async def run_universe_quote_update(db: AsyncSession) -> Dict:
                 stats["http_requests"] += 1
                 
                 # Process results
+                quotes_to_cache: Dict[str, Dict] = {}
                 for symbol, quote in quotes.items():
                     if quote and quote.price:
                         entry = entry_map.get(symbol)
@@ -512,15 +521,16 @@ async def run_universe_quote_update(db: AsyncSession) -> Dict:
                                 "day_low": float(quote.day_low) if quote.day_low else None,
                                 "prev_close": float(quote.prev_close) if quote.prev_close else None,
                             }
-                            
-                            try:
-                                if redis_client._client is not None:
-                                    await redis_client.set_quote(symbol, quote_data)
-                            except Exception:
-                                pass
+                            quotes_to_cache[symbol] = quote_data
                             
                             stats["updated"] += 1
                 
+                # One pipelined write for the whole batch
+                try:
+                    await redis_client.set_quotes(quotes_to_cache)
+                except Exception:
+                    pass
+                
                 # Mark failures
                 for symbol in batch_symbols:
                     if symbol not in quotes:
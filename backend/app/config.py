@@ -99,6 +99,7 @@ class Settings(BaseSettings):
     REDIS_DB: int = 0
     # Direct REDIS_URL from environment (for Docker - overrides individual settings)
     REDIS_URL: str = ""
+    RATE_LIMIT_SHARED: bool = True  # Enforce provider rate limits across processes via Redis
     
     @property
     def redis_url(self) -> str:
@@ -150,6 +151,7 @@ class Settings(BaseSettings):
     # Rate Limit Settings
     # =========================
     RATE_LIMIT_TARGET_PERCENT: int = 75
+    PROVIDER_HEDGING: bool = False  # Also ask a backup provider when a quote is slower than the primary's p95
     
     # =========================
     # Scheduler Settings
@@ -162,6 +164,15 @@ class Settings(BaseSettings):
     # =========================
     ML_MODELS_PATH: str = "./ml_models"
     ML_RETRAIN_INTERVAL_DAYS: int = 7
+    ML_FEATURE_STORE_PATH: str = ""  # Columnar feature history; empty = in-memory only
+    
+    # =========================
+    # Compute Executor
+    # =========================
+    COMPUTE_WORKERS: int = 2  # Worker processes for CPU-bound endpoints; 0 = run inline
+    COMPUTE_QUEUE_SIZE: int = 16  # Tasks allowed to wait before requests get 503
+    COMPUTE_TASK_TIMEOUT: float = 60.0  # seconds; 0 = no limit
+    COMPUTE_WARM_ML_MODELS: bool = True  # Load trained models in every worker at start-up
     
     # =========================
     # Logging
@@ -6,6 +6,7 @@ Contains analytics services:
 - Risk metrics
 - Benchmarking
 - Reporting
+- Rolling-window statistics
 """
 from .performance import (
     PerformanceAnalytics,
@@ -19,6 +20,7 @@ from .risk_metrics import (
     RiskMetrics,
     VaRResult,
     VaRMethod,
+    BatchVaRResult,
     BetaAnalysis,
     CorrelationAnalysis,
     StressTestResult,
@@ -34,6 +36,15 @@ from .benchmarking import (
     PeerGroupComparison,
     get_benchmark_service
 )
+from .rolling import (
+    compute_rolling_metrics,
+    rolling_compound_return,
+    rolling_std,
+    rolling_sharpe,
+    rolling_beta,
+    rolling_tracking_error,
+    rolling_historical_var
+)
 from .reporting import (
     ReportGenerator,
     Report,
@@ -57,6 +68,7 @@ __all__ = [
     'RiskMetrics',
     'VaRResult',
     'VaRMethod',
+    'BatchVaRResult',
     'BetaAnalysis',
     'CorrelationAnalysis',
     'StressTestResult',
@@ -70,6 +82,14 @@ __all__ = [
     'RollingBenchmarkMetric',
     'PeerGroupComparison',
     'get_benchmark_service',
+    # Rolling statistics
+    'compute_rolling_metrics',
+    'rolling_compound_return',
+    'rolling_std',
+    'rolling_sharpe',
+    'rolling_beta',
+    'rolling_tracking_error',
+    'rolling_historical_var',
     # Reporting
     'ReportGenerator',
     'Report',
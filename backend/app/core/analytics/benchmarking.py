@@ -14,6 +14,8 @@ from datetime import datetime, timedelta
 from enum import Enum
 from loguru import logger
 
+from . import rolling
+
 
 class BenchmarkType(str, Enum):
     """Type of benchmark."""
@@ -350,57 +352,45 @@ class BenchmarkService:
             return {}
         
         results = {}
+        benchmark_returns = benchmark_returns[:n]
+        
+        if dates:
+            metric_dates = list(dates[window - 1:n])
+        else:
+            metric_dates = [datetime.now() + timedelta(days=i) for i in range(n - window + 1)]
         
         for metric in metrics:
-            values = []
-            metric_dates = []
-            
-            for i in range(window - 1, n):
-                port_window = portfolio_returns[i - window + 1:i + 1]
-                bench_window = benchmark_returns[i - window + 1:i + 1]
+            if metric == 'excess_return':
+                values = (
+                    rolling.rolling_compound_return(portfolio_returns, window)
+                    - rolling.rolling_compound_return(benchmark_returns, window)
+                )
                 
-                if metric == 'excess_return':
-                    port_ret = np.prod(1 + port_window) - 1
-                    bench_ret = np.prod(1 + bench_window) - 1
-                    value = port_ret - bench_ret
-                    
-                elif metric == 'beta':
-                    cov = np.cov(port_window, bench_window)[0, 1]
-                    var = np.var(bench_window)
-                    value = cov / var if var > 0 else 1.0
-                    
-                elif metric == 'tracking_error':
-                    diff = port_window - bench_window
-                    value = np.std(diff) * np.sqrt(self.trading_days)
-                    
-                elif metric == 'information_ratio':
-                    diff = port_window - bench_window
-                    te = np.std(diff) * np.sqrt(self.trading_days)
-                    excess = np.mean(diff) * self.trading_days
-                    value = excess / te if te > 0 else 0
-                    
-                elif metric == 'alpha':
-                    cov = np.cov(port_window, bench_window)[0, 1]
-                    var = np.var(bench_window)
-                    beta = cov / var if var > 0 else 1.0
-                    
-                    port_ann = (np.prod(1 + port_window) - 1) * (self.trading_days / window)
-                    bench_ann = (np.prod(1 + bench_window) - 1) * (self.trading_days / window)
-                    
-                    value = port_ann - self.risk_free_rate - beta * (bench_ann - self.risk_free_rate)
-                    
-                else:
-                    value = 0
+            elif metric == 'beta':
+                values = self._rolling_beta(portfolio_returns, benchmark_returns, window)
                 
-                values.append(float(value))
-                if dates and i < len(dates):
-                    metric_dates.append(dates[i])
-            
-            if not metric_dates and dates:
-                metric_dates = dates[window - 1:]
-            elif not metric_dates:
-                metric_dates = [datetime.now() + timedelta(days=i) for i in range(len(values))]
+            elif metric == 'tracking_error':
+                values = rolling.rolling_tracking_error(
+                    portfolio_returns, benchmark_returns, window, self.trading_days
+                )
+                
+            elif metric == 'information_ratio':
+                values = rolling.rolling_information_ratio(
+                    portfolio_returns, benchmark_returns, window, self.trading_days
+                )
+                
+            elif metric == 'alpha':
+                beta = self._rolling_beta(portfolio_returns, benchmark_returns, window)
+                scale = self.trading_days / window
+                port_ann = rolling.rolling_compound_return(portfolio_returns, window) * scale
+                bench_ann = rolling.rolling_compound_return(benchmark_returns, window) * scale
+                
+                values = port_ann - self.risk_free_rate - beta * (bench_ann - self.risk_free_rate)
+                
+            else:
+                values = np.zeros(n - window + 1)
             
+            values = values.tolist()
             results[metric] = RollingBenchmarkMetric(
                 dates=metric_dates[:len(values)],
                 values=values,
@@ -410,6 +400,17 @@ class BenchmarkService:
         
         return results
     
+    def _rolling_beta(
+        self,
+        portfolio_returns: np.ndarray,
+        benchmark_returns: np.ndarray,
+        window: int
+    ) -> np.ndarray:
+        """Rolling beta, sample covariance over population variance as in compare_to_benchmark."""
+        cov = rolling.rolling_cov(portfolio_returns, benchmark_returns, window, ddof=1)
+        var = rolling.rolling_var(benchmark_returns, window)
+        return rolling.safe_divide(cov, var, 1.0)
+    
     def compare_to_peer_group(
         self,
         portfolio_returns: np.ndarray,
@@ -13,6 +13,8 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 
+from .rolling import compute_rolling_metrics
+
 
 class ReturnType(str, Enum):
     """Type of return calculation."""
@@ -465,34 +467,18 @@ class PerformanceAnalytics:
             Dictionary of rolling metrics
         """
         metrics = metrics or ['return', 'volatility', 'sharpe']
-        results = {}
         
-        n = len(returns)
-        if n < window:
-            return results
+        returns = np.asarray(returns, dtype=float)
+        if len(returns) < window:
+            return {}
         
-        for metric in metrics:
-            rolling_values = []
-            
-            for i in range(window - 1, n):
-                window_returns = returns[i - window + 1:i + 1]
-                
-                if metric == 'return':
-                    value = np.prod(1 + window_returns) - 1
-                elif metric == 'volatility':
-                    value = np.std(window_returns) * np.sqrt(self.trading_days)
-                elif metric == 'sharpe':
-                    ann_ret = (np.prod(1 + window_returns) - 1) * (self.trading_days / window)
-                    ann_vol = np.std(window_returns) * np.sqrt(self.trading_days)
-                    value = (ann_ret - self.risk_free_rate) / ann_vol if ann_vol > 0 else 0
-                else:
-                    value = 0
-                
-                rolling_values.append(value)
-            
-            results[metric] = np.array(rolling_values)
-        
-        return results
+        return compute_rolling_metrics(
+            returns,
+            window,
+            metrics=metrics,
+            trading_days=self.trading_days,
+            risk_free_rate=self.risk_free_rate
+        )
     
     def calculate_period_returns(
         self,
@@ -4,12 +4,13 @@ Risk Metrics
 Advanced risk analytics:
 - Value at Risk (VaR) - Historical, Parametric, Monte Carlo
 - Expected Shortfall (CVaR)
+- Batch VaR/CVaR for many portfolios and confidence levels at once
 - Beta and correlation analysis
 - Factor risk decomposition
 - Stress testing
 """
 import numpy as np
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -48,6 +49,45 @@ class VaRResult:
         }
 
 
+@dataclass
+class BatchVaRResult:
+    """VaR and CVaR of many portfolios at several confidence levels."""
+    confidence_levels: np.ndarray  # (levels,)
+    time_horizon: int  # Days
+    var: Dict[VaRMethod, np.ndarray]  # Method -> (portfolios x levels)
+    cvar: Dict[VaRMethod, np.ndarray]  # Method -> (portfolios x levels)
+    volatility: np.ndarray  # Per-period P&L volatility (portfolios,)
+    n_simulations: int = 0
+    
+    @property
+    def n_portfolios(self) -> int:
+        return len(self.volatility)
+    
+    def to_var_results(self, portfolio: int) -> List[VaRResult]:
+        """Results of one portfolio as VaRResult objects (method-major order)."""
+        return [
+            VaRResult(
+                var_value=float(self.var[method][portfolio, j]),
+                confidence_level=float(level),
+                method=method,
+                time_horizon=self.time_horizon,
+                cvar_value=float(self.cvar[method][portfolio, j])
+            )
+            for method in self.var
+            for j, level in enumerate(self.confidence_levels)
+        ]
+    
+    def to_dict(self) -> dict:
+        return {
+            'confidence_levels': self.confidence_levels.tolist(),
+            'time_horizon': self.time_horizon,
+            'var': {m.value: v.tolist() for m, v in self.var.items()},
+            'cvar': {m.value: v.tolist() for m, v in self.cvar.items()},
+            'volatility': self.volatility.tolist(),
+            'n_simulations': self.n_simulations
+        }
+
+
 @dataclass
 class BetaAnalysis:
     """Beta and market risk analysis."""
@@ -341,16 +381,19 @@ class RiskMetrics:
         kurt = stats.kurtosis(portfolio_returns)
         
         z = stats.norm.ppf(1 - confidence_level)
-        
-        # Cornish-Fisher expansion
-        z_cf = (z + (z**2 - 1) * skew / 6 + 
-                (z**3 - 3*z) * (kurt - 3) / 24 - 
-                (2*z**3 - 5*z) * skew**2 / 36)
+        z_cf = self._cornish_fisher_z(z, skew, kurt)
         
         var = -(mean + z_cf * std) * np.sqrt(time_horizon)
         
         return float(var)
     
+    @staticmethod
+    def _cornish_fisher_z(z, skew, kurt):
+        """Cornish-Fisher expansion of a normal quantile (broadcasts over arrays)."""
+        return (z + (z**2 - 1) * skew / 6 + 
+                (z**3 - 3*z) * (kurt - 3) / 24 - 
+                (2*z**3 - 5*z) * skew**2 / 36)
+    
     def _calculate_cvar(
         self,
         returns: np.ndarray,
@@ -387,12 +430,8 @@ class RiskMetrics:
         from scipy import stats
         z = stats.norm.ppf(confidence_level)
         
-        marginal = {}
-        for i in range(len(weights)):
-            asset_contrib = np.dot(cov_matrix[i], weights) / portfolio_vol
-            marginal[f"asset_{i}"] = float(z * asset_contrib)
-        
-        return marginal
+        marginal = z * (cov_matrix @ weights) / portfolio_vol
+        return {f"asset_{i}": float(m) for i, m in enumerate(marginal)}
     
     def _component_var(
         self,
@@ -402,12 +441,150 @@ class RiskMetrics:
     ) -> Dict[str, float]:
         """Calculate component VaR by asset."""
         marginal = self._marginal_var(returns, weights, confidence_level)
+        return {key: float(mvar * w) for (key, mvar), w in zip(marginal.items(), weights)}
+    
+    # ==================== Batch VaR ====================
+    
+    def calculate_var_batch(
+        self,
+        returns: np.ndarray,
+        weights: np.ndarray,
+        confidence_levels: Sequence[float] = (0.95, 0.99),
+        methods: Sequence[VaRMethod] = (
+            VaRMethod.HISTORICAL, VaRMethod.PARAMETRIC, VaRMethod.CORNISH_FISHER
+        ),
+        time_horizon: int = 1,
+        n_simulations: int = 10000,
+        seed: Optional[int] = None
+    ) -> BatchVaRResult:
+        """
+        VaR and CVaR for many portfolios and confidence levels in one pass.
+        
+        The P&L of all portfolios is one matrix product; quantiles, moments
+        and tail means are taken column-wise for every level at once. Monte
+        Carlo draws one Cholesky-correlated scenario set from the asset
+        covariance and prices every portfolio on it.
+        
+        CVaR is the mean loss beyond VaR: the empirical tail for historical
+        and Cornish-Fisher (as in calculate_var), the normal closed form for
+        parametric and the scenario tail for Monte Carlo.
         
-        component = {}
-        for i, (key, mvar) in enumerate(marginal.items()):
-            component[key] = float(mvar * weights[i])
+        Args:
+            returns: Asset returns (n_periods x n_assets)
+            weights: Portfolio weights (n_portfolios x n_assets), or one vector
+            confidence_levels: Confidence levels (e.g., 0.95, 0.99)
+            methods: VaR methods to compute
+            time_horizon: Time horizon in days
+            n_simulations: Monte Carlo scenarios (shared by all portfolios)
+            seed: Random seed for the Monte Carlo scenarios
+            
+        Returns:
+            BatchVaRResult with (portfolios x levels) arrays per method
+        """
+        from scipy import stats
+        
+        returns = np.asarray(returns, dtype=float)
+        if returns.ndim == 1:
+            returns = returns[:, None]
+        weights = np.atleast_2d(np.asarray(weights, dtype=float))
+        if weights.shape[1] != returns.shape[1]:
+            raise ValueError(
+                f"weights have {weights.shape[1]} assets, returns have {returns.shape[1]}"
+            )
+        
+        levels = np.asarray(confidence_levels, dtype=float)
+        tail = 1 - levels
+        scale = np.sqrt(time_horizon)
+        
+        # Portfolio P&L (n_periods x n_portfolios)
+        pnl = returns @ weights.T
+        mean = pnl.mean(axis=0)
+        std = pnl.std(axis=0)
+        z = stats.norm.ppf(tail)[None, :]
+        
+        var: Dict[VaRMethod, np.ndarray] = {}
+        cvar: Dict[VaRMethod, np.ndarray] = {}
+        empirical = None
+        
+        for method in methods:
+            method = VaRMethod(method)
+            if method in (VaRMethod.HISTORICAL, VaRMethod.CORNISH_FISHER) and empirical is None:
+                empirical = self._tail_var_cvar(pnl, tail)
+            
+            if method == VaRMethod.HISTORICAL:
+                var[method] = empirical[0] * scale
+                cvar[method] = empirical[1] * scale
+            elif method == VaRMethod.PARAMETRIC:
+                var[method] = -(mean[:, None] + z * std[:, None]) * scale
+                shortfall = stats.norm.pdf(z) / tail[None, :]
+                cvar[method] = -(mean[:, None] - shortfall * std[:, None]) * scale
+            elif method == VaRMethod.CORNISH_FISHER:
+                skew = stats.skew(pnl, axis=0)[:, None]
+                kurt = stats.kurtosis(pnl, axis=0)[:, None]
+                z_cf = self._cornish_fisher_z(z, skew, kurt)
+                var[method] = -(mean[:, None] + z_cf * std[:, None]) * scale
+                cvar[method] = empirical[1] * scale
+            elif method == VaRMethod.MONTE_CARLO:
+                simulated = self._simulate_portfolios(returns, weights, n_simulations, seed)
+                mc_var, mc_cvar = self._tail_var_cvar(simulated, tail)
+                var[method] = mc_var * scale
+                cvar[method] = mc_cvar * scale
+        
+        return BatchVaRResult(
+            confidence_levels=levels,
+            time_horizon=time_horizon,
+            var=var,
+            cvar=cvar,
+            volatility=std,
+            n_simulations=n_simulations if VaRMethod.MONTE_CARLO in var else 0
+        )
+    
+    @staticmethod
+    def _tail_var_cvar(pnl: np.ndarray, tail: np.ndarray):
+        """
+        Empirical VaR and CVaR of each column at each tail probability.
+        
+        Returns:
+            (var, cvar), each (n_columns x n_levels)
+        """
+        thresholds = np.percentile(pnl, tail * 100, axis=0)  # (levels x columns)
+        cvar = np.zeros_like(thresholds)
+        # One level at a time keeps the temporaries at (periods x columns)
+        for j, threshold in enumerate(thresholds):
+            in_tail = pnl <= threshold
+            counts = np.count_nonzero(in_tail, axis=0)
+            tail_sum = (pnl * in_tail).sum(axis=0)
+            np.divide(-tail_sum, counts, out=cvar[j], where=counts > 0)
+        return -thresholds.T, cvar.T
+    
+    @staticmethod
+    def _simulate_portfolios(
+        returns: np.ndarray,
+        weights: np.ndarray,
+        n_simulations: int,
+        seed: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Portfolio returns on one set of correlated normal scenarios.
+        
+        Scenarios are mu + Z @ L.T with L the Cholesky factor of the asset
+        covariance; pricing all portfolios is Z @ (W @ L).T, so the
+        (scenarios x assets) matrix is never formed.
         
-        return component
+        Returns:
+            Simulated returns (n_simulations x n_portfolios)
+        """
+        mu = returns.mean(axis=0)
+        cov = np.atleast_2d(np.cov(returns.T, bias=True))
+        try:
+            factor = np.linalg.cholesky(cov)
+        except np.linalg.LinAlgError:
+            # Singular covariance (collinear assets, few periods)
+            eigvals, eigvecs = np.linalg.eigh(cov)
+            factor = eigvecs * np.sqrt(np.clip(eigvals, 0.0, None))
+        
+        draws = np.random.default_rng(seed).standard_normal((n_simulations, len(mu)))
+        return draws @ (weights @ factor).T + weights @ mu
     
     def calculate_beta_analysis(
         self,
@@ -672,15 +849,18 @@ class RiskMetrics:
         
         returns = np.asarray(returns)
         
-        # VaR metrics
-        var_95 = self.calculate_var(returns, 0.95, VaRMethod.HISTORICAL, 1)
-        var_99 = self.calculate_var(returns, 0.99, VaRMethod.HISTORICAL, 1)
-        var_95_10d = self.calculate_var(returns, 0.95, VaRMethod.HISTORICAL, 10)
+        # VaR metrics (one pass; historical VaR scales with sqrt(horizon))
+        portfolio_returns = returns.mean(axis=1) if returns.ndim > 1 else returns
+        var_batch = self.calculate_var_batch(
+            portfolio_returns, np.ones(1), (0.95, 0.99), (VaRMethod.HISTORICAL,)
+        )
+        var_95, var_99 = var_batch.var[VaRMethod.HISTORICAL][0]
+        cvar_95 = var_batch.cvar[VaRMethod.HISTORICAL][0, 0]
         
-        summary.var_95_1d = var_95.var_value
-        summary.var_99_1d = var_99.var_value
-        summary.var_95_10d = var_95_10d.var_value
-        summary.cvar_95_1d = var_95.cvar_value
+        summary.var_95_1d = float(var_95)
+        summary.var_99_1d = float(var_99)
+        summary.var_95_10d = float(var_95 * np.sqrt(10))
+        summary.cvar_95_1d = float(cvar_95)
         
         # Volatility
         summary.realized_volatility = float(np.std(returns) * np.sqrt(self.trading_days))
@@ -0,0 +1,245 @@
+"""
+Rolling Statistics
+
+Vectorized rolling-window metrics shared by the analytics services:
+- Compounded return (cumulative log-products)
+- Mean, volatility, covariance (cumulative sums)
+- Sharpe, beta, tracking error, information ratio
+- Historical VaR (strided window view + partition)
+
+Every function takes 1-D arrays and returns values for windows ending at
+index window-1 .. n-1, i.e. an array of length n - window + 1 aligned with
+``values[window - 1:]``. Inputs shorter than the window give empty arrays.
+"""
+import numpy as np
+from typing import Dict, List, Optional
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# Rolling variances below this fraction of the window's mean square, or
+# within a few ulps of the running sum of squares, are cumulative-sum
+# rounding noise and are reported as exactly zero
+_VAR_RTOL = 1e-10
+_VAR_ULPS = 64 * np.finfo(float).eps
+
+
+def _as_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=float)
+
+
+def _empty(n: int, window: int) -> bool:
+    if window < 1:
+        raise ValueError(f"window must be >= 1, got {window}")
+    return n < window
+
+
+def rolling_windows(values, window: int) -> np.ndarray:
+    """
+    Read-only (n - window + 1, window) view of all windows (no copy).
+    """
+    values = _as_array(values)
+    if _empty(len(values), window):
+        return np.empty((0, window))
+    return sliding_window_view(values, window)
+
+
+def rolling_sum(values, window: int) -> np.ndarray:
+    """Rolling sum via a single cumulative sum."""
+    values = _as_array(values)
+    if _empty(len(values), window):
+        return np.empty(0)
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    return csum[window:] - csum[:-window]
+
+
+def rolling_mean(values, window: int) -> np.ndarray:
+    """Rolling arithmetic mean."""
+    return rolling_sum(values, window) / window
+
+
+def rolling_cov(x, y, window: int, ddof: int = 0) -> np.ndarray:
+    """
+    Rolling covariance of two aligned series.
+
+    Both series are centred on their full-sample mean first; covariance is
+    shift-invariant and centring keeps the sum-of-products subtraction
+    well conditioned.
+    """
+    x = _as_array(x)
+    y = _as_array(y)
+    if _empty(len(x), window):
+        return np.empty(0)
+    if window - ddof <= 0:
+        return np.full(len(x) - window + 1, np.nan)
+
+    x = x - x.mean()
+    y = y - y.mean()
+    sx = rolling_sum(x, window)
+    sy = rolling_sum(y, window)
+    sxy = rolling_sum(x * y, window)
+    return (sxy - sx * sy / window) / (window - ddof)
+
+
+def rolling_var(values, window: int, ddof: int = 0) -> np.ndarray:
+    """Rolling variance, clipped at zero with rounding noise removed."""
+    values = _as_array(values)
+    if _empty(len(values), window):
+        return np.empty(0)
+    if window - ddof <= 0:
+        return np.full(len(values) - window + 1, np.nan)
+
+    centred = values - values.mean()
+    var = rolling_cov(centred, centred, window, ddof=ddof)
+    squares = centred * centred
+    noise = np.maximum(
+        _VAR_RTOL * rolling_mean(squares, window),
+        _VAR_ULPS * squares.sum() / window,
+    )
+    var[var <= noise] = 0.0
+    return var
+
+
+def rolling_std(values, window: int, ddof: int = 0) -> np.ndarray:
+    """Rolling standard deviation (np.std semantics for ddof=0)."""
+    return np.sqrt(rolling_var(values, window, ddof=ddof))
+
+
+def rolling_compound_return(returns, window: int) -> np.ndarray:
+    """
+    Rolling compounded return prod(1 + r) - 1.
+
+    Uses cumulative sums of log1p(r). Series containing a return <= -100%
+    fall back to a strided product, since the log is undefined there.
+    """
+    returns = _as_array(returns)
+    if _empty(len(returns), window):
+        return np.empty(0)
+
+    growth = 1.0 + returns
+    if np.any(growth <= 0):
+        return np.prod(sliding_window_view(growth, window), axis=1) - 1.0
+    return np.expm1(rolling_sum(np.log(growth), window))
+
+
+def rolling_sharpe(
+    returns,
+    window: int,
+    trading_days: int = 252,
+    risk_free_rate: float = 0.0,
+) -> np.ndarray:
+    """
+    Rolling Sharpe ratio.
+
+    Annualized return is the window's compounded return scaled by
+    trading_days / window; windows with zero volatility give 0.
+    """
+    returns = _as_array(returns)
+    ann_ret = rolling_compound_return(returns, window) * (trading_days / window)
+    ann_vol = rolling_std(returns, window) * np.sqrt(trading_days)
+    return safe_divide(ann_ret - risk_free_rate, ann_vol, 0.0)
+
+
+def rolling_beta(returns, benchmark_returns, window: int) -> np.ndarray:
+    """Rolling beta cov(r, b) / var(b); windows with a flat benchmark give 1."""
+    cov = rolling_cov(returns, benchmark_returns, window)
+    var = rolling_var(benchmark_returns, window)
+    return safe_divide(cov, var, 1.0)
+
+
+def rolling_tracking_error(returns, benchmark_returns, window: int, trading_days: int = 252) -> np.ndarray:
+    """Rolling annualized tracking error std(r - b) * sqrt(trading_days)."""
+    diff = _as_array(returns) - _as_array(benchmark_returns)
+    return rolling_std(diff, window) * np.sqrt(trading_days)
+
+
+def rolling_information_ratio(returns, benchmark_returns, window: int, trading_days: int = 252) -> np.ndarray:
+    """Rolling information ratio: annualized mean excess over tracking error."""
+    diff = _as_array(returns) - _as_array(benchmark_returns)
+    te = rolling_std(diff, window) * np.sqrt(trading_days)
+    return safe_divide(rolling_mean(diff, window) * trading_days, te, 0.0)
+
+
+def rolling_historical_var(returns, window: int, confidence_level: float = 0.95) -> np.ndarray:
+    """
+    Rolling historical VaR, -percentile(window, (1 - confidence) * 100).
+
+    Matches np.percentile's linear interpolation but only partitions the
+    two order statistics it needs in each window.
+    """
+    windows = rolling_windows(returns, window)
+    if len(windows) == 0:
+        return np.empty(0)
+
+    h = (window - 1) * (1.0 - confidence_level)
+    lo = int(np.floor(h))
+    hi = min(lo + 1, window - 1)
+    part = np.partition(windows, [lo, hi], axis=1)
+    quantile = part[:, lo] + (h - lo) * (part[:, hi] - part[:, lo])
+    return -quantile
+
+
+def compute_rolling_metrics(
+    returns,
+    window: int,
+    metrics: Optional[List[str]] = None,
+    benchmark_returns=None,
+    trading_days: int = 252,
+    risk_free_rate: float = 0.0,
+    confidence_level: float = 0.95,
+) -> Dict[str, np.ndarray]:
+    """
+    Compute several rolling metrics in one pass over shared intermediates.
+
+    Args:
+        returns: Portfolio returns
+        window: Rolling window size
+        metrics: Any of 'return', 'volatility', 'sharpe', 'var', and with a
+            benchmark 'beta', 'tracking_error', 'information_ratio'
+        benchmark_returns: Benchmark returns aligned with returns
+        trading_days: Periods per year for annualization
+        risk_free_rate: Annual risk-free rate for Sharpe
+        confidence_level: VaR confidence level
+
+    Returns:
+        Dictionary of aligned arrays (length n - window + 1)
+    """
+    returns = _as_array(returns)
+    metrics = metrics or ['return', 'volatility', 'sharpe']
+    if _empty(len(returns), window):
+        return {metric: np.empty(0) for metric in metrics}
+
+    results: Dict[str, np.ndarray] = {}
+    compound = vol = None
+
+    if {'return', 'sharpe'} & set(metrics):
+        compound = rolling_compound_return(returns, window)
+    if {'volatility', 'sharpe'} & set(metrics):
+        vol = rolling_std(returns, window) * np.sqrt(trading_days)
+
+    for metric in metrics:
+        if metric == 'return':
+            results[metric] = compound
+        elif metric == 'volatility':
+            results[metric] = vol
+        elif metric == 'sharpe':
+            ann_ret = compound * (trading_days / window)
+            results[metric] = safe_divide(ann_ret - risk_free_rate, vol, 0.0)
+        elif metric == 'var':
+            results[metric] = rolling_historical_var(returns, window, confidence_level)
+        elif benchmark_returns is not None and metric == 'beta':
+            results[metric] = rolling_beta(returns, benchmark_returns, window)
+        elif benchmark_returns is not None and metric == 'tracking_error':
+            results[metric] = rolling_tracking_error(returns, benchmark_returns, window, trading_days)
+        elif benchmark_returns is not None and metric == 'information_ratio':
+            results[metric] = rolling_information_ratio(returns, benchmark_returns, window, trading_days)
+        else:
+            results[metric] = np.zeros(len(returns) - window + 1)
+
+    return results
+
+
+def safe_divide(num: np.ndarray, den: np.ndarray, default: float) -> np.ndarray:
+    """num / den with `default` wherever den is not positive."""
+    out = np.full(np.shape(num), default, dtype=float)
+    np.divide(num, den, out=out, where=den > 0)
+    return out
@@ -0,0 +1,351 @@
+"""
+Compute Executor
+
+Runs CPU-bound work (portfolio optimizers, efficient frontiers, Monte
+Carlo VaR, batched ML inference) in a pool of worker processes so it
+does not block the event loop:
+
+- Warm start: workers are spawned at startup and import the heavy
+  modules (numpy, pandas, scipy, optimizer, ML service) once, so the
+  first request does not pay for process start-up and imports.
+- Backpressure: at most max_workers running + max_queue waiting tasks;
+  further submissions are rejected with ComputeQueueFull (HTTP 503).
+- Timeouts and cancellation: waiting tasks are held on the event loop
+  and only handed to the pool when a worker is free, so a task whose
+  timeout expires (or whose caller is cancelled) while queued never runs.
+  A task that is already running cannot be interrupted; it keeps its
+  worker until it finishes, so the bound on in-flight work still holds.
+
+When the executor is disabled (COMPUTE_WORKERS=0) or not started (tests,
+scripts), run() calls the function inline.
+"""
+import asyncio
+import importlib
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+
+
+DEFAULT_PRELOAD = (
+    "numpy",
+    "pandas",
+    "scipy.optimize",
+    "app.core.optimizer.optimizer",
+    "app.core.analytics.risk_metrics",
+    "app.ml.trained_service",
+)
+
+
+class ComputeExecutorError(Exception):
+    """Base error for rejected or failed compute tasks."""
+
+
+class ComputeQueueFull(ComputeExecutorError):
+    """All worker and queue slots are taken."""
+
+
+class ComputeTimeout(ComputeExecutorError):
+    """A task did not finish within its timeout."""
+
+
+# ==================== Worker Side ====================
+
+def _init_worker(preload: Sequence[str], warmers: Sequence[Callable[[], Any]]) -> None:
+    """Worker initializer: import heavy modules and run warm-up hooks once."""
+    for module in preload:
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            logger.warning(f"Compute worker {os.getpid()} could not preload {module}: {e}")
+    for warm in warmers:
+        try:
+            warm()
+        except Exception as e:
+            logger.warning(f"Compute worker {os.getpid()} warm-up failed: {e}")
+
+
+def _invoke(fn: Callable, args: tuple, kwargs: dict):
+    """Run one task and measure its time inside the worker."""
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+# ==================== Executor ====================
+
+class ComputeExecutor:
+    """
+    Bounded process pool for CPU-bound request work.
+
+    Usage:
+        executor = ComputeExecutor(max_workers=4, max_queue=16)
+        await executor.start()
+        result = await executor.run(solve_allocation, method, ..., timeout=30)
+        executor.get_stats()  # queue depth, latency percentiles
+        await executor.shutdown()
+
+    fn and its arguments must be picklable (module-level functions,
+    plain data, dataclasses, numpy arrays, DataFrames).
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_queue: int = 16,
+        default_timeout: Optional[float] = 60.0,
+        preload: Sequence[str] = DEFAULT_PRELOAD,
+        warmers: Sequence[Callable[[], Any]] = (),
+        mp_context: str = "spawn",
+        latency_window: int = 1000
+    ):
+        """
+        Args:
+            max_workers: Worker processes (0 disables the pool: run inline)
+            max_queue: Tasks allowed to wait for a worker
+            default_timeout: Per-task timeout in seconds (None = no limit)
+            preload: Modules imported by every worker at start-up
+            warmers: Module-level callables run once per worker (e.g. model loading)
+            mp_context: multiprocessing start method; spawn avoids forking the event loop
+            latency_window: Number of recent tasks kept for latency percentiles
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.default_timeout = default_timeout
+        self.preload = tuple(preload)
+        self.warmers = tuple(warmers)
+        self.mp_context = mp_context
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._free_workers: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._latencies: deque = deque(maxlen=latency_window)
+        self._queue_waits: deque = deque(maxlen=latency_window)
+        self._stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'rejected': 0,
+            'timeouts': 0,
+            'cancelled': 0,
+            'inline': 0,
+        }
+
+    @property
+    def capacity(self) -> int:
+        """Maximum tasks running or waiting at once."""
+        return self.max_workers + self.max_queue
+
+    @property
+    def is_running(self) -> bool:
+        return self._pool is not None
+
+    async def start(self) -> None:
+        """Create the pool and spawn every worker before the first request."""
+        if self._pool is not None or self.max_workers <= 0:
+            return
+
+        started = time.perf_counter()
+        self._free_workers = asyncio.Semaphore(self.max_workers)
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context(self.mp_context),
+            initializer=_init_worker,
+            initargs=(self.preload, self.warmers),
+        )
+        # One ping per worker: the pool spawns a process for each pending call
+        pings = [asyncio.wrap_future(self._pool.submit(_ping)) for _ in range(self.max_workers)]
+        pids = await asyncio.gather(*pings)
+        logger.info(
+            f"Compute executor started: {len(set(pids))} workers warm "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+
+    async def shutdown(self, wait: bool = True) -> None:
+        """Stop the pool; queued tasks are cancelled."""
+        pool, self._pool = self._pool, None
+        if pool is None:
+            return
+        await asyncio.get_running_loop().run_in_executor(
+            None, lambda: pool.shutdown(wait=wait, cancel_futures=True)
+        )
+        logger.info("Compute executor stopped")
+
+    # ==================== Submission ====================
+
+    def _acquire(self) -> bool:
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self._stats['rejected'] += 1
+                return False
+            self._in_flight += 1
+            self._stats['submitted'] += 1
+            return True
+
+    def _release(self, counter: Optional[str] = None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if counter:
+                self._stats[counter] += 1
+
+    def _on_done(self, loop: asyncio.AbstractEventLoop, submitted: float, future: Future) -> None:
+        """Free the worker and the slot once the pool is really done with the task."""
+        if future.cancelled() or future.exception() is not None:
+            self._release('failed')
+        else:
+            _, run_seconds = future.result()
+            total = time.perf_counter() - submitted
+            with self._lock:
+                self._in_flight -= 1
+                self._stats['completed'] += 1
+                self._latencies.append(total)
+                self._queue_waits.append(max(total - run_seconds, 0.0))
+        loop.call_soon_threadsafe(self._free_workers.release)
+
+    async def _submit(self, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        """Wait for a free worker, then run the task on it."""
+        submitted = time.perf_counter()
+        try:
+            await self._free_workers.acquire()
+        except asyncio.CancelledError:
+            # Timed out or cancelled while queued: the task never runs
+            self._release('cancelled')
+            raise
+
+        try:
+            future = self._pool.submit(_invoke, fn, args, kwargs)
+        except Exception:
+            self._free_workers.release()
+            self._release('failed')
+            raise
+        loop = asyncio.get_running_loop()
+        future.add_done_callback(lambda f: self._on_done(loop, submitted, f))
+
+        # Shielded: cancelling the caller must not mark a running task as done
+        result, _ = await asyncio.shield(asyncio.wrap_future(future))
+        return result
+
+    async def run(
+        self,
+        fn: Callable,
+        *args,
+        timeout: Optional[float] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Run fn(*args, **kwargs) in a worker process.
+
+        Args:
+            fn: Module-level function
+            *args, **kwargs: Picklable arguments
+            timeout: Seconds to wait, queueing included (default: default_timeout)
+
+        Returns:
+            fn's return value
+
+        Raises:
+            ComputeQueueFull: No free slot (caller should retry later)
+            ComputeTimeout: The task did not finish in time
+        """
+        if self._pool is None:
+            self._stats['inline'] += 1
+            return fn(*args, **kwargs)
+
+        if not self._acquire():
+            raise ComputeQueueFull(
+                f"Compute queue full ({self._in_flight} tasks in flight, capacity {self.capacity})"
+            )
+
+        timeout = self.default_timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(self._submit(fn, args, kwargs), timeout)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._stats['timeouts'] += 1
+            name = getattr(fn, '__name__', repr(fn))
+            raise ComputeTimeout(f"{name} did not finish within {timeout}s")
+
+    # ==================== Metrics ====================
+
+    @staticmethod
+    def _percentiles(values: deque) -> dict:
+        if not values:
+            return {'p50_ms': None, 'p95_ms': None, 'p99_ms': None, 'max_ms': None}
+        data = np.fromiter(values, dtype=float) * 1000
+        p50, p95, p99 = np.percentile(data, [50, 95, 99])
+        return {
+            'p50_ms': round(float(p50), 2),
+            'p95_ms': round(float(p95), 2),
+            'p99_ms': round(float(p99), 2),
+            'max_ms': round(float(data.max()), 2),
+        }
+
+    def collect_metrics(self):
+        """Queue depth and task counters for the /metrics endpoint."""
+        stats = self.get_stats()
+        yield (
+            "compute_tasks_total", "counter", "Compute tasks by result",
+            [({"result": k}, stats[k]) for k in self._stats],
+        )
+        yield ("compute_in_flight", "gauge", "Compute tasks running or queued", [({}, stats["in_flight"])])
+        yield ("compute_queue_depth", "gauge", "Compute tasks waiting for a worker", [({}, stats["queue_depth"])])
+        yield (
+            "compute_latency_p95_ms", "gauge", "p95 compute task latency (recent window)",
+            [({}, stats["latency"]["p95_ms"])],
+        )
+    
+    def get_stats(self) -> dict:
+        """Queue depth, throughput counters and latency percentiles."""
+        with self._lock:
+            in_flight = self._in_flight
+            latencies = self._percentiles(self._latencies)
+            queue_waits = self._percentiles(self._queue_waits)
+            counters = dict(self._stats)
+
+        return {
+            **counters,
+            'running': self.is_running,
+            'workers': self.max_workers,
+            'capacity': self.capacity,
+            'in_flight': in_flight,
+            'queue_depth': max(in_flight - self.max_workers, 0),
+            'latency': latencies,
+            'queue_wait': queue_waits,
+        }
+
+
+# Global instance
+_compute_executor: Optional[ComputeExecutor] = None
+
+
+def get_compute_executor() -> ComputeExecutor:
+    """Get or create the global compute executor (configured from settings)."""
+    global _compute_executor
+    if _compute_executor is None:
+        from app.config import settings
+        from app.ml.trained_service import get_trained_model_service
+        _compute_executor = ComputeExecutor(
+            max_workers=settings.COMPUTE_WORKERS,
+            max_queue=settings.COMPUTE_QUEUE_SIZE,
+            default_timeout=settings.COMPUTE_TASK_TIMEOUT or None,
+            warmers=(get_trained_model_service,) if settings.COMPUTE_WARM_ML_MODELS else (),
+        )
+        from app.core.metrics import metrics
+        metrics.register_collector(_compute_executor.collect_metrics)
+    return _compute_executor
+
+
+async def run_compute(fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+    """Run a CPU-bound call on the global compute executor."""
+    return await get_compute_executor().run(fn, *args, timeout=timeout, **kwargs)
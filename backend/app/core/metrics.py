@@ -0,0 +1,212 @@
+"""
+Metrics Registry
+
+Process-wide counters and latency histograms with a Prometheus text
+exposition (served at /metrics):
+
+- LatencyHistogram: fixed log-spaced buckets, so memory per series is
+  constant and quantiles are read in O(buckets) without sorting samples.
+  Samples can also be removed, which lets a histogram track a sliding
+  window of the last N requests.
+- MetricsRegistry: counters and histograms keyed by name and labels,
+  plus collectors that publish existing component statistics (cache,
+  compute executor, ...) at scrape time.
+
+Values are per process; Prometheus aggregates across workers.
+"""
+import math
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# Bucket upper bounds in ms: powers of sqrt(2) from 1ms to ~65s
+# (bucket width ~41%, so interpolated quantiles are within ~20%)
+DEFAULT_LATENCY_BUCKETS_MS: Tuple[float, ...] = tuple(
+    round(2 ** (i / 2), 1) for i in range(33)
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# (name, type, help, [(labels, value), ...]) published by a collector
+MetricFamily = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram.
+
+    Usage:
+        hist = LatencyHistogram()
+        hist.observe(123.4)
+        hist.quantile(0.95)
+    """
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_LATENCY_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # Last bucket: above the top bound
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def remove(self, value: float) -> None:
+        """Forget a previously observed value (sliding windows)."""
+        self.counts[bisect_left(self.bounds, value)] -= 1
+        self.count -= 1
+        self.sum -= value
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """
+        Approximate q-quantile, interpolated linearly inside its bucket.
+
+        Values above the top bound are reported as the top bound.
+        """
+        if self.count <= 0:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for i, n in enumerate(self.counts):
+            if n and cumulative + n >= rank:
+                if i == len(self.bounds):
+                    return self.bounds[-1]
+                lower = self.bounds[i - 1] if i else 0.0
+                return lower + (self.bounds[i] - lower) * max(rank - cumulative, 0) / n
+            cumulative += n
+        return self.bounds[-1]
+
+    def cumulative_buckets(self) -> List[Tuple[str, int]]:
+        """(le, cumulative count) pairs for the exposition format."""
+        buckets, total = [], 0
+        for bound, n in zip(self.bounds, self.counts):
+            total += n
+            buckets.append((_format_value(bound), total))
+        buckets.append(("+Inf", self.count))
+        return buckets
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class MetricsRegistry:
+    """
+    Counters, histograms and scrape-time collectors.
+
+    Usage:
+        metrics.inc("provider_failovers_total", provider="finnhub", reason="error")
+        metrics.observe("provider_request_latency_ms", 84.0, provider="finnhub", operation="quote")
+        metrics.render()  # Prometheus text format
+    """
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, LatencyHistogram]] = {}
+        self._help: Dict[str, str] = {}
+        self._collectors: List[Callable[[], Iterable[MetricFamily]]] = []
+
+    @staticmethod
+    def _key(labels: Dict[str, str]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def describe(self, name: str, help_text: str) -> None:
+        """Set the HELP text of a metric."""
+        self._help[name] = help_text
+
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        """Increase a counter."""
+        series = self._counters.setdefault(name, {})
+        key = self._key(labels)
+        series[key] = series.get(key, 0.0) + value
+
+    def histogram(self, name: str, **labels) -> LatencyHistogram:
+        """Get or create the histogram of one label set."""
+        series = self._histograms.setdefault(name, {})
+        key = self._key(labels)
+        hist = series.get(key)
+        if hist is None:
+            hist = series[key] = LatencyHistogram()
+        return hist
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Record a value in a histogram."""
+        self.histogram(name, **labels).observe(value)
+
+    def get_counter(self, name: str, **labels) -> float:
+        return self._counters.get(name, {}).get(self._key(labels), 0.0)
+
+    def register_collector(self, collector: Callable[[], Iterable[MetricFamily]]) -> None:
+        """Add a callable that returns metric families at scrape time."""
+        self._collectors.append(collector)
+
+    def reset(self) -> None:
+        """Drop all recorded series (collectors are kept)."""
+        self._counters.clear()
+        self._histograms.clear()
+
+    # ==================== Exposition ====================
+
+    def _header(self, lines: List[str], name: str, kind: str, help_text: str = "") -> None:
+        help_text = help_text or self._help.get(name, "")
+        if help_text:
+            lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+
+        for name in sorted(self._counters):
+            self._header(lines, name, "counter")
+            for key, value in sorted(self._counters[name].items()):
+                lines.append(f"{name}{_labels(key)} {_format_value(value)}")
+
+        for name in sorted(self._histograms):
+            self._header(lines, name, "histogram")
+            for key, hist in sorted(self._histograms[name].items()):
+                for le, count in hist.cumulative_buckets():
+                    lines.append(f"{name}_bucket{_labels(key, ('le', le))} {count}")
+                lines.append(f"{name}_sum{_labels(key)} {_format_value(hist.sum)}")
+                lines.append(f"{name}_count{_labels(key)} {hist.count}")
+
+        for collector in self._collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                lines.append(f"# collector {getattr(collector, '__name__', collector)} failed: {_escape(e)}")
+                continue
+            for name, kind, help_text, samples in families:
+                self._header(lines, name, kind, help_text)
+                for labels, value in samples:
+                    if value is None:
+                        continue
+                    lines.append(f"{name}{_labels(self._key(labels))} {_format_value(float(value))}")
+
+        return "\n".join(lines) + "\n"
+
+
+# Global registry
+metrics = MetricsRegistry()
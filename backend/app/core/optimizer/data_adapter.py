@@ -16,16 +16,19 @@ from typing import Dict, Optional, Any, List, Tuple
 from datetime import datetime, date, timedelta
 import logging
 
-from sqlalchemy import select, func, and_
+from sqlalchemy import select
 
 from app.data_providers.orchestrator import ProviderOrchestrator
 from app.data_providers.adapters.base import TimeFrame, MarketType
 from app.db.database import async_session_maker
-from app.db.models.price_bar import PriceBar, TimeFrame as DBTimeFrame
+from app.db.repositories.price_bar import load_price_matrix
 
 logger = logging.getLogger(__name__)
 
 
+# Columns returned by get_historical_prices
+OHLCV_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
 # European exchange suffixes
 EU_SUFFIXES = {'.MI', '.PA', '.DE', '.MC', '.AS', '.L', '.BR', '.CO', '.HE', '.LI', '.LS', '.VX', '.SW'}
 
@@ -66,6 +69,15 @@ class OptimizerDataAdapter:
         self.orchestrator = orchestrator
         self.min_data_days = min_data_days
         self.use_db_first = use_db_first
+        # (SYMBOL, start, end) -> OHLCV frame, filled by prefetch_historical_prices
+        self._prefetched: Dict[Tuple[str, date, date], pd.DataFrame] = {}
+        # SYMBOL -> fundamentals, filled by prefetch_fundamentals
+        self._prefetched_fundamentals: Dict[str, Dict[str, Any]] = {}
+    
+    @property
+    def max_concurrency(self) -> int:
+        """Parallel requests the orchestrator allows (its provider semaphore)."""
+        return self.orchestrator.config.max_parallel_requests
     
     async def get_historical_prices_batch(
         self,
@@ -99,14 +111,14 @@ class OptimizerDataAdapter:
         
         if self.use_db_first:
             # Try to get data from DB first
-            db_results = await self._fetch_from_db(symbols, start, end)
+            db_prices = await self._fetch_from_db(symbols, start, end)
             
-            for symbol, df in db_results.items():
-                if df is not None and len(df) >= self.min_data_days * 0.7:  # 70% coverage ok
-                    all_dfs.append(df)
-                    symbols_from_db.append(symbol)
-                else:
-                    symbols_need_fetch.append(symbol)
+            # 70% coverage ok
+            sufficient = db_prices.count() >= self.min_data_days * 0.7
+            symbols_from_db = list(db_prices.columns[sufficient])
+            symbols_need_fetch = list(db_prices.columns[~sufficient])
+            if symbols_from_db:
+                all_dfs.append(db_prices[symbols_from_db])
             
             logger.info(
                 f"DB fetch: {len(symbols_from_db)} symbols with sufficient data, "
@@ -127,9 +139,7 @@ class OptimizerDataAdapter:
             return pd.DataFrame()
         
         # Merge all DataFrames
-        result = all_dfs[0]
-        for df in all_dfs[1:]:
-            result = result.join(df, how='outer')
+        result = pd.concat(all_dfs, axis=1) if len(all_dfs) > 1 else all_dfs[0]
         
         result.sort_index(inplace=True)
         
@@ -148,42 +158,19 @@ class OptimizerDataAdapter:
         symbols: List[str],
         start_date: date,
         end_date: date
-    ) -> Dict[str, Optional[pd.DataFrame]]:
+    ) -> pd.DataFrame:
         """
-        Fetch historical data from price_bars table.
+        Fetch closing prices from price_bars table in a single query.
         
-        Returns dict mapping symbol to DataFrame (or None if no data).
+        Returns DataFrame with dates as index and one column per symbol,
+        NaN where a symbol has no bar (all-NaN if it has no data).
         """
-        results = {}
-        
         async with async_session_maker() as db:
-            for symbol in symbols:
-                query = (
-                    select(PriceBar.timestamp, PriceBar.close)
-                    .where(
-                        and_(
-                            PriceBar.symbol == symbol.upper(),
-                            PriceBar.timeframe == DBTimeFrame.D1,
-                            func.date(PriceBar.timestamp) >= start_date,
-                            func.date(PriceBar.timestamp) <= end_date
-                        )
-                    )
-                    .order_by(PriceBar.timestamp)
-                )
-                
-                result = await db.execute(query)
-                rows = result.fetchall()
-                
-                if rows:
-                    df = pd.DataFrame(rows, columns=['timestamp', symbol])
-                    df.set_index('timestamp', inplace=True)
-                    results[symbol] = df
-                    logger.debug(f"DB: {symbol} has {len(df)} bars")
-                else:
-                    results[symbol] = None
-                    logger.debug(f"DB: {symbol} has no data")
+            matrices = await load_price_matrix(db, symbols, start_date, end_date, fields=('close',))
         
-        return results
+        prices = matrices['close']
+        logger.debug(f"DB: {int(prices.count().sum())} bars for {len(symbols)} symbols")
+        return prices
     
     async def _fetch_from_providers(
         self,
@@ -253,15 +240,84 @@ class OptimizerDataAdapter:
         start = start_date.date() if isinstance(start_date, datetime) else start_date
         end = end_date.date() if isinstance(end_date, datetime) else end_date
         
-        # Try DB first
+        # Try DB first (prefetched batch, then single-symbol query)
         if self.use_db_first:
-            df = await self._fetch_full_ohlcv_from_db(symbol, start, end)
+            df = self._prefetched.get((symbol.upper(), start, end))
+            if df is None:
+                df = await self._fetch_full_ohlcv_from_db(symbol, start, end)
             if df is not None and len(df) >= self.min_data_days * 0.7:
                 return df
         
         # Fallback to provider
         return await self._fetch_full_ohlcv_from_provider(symbol, start, end)
     
+    async def prefetch_historical_prices(
+        self,
+        symbols: List[str],
+        start_date: datetime,
+        end_date: datetime
+    ) -> int:
+        """
+        Load OHLCV history for many symbols from the DB in one query.
+        
+        Subsequent get_historical_prices calls for the same date range are
+        served from memory; symbols with too little DB data still fall
+        back to the provider there.
+        
+        Args:
+            symbols: List of ticker symbols
+            start_date: Start datetime
+            end_date: End datetime
+            
+        Returns:
+            Number of symbols with DB data
+        """
+        if not self.use_db_first or not symbols:
+            return 0
+        
+        start = start_date.date() if isinstance(start_date, datetime) else start_date
+        end = end_date.date() if isinstance(end_date, datetime) else end_date
+        
+        frames = await self._fetch_ohlcv_frames_from_db(symbols, start, end)
+        for symbol, df in frames.items():
+            self._prefetched[(symbol.upper(), start, end)] = df
+        
+        logger.info(f"Prefetched DB history for {len(frames)}/{len(symbols)} symbols")
+        return len(frames)
+    
+    async def prefetch_fundamentals(self, symbols: List[str]) -> int:
+        """
+        Load fundamentals for many symbols from market_universe in one query.
+        
+        Subsequent get_fundamentals calls for these symbols are served
+        from memory.
+        
+        Args:
+            symbols: List of ticker symbols
+            
+        Returns:
+            Number of symbols found
+        """
+        from app.db.models.market_universe import MarketUniverse
+        
+        if not symbols:
+            return 0
+        
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(MarketUniverse).where(MarketUniverse.symbol.in_(symbols))
+            )
+            for asset in result.scalars().all():
+                self._prefetched_fundamentals[asset.symbol.upper()] = self._universe_fundamentals(asset)
+        
+        logger.info(f"Prefetched fundamentals for {len(self._prefetched_fundamentals)}/{len(symbols)} symbols")
+        return len(self._prefetched_fundamentals)
+    
+    def clear_prefetched(self) -> None:
+        """Drop prefetched OHLCV history and fundamentals."""
+        self._prefetched.clear()
+        self._prefetched_fundamentals.clear()
+    
     async def _fetch_full_ohlcv_from_db(
         self,
         symbol: str,
@@ -269,36 +325,33 @@ class OptimizerDataAdapter:
         end_date: date
     ) -> Optional[pd.DataFrame]:
         """Fetch full OHLCV data from DB."""
+        frames = await self._fetch_ohlcv_frames_from_db([symbol], start_date, end_date)
+        return frames.get(symbol)
+    
+    async def _fetch_ohlcv_frames_from_db(
+        self,
+        symbols: List[str],
+        start_date: date,
+        end_date: date
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch OHLCV data for many symbols from DB in a single query.
+        
+        Returns dict mapping symbol to DataFrame (symbols without bars omitted).
+        """
         async with async_session_maker() as db:
-            query = (
-                select(
-                    PriceBar.timestamp,
-                    PriceBar.open,
-                    PriceBar.high,
-                    PriceBar.low,
-                    PriceBar.close,
-                    PriceBar.volume
-                )
-                .where(
-                    and_(
-                        PriceBar.symbol == symbol.upper(),
-                        PriceBar.timeframe == DBTimeFrame.D1,
-                        func.date(PriceBar.timestamp) >= start_date,
-                        func.date(PriceBar.timestamp) <= end_date
-                    )
-                )
-                .order_by(PriceBar.timestamp)
-            )
-            
-            result = await db.execute(query)
-            rows = result.fetchall()
-            
-            if not rows:
-                return None
-            
-            df = pd.DataFrame(rows, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df.set_index('timestamp', inplace=True)
-            return df
+            matrices = await load_price_matrix(db, symbols, start_date, end_date, fields=OHLCV_FIELDS)
+        
+        frames = {}
+        for symbol in matrices['close'].columns:
+            df = pd.DataFrame({field: matrices[field][symbol] for field in OHLCV_FIELDS})
+            df = df[df['close'].notna()]
+            if df.empty:
+                continue
+            df['volume'] = df['volume'].fillna(0)
+            df.index.name = 'timestamp'
+            frames[symbol] = df
+        return frames
     
     async def _fetch_full_ohlcv_from_provider(
         self,
@@ -337,6 +390,24 @@ class OptimizerDataAdapter:
         
         return df
     
+    @staticmethod
+    def _universe_fundamentals(asset) -> Dict[str, Any]:
+        """Fundamentals dict from a market_universe row."""
+        return {
+            'name': asset.name or asset.symbol,
+            'sector': asset.sector,
+            'industry': asset.industry,
+            'market_cap': asset.market_cap,
+            'pe_ratio': None,  # Not stored in market_universe
+            'pb_ratio': None,
+            'dividend_yield': None,
+            'roe': None,
+            'debt_to_equity': None,
+            'revenue_growth': None,
+            'earnings_growth': None,
+            'beta': None
+        }
+    
     async def get_fundamentals(self, symbol: str) -> Dict[str, Any]:
         """
         Get fundamental data for a symbol from market_universe table.
@@ -349,6 +420,10 @@ class OptimizerDataAdapter:
         """
         from app.db.models.market_universe import MarketUniverse
         
+        prefetched = self._prefetched_fundamentals.get(symbol.upper())
+        if prefetched is not None:
+            return prefetched
+        
         try:
             # Fetch from market_universe table
             async with async_session_maker() as session:
@@ -358,20 +433,7 @@ class OptimizerDataAdapter:
                 asset = result.scalar_one_or_none()
                 
                 if asset:
-                    return {
-                        'name': asset.name or symbol,
-                        'sector': asset.sector,
-                        'industry': asset.industry,
-                        'market_cap': asset.market_cap,
-                        'pe_ratio': None,  # Not stored in market_universe
-                        'pb_ratio': None,
-                        'dividend_yield': None,
-                        'roe': None,
-                        'debt_to_equity': None,
-                        'revenue_growth': None,
-                        'earnings_growth': None,
-                        'beta': None
-                    }
+                    return self._universe_fundamentals(asset)
         except Exception as e:
             logger.warning(f"Failed to get fundamentals from DB for {symbol}: {e}")
         
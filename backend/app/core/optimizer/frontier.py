@@ -0,0 +1,380 @@
+"""
+Efficient Frontier Solver
+
+Traces the mean-variance frontier for a fully invested portfolio with
+per-asset weight bounds (long-only or box-constrained):
+
+- Critical line method (Markowitz): computes the turning points of the
+  frontier in closed form. Between two turning points the set of assets
+  at a bound does not change, so weights are linear in the target return
+  and any number of frontier points is an interpolation - no solver
+  calls per point.
+- SLSQP fallback: used if the critical line fails numerically (e.g. a
+  singular covariance) or its minimum variance end disagrees with a
+  direct solve. Each point is warm-started from the previous
+  solution and the solver gets analytic gradients and constraint
+  Jacobians instead of finite differences.
+"""
+import warnings
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+from loguru import logger
+from scipy.optimize import minimize
+
+
+Bounds = Union[float, np.ndarray]
+
+# Tolerance for bound / budget violations of a turning point
+_TOL = 1e-9
+# Relative size of the tie-breaking perturbation of expected returns
+_TIE = 1e-7
+# Allowed excess of the critical-line minimum variance over the SLSQP one
+_MIN_VAR_RTOL = 1e-6
+
+
+@dataclass
+class FrontierTrace:
+    """Frontier points ordered from minimum variance to maximum return."""
+    weights: np.ndarray          # points x assets
+    returns: np.ndarray
+    volatilities: np.ndarray
+    method: str                  # 'critical_line' or 'slsqp'
+    turning_points: int = 0
+    solver_iterations: int = 0
+    failed: List[int] = field(default_factory=list)  # SLSQP points that did not converge
+
+    def __len__(self) -> int:
+        return len(self.returns)
+
+
+def _as_bounds(value: Bounds, n: int) -> np.ndarray:
+    return np.broadcast_to(np.asarray(value, dtype=float), (n,)).copy()
+
+
+def max_return_weights(expected_returns: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    Highest-return fully invested portfolio under box bounds.
+
+    Starts at the lower bounds and fills assets in order of decreasing
+    expected return up to their upper bound.
+
+    Returns:
+        (weights, index of the asset left between its bounds)
+    """
+    weights = lower.copy()
+    free = 0
+    for i in np.argsort(-expected_returns, kind='stable'):
+        free = i
+        weights[i] += min(upper[i] - lower[i], 1 - weights.sum())
+        if weights.sum() >= 1 - _TOL:
+            break
+    return weights, int(free)
+
+
+# ==================== Critical Line ====================
+
+def critical_line(
+    expected_returns: np.ndarray,
+    cov_matrix: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    max_iterations: int = 1000
+) -> List[np.ndarray]:
+    """
+    Turning points of the efficient frontier (critical line algorithm).
+
+    Args:
+        expected_returns: Expected returns (n,)
+        cov_matrix: Covariance matrix (n x n), positive definite on the free assets
+        lower, upper: Weight bounds (n,); sum(lower) <= 1 <= sum(upper)
+
+    Returns:
+        Turning-point weights ordered from maximum return to minimum variance
+
+    Raises:
+        np.linalg.LinAlgError: Singular covariance of the free assets
+    """
+    mu_true = np.asarray(expected_returns, dtype=float)
+    cov = np.asarray(cov_matrix, dtype=float)
+    n = len(mu_true)
+    # Tied returns leave the starting corner and the lambda steps undefined
+    # (a whole group of assets is interchangeable), so ties are broken
+    # with a perturbation far below any meaningful return difference
+    tie = _TIE * max(np.ptp(mu_true), np.abs(mu_true).max(), _TOL)
+    mu = mu_true - tie * np.arange(n) / n
+
+    weights, first = max_return_weights(mu, lower, upper)
+    is_free = np.zeros(n, dtype=bool)
+    is_free[first] = True
+    points = [weights.copy()]
+    lambdas: List[float] = []
+    # Asset that changed state in the last step; it may not flip straight
+    # back (at a tie in lambda that would cycle forever)
+    last_changed = -1
+
+    for _ in range(max_iterations):
+        f = np.flatnonzero(is_free)
+        b = np.flatnonzero(~is_free)
+        cov_f_inv = np.linalg.inv(cov[np.ix_(f, f)])
+        w_b = weights[b]
+        # Covariance with the bounded weights: (cov[:, B] @ w_B) for every asset
+        bounded_load = cov[:, b] @ w_b
+
+        c4 = cov_f_inv.sum(axis=1)              # inv @ 1
+        c2 = cov_f_inv @ mu[f]                  # inv @ mu
+        c1, c3 = c4.sum(), c4 @ mu[f]
+        l3 = cov_f_inv @ bounded_load[f]
+        l1, l2 = w_b.sum(), l3.sum()
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Case a: a free weight moves to one of its bounds
+            l_in, i_in, b_in = -np.inf, -1, 0.0
+            if len(f) > 1:
+                c = -c1 * c2 + c3 * c4
+                bound = np.where(c > 0, upper[f], lower[f])
+                lam = ((1 - l1 + l2) * c4 - c1 * (bound + l3)) / c
+                lam[(c == 0) | (f == last_changed)] = -np.inf
+                j = int(np.argmax(lam))
+                l_in, i_in, b_in = lam[j], f[j], bound[j]
+
+            # Case b: a bounded weight becomes free. The system for f + [i]
+            # is the bordered inverse of cov_f (Schur complement s), so only
+            # its last row is needed, for all candidates at once.
+            l_out, i_out = -np.inf, -1
+            if len(b):
+                cov_fb = cov[np.ix_(f, b)]
+                u = cov_f_inv @ cov_fb
+                schur = cov[b, b] - np.einsum('km,km->m', cov_fb, u)
+                u1, um = u.sum(axis=0), mu[f] @ u
+                y_f = bounded_load[f][:, None] - cov_fb * w_b
+                y_i = bounded_load[b] - cov[b, b] * w_b
+                uy = np.einsum('km,km->m', u, y_f)
+
+                c1_b = c1 + (u1 - 1) ** 2 / schur
+                c3_b = c3 + (u1 - 1) * (um - mu[b]) / schur
+                c2_last = (mu[b] - um) / schur
+                c4_last = (1 - u1) / schur
+                c = -c1_b * c2_last + c3_b * c4_last
+                l2_b = c4 @ y_f + (u1 - 1) * (uy - y_i) / schur
+                l3_last = (y_i - uy) / schur
+                lam = ((1 - (l1 - w_b) + l2_b) * c4_last - c1_b * (w_b + l3_last)) / c
+
+                invalid = (c == 0) | ~np.isfinite(lam) | (b == last_changed)
+                if np.any(np.abs(schur) < 1e-14 * np.abs(cov[b, b])):
+                    raise np.linalg.LinAlgError("Singular matrix")
+                if lambdas:
+                    invalid |= lam >= lambdas[-1]
+                lam[invalid] = -np.inf
+                j = int(np.argmax(lam))
+                l_out, i_out = lam[j], b[j]
+
+        if l_in < 0 and l_out < 0:
+            # Minimum variance portfolio closes the frontier
+            lam = 0.0
+        elif l_in > l_out:
+            lam = l_in
+            is_free[i_in] = False
+            weights[i_in] = b_in
+            last_changed = i_in
+        else:
+            lam = l_out
+            is_free[i_out] = True
+            last_changed = i_out
+
+        # Weights of the free assets at lambda
+        f = np.flatnonzero(is_free)
+        b = np.flatnonzero(~is_free)
+        cov_f_inv = np.linalg.inv(cov[np.ix_(f, f)])
+        w_b = weights[b]
+        ones_inv = cov_f_inv.sum(axis=1)
+        mu_inv = cov_f_inv @ mu[f]
+        w1 = cov_f_inv @ (cov[np.ix_(f, b)] @ w_b)
+        gamma = (-lam * mu_inv.sum() + 1 - w_b.sum() + w1.sum()) / ones_inv.sum()
+        weights[f] = -w1 + gamma * ones_inv + lam * mu_inv
+
+        lambdas.append(lam)
+        points.append(weights.copy())
+        if lam == 0:
+            break
+
+    # Drop numerically invalid points, then keep the part where return
+    # strictly rises from the minimum variance point
+    valid = [
+        w for w in points
+        if np.all(w >= lower - _TOL) and np.all(w <= upper + _TOL) and abs(w.sum() - 1) < _TOL * n
+    ]
+    kept: List[np.ndarray] = []
+    for w in reversed(valid):
+        if not kept or w @ mu_true > kept[-1] @ mu_true + tie:
+            kept.append(w)
+    if not kept:
+        raise np.linalg.LinAlgError("No valid turning points")
+    return kept[::-1]
+
+
+# ==================== Solver ====================
+
+class EfficientFrontierSolver:
+    """
+    Efficient frontier for a fully invested portfolio with weight bounds.
+
+    Usage:
+        solver = EfficientFrontierSolver(mu, cov, lower=0.0, upper=0.3)
+        trace = solver.trace(50)
+        trace.weights, trace.returns, trace.volatilities
+    """
+
+    def __init__(
+        self,
+        expected_returns: np.ndarray,
+        cov_matrix: np.ndarray,
+        lower: Bounds = 0.0,
+        upper: Bounds = 1.0
+    ):
+        """
+        Args:
+            expected_returns: Expected returns (n,)
+            cov_matrix: Covariance matrix (n x n)
+            lower: Minimum weight, scalar or per asset
+            upper: Maximum weight, scalar or per asset
+        """
+        self.mu = np.asarray(expected_returns, dtype=float)
+        self.cov = np.asarray(cov_matrix, dtype=float)
+        n = len(self.mu)
+        self.lower = _as_bounds(lower, n)
+        self.upper = _as_bounds(upper, n)
+        if self.lower.sum() > 1 + _TOL or self.upper.sum() < 1 - _TOL:
+            raise ValueError("Weight bounds do not admit a fully invested portfolio")
+        self._turning_points: Optional[np.ndarray] = None
+
+    # ==================== Closed Form ====================
+
+    def turning_points(self) -> np.ndarray:
+        """Critical-line turning points, from minimum variance to maximum return."""
+        if self._turning_points is None:
+            points = critical_line(self.mu, self.cov, self.lower, self.upper)
+            # The minimum variance end must agree with a direct solve; if it
+            # does not, the critical line went wrong and is not trusted
+            min_var = self.solve()
+            cla_var, _ = self._variance(points[-1])
+            if min_var.success and cla_var > min_var.fun * (1 + _MIN_VAR_RTOL) + _TOL:
+                raise np.linalg.LinAlgError(
+                    f"Minimum variance mismatch ({cla_var:.6g} vs {min_var.fun:.6g})"
+                )
+            self._turning_points = np.array(points[::-1])
+        return self._turning_points
+
+    def _interpolate(self, targets: np.ndarray) -> np.ndarray:
+        points = self.turning_points()
+        rets = points @ self.mu
+        k = np.clip(np.searchsorted(rets, targets, side='right') - 1, 0, max(len(rets) - 2, 0))
+        if len(rets) == 1:
+            return np.repeat(points, len(targets), axis=0)
+        span = rets[k + 1] - rets[k]
+        a = np.clip((targets - rets[k]) / span, 0.0, 1.0)[:, None]
+        return (1 - a) * points[k] + a * points[k + 1]
+
+    # ==================== Iterative ====================
+
+    def _variance(self, w: np.ndarray) -> Tuple[float, np.ndarray]:
+        sigma_w = self.cov @ w
+        return float(w @ sigma_w), 2 * sigma_w
+
+    def solve(self, target_return: Optional[float] = None, x0: Optional[np.ndarray] = None):
+        """
+        Minimum variance portfolio (at a target return, if given) via SLSQP.
+
+        Args:
+            target_return: Required expected return (None = global minimum variance)
+            x0: Starting weights (warm start); default equal weight clipped to bounds
+
+        Returns:
+            scipy OptimizeResult
+        """
+        n = len(self.mu)
+        if x0 is None:
+            x0 = np.clip(np.ones(n) / n, self.lower, self.upper)
+
+        constraints = [{
+            'type': 'eq',
+            'fun': lambda w: w.sum() - 1,
+            'jac': lambda w: np.ones(n),
+        }]
+        if target_return is not None:
+            constraints.append({
+                'type': 'eq',
+                'fun': lambda w: w @ self.mu - target_return,
+                'jac': lambda w: self.mu,
+            })
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return minimize(
+                self._variance,
+                x0,
+                jac=True,
+                method='SLSQP',
+                bounds=list(zip(self.lower, self.upper)),
+                constraints=constraints,
+                options={'maxiter': 1000, 'ftol': 1e-12}
+            )
+
+    def _trace_slsqp(self, n_points: int, max_target: Optional[float] = None) -> FrontierTrace:
+        min_var = self.solve()
+        max_ret, _ = max_return_weights(self.mu, self.lower, self.upper)
+        low, top = min_var.x @ self.mu, max_ret @ self.mu
+        if max_target is not None:
+            top = max(min(max_target, top), low)
+        targets = np.linspace(low, top, n_points)
+
+        weights = np.empty((n_points, len(self.mu)))
+        iterations, failed = min_var.nit, []
+        x = min_var.x
+        for p, target in enumerate(targets):
+            result = self.solve(target, x0=x)
+            iterations += result.nit
+            if not result.success:
+                failed.append(p)
+            x = np.clip(result.x, self.lower, self.upper)
+            weights[p] = x
+
+        return self._trace(weights, 'slsqp', solver_iterations=iterations, failed=failed)
+
+    # ==================== Tracing ====================
+
+    def _trace(self, weights: np.ndarray, method: str, **extra) -> FrontierTrace:
+        variances = np.einsum('pi,ij,pj->p', weights, self.cov, weights)
+        return FrontierTrace(
+            weights=weights,
+            returns=weights @ self.mu,
+            volatilities=np.sqrt(np.maximum(variances, 0.0)),
+            method=method,
+            **extra
+        )
+
+    def trace(
+        self,
+        n_points: int = 50,
+        max_target: Optional[float] = None
+    ) -> FrontierTrace:
+        """
+        Frontier points at evenly spaced target returns.
+
+        Args:
+            n_points: Number of points
+            max_target: Highest target return (default: maximum attainable)
+
+        Returns:
+            FrontierTrace from minimum variance to the highest target
+        """
+        try:
+            points = self.turning_points()
+            rets = points @ self.mu
+            top = rets[-1] if max_target is None else min(max_target, rets[-1])
+            targets = np.linspace(rets[0], max(top, rets[0]), n_points)
+            return self._trace(self._interpolate(targets), 'critical_line', turning_points=len(points))
+        except np.linalg.LinAlgError as e:
+            logger.debug(f"Critical line failed ({e}), tracing frontier with SLSQP")
+            return self._trace_slsqp(n_points, max_target)
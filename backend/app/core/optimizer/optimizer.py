@@ -45,6 +45,7 @@ from .proposal import (
     ProposalType,
     AllocationItem
 )
+from app.core.compute_executor import ComputeExecutorError, run_compute
 from loguru import logger
 
 
@@ -90,6 +91,105 @@ class OptimizationResponse:
     optimization_result: Optional[OptimizationResult]
     error: Optional[str] = None
     execution_time_ms: float = 0
+    screening_stats: Dict[str, Any] = field(default_factory=dict)  # Stage timings (ms) and counts
+
+
+# ==================== Compute Functions ====================
+# Module-level so they can run on the compute executor's worker processes.
+
+def solve_allocation(
+    method: OptimizationMethod,
+    risk_model: RiskModel,
+    risk_free_rate: float,
+    expected_returns: np.ndarray,
+    cov_matrix: np.ndarray,
+    returns: pd.DataFrame,
+    constraints: OptimizationConstraints,
+    market_caps: Optional[np.ndarray] = None,
+    views: Optional[List[Dict]] = None
+) -> OptimizationResult:
+    """
+    Run one optimization method on prepared inputs.
+    
+    Args:
+        method: Optimization method
+        risk_model: Risk model (used for risk contributions)
+        risk_free_rate: Risk-free rate
+        expected_returns: Annualized expected returns
+        cov_matrix: Annualized covariance matrix
+        returns: Historical returns (HRP clustering)
+        constraints: Weight constraints
+        market_caps: Market caps (Black-Litterman)
+        views: Investor views (Black-Litterman)
+        
+    Returns:
+        OptimizationResult
+    """
+    if method == OptimizationMethod.MIN_VARIANCE:
+        optimizer = MeanVarianceOptimizer(risk_model, risk_free_rate)
+        return optimizer.optimize(
+            expected_returns, cov_matrix,
+            OptimizationObjective.MIN_VARIANCE,
+            constraints
+        )
+    
+    if method == OptimizationMethod.RISK_PARITY:
+        optimizer = RiskParityOptimizer(risk_model)
+        result = optimizer.optimize(cov_matrix, constraints=constraints)
+        # Add expected return to result
+        result.expected_return = float(result.weights @ expected_returns)
+        return result
+    
+    if method == OptimizationMethod.HRP:
+        optimizer = HierarchicalRiskParityOptimizer()
+        result = optimizer.optimize(returns, cov_matrix)
+        result.expected_return = float(result.weights @ expected_returns)
+        result.sharpe_ratio = (
+            result.expected_return / result.expected_volatility
+            if result.expected_volatility > 0 else 0
+        )
+        return result
+    
+    if method == OptimizationMethod.BLACK_LITTERMAN:
+        optimizer = BlackLittermanOptimizer(risk_model, risk_free_rate)
+        return optimizer.optimize(
+            market_caps, cov_matrix,
+            views=views,
+            constraints=constraints
+        )
+    
+    # Mean-variance and default: max Sharpe
+    optimizer = MeanVarianceOptimizer(risk_model, risk_free_rate)
+    return optimizer.optimize(
+        expected_returns, cov_matrix,
+        OptimizationObjective.MAX_SHARPE,
+        constraints
+    )
+
+
+def compute_efficient_frontier(
+    risk_model: RiskModel,
+    risk_free_rate: float,
+    expected_returns: np.ndarray,
+    cov_matrix: np.ndarray,
+    n_points: int = 50,
+    constraints: Optional[OptimizationConstraints] = None
+) -> List[Dict]:
+    """Efficient frontier points as plain dicts."""
+    optimizer = MeanVarianceOptimizer(risk_model, risk_free_rate)
+    frontier = optimizer.efficient_frontier(
+        expected_returns, cov_matrix, n_points, constraints
+    )
+    
+    return [
+        {
+            'expected_return': r.expected_return,
+            'expected_volatility': r.expected_volatility,
+            'sharpe_ratio': r.sharpe_ratio,
+            'weights': r.weights.tolist()
+        }
+        for r in frontier
+    ]
 
 
 class PortfolioOptimizer:
@@ -154,6 +254,7 @@ class PortfolioOptimizer:
                     success=False,
                     proposal=None,
                     screened_assets=screened,
+                    screening_stats=self.screener.last_stats,
                     optimization_result=None,
                     error=f"Only {len(screened)} assets passed screening, "
                           f"minimum {request.min_positions} required"
@@ -173,6 +274,7 @@ class PortfolioOptimizer:
                     success=False,
                     proposal=None,
                     screened_assets=screened,
+                    screening_stats=self.screener.last_stats,
                     optimization_result=None,
                     error="Failed to fetch historical data"
                 )
@@ -187,6 +289,7 @@ class PortfolioOptimizer:
                     success=False,
                     proposal=None,
                     screened_assets=screened,
+                    screening_stats=self.screener.last_stats,
                     optimization_result=opt_result,
                     error=f"Optimization failed: {opt_result.message}"
                 )
@@ -212,9 +315,13 @@ class PortfolioOptimizer:
                 proposal=proposal,
                 screened_assets=screened,
                 optimization_result=opt_result,
-                execution_time_ms=execution_time
+                execution_time_ms=execution_time,
+                screening_stats=self.screener.last_stats
             )
             
+        except ComputeExecutorError:
+            # Overload / timeout: let the API layer answer 503 / 504
+            raise
         except Exception as e:
             logger.exception(f"Optimization failed: {e}")
             return OptimizationResponse(
@@ -337,61 +444,21 @@ class PortfolioOptimizer:
             'aggressive': 0.22
         }.get(request.risk_profile, 0.15)
         
-        # Run optimizer
-        if method == OptimizationMethod.MEAN_VARIANCE:
-            optimizer = MeanVarianceOptimizer(self.risk_model, self.risk_free_rate)
-            result = optimizer.optimize(
-                expected_returns, cov_matrix,
-                OptimizationObjective.MAX_SHARPE,
-                constraints
-            )
-            
-        elif method == OptimizationMethod.MIN_VARIANCE:
-            optimizer = MeanVarianceOptimizer(self.risk_model, self.risk_free_rate)
-            result = optimizer.optimize(
-                expected_returns, cov_matrix,
-                OptimizationObjective.MIN_VARIANCE,
-                constraints
-            )
-            
-        elif method == OptimizationMethod.RISK_PARITY:
-            optimizer = RiskParityOptimizer(self.risk_model)
-            result = optimizer.optimize(cov_matrix, constraints=constraints)
-            # Add expected return to result
-            result.expected_return = float(result.weights @ expected_returns)
-            
-        elif method == OptimizationMethod.HRP:
-            optimizer = HierarchicalRiskParityOptimizer()
-            result = optimizer.optimize(returns, cov_matrix)
-            result.expected_return = float(result.weights @ expected_returns)
-            result.sharpe_ratio = (
-                result.expected_return / result.expected_volatility
-                if result.expected_volatility > 0 else 0
-            )
-            
-        elif method == OptimizationMethod.BLACK_LITTERMAN:
-            # Get market caps from screened assets
+        # Market caps for Black-Litterman
+        market_caps = None
+        if method == OptimizationMethod.BLACK_LITTERMAN:
             market_caps = np.array([
                 a.market_cap or 1e9 for a in screened[:len(returns.columns)]
             ])
-            
-            optimizer = BlackLittermanOptimizer(
-                self.risk_model, self.risk_free_rate
-            )
-            result = optimizer.optimize(
-                market_caps, cov_matrix,
-                views=request.views,
-                constraints=constraints
-            )
-            
-        else:
-            # Default to max Sharpe
-            optimizer = MeanVarianceOptimizer(self.risk_model, self.risk_free_rate)
-            result = optimizer.optimize(
-                expected_returns, cov_matrix,
-                OptimizationObjective.MAX_SHARPE,
-                constraints
-            )
+        
+        # Run optimizer on the compute executor
+        result = await run_compute(
+            solve_allocation,
+            method, self.risk_model, self.risk_free_rate,
+            expected_returns, cov_matrix, returns, constraints,
+            market_caps=market_caps,
+            views=request.views
+        )
         
         return result
     
@@ -488,8 +555,12 @@ class PortfolioOptimizer:
         # If no target provided, calculate new optimal
         if target_weights is None:
             cov = self.risk_model.estimate_covariance(returns).values
-            optimizer = RiskParityOptimizer(self.risk_model)
-            result = optimizer.optimize(cov)
+            constraints = OptimizationConstraints()
+            result = await run_compute(
+                solve_allocation,
+                OptimizationMethod.RISK_PARITY, self.risk_model, self.risk_free_rate,
+                np.zeros(len(cov)), cov, returns, constraints
+            )
             target_weights = result.weights
         
         # Prepare asset info
@@ -522,23 +593,29 @@ class PortfolioOptimizer:
         Returns:
             List of points with return, volatility, weights
         """
+        return compute_efficient_frontier(
+            self.risk_model, self.risk_free_rate,
+            *self._frontier_inputs(returns), n_points, constraints
+        )
+    
+    async def get_efficient_frontier_async(
+        self,
+        returns: pd.DataFrame,
+        n_points: int = 50,
+        constraints: Optional[OptimizationConstraints] = None
+    ) -> List[Dict]:
+        """get_efficient_frontier on the compute executor."""
+        return await run_compute(
+            compute_efficient_frontier,
+            self.risk_model, self.risk_free_rate,
+            *self._frontier_inputs(returns), n_points, constraints
+        )
+    
+    def _frontier_inputs(self, returns: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Expected returns and covariance (estimated in-process, where the cache lives)."""
         cov = self.risk_model.estimate_covariance(returns).values
         expected_returns = self.risk_model.calculate_expected_returns(returns).values
-        
-        optimizer = MeanVarianceOptimizer(self.risk_model, self.risk_free_rate)
-        frontier = optimizer.efficient_frontier(
-            expected_returns, cov, n_points, constraints
-        )
-        
-        return [
-            {
-                'expected_return': r.expected_return,
-                'expected_volatility': r.expected_volatility,
-                'sharpe_ratio': r.sharpe_ratio,
-                'weights': r.weights.tolist()
-            }
-            for r in frontier
-        ]
+        return expected_returns, cov
 
 
 # Export convenience function
@@ -3,13 +3,15 @@ Risk Models for Portfolio Optimization
 
 Provides various risk measurement and modeling approaches:
 - Historical volatility and correlation
-- Exponentially weighted moving average (EWMA)
+- Exponentially weighted moving average (EWMA), batch and incremental
+- Shrinkage (Ledoit-Wolf, constant correlation) as matrix products
 - GARCH models for volatility forecasting
 - Risk metrics: VaR, CVaR, Maximum Drawdown
 """
 
 import numpy as np
 import pandas as pd
+from collections import OrderedDict
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
@@ -38,6 +40,137 @@ class RiskMetrics:
     beta: Optional[float]                 # Market beta if benchmark provided
 
 
+class CovarianceCache:
+    """
+    Small LRU of estimated covariance matrices.
+    
+    Keyed by estimator settings, universe (column order) and the date
+    range of the returns, so repeated optimizations over the same screened
+    universe on the same day reuse one estimate.
+    """
+    
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: tuple) -> Optional[pd.DataFrame]:
+        cov = self._entries.get(key)
+        if cov is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return cov.copy()
+    
+    def set(self, key: tuple, cov: pd.DataFrame) -> None:
+        self._entries[key] = cov.copy()
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+    
+    def get_stats(self) -> Dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Shared across RiskModel instances (one per optimizer request)
+covariance_cache = CovarianceCache()
+
+
+def ewma_decay(halflife: float) -> float:
+    """Per-period decay (1 - alpha) for a given halflife."""
+    return float(np.exp(-np.log(2) / halflife))
+
+
+def ewma_weights(n_obs: int, halflife: float) -> np.ndarray:
+    """Normalized EWMA weights, oldest first (most recent has highest weight)."""
+    weights = ewma_decay(halflife) ** np.arange(n_obs - 1, -1, -1, dtype=float)
+    return weights / weights.sum()
+
+
+class EWMACovarianceState:
+    """
+    Incrementally updated EWMA covariance.
+    
+    Keeps decayed sums of x and x x^T plus the plain sums used for the
+    (unweighted) mean, so rolling yesterday's estimate forward costs one
+    rank-1 update instead of re-weighting the whole history. The result
+    equals RiskModel._ewma_covariance on the same rows; pass the row
+    leaving a fixed-length window as `drop` to keep the window length.
+    
+    Usage:
+        state = EWMACovarianceState.from_returns(returns, halflife=60)
+        state.update(today_row, drop=oldest_row)
+        cov = state.covariance(annualization_factor=252)
+    """
+    
+    def __init__(self, n_assets: int, halflife: float, columns: Optional[List] = None):
+        self.decay = ewma_decay(halflife)
+        self.columns = list(columns) if columns is not None else list(range(n_assets))
+        self.n_obs = 0
+        self.w_sum = 0.0                                  # sum of weights
+        self.wx_sum = np.zeros(n_assets)                  # sum of w * x
+        self.wxx_sum = np.zeros((n_assets, n_assets))     # sum of w * x x^T
+        self.x_sum = np.zeros(n_assets)                   # plain sum for the mean
+    
+    @classmethod
+    def from_returns(cls, returns: pd.DataFrame, halflife: float) -> "EWMACovarianceState":
+        """Build the state from a return history in one pass of matrix products."""
+        values = np.asarray(returns, dtype=float)
+        n_obs, n_assets = values.shape
+        state = cls(n_assets, halflife, columns=getattr(returns, "columns", None))
+        
+        raw = state.decay ** np.arange(n_obs - 1, -1, -1, dtype=float)
+        state.n_obs = n_obs
+        state.w_sum = float(raw.sum())
+        state.wx_sum = raw @ values
+        state.wxx_sum = (values * raw[:, None]).T @ values
+        state.x_sum = values.sum(axis=0)
+        return state
+    
+    def update(self, row: np.ndarray, drop: Optional[np.ndarray] = None) -> None:
+        """
+        Roll the estimate forward by one period.
+        
+        Args:
+            row: New return row (one value per asset)
+            drop: Oldest row leaving the window (None = expanding window)
+        """
+        row = np.asarray(row, dtype=float)
+        self.w_sum = self.decay * self.w_sum + 1.0
+        self.wx_sum = self.decay * self.wx_sum + row
+        self.wxx_sum = self.decay * self.wxx_sum + np.outer(row, row)
+        self.x_sum = self.x_sum + row
+        self.n_obs += 1
+        
+        if drop is not None:
+            drop = np.asarray(drop, dtype=float)
+            # After the decay step the dropped row carries weight decay^n_obs-1
+            w_old = self.decay ** (self.n_obs - 1)
+            self.w_sum -= w_old
+            self.wx_sum -= w_old * drop
+            self.wxx_sum -= w_old * np.outer(drop, drop)
+            self.x_sum -= drop
+            self.n_obs -= 1
+    
+    def covariance(self, annualization_factor: int = 252) -> pd.DataFrame:
+        """Current EWMA covariance around the plain sample mean."""
+        mean = self.x_sum / self.n_obs
+        wmean = self.wx_sum / self.w_sum
+        cov = (
+            self.wxx_sum / self.w_sum
+            - np.outer(wmean, mean)
+            - np.outer(mean, wmean)
+            + np.outer(mean, mean)
+        )
+        cov = (cov + cov.T) / 2 * annualization_factor
+        return pd.DataFrame(cov, index=self.columns, columns=self.columns)
+
+
 class RiskModel:
     """
     Risk modeling for portfolio optimization.
@@ -50,11 +183,13 @@ class RiskModel:
         self,
         model_type: RiskModelType = RiskModelType.LEDOIT_WOLF,
         halflife: int = 60,  # For EWMA
-        annualization_factor: int = 252  # Trading days
+        annualization_factor: int = 252,  # Trading days
+        use_cache: bool = True
     ):
         self.model_type = model_type
         self.halflife = halflife
         self.annualization_factor = annualization_factor
+        self.use_cache = use_cache
     
     def estimate_covariance(
         self,
@@ -64,6 +199,9 @@ class RiskModel:
         """
         Estimate covariance matrix from returns data.
         
+        Estimates for date-indexed returns are cached by model, universe
+        and date range (see CovarianceCache).
+        
         Args:
             returns: DataFrame of asset returns (assets as columns)
             model_type: Override default model type
@@ -73,16 +211,46 @@ class RiskModel:
         """
         model = model_type or self.model_type
         
+        key = self._cache_key(returns, model)
+        if key is not None:
+            cached = covariance_cache.get(key)
+            if cached is not None:
+                return cached
+        
         if model == RiskModelType.SAMPLE:
-            return self._sample_covariance(returns)
+            cov = self._sample_covariance(returns)
         elif model == RiskModelType.EWMA:
-            return self._ewma_covariance(returns)
+            cov = self._ewma_covariance(returns)
         elif model == RiskModelType.LEDOIT_WOLF:
-            return self._ledoit_wolf_covariance(returns)
+            cov = self._ledoit_wolf_covariance(returns)
         elif model == RiskModelType.CONSTANT_CORRELATION:
-            return self._constant_correlation_covariance(returns)
+            cov = self._constant_correlation_covariance(returns)
         else:
             raise ValueError(f"Unknown model type: {model}")
+        
+        if key is not None:
+            covariance_cache.set(key, cov)
+        return cov
+    
+    def _cache_key(self, returns: pd.DataFrame, model: RiskModelType) -> Optional[tuple]:
+        """Cache key, or None when the returns are not identified by dates."""
+        if not self.use_cache or not isinstance(returns.index, pd.DatetimeIndex) or returns.empty:
+            return None
+        return (
+            model.value,
+            self.halflife if model == RiskModelType.EWMA else None,
+            self.annualization_factor,
+            tuple(returns.columns),
+            returns.index[0],
+            returns.index[-1],
+            len(returns),
+        )
+    
+    @staticmethod
+    def _demeaned(returns: pd.DataFrame) -> np.ndarray:
+        """Returns as a float matrix with column means removed."""
+        values = np.asarray(returns, dtype=float)
+        return values - values.mean(axis=0)
     
     def _sample_covariance(self, returns: pd.DataFrame) -> pd.DataFrame:
         """Standard sample covariance matrix"""
@@ -90,26 +258,11 @@ class RiskModel:
     
     def _ewma_covariance(self, returns: pd.DataFrame) -> pd.DataFrame:
         """Exponentially weighted covariance matrix"""
-        # Calculate decay factor
-        alpha = 1 - np.exp(-np.log(2) / self.halflife)
-        
-        # Initialize
-        n_assets = returns.shape[1]
-        cov = np.zeros((n_assets, n_assets))
+        demeaned = self._demeaned(returns)
+        weights = ewma_weights(len(demeaned), self.halflife)
         
-        # Calculate EWMA covariance
-        returns_np = returns.values
-        mean = returns_np.mean(axis=0)
-        demeaned = returns_np - mean
-        
-        weights = np.array([(1 - alpha) ** i for i in range(len(demeaned))])
-        weights = weights[::-1]  # Most recent has highest weight
-        weights /= weights.sum()
-        
-        for i in range(n_assets):
-            for j in range(i, n_assets):
-                cov[i, j] = np.sum(weights * demeaned[:, i] * demeaned[:, j])
-                cov[j, i] = cov[i, j]
+        # sum_t w_t x_t x_t^T as one matrix product
+        cov = (demeaned * weights[:, None]).T @ demeaned
         
         # Annualize
         cov *= self.annualization_factor
@@ -121,31 +274,30 @@ class RiskModel:
         Ledoit-Wolf shrinkage estimator.
         Shrinks sample covariance toward a structured target (identity scaled).
         """
-        returns_np = returns.values
-        n, p = returns_np.shape
+        X = self._demeaned(returns)
+        n, p = X.shape
         
         # Sample covariance
-        mean = returns_np.mean(axis=0)
-        X = returns_np - mean
         sample_cov = X.T @ X / n
         
         # Compute shrinkage target (scaled identity matrix)
-        trace_s = np.trace(sample_cov)
-        mu = trace_s / p
-        delta = sample_cov - mu * np.eye(p)
+        mu = np.trace(sample_cov) / p
+        delta = sample_cov.copy()
+        delta[np.diag_indices(p)] -= mu
         
         # Frobenius norm squared
-        delta_2 = (delta ** 2).sum()
+        delta_2 = np.einsum('ij,ij->', delta, delta)
         
         # Estimate shrinkage intensity
-        X2 = X ** 2
-        sum_var = np.sum((X2.T @ X2) / n - sample_cov ** 2)
+        X2 = X * X
+        sum_var = (X2.T @ X2).sum() / n - np.einsum('ij,ij->', sample_cov, sample_cov)
         
         # Optimal shrinkage
-        shrinkage = max(0, min(1, sum_var / delta_2))
+        shrinkage = max(0, min(1, sum_var / delta_2)) if delta_2 > 0 else 1.0
         
         # Shrunk covariance
-        shrunk_cov = shrinkage * mu * np.eye(p) + (1 - shrinkage) * sample_cov
+        shrunk_cov = (1 - shrinkage) * sample_cov
+        shrunk_cov[np.diag_indices(p)] += shrinkage * mu
         
         # Annualize
         shrunk_cov *= self.annualization_factor
@@ -157,23 +309,24 @@ class RiskModel:
         Constant correlation model.
         All pairwise correlations are set to the average correlation.
         """
-        # Sample statistics
-        sample_cov = returns.cov().values
+        # Sample covariance and volatilities from one matrix product
+        X = self._demeaned(returns)
+        n_obs = len(X)
+        sample_cov = X.T @ X / (n_obs - 1)
         vols = np.sqrt(np.diag(sample_cov))
-        
-        # Correlation matrix
-        corr = returns.corr().values
+        vol_matrix = np.outer(vols, vols)
         
         # Average correlation (excluding diagonal)
         n = len(vols)
-        avg_corr = (corr.sum() - n) / (n * (n - 1))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = np.where(vol_matrix > 0, sample_cov / vol_matrix, 0.0)
+        avg_corr = (corr.sum() - np.trace(corr)) / (n * (n - 1)) if n > 1 else 0.0
         
         # Constant correlation matrix
         const_corr = np.full((n, n), avg_corr)
         np.fill_diagonal(const_corr, 1.0)
         
         # Reconstruct covariance
-        vol_matrix = np.outer(vols, vols)
         cov = const_corr * vol_matrix
         
         # Annualize
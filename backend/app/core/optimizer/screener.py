@@ -14,7 +14,9 @@ from typing import Dict, List, Optional, Set, Tuple, Any
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime, timedelta
+from collections import OrderedDict
 import asyncio
+import time
 
 
 class ScreenerCriteriaType(str, Enum):
@@ -69,6 +71,159 @@ class ScreenerConfig:
     lookback_days: int = 252  # Historical data period
     top_n: Optional[int] = None  # Return top N assets
     currency: Optional[str] = None  # Filter by currency (EUR, USD, GBP, etc.)
+    max_concurrency: Optional[int] = None  # Parallel symbol fetches (default: provider limit)
+
+
+class ScreeningDataCache:
+    """
+    TTL cache of processed screening data, keyed by (symbol, lookback).
+    
+    Shared by all AssetScreener instances, so consecutive optimizer
+    requests (each with a fresh screener) reuse fetched symbols.
+    """
+    
+    def __init__(self, ttl_seconds: float = 3600, max_entries: int = 10_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, int], Tuple[float, Dict]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, symbol: str, lookback_days: int) -> Optional[Dict]:
+        key = (symbol, lookback_days)
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+    
+    def set(self, symbol: str, lookback_days: int, data: Dict) -> None:
+        key = (symbol, lookback_days)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        self._entries.clear()
+    
+    def get_stats(self) -> Dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Shared across AssetScreener instances (one per optimizer request)
+screening_cache = ScreeningDataCache()
+
+# Parallel symbol fetches when the data provider does not advertise a limit
+DEFAULT_FETCH_CONCURRENCY = 10
+
+# Metrics where a lower value scores higher
+LOWER_IS_BETTER = frozenset({'volatility', 'pe_ratio', 'pb_ratio', 'debt_to_equity', 'beta'})
+
+
+# ==================== Vectorized Scoring ====================
+
+def percentile_ranks(values: np.ndarray) -> np.ndarray:
+    """
+    Column-wise percentile rank of every entry.
+    
+    The rank of x is the share of non-missing values in its column that
+    are <= x (ties share the highest rank). One sort per column, then a
+    binary search per entry: O(n log n) instead of comparing all pairs.
+    
+    Args:
+        values: Metric matrix (assets x criteria), NaN = missing
+        
+    Returns:
+        Matrix of ranks in (0, 1]; NaN where the value is missing
+    """
+    values = np.asarray(values, dtype=float)
+    ranks = np.full(values.shape, np.nan)
+    for j in range(values.shape[1]):
+        column = values[:, j]
+        present = ~np.isnan(column)
+        ordered = np.sort(column[present])
+        if len(ordered):
+            ranks[present, j] = np.searchsorted(ordered, column[present], side='right') / len(ordered)
+    return ranks
+
+
+def top_k_indices(scores: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first.
+    
+    Uses argpartition so only the selected k are sorted; ties keep
+    their original order.
+    
+    Args:
+        scores: Score per asset
+        k: Number to select (None = all)
+    """
+    n = len(scores)
+    if k is None or k >= n:
+        candidates = np.arange(n)
+    elif k <= 0:
+        return np.array([], dtype=int)
+    else:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+
+@dataclass
+class ScoreTable:
+    """Criterion scores for the screened assets."""
+    symbols: List[str]
+    metrics: List[str]        # One column per distinct criterion metric
+    scores: np.ndarray        # assets x metrics
+    total: np.ndarray         # Weighted total per asset
+
+
+def score_matrix(
+    values: np.ndarray,
+    metrics: List[str],
+    criteria: List[ScreenerCriteria]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Percentile scores and weighted totals.
+    
+    A criterion scores 0 for assets with a missing value or a value
+    outside its [min_value, max_value]; metrics in LOWER_IS_BETTER are
+    inverted. When several criteria share a metric, the last one
+    defines its score (as in the per-asset dictionaries).
+    
+    Args:
+        values: Metric matrix (assets x metrics)
+        metrics: Column names of values
+        criteria: Scoring criteria
+        
+    Returns:
+        (scores assets x metrics, total score per asset)
+    """
+    ranks = percentile_ranks(values)
+    scores = np.zeros_like(ranks)
+    column = {m: j for j, m in enumerate(metrics)}
+    
+    for criterion in criteria:
+        j = column[criterion.metric]
+        col = values[:, j]
+        valid = ~np.isnan(col)
+        if criterion.min_value is not None:
+            valid &= col >= criterion.min_value
+        if criterion.max_value is not None:
+            valid &= col <= criterion.max_value
+        rank = 1 - ranks[:, j] if criterion.metric in LOWER_IS_BETTER else ranks[:, j]
+        scores[:, j] = np.where(valid, rank, 0.0)
+    
+    weights = np.zeros(len(metrics))
+    for criterion in criteria:
+        weights[column[criterion.metric]] += criterion.weight
+    total_weight = weights.sum()
+    total = scores @ weights / total_weight if total_weight > 0 else np.zeros(len(values))
+    return scores, total
 
 
 class AssetScreener:
@@ -79,16 +234,22 @@ class AssetScreener:
     applies filters and scoring to identify investment candidates.
     """
     
-    def __init__(self, data_provider: Any = None):
+    def __init__(
+        self,
+        data_provider: Any = None,
+        cache: Optional[ScreeningDataCache] = None
+    ):
         """
         Initialize the asset screener.
         
         Args:
             data_provider: Data provider for fetching market data
+            cache: Screening data cache (default: the shared screening_cache)
         """
         self.data_provider = data_provider
-        self._cache: Dict[str, Any] = {}
-        self._cache_expiry: Dict[str, datetime] = {}
+        self.cache = cache if cache is not None else screening_cache
+        # Stage timings (ms) and counts of the last screen() call
+        self.last_stats: Dict[str, Any] = {}
     
     async def screen(
         self,
@@ -105,6 +266,9 @@ class AssetScreener:
         """
         from loguru import logger
         
+        self.last_stats = {}
+        started = time.perf_counter()
+        
         # Get universe
         universe = config.universe
         logger.info(f"screen() called with config.universe={len(universe) if universe else 0} items, currency={config.currency}")
@@ -114,25 +278,35 @@ class AssetScreener:
             logger.info(f"No universe provided, loading from DB with currency={config.currency}")
             universe = await self._get_universe_from_db(config.currency)
             logger.info(f"Universe loaded: {len(universe)} symbols")
+        self._record_stage('universe', started)
         
         # Fetch data for all symbols
-        data = await self._fetch_screening_data(universe, config.lookback_days)
+        data = await self._fetch_screening_data(
+            universe, config.lookback_days, config.max_concurrency
+        )
         
         # Apply filters
+        stage = time.perf_counter()
         filtered = self._apply_filters(data, config)
+        self._record_stage('filter', stage)
         
         # Calculate scores
-        scored = self._calculate_scores(filtered, config.criteria)
-        
-        # Rank
-        ranked = self._rank_assets(scored)
+        stage = time.perf_counter()
+        table = self._calculate_scores(filtered, config.criteria)
+        self._record_stage('score', stage)
         
-        # Apply top_n if specified
-        if config.top_n:
-            ranked = ranked[:config.top_n]
+        # Rank (only the top_n, if specified)
+        stage = time.perf_counter()
+        ranked = self._rank_assets(filtered, table, config.top_n)
+        self._record_stage('rank', stage)
+        self._record_stage('total', started)
         
+        logger.info(f"Screening stats: {self.last_stats}")
         return ranked
     
+    def _record_stage(self, stage: str, started: float) -> None:
+        self.last_stats[f"{stage}_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    
     async def _get_universe_from_db(self, currency: Optional[str] = None) -> List[str]:
         """
         Get universe of stocks from market_universe table.
@@ -225,14 +399,28 @@ class AssetScreener:
                 "AMD", "IBM", "GE", "CAT"
             ]
     
+    def _fetch_concurrency(self, override: Optional[int] = None) -> int:
+        """Parallel fetches: explicit override, else the provider's own limit."""
+        if override:
+            return override
+        limit = getattr(self.data_provider, 'max_concurrency', None)
+        return limit if isinstance(limit, int) and limit > 0 else DEFAULT_FETCH_CONCURRENCY
+    
     async def _fetch_screening_data(
         self,
         symbols: List[str],
-        lookback_days: int
+        lookback_days: int,
+        max_concurrency: Optional[int] = None
     ) -> Dict[str, Dict]:
         """
         Fetch all required data for screening.
         
+        Cached symbols are served from the shared cache; the rest are
+        prefetched in bulk (one DB query for history, one for
+        fundamentals) and then processed concurrently, at most
+        max_concurrency at a time so provider fallbacks stay within the
+        provider rate limits.
+        
         Returns dict with symbol -> data mapping.
         """
         from loguru import logger
@@ -241,19 +429,66 @@ class AssetScreener:
         success_count = 0
         fail_count = 0
         
+        # Stage 1: shared cache
+        stage = time.perf_counter()
+        cached = {}
         for symbol in symbols:
-            try:
-                asset_data = await self._fetch_single_asset_data(symbol, lookback_days)
-                if asset_data:
-                    data[symbol] = asset_data
-                    success_count += 1
-                else:
-                    fail_count += 1
-            except Exception as e:
+            entry = self.cache.get(symbol, lookback_days)
+            if entry is not None:
+                cached[symbol] = entry
+        missing = [s for s in symbols if s not in cached]
+        self._record_stage('cache', stage)
+        
+        # Stage 2: bulk DB reads for all uncached symbols
+        stage = time.perf_counter()
+        prefetch = getattr(self.data_provider, 'prefetch_historical_prices', None)
+        prefetch_fundamentals = getattr(self.data_provider, 'prefetch_fundamentals', None)
+        if missing and prefetch is not None:
+            now = datetime.now()
+            bulk = [prefetch(missing, now - timedelta(days=lookback_days), now)]
+            if prefetch_fundamentals is not None:
+                bulk.append(prefetch_fundamentals(missing))
+            for result in await asyncio.gather(*bulk, return_exceptions=True):
+                if isinstance(result, Exception):
+                    logger.warning(f"Batch prefetch failed, fetching per symbol: {result}")
+        self._record_stage('prefetch', stage)
+        
+        # Stage 3: per-symbol processing (provider fallback), bounded
+        stage = time.perf_counter()
+        concurrency = self._fetch_concurrency(max_concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch_one(symbol: str) -> Optional[Dict]:
+            async with semaphore:
+                return await self._fetch_single_asset_data(symbol, lookback_days)
+        
+        results = await asyncio.gather(
+            *(fetch_one(s) for s in missing), return_exceptions=True
+        )
+        fetched = dict(zip(missing, results))
+        self._record_stage('fetch', stage)
+        
+        if prefetch is not None:
+            self.data_provider.clear_prefetched()
+        
+        for symbol in symbols:
+            asset_data = cached.get(symbol)
+            if asset_data is None:
+                asset_data = fetched.get(symbol)
+            if asset_data and not isinstance(asset_data, Exception):
+                data[symbol] = asset_data
+                success_count += 1
+            else:
                 # Skip assets with data issues
                 fail_count += 1
-                continue
         
+        self.last_stats.update({
+            'symbols': len(symbols),
+            'cache_hits': len(cached),
+            'fetched': len(missing),
+            'failed': fail_count,
+            'concurrency': concurrency,
+        })
         logger.info(f"Screening data fetch complete: {success_count} success, {fail_count} failed out of {len(symbols)} symbols")
         
         return data
@@ -263,38 +498,29 @@ class AssetScreener:
         symbol: str,
         lookback_days: int
     ) -> Optional[Dict]:
-        """Fetch data for a single asset - REAL DATA ONLY"""
-        # Check cache
-        cache_key = f"{symbol}_{lookback_days}"
-        if cache_key in self._cache:
-            if self._cache_expiry.get(cache_key, datetime.min) > datetime.now():
-                return self._cache[cache_key]
-        
+        """Fetch data for a single asset - REAL DATA ONLY (cache lookup is done by the caller)"""
         # Require data provider
         if self.data_provider is None:
             raise ValueError("No data provider configured - cannot fetch asset data")
         
         try:
-            # Fetch price history
+            # Fetch price history and fundamentals together
             end_date = datetime.now()
             start_date = end_date - timedelta(days=lookback_days)
             
-            history = await self.data_provider.get_historical_prices(
-                symbol, start_date, end_date
+            history, fundamentals = await asyncio.gather(
+                self.data_provider.get_historical_prices(symbol, start_date, end_date),
+                self.data_provider.get_fundamentals(symbol)
             )
             
             if history.empty:
                 return None
             
-            # Fetch fundamental data
-            fundamentals = await self.data_provider.get_fundamentals(symbol)
-            
             # Calculate derived metrics
             data = self._process_raw_data(symbol, history, fundamentals)
             
             # Cache
-            self._cache[cache_key] = data
-            self._cache_expiry[cache_key] = datetime.now() + timedelta(hours=1)
+            self.cache.set(symbol, lookback_days, data)
             
             return data
             
@@ -382,84 +608,23 @@ class AssetScreener:
         self,
         data: Dict[str, Dict],
         criteria: List[ScreenerCriteria]
-    ) -> List[ScreenedAsset]:
-        """Calculate scores for each asset based on criteria"""
+    ) -> ScoreTable:
+        """Calculate criterion and total scores for all assets at once"""
         if not criteria:
             # Default criteria
             criteria = self._get_default_criteria()
         
-        screened = []
-        
-        for symbol, asset in data.items():
-            scores = {}
-            
-            for criterion in criteria:
-                score = self._calculate_criterion_score(asset, criterion, data)
-                scores[criterion.metric] = score
-            
-            # Calculate weighted total score
-            total_weight = sum(c.weight for c in criteria)
-            total_score = sum(
-                scores.get(c.metric, 0) * c.weight 
-                for c in criteria
-            ) / total_weight if total_weight > 0 else 0
-            
-            screened.append(ScreenedAsset(
-                symbol=symbol,
-                name=asset.get('name', symbol),
-                sector=asset.get('sector'),
-                industry=asset.get('industry'),
-                market_cap=asset.get('market_cap'),
-                scores=scores,
-                total_score=total_score,
-                metrics={
-                    'price': asset.get('price'),
-                    'pe_ratio': asset.get('pe_ratio'),
-                    'dividend_yield': asset.get('dividend_yield'),
-                    'beta': asset.get('beta'),
-                    'volume': asset.get('volume')
-                }
-            ))
-        
-        return screened
-    
-    def _calculate_criterion_score(
-        self,
-        asset: Dict,
-        criterion: ScreenerCriteria,
-        all_data: Dict[str, Dict]
-    ) -> float:
-        """Calculate score for a single criterion"""
-        metric = criterion.metric
-        
-        # Get metric value for this asset
-        value = self._get_metric_value(asset, metric)
-        if value is None:
-            return 0.0
-        
-        # Apply min/max filters
-        if criterion.min_value is not None and value < criterion.min_value:
-            return 0.0
-        if criterion.max_value is not None and value > criterion.max_value:
-            return 0.0
-        
-        # Calculate percentile score
-        all_values = [
-            self._get_metric_value(a, metric)
-            for a in all_data.values()
-        ]
-        all_values = [v for v in all_values if v is not None]
-        
-        if not all_values:
-            return 0.5
-        
-        percentile = sum(1 for v in all_values if v <= value) / len(all_values)
-        
-        # Some metrics are better when lower (e.g., volatility, P/E)
-        if metric in ['volatility', 'pe_ratio', 'pb_ratio', 'debt_to_equity', 'beta']:
-            percentile = 1 - percentile
-        
-        return percentile
+        symbols = list(data)
+        metrics = list(dict.fromkeys(c.metric for c in criteria))
+        values = np.full((len(symbols), len(metrics)), np.nan)
+        for i, symbol in enumerate(symbols):
+            for j, metric in enumerate(metrics):
+                value = self._get_metric_value(data[symbol], metric)
+                if value is not None:
+                    values[i, j] = value
+        
+        scores, total = score_matrix(values, metrics, criteria)
+        return ScoreTable(symbols=symbols, metrics=metrics, scores=scores, total=total)
     
     def _get_metric_value(self, asset: Dict, metric: str) -> Optional[float]:
         """Get metric value from asset data"""
@@ -531,14 +696,37 @@ class AssetScreener:
             )
         ]
     
-    def _rank_assets(self, screened: List[ScreenedAsset]) -> List[ScreenedAsset]:
-        """Rank assets by total score"""
-        sorted_assets = sorted(screened, key=lambda x: x.total_score, reverse=True)
+    def _rank_assets(
+        self,
+        data: Dict[str, Dict],
+        table: ScoreTable,
+        top_n: Optional[int] = None
+    ) -> List[ScreenedAsset]:
+        """Rank assets by total score, keeping the top_n if given"""
+        ranked = []
         
-        for i, asset in enumerate(sorted_assets):
-            asset.rank = i + 1
+        for rank, i in enumerate(top_k_indices(table.total, top_n or None), start=1):
+            symbol = table.symbols[i]
+            asset = data[symbol]
+            ranked.append(ScreenedAsset(
+                symbol=symbol,
+                name=asset.get('name', symbol),
+                sector=asset.get('sector'),
+                industry=asset.get('industry'),
+                market_cap=asset.get('market_cap'),
+                scores=dict(zip(table.metrics, table.scores[i].tolist())),
+                total_score=float(table.total[i]),
+                rank=rank,
+                metrics={
+                    'price': asset.get('price'),
+                    'pe_ratio': asset.get('pe_ratio'),
+                    'dividend_yield': asset.get('dividend_yield'),
+                    'beta': asset.get('beta'),
+                    'volume': asset.get('volume')
+                }
+            ))
         
-        return sorted_assets
+        return ranked
 
 
 def get_screener_for_risk_profile(
@@ -21,6 +21,7 @@ from scipy.spatial.distance import squareform
 import warnings
 
 from .risk_models import RiskModel, RiskModelType
+from .frontier import EfficientFrontierSolver
 
 
 class OptimizationObjective(str, Enum):
@@ -192,6 +193,21 @@ class MeanVarianceOptimizer:
         weights = np.clip(weights, constraints.min_weight, constraints.max_weight)
         weights /= weights.sum()  # Normalize to ensure sum = 1
         
+        return self._build_result(
+            weights, expected_returns, cov_matrix,
+            success=result.success,
+            message=result.message if not result.success else "Optimization successful"
+        )
+    
+    def _build_result(
+        self,
+        weights: np.ndarray,
+        expected_returns: np.ndarray,
+        cov_matrix: np.ndarray,
+        success: bool = True,
+        message: str = "Optimization successful"
+    ) -> OptimizationResult:
+        """Portfolio metrics for a set of weights."""
         # Calculate metrics
         exp_return = weights @ expected_returns
         exp_vol = np.sqrt(weights @ cov_matrix @ weights)
@@ -209,8 +225,8 @@ class MeanVarianceOptimizer:
             expected_return=exp_return,
             expected_volatility=exp_vol,
             sharpe_ratio=sharpe,
-            success=result.success,
-            message=result.message if not result.success else "Optimization successful",
+            success=success,
+            message=message,
             risk_contributions=risk_contrib,
             diversification_ratio=div_ratio
         )
@@ -236,43 +252,24 @@ class MeanVarianceOptimizer:
         """
         constraints = constraints or OptimizationConstraints()
         
-        # Find minimum variance portfolio
-        min_var = self.optimize(
-            expected_returns, cov_matrix,
-            OptimizationObjective.MIN_VARIANCE,
-            constraints
-        )
-        
-        # Find maximum return portfolio
-        max_ret = self.optimize(
-            expected_returns, cov_matrix,
-            OptimizationObjective.MAX_RETURN,
-            constraints
-        )
-        
-        # Generate target returns
-        target_returns = np.linspace(
-            min_var.expected_return,
-            max_ret.expected_return,
-            n_points
-        )
-        
-        frontier = []
-        for target in target_returns:
-            constr = OptimizationConstraints(
-                min_weight=constraints.min_weight,
-                max_weight=constraints.max_weight,
-                target_return=target
-            )
-            result = self.optimize(
+        # Traced from the critical-line turning points (SLSQP with warm
+        # starts as fallback) instead of one cold-started solve per point
+        try:
+            solver = EfficientFrontierSolver(
                 expected_returns, cov_matrix,
-                OptimizationObjective.TARGET_RETURN,
-                constr
+                lower=constraints.min_weight,
+                upper=constraints.max_weight
             )
-            if result.success:
-                frontier.append(result)
-        
-        return frontier
+        except ValueError:
+            # Bounds leave no fully invested portfolio
+            return []
+        trace = solver.trace(n_points)
+        
+        return [
+            self._build_result(w, expected_returns, cov_matrix)
+            for p, w in enumerate(trace.weights)
+            if p not in trace.failed
+        ]
 
 
 class RiskParityOptimizer:
@@ -12,6 +12,8 @@ from typing import Optional, Callable, Awaitable
 from collections import defaultdict
 from loguru import logger
 
+from app.core.metrics import metrics
+
 
 @dataclass
 class BudgetConfig:
@@ -157,6 +159,7 @@ class BudgetTracker:
             usage.daily_spent += cost
             usage.monthly_spent += cost
             usage.request_count += 1
+            metrics.inc("provider_budget_spend_total", float(cost), provider=provider)
             
             if endpoint:
                 usage.endpoint_usage[endpoint] = (
@@ -343,3 +346,4 @@ class BudgetTracker:
 
 # Global budget tracker instance
 budget_tracker = BudgetTracker()
+metrics.describe("provider_budget_spend_total", "Recorded provider API spend")
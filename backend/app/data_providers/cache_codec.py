@@ -0,0 +1,355 @@
+"""
+Cache Codec
+
+Compact column-wise binary encoding for cached market data.
+
+OHLCV series and quote batches are stored as packed little-endian
+float64/int64 columns with dictionary-encoded string columns, optionally
+zlib-compressed. The Redis client runs with ``decode_responses=True``, so
+the packed blob is wrapped in a short ASCII prefix plus base64 to remain a
+valid text value.
+
+Layout of the binary blob (before base64):
+
+    MAGIC (4s) | version (B) | kind (B) | flags (B) | payload
+
+    payload = rows (I) | meta_len (I) | meta JSON | columns...
+
+``meta`` holds the string dictionaries; every string column is then a
+uint16 code array (0xFFFF = None) and every numeric column a packed array.
+"""
+import base64
+import json
+import struct
+import zlib
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Optional, Union
+
+import numpy as np
+
+from app.data_providers.adapters.base import Quote, OHLCV, MarketType, TimeFrame
+
+
+MAGIC = b"PTCB"
+VERSION = 1
+TEXT_PREFIX = "ptc:"
+
+KIND_OHLCV = 1
+KIND_QUOTE = 2
+
+FLAG_ZLIB = 0x01
+
+_HEADER = struct.Struct("<4sBBB")
+_PAYLOAD_HEADER = struct.Struct("<II")
+
+_NULL_CODE = 0xFFFF
+_NULL_INT = np.iinfo(np.int64).min
+_NAIVE_OFFSET = np.iinfo(np.int32).min
+_EPOCH = datetime(1970, 1, 1)
+
+
+class CacheCodecError(ValueError):
+    """Raised when a cached blob cannot be decoded."""
+
+
+# ==================== Column Helpers ====================
+
+def _decimal_or_nan(value: Optional[Decimal]) -> float:
+    # Mirrors to_dict(): falsy decimals are cached as "missing"
+    return float(value) if value else np.nan
+
+
+def _to_decimal(value: float) -> Optional[Decimal]:
+    return None if value != value else Decimal(str(value))
+
+
+def _int_or_null(value: Optional[int]) -> int:
+    return _NULL_INT if value is None else int(value)
+
+
+def _from_int(value: int) -> Optional[int]:
+    return None if value == _NULL_INT else value
+
+
+def _encode_timestamps(values: list[datetime]) -> tuple[bytes, bytes]:
+    """Encode datetimes as wall-clock microseconds plus a UTC offset column."""
+    micros = np.empty(len(values), dtype="<i8")
+    offsets = np.empty(len(values), dtype="<i4")
+
+    for i, ts in enumerate(values):
+        offset = ts.utcoffset()
+        offsets[i] = _NAIVE_OFFSET if offset is None else int(offset.total_seconds())
+        delta = ts.replace(tzinfo=None) - _EPOCH
+        micros[i] = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+    return micros.tobytes(), offsets.tobytes()
+
+
+def _decode_timestamps(micros: np.ndarray, offsets: list[int]) -> list[datetime]:
+    # datetime64 -> object conversion builds the naive datetimes in C
+    naive = micros.astype("datetime64[us]").astype(object).tolist()
+    if all(offset == _NAIVE_OFFSET for offset in offsets):
+        return naive
+
+    zones: dict[int, Optional[timezone]] = {}
+    result: list[datetime] = []
+
+    for ts, offset in zip(naive, offsets):
+        if offset not in zones:
+            zones[offset] = (
+                None if offset == _NAIVE_OFFSET
+                else timezone(timedelta(seconds=offset))
+            )
+        tz = zones[offset]
+        result.append(ts.replace(tzinfo=tz) if tz else ts)
+
+    return result
+
+
+def _decimal_column(values: list[float]) -> list[Decimal]:
+    """Convert a non-null float column exactly as Decimal(str(x)) would."""
+    return list(map(Decimal, map(str, values)))
+
+
+def _encode_strings(values: list[Optional[str]]) -> tuple[list[str], bytes]:
+    """Dictionary-encode a string column into (dictionary, uint16 codes)."""
+    lookup: dict[str, int] = {}
+    codes = np.empty(len(values), dtype="<u2")
+
+    for i, value in enumerate(values):
+        if value is None:
+            codes[i] = _NULL_CODE
+            continue
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(lookup)
+            if code >= _NULL_CODE:
+                raise CacheCodecError("Too many distinct strings in column")
+        codes[i] = code
+
+    return list(lookup), codes.tobytes()
+
+
+class _Reader:
+    """Sequential reader over packed column blocks."""
+
+    def __init__(self, buffer: bytes, offset: int, rows: int):
+        self._buffer = buffer
+        self._offset = offset
+        self._rows = rows
+
+    def array(self, dtype: str) -> np.ndarray:
+        arr = np.frombuffer(self._buffer, dtype=dtype, count=self._rows, offset=self._offset)
+        self._offset += arr.nbytes
+        return arr
+
+    def column(self, dtype: str) -> list:
+        return self.array(dtype).tolist()
+
+    def strings(self, dictionary: list[str]) -> list[Optional[str]]:
+        return [
+            None if code == _NULL_CODE else dictionary[code]
+            for code in self.column("<u2")
+        ]
+
+
+# ==================== Envelope ====================
+
+def _pack(kind: int, rows: int, meta: dict, columns: list[bytes], compress_threshold: Optional[int]) -> str:
+    meta_bytes = json.dumps(meta, separators=(",", ":")).encode()
+    payload = b"".join([
+        _PAYLOAD_HEADER.pack(rows, len(meta_bytes)),
+        meta_bytes,
+        *columns,
+    ])
+
+    flags = 0
+    if compress_threshold is not None and len(payload) > compress_threshold:
+        payload = zlib.compress(payload, 1)
+        flags |= FLAG_ZLIB
+
+    blob = _HEADER.pack(MAGIC, VERSION, kind, flags) + payload
+    return TEXT_PREFIX + base64.b64encode(blob).decode("ascii")
+
+
+def _unpack(data: Union[str, bytes], expected_kind: int) -> tuple[int, dict, _Reader]:
+    if isinstance(data, str):
+        blob = base64.b64decode(data[len(TEXT_PREFIX):])
+    elif data.startswith(TEXT_PREFIX.encode()):
+        blob = base64.b64decode(data[len(TEXT_PREFIX):])
+    else:
+        blob = data
+
+    if len(blob) < _HEADER.size:
+        raise CacheCodecError("Truncated cache blob")
+
+    magic, version, kind, flags = _HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise CacheCodecError("Not a packed cache blob")
+    if version != VERSION:
+        raise CacheCodecError(f"Unsupported cache codec version {version}")
+    if kind != expected_kind:
+        raise CacheCodecError(f"Unexpected cache blob kind {kind}")
+
+    payload = blob[_HEADER.size:]
+    if flags & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+
+    rows, meta_len = _PAYLOAD_HEADER.unpack_from(payload)
+    start = _PAYLOAD_HEADER.size
+    meta = json.loads(payload[start:start + meta_len])
+
+    return rows, meta, _Reader(payload, start + meta_len, rows)
+
+
+def is_packed(data: Union[str, bytes]) -> bool:
+    """Check whether a cached value was written by this codec."""
+    if isinstance(data, str):
+        return data.startswith(TEXT_PREFIX)
+    return data.startswith(MAGIC) or data.startswith(TEXT_PREFIX.encode())
+
+
+# ==================== OHLCV ====================
+
+def encode_ohlcv_list(bars: list[OHLCV], compress_threshold: Optional[int] = None) -> str:
+    """Encode a list of OHLCV bars column-wise."""
+    symbols, symbol_codes = _encode_strings([b.symbol for b in bars])
+    providers, provider_codes = _encode_strings([b.provider for b in bars])
+    timeframes, timeframe_codes = _encode_strings([b.timeframe.value for b in bars])
+    micros, offsets = _encode_timestamps([b.timestamp for b in bars])
+
+    prices = np.array(
+        [
+            (float(b.open), float(b.high), float(b.low), float(b.close),
+             _decimal_or_nan(b.adjusted_close), _decimal_or_nan(b.vwap))
+            for b in bars
+        ],
+        dtype="<f8",
+    ).reshape(len(bars), 6)
+
+    columns = [
+        symbol_codes,
+        provider_codes,
+        timeframe_codes,
+        micros,
+        offsets,
+        # Column-major so each price field is contiguous
+        np.ascontiguousarray(prices.T).tobytes(),
+        np.array([_int_or_null(b.volume) for b in bars], dtype="<i8").tobytes(),
+        np.array([_int_or_null(b.trade_count) for b in bars], dtype="<i8").tobytes(),
+    ]
+    meta = {"symbol": symbols, "provider": providers, "timeframe": timeframes}
+
+    return _pack(KIND_OHLCV, len(bars), meta, columns, compress_threshold)
+
+
+def decode_ohlcv_list(data: Union[str, bytes]) -> list[OHLCV]:
+    """Decode a list of OHLCV bars written by encode_ohlcv_list."""
+    rows, meta, reader = _unpack(data, KIND_OHLCV)
+
+    symbols = reader.strings(meta["symbol"])
+    providers = reader.strings(meta["provider"])
+    timeframes = [TimeFrame(tf) for tf in meta["timeframe"]]
+    timeframe_codes = reader.column("<u2")
+    timestamps = _decode_timestamps(reader.array("<i8"), reader.column("<i4"))
+    opens, highs, lows, closes = (_decimal_column(reader.column("<f8")) for _ in range(4))
+    adjusted, vwaps = reader.column("<f8"), reader.column("<f8")
+    volumes = reader.column("<i8")
+    trade_counts = reader.column("<i8")
+
+    return [
+        OHLCV(
+            symbol=symbols[i],
+            timestamp=timestamps[i],
+            open=opens[i],
+            high=highs[i],
+            low=lows[i],
+            close=closes[i],
+            volume=_from_int(volumes[i]),
+            provider=providers[i] or "",
+            timeframe=timeframes[timeframe_codes[i]],
+            adjusted_close=_to_decimal(adjusted[i]),
+            vwap=_to_decimal(vwaps[i]),
+            trade_count=_from_int(trade_counts[i]),
+        )
+        for i in range(rows)
+    ]
+
+
+# ==================== Quotes ====================
+
+_QUOTE_DECIMALS = (
+    "price", "bid", "ask", "change", "change_percent",
+    "day_high", "day_low", "day_open", "prev_close",
+)
+_QUOTE_INTS = ("bid_size", "ask_size", "volume")
+_QUOTE_STRINGS = ("symbol", "provider", "market_type", "exchange", "currency")
+
+
+def encode_quotes(quotes: list[Quote], compress_threshold: Optional[int] = None) -> str:
+    """Encode a batch of quotes column-wise."""
+    meta: dict[str, list[str]] = {}
+    columns: list[bytes] = []
+
+    for name in _QUOTE_STRINGS:
+        values = [getattr(q, name) for q in quotes]
+        if name == "market_type":
+            values = [v.value for v in values]
+        meta[name], codes = _encode_strings(values)
+        columns.append(codes)
+
+    columns.extend(_encode_timestamps([q.timestamp for q in quotes]))
+
+    decimals = np.array(
+        [
+            [float(q.price)] + [_decimal_or_nan(getattr(q, f)) for f in _QUOTE_DECIMALS[1:]]
+            for q in quotes
+        ],
+        dtype="<f8",
+    ).reshape(len(quotes), len(_QUOTE_DECIMALS))
+    columns.append(np.ascontiguousarray(decimals.T).tobytes())
+
+    ints = np.array(
+        [[_int_or_null(getattr(q, f)) for f in _QUOTE_INTS] for q in quotes],
+        dtype="<i8",
+    ).reshape(len(quotes), len(_QUOTE_INTS))
+    columns.append(np.ascontiguousarray(ints.T).tobytes())
+
+    return _pack(KIND_QUOTE, len(quotes), meta, columns, compress_threshold)
+
+
+def decode_quotes(data: Union[str, bytes]) -> list[Quote]:
+    """Decode a batch of quotes written by encode_quotes."""
+    rows, meta, reader = _unpack(data, KIND_QUOTE)
+
+    strings = {name: reader.strings(meta[name]) for name in _QUOTE_STRINGS}
+    timestamps = _decode_timestamps(reader.array("<i8"), reader.column("<i4"))
+    decimals = {name: reader.column("<f8") for name in _QUOTE_DECIMALS}
+    prices = _decimal_column(decimals["price"])
+    ints = {name: reader.column("<i8") for name in _QUOTE_INTS}
+    market_types = {v: MarketType(v) for v in meta["market_type"]}
+
+    return [
+        Quote(
+            symbol=strings["symbol"][i],
+            price=prices[i],
+            bid=_to_decimal(decimals["bid"][i]),
+            ask=_to_decimal(decimals["ask"][i]),
+            bid_size=_from_int(ints["bid_size"][i]),
+            ask_size=_from_int(ints["ask_size"][i]),
+            volume=_from_int(ints["volume"][i]),
+            timestamp=timestamps[i],
+            provider=strings["provider"][i] or "",
+            market_type=market_types[strings["market_type"][i]],
+            change=_to_decimal(decimals["change"][i]),
+            change_percent=_to_decimal(decimals["change_percent"][i]),
+            day_high=_to_decimal(decimals["day_high"][i]),
+            day_low=_to_decimal(decimals["day_low"][i]),
+            day_open=_to_decimal(decimals["day_open"][i]),
+            prev_close=_to_decimal(decimals["prev_close"][i]),
+            exchange=strings["exchange"][i],
+            currency=strings["currency"][i] or "USD",
+        )
+        for i in range(rows)
+    ]
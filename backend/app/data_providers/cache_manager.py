@@ -3,17 +3,27 @@ Cache Manager
 
 Redis-based caching layer for market data.
 Supports different TTLs for quotes, historical data, and metadata.
+
+Quotes go through two tiers: a small in-process LRU (L1) in front of
+Redis (L2). Writes and invalidations are broadcast over Redis pub/sub so
+every worker drops its stale L1 entries.
 """
 import json
 import asyncio
+import copy
+import time
+import uuid
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Optional, TypeVar, Generic, Any, Callable
 from loguru import logger
 
+from app.core.metrics import metrics
 from app.db.redis_client import redis_client
 from app.data_providers.adapters.base import Quote, OHLCV, MarketType, TimeFrame
+from app.data_providers import cache_codec
 
 
 T = TypeVar('T')
@@ -30,15 +40,126 @@ class CacheConfig:
     # Key prefixes
     prefix: str = "market"
     
-    # Compression threshold (bytes)
+    # Store quotes and bar series with the packed binary codec
+    # (JSON entries written by older versions are still readable)
+    binary_codec: bool = True
+    
+    # Compression threshold (bytes) for packed entries
     compress_threshold: int = 1024
     
     # Max items in list caches
     max_list_size: int = 1000
+    
+    # In-process L1 quote tier
+    l1_enabled: bool = True
+    l1_max_size: int = 5000
+    l1_quote_ttl: float = 2.0       # Kept below quote_ttl to bound staleness
+    
+    # Pub/sub channel used to keep L1 coherent across workers
+    invalidation_channel: str = "market:invalidate"
+
+
+class LRUCache(Generic[T]):
+    """
+    Bounded in-process LRU cache with per-entry expiry.
+    
+    Expired entries are dropped on read and purged before any LRU
+    eviction, so live entries are only evicted when the cache is full
+    of unexpired data.
+    """
+    
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, T]] = OrderedDict()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def get(self, key: str) -> Optional[T]:
+        """Get a live entry, refreshing its LRU position."""
+        entry = self._data.get(key)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self._stats["expirations"] += 1
+            self._stats["misses"] += 1
+            return None
+        
+        self._data.move_to_end(key)
+        self._stats["hits"] += 1
+        return value
+    
+    def set(self, key: str, value: T, ttl: Optional[float] = None) -> None:
+        """Store an entry, evicting expired and then least-recently-used ones."""
+        if self.max_size <= 0:
+            return
+        
+        self._data[key] = (time.monotonic() + (ttl if ttl is not None else self.ttl), value)
+        self._data.move_to_end(key)
+        self._stats["sets"] += 1
+        
+        if len(self._data) > self.max_size:
+            self._purge_expired()
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self._stats["evictions"] += 1
+    
+    def delete(self, key: str) -> None:
+        """Drop an entry if present."""
+        if self._data.pop(key, None) is not None:
+            self._stats["invalidations"] += 1
+    
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._stats["invalidations"] += len(self._data)
+        self._data.clear()
+    
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        expired = [k for k, (expires_at, _) in self._data.items() if expires_at <= now]
+        for key in expired:
+            del self._data[key]
+        self._stats["expirations"] += len(expired)
+    
+    def get_stats(self) -> dict[str, Any]:
+        """Get L1 statistics."""
+        total = self._stats["hits"] + self._stats["misses"]
+        hit_rate = self._stats["hits"] / total if total > 0 else 0
+        
+        return {
+            **self._stats,
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hit_rate": round(hit_rate * 100, 2),
+        }
+    
+    def reset_stats(self) -> None:
+        """Reset L1 statistics."""
+        for key in self._stats:
+            self._stats[key] = 0
 
 
 class CacheSerializer:
-    """Handles serialization/deserialization of cached data."""
+    """
+    Handles serialization/deserialization of cached data.
+    
+    The ``serialize_*`` methods write JSON, the ``pack_*`` methods write the
+    compact binary format from ``cache_codec``. All ``deserialize_*`` methods
+    accept either format.
+    """
     
     @staticmethod
     def serialize_quote(quote: Quote) -> str:
@@ -46,9 +167,8 @@ class CacheSerializer:
         return json.dumps(quote.to_dict())
     
     @staticmethod
-    def deserialize_quote(data: str) -> Quote:
-        """Deserialize a Quote from JSON string."""
-        d = json.loads(data)
+    def _quote_from_dict(d: dict[str, Any]) -> Quote:
+        """Build a Quote from its to_dict() representation."""
         return Quote(
             symbol=d["symbol"],
             price=Decimal(str(d["price"])),
@@ -70,15 +190,33 @@ class CacheSerializer:
             currency=d.get("currency", "USD"),
         )
     
+    @staticmethod
+    def deserialize_quote(data: str) -> Quote:
+        """Deserialize a Quote from JSON string or packed blob."""
+        if cache_codec.is_packed(data):
+            return cache_codec.decode_quotes(data)[0]
+        return CacheSerializer._quote_from_dict(json.loads(data))
+    
+    @staticmethod
+    def pack_quotes(quotes: list[Quote], compress_threshold: Optional[int] = None) -> str:
+        """Serialize a batch of quotes to the packed binary format."""
+        return cache_codec.encode_quotes(quotes, compress_threshold)
+    
+    @staticmethod
+    def deserialize_quotes(data: str) -> list[Quote]:
+        """Deserialize a batch of quotes from JSON list or packed blob."""
+        if cache_codec.is_packed(data):
+            return cache_codec.decode_quotes(data)
+        return [CacheSerializer._quote_from_dict(d) for d in json.loads(data)]
+    
     @staticmethod
     def serialize_ohlcv(ohlcv: OHLCV) -> str:
         """Serialize an OHLCV to JSON string."""
         return json.dumps(ohlcv.to_dict())
     
     @staticmethod
-    def deserialize_ohlcv(data: str) -> OHLCV:
-        """Deserialize an OHLCV from JSON string."""
-        d = json.loads(data)
+    def _ohlcv_from_dict(d: dict[str, Any]) -> OHLCV:
+        """Build an OHLCV from its to_dict() representation."""
         return OHLCV(
             symbol=d["symbol"],
             timestamp=datetime.fromisoformat(d["timestamp"]),
@@ -94,16 +232,29 @@ class CacheSerializer:
             trade_count=d.get("trade_count"),
         )
     
+    @staticmethod
+    def deserialize_ohlcv(data: str) -> OHLCV:
+        """Deserialize an OHLCV from JSON string or packed blob."""
+        if cache_codec.is_packed(data):
+            return cache_codec.decode_ohlcv_list(data)[0]
+        return CacheSerializer._ohlcv_from_dict(json.loads(data))
+    
     @staticmethod
     def serialize_ohlcv_list(ohlcv_list: list[OHLCV]) -> str:
         """Serialize a list of OHLCV to JSON string."""
         return json.dumps([o.to_dict() for o in ohlcv_list])
     
+    @staticmethod
+    def pack_ohlcv_list(ohlcv_list: list[OHLCV], compress_threshold: Optional[int] = None) -> str:
+        """Serialize a list of OHLCV to the packed binary format."""
+        return cache_codec.encode_ohlcv_list(ohlcv_list, compress_threshold)
+    
     @staticmethod
     def deserialize_ohlcv_list(data: str) -> list[OHLCV]:
-        """Deserialize a list of OHLCV from JSON string."""
-        items = json.loads(data)
-        return [CacheSerializer.deserialize_ohlcv(json.dumps(d)) for d in items]
+        """Deserialize a list of OHLCV from JSON string or packed blob."""
+        if cache_codec.is_packed(data):
+            return cache_codec.decode_ohlcv_list(data)
+        return [CacheSerializer._ohlcv_from_dict(d) for d in json.loads(data)]
 
 
 class CacheManager:
@@ -115,6 +266,7 @@ class CacheManager:
     - Automatic serialization/deserialization
     - Batch operations for efficiency
     - Cache invalidation patterns
+    - In-process L1 quote tier kept coherent over pub/sub
     - Statistics tracking
     """
     
@@ -126,22 +278,49 @@ class CacheManager:
             "sets": 0,
             "deletes": 0,
         }
+        self._l1: LRUCache[Quote] = LRUCache(
+            self.config.l1_max_size if self.config.l1_enabled else 0,
+            self.config.l1_quote_ttl,
+        )
+        # Identifies this process so it can skip its own invalidations
+        self._instance_id = uuid.uuid4().hex
+        self._listener_task: Optional[asyncio.Task] = None
     
     def _key(self, *parts: str) -> str:
         """Build a cache key from parts."""
         return f"{self.config.prefix}:{':'.join(parts)}"
     
+    def _encode_quote(self, quote: Quote) -> str:
+        """Encode a quote in the configured cache format."""
+        if self.config.binary_codec:
+            return CacheSerializer.pack_quotes([quote], self.config.compress_threshold)
+        return CacheSerializer.serialize_quote(quote)
+    
+    def _encode_bars(self, bars: list[OHLCV]) -> str:
+        """Encode a bar series in the configured cache format."""
+        if self.config.binary_codec:
+            return CacheSerializer.pack_ohlcv_list(bars, self.config.compress_threshold)
+        return CacheSerializer.serialize_ohlcv_list(bars)
+    
     # ==================== Quote Caching ====================
     
     async def get_quote(self, symbol: str) -> Optional[Quote]:
-        """Get a cached quote for a symbol."""
-        key = self._key("quote", symbol.upper())
+        """Get a cached quote for a symbol (L1 first, then Redis)."""
+        symbol = symbol.upper()
+        
+        local = self._l1.get(symbol)
+        if local is not None:
+            return copy.copy(local)
+        
+        key = self._key("quote", symbol)
         
         try:
             data = await redis_client.client.get(key)
             if data:
                 self._stats["hits"] += 1
-                return CacheSerializer.deserialize_quote(data)
+                quote = CacheSerializer.deserialize_quote(data)
+                self._l1.set(symbol, quote)
+                return copy.copy(quote)
             self._stats["misses"] += 1
             return None
         except Exception as e:
@@ -149,54 +328,77 @@ class CacheManager:
             return None
     
     async def set_quote(self, quote: Quote) -> None:
-        """Cache a quote."""
-        key = self._key("quote", quote.symbol.upper())
+        """Cache a quote in both tiers and invalidate other workers' L1."""
+        symbol = quote.symbol.upper()
+        key = self._key("quote", symbol)
+        self._l1.set(symbol, copy.copy(quote))
         
         try:
-            data = CacheSerializer.serialize_quote(quote)
-            await redis_client.client.setex(key, self.config.quote_ttl, data)
+            data = self._encode_quote(quote)
+            pipe = redis_client.client.pipeline(transaction=False)
+            pipe.setex(key, self.config.quote_ttl, data)
+            self._queue_invalidation(pipe, [symbol])
+            await pipe.execute()
             self._stats["sets"] += 1
         except Exception as e:
             logger.error(f"Cache set error for {quote.symbol}: {e}")
     
     async def get_quotes(self, symbols: list[str]) -> dict[str, Optional[Quote]]:
-        """Get cached quotes for multiple symbols."""
+        """Get cached quotes for multiple symbols (L1 first, then Redis)."""
         result: dict[str, Optional[Quote]] = {}
+        remote: list[str] = []
+        
+        for symbol in symbols:
+            symbol = symbol.upper()
+            local = self._l1.get(symbol)
+            if local is not None:
+                result[symbol] = copy.copy(local)
+            else:
+                remote.append(symbol)
+        
+        if not remote:
+            return result
         
         # Build keys
-        keys = [self._key("quote", s.upper()) for s in symbols]
+        keys = [self._key("quote", s) for s in remote]
         
         try:
             # Use pipeline for batch get
             values = await redis_client.client.mget(keys)
             
-            for symbol, value in zip(symbols, values):
+            for symbol, value in zip(remote, values):
                 if value:
-                    result[symbol.upper()] = CacheSerializer.deserialize_quote(value)
+                    quote = CacheSerializer.deserialize_quote(value)
+                    self._l1.set(symbol, quote)
+                    result[symbol] = copy.copy(quote)
                     self._stats["hits"] += 1
                 else:
-                    result[symbol.upper()] = None
+                    result[symbol] = None
                     self._stats["misses"] += 1
             
             return result
         except Exception as e:
             logger.error(f"Cache mget error: {e}")
-            return {s.upper(): None for s in symbols}
+            return {**{s: None for s in remote}, **result}
     
     async def set_quotes(self, quotes: list[Quote]) -> None:
-        """Cache multiple quotes."""
+        """Cache multiple quotes in both tiers and invalidate other workers' L1."""
         if not quotes:
             return
         
+        for quote in quotes:
+            self._l1.set(quote.symbol.upper(), copy.copy(quote))
+        
         try:
             # Use pipeline for batch set
-            pipe = redis_client.client.pipeline()
+            pipe = redis_client.client.pipeline(transaction=False)
             
             for quote in quotes:
                 key = self._key("quote", quote.symbol.upper())
-                data = CacheSerializer.serialize_quote(quote)
+                data = self._encode_quote(quote)
                 pipe.setex(key, self.config.quote_ttl, data)
             
+            self._queue_invalidation(pipe, [q.symbol.upper() for q in quotes])
             await pipe.execute()
             self._stats["sets"] += len(quotes)
         except Exception as e:
@@ -249,7 +451,7 @@ class CacheManager:
         )
         
         try:
-            serialized = CacheSerializer.serialize_ohlcv_list(data)
+            serialized = self._encode_bars(data)
             await redis_client.client.setex(key, self.config.historical_ttl, serialized)
             self._stats["sets"] += 1
         except Exception as e:
@@ -281,7 +483,7 @@ class CacheManager:
         key = self._key("bar", bar.symbol.upper(), bar.timeframe.value, "latest")
         
         try:
-            data = CacheSerializer.serialize_ohlcv(bar)
+            data = self._encode_bars([bar])
             # Use historical TTL for bars
             await redis_client.client.setex(key, self.config.historical_ttl, data)
             self._stats["sets"] += 1
@@ -320,10 +522,15 @@ class CacheManager:
     
     async def invalidate_quote(self, symbol: str) -> None:
         """Invalidate cached quote for a symbol."""
-        key = self._key("quote", symbol.upper())
+        symbol = symbol.upper()
+        key = self._key("quote", symbol)
+        self._l1.delete(symbol)
         
         try:
-            await redis_client.client.delete(key)
+            pipe = redis_client.client.pipeline(transaction=False)
+            pipe.delete(key)
+            self._queue_invalidation(pipe, [symbol])
+            await pipe.execute()
             self._stats["deletes"] += 1
         except Exception as e:
             logger.error(f"Cache invalidate error for {symbol}: {e}")
@@ -353,8 +560,10 @@ class CacheManager:
             self._key("historical", symbol.upper(), "*"),
             self._key("bar", symbol.upper(), "*"),
         ]
+        self._l1.delete(symbol.upper())
         
         try:
+            await self._publish_invalidation([symbol.upper()])
             for pattern in patterns:
                 keys = await redis_client.client.keys(pattern)
                 if keys:
@@ -366,8 +575,10 @@ class CacheManager:
     async def clear_all(self) -> None:
         """Clear all market data cache."""
         pattern = f"{self.config.prefix}:*"
+        self._l1.clear()
         
         try:
+            await self._publish_invalidation(None)
             keys = await redis_client.client.keys(pattern)
             if keys:
                 await redis_client.client.delete(*keys)
@@ -376,10 +587,92 @@ class CacheManager:
         except Exception as e:
             logger.error(f"Cache clear all error: {e}")
     
+    # ==================== L1 Coherence ====================
+    
+    def _invalidation_message(self, symbols: Optional[list[str]]) -> str:
+        """Build an invalidation message; ``None`` means "drop everything"."""
+        return json.dumps({"origin": self._instance_id, "symbols": symbols})
+    
+    def _queue_invalidation(self, pipe, symbols: list[str]) -> None:
+        """Queue an L1 invalidation on a pipeline alongside the write."""
+        if self.config.l1_enabled:
+            pipe.publish(self.config.invalidation_channel, self._invalidation_message(symbols))
+    
+    async def _publish_invalidation(self, symbols: Optional[list[str]]) -> None:
+        """Tell other workers to drop L1 entries."""
+        if self.config.l1_enabled:
+            await redis_client.publish(
+                self.config.invalidation_channel, self._invalidation_message(symbols)
+            )
+    
+    def handle_invalidation(self, message: str) -> None:
+        """Apply an invalidation received from another worker."""
+        try:
+            payload = json.loads(message)
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring malformed cache invalidation: {message!r}")
+            return
+        
+        if payload.get("origin") == self._instance_id:
+            return
+        
+        symbols = payload.get("symbols")
+        if symbols is None:
+            self._l1.clear()
+        else:
+            for symbol in symbols:
+                self._l1.delete(symbol)
+    
+    async def start_invalidation_listener(self) -> None:
+        """Start the background task that applies remote L1 invalidations."""
+        if not self.config.l1_enabled:
+            return
+        if self._listener_task and not self._listener_task.done():
+            return
+        self._listener_task = asyncio.create_task(self._listen_invalidations())
+    
+    async def stop_invalidation_listener(self) -> None:
+        """Stop the invalidation listener."""
+        if self._listener_task:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+    
+    async def _listen_invalidations(self) -> None:
+        """Subscribe to the invalidation channel, resubscribing after errors."""
+        channel = self.config.invalidation_channel
+        
+        while True:
+            pubsub = None
+            try:
+                pubsub = redis_client.pubsub()
+                await pubsub.subscribe(channel)
+                logger.info(f"Cache L1 invalidation listener subscribed to {channel}")
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.handle_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Cache invalidation listener error: {e}")
+                # Invalidations may have been missed while disconnected
+                self._l1.clear()
+                await asyncio.sleep(1.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.unsubscribe(channel)
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+    
     # ==================== Cache Stats ====================
     
     def get_stats(self) -> dict[str, Any]:
-        """Get cache statistics."""
+        """Get cache statistics (top-level counters are the Redis tier)."""
         total = self._stats["hits"] + self._stats["misses"]
         hit_rate = self._stats["hits"] / total if total > 0 else 0
         
@@ -387,6 +680,7 @@ class CacheManager:
             **self._stats,
             "total_requests": total,
             "hit_rate": round(hit_rate * 100, 2),
+            "l1": self._l1.get_stats(),
         }
     
     def reset_stats(self) -> None:
@@ -397,10 +691,29 @@ class CacheManager:
             "sets": 0,
             "deletes": 0,
         }
+        self._l1.reset_stats()
+    
+    def collect_metrics(self):
+        """Hit/miss counters of both tiers for the /metrics endpoint."""
+        l1 = self._l1.get_stats()
+        yield (
+            "cache_requests_total", "counter", "Market data cache lookups by tier and result",
+            [
+                ({"tier": "l1", "result": "hit"}, l1["hits"]),
+                ({"tier": "l1", "result": "miss"}, l1["misses"]),
+                ({"tier": "redis", "result": "hit"}, self._stats["hits"]),
+                ({"tier": "redis", "result": "miss"}, self._stats["misses"]),
+            ],
+        )
+        yield (
+            "cache_l1_entries", "gauge", "Entries in the in-process cache",
+            [({}, l1["size"])],
+        )
 
 
 # Global cache manager instance
 cache_manager = CacheManager()
+metrics.register_collector(cache_manager.collect_metrics)
 
 
 # ==================== Cache Decorator ====================
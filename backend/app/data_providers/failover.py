@@ -5,11 +5,13 @@ Manages automatic failover between data providers.
 Selects the best available provider based on health, priority, and capabilities.
 """
 import asyncio
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional, TypeVar, Generic, Callable, Awaitable, Any
 from loguru import logger
 
+from app.core.metrics import metrics
 from app.data_providers.adapters.base import (
     BaseAdapter,
     MarketType,
@@ -36,6 +38,16 @@ class FailoverConfig:
     prefer_healthy: bool = True     # Prefer healthy providers
     prefer_budget: bool = True      # Prefer providers with remaining budget
     prefer_low_latency: bool = True # Prefer providers with lower latency
+    
+    # Hedged requests: if the selected provider has not answered within
+    # its observed p95 latency, fire the next-ranked provider in parallel;
+    # the first valid answer wins and the other call is cancelled
+    hedge_requests: bool = False
+    hedge_data_types: tuple[DataType, ...] = (DataType.QUOTE,)
+    hedge_min_samples: int = 20          # Latency samples needed to trust the p95
+    hedge_default_delay_ms: float = 1000.0  # Delay while the p95 is unknown
+    hedge_min_delay_ms: float = 50.0
+    hedge_max_delay_ms: float = 5000.0
 
 
 @dataclass
@@ -66,6 +78,13 @@ class FailoverManager:
         self._providers: dict[str, BaseAdapter] = {}
         self._groups: dict[tuple[MarketType, DataType], ProviderGroup] = {}
         self._lock = asyncio.Lock()
+        self._hedge_stats = {
+            "hedged": 0,           # Requests where a hedge was fired
+            "hedge_wins": 0,       # ... and the hedge answered first
+            "primary_wins": 0,     # ... and the primary still answered first
+            "no_candidate": 0,     # Hedge delay passed but no provider was available
+            "latency_saved_ms": 0.0,
+        }
         
     def register_provider(self, adapter: BaseAdapter) -> None:
         """Register a data provider adapter."""
@@ -242,39 +261,33 @@ class FailoverManager:
                 break
             
             try:
-                # Acquire rate limit
-                await rate_limiter.acquire(provider.name)
-                
-                # Check budget
-                await budget_tracker.check_and_record(provider.name)
-                
-                # Execute the operation
-                start_time = datetime.utcnow()
-                result = await operation(provider)
-                
-                # Record success
-                latency_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
-                await health_monitor.record_success(provider.name, latency_ms)
+                if self.config.hedge_requests and data_type in self.config.hedge_data_types:
+                    return await self._execute_hedged(
+                        operation, provider, market_type, data_type, excluded
+                    )
                 
-                return result
+                return await self._call_provider(operation, provider, data_type.value)
                 
             except RateLimitError as e:
                 logger.warning(f"Rate limit hit for {provider.name}: {e}")
+                metrics.inc("provider_failovers_total", provider=provider.name, reason="rate_limit")
                 excluded.append(provider.name)
                 last_error = e
                 
             except BudgetExceededError as e:
                 logger.warning(f"Budget exceeded for {provider.name}: {e}")
+                metrics.inc("provider_failovers_total", provider=provider.name, reason="budget")
                 excluded.append(provider.name)
                 last_error = e
                 
             except ProviderError as e:
                 logger.error(f"Provider error from {provider.name}: {e}")
-                await health_monitor.record_failure(provider.name, str(e))
+                await health_monitor.record_failure(provider.name, str(e), data_type.value)
                 
                 if not e.recoverable:
                     raise
                 
+                metrics.inc("provider_failovers_total", provider=provider.name, reason="error")
                 excluded.append(provider.name)
                 last_error = e
                 
@@ -288,7 +301,8 @@ class FailoverManager:
                 
             except Exception as e:
                 logger.error(f"Unexpected error from {provider.name}: {e}")
-                await health_monitor.record_failure(provider.name, str(e))
+                await health_monitor.record_failure(provider.name, str(e), data_type.value)
+                metrics.inc("provider_failovers_total", provider=provider.name, reason="error")
                 excluded.append(provider.name)
                 last_error = e
         
@@ -298,6 +312,145 @@ class FailoverManager:
             error_msg += f": {last_error}"
         raise ProviderError("failover", error_msg, recoverable=False)
     
+    async def _call_provider(
+        self,
+        operation: Callable[[BaseAdapter], Awaitable[T]],
+        provider: BaseAdapter,
+        operation_label: str = "request",
+    ) -> T:
+        """Run the operation on one provider (rate limit, budget, health)."""
+        # Acquire rate limit
+        await rate_limiter.acquire(provider.name)
+        
+        # Check budget
+        await budget_tracker.check_and_record(provider.name)
+        
+        # Execute the operation
+        start_time = datetime.utcnow()
+        result = await operation(provider)
+        
+        # Record success
+        latency_ms = (datetime.utcnow() - start_time).total_seconds() * 1000
+        await health_monitor.record_success(provider.name, latency_ms, operation_label)
+        
+        return result
+    
+    def _hedge_delay_ms(self, provider: str) -> float:
+        """Time to wait for a provider before hedging: its observed p95 latency."""
+        if health_monitor.get_sample_count(provider) < self.config.hedge_min_samples:
+            return self.config.hedge_default_delay_ms
+        p95 = health_monitor.get_latency_quantile(provider, 0.95)
+        if p95 is None:
+            return self.config.hedge_default_delay_ms
+        return min(max(p95, self.config.hedge_min_delay_ms), self.config.hedge_max_delay_ms)
+    
+    @staticmethod
+    def _expected_latency_ms(provider: str, elapsed_ms: float) -> float:
+        """Mean observed latency of requests slower than elapsed_ms (elapsed_ms if none)."""
+        slower = [x for x in health_monitor.get_latency_samples(provider) if x > elapsed_ms]
+        return sum(slower) / len(slower) if slower else elapsed_ms
+    
+    async def _execute_hedged(
+        self,
+        operation: Callable[[BaseAdapter], Awaitable[T]],
+        primary: BaseAdapter,
+        market_type: MarketType,
+        data_type: DataType,
+        excluded: list[str],
+    ) -> T:
+        """
+        Call the primary; after its p95 latency, also call the next-ranked provider.
+        
+        The hedge provider comes from select_provider, so it is healthy,
+        within budget and has rate limit capacity. The first non-None
+        answer wins and the other call is cancelled (a cancelled primary
+        still records its elapsed time as a lower-bound latency sample, so
+        the hedge delay does not drift down). If every call fails,
+        the primary's error is raised (hedge failures are recorded here
+        and the hedge provider is added to `excluded`).
+        """
+        started = time.perf_counter()
+        primary_task = asyncio.create_task(self._call_provider(operation, primary, data_type.value))
+        tasks = {primary_task: primary}
+        
+        try:
+            delay = self._hedge_delay_ms(primary.name) / 1000
+            done, _ = await asyncio.wait({primary_task}, timeout=delay)
+            if done:
+                # Answered (or failed) in time: no hedge
+                return primary_task.result()
+            
+            hedge = self.select_provider(
+                market_type, data_type, exclude=excluded + [primary.name]
+            )
+            if hedge is None:
+                self._hedge_stats["no_candidate"] += 1
+                return await primary_task
+            
+            self._hedge_stats["hedged"] += 1
+            logger.debug(
+                f"Hedging {primary.name} after {delay * 1000:.0f}ms with {hedge.name}"
+            )
+            tasks[asyncio.create_task(self._call_provider(operation, hedge, data_type.value))] = hedge
+            
+            pending = set(tasks)
+            empty_result = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task.result() is not None:
+                            self._record_hedge_winner(task is primary_task, primary, started)
+                            if not primary_task.done():
+                                # Cancelled below: its latency is at least the time so far
+                                await health_monitor.record_lower_bound_latency(
+                                    primary.name, (time.perf_counter() - started) * 1000
+                                )
+                            if task is not primary_task and primary_task.done() and primary_task.exception():
+                                await health_monitor.record_failure(primary.name, str(primary_task.exception()))
+                            return task.result()
+                        empty_result = task
+                    elif task is not primary_task:
+                        await health_monitor.record_failure(tasks[task].name, str(task.exception()))
+                        excluded.append(tasks[task].name)
+            
+            if empty_result is not None:
+                return empty_result.result()
+            return primary_task.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    def _record_hedge_winner(self, primary_won: bool, primary: BaseAdapter, started: float) -> None:
+        if primary_won:
+            self._hedge_stats["primary_wins"] += 1
+            return
+        self._hedge_stats["hedge_wins"] += 1
+        # The primary had not answered after `elapsed`; estimate when it would have
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        saved = self._expected_latency_ms(primary.name, elapsed_ms) - elapsed_ms
+        self._hedge_stats["latency_saved_ms"] += max(saved, 0.0)
+    
+    def get_hedge_stats(self) -> dict:
+        """Hedged request counters and estimated latency saved."""
+        stats = dict(self._hedge_stats)
+        stats["latency_saved_ms"] = round(stats["latency_saved_ms"], 1)
+        stats["enabled"] = self.config.hedge_requests
+        return stats
+    
+    def collect_metrics(self):
+        """Hedging counters for the /metrics endpoint."""
+        stats = self._hedge_stats
+        yield (
+            "provider_hedged_requests_total", "counter", "Requests sent to a second provider",
+            [({}, stats["hedged"])],
+        )
+        yield (
+            "provider_hedge_wins_total", "counter", "Hedged requests by the provider that answered first",
+            [({"winner": "hedge"}, stats["hedge_wins"]), ({"winner": "primary"}, stats["primary_wins"])],
+        )
+    
     async def broadcast(
         self,
         operation: Callable[[BaseAdapter], Awaitable[T]],
@@ -348,9 +501,12 @@ class FailoverManager:
                     p.name for p in group.get_ordered_providers()
                 ]
                 for (market, data), group in self._groups.items()
-            }
+            },
+            "hedging": self.get_hedge_stats(),
         }
 
 
 # Global failover manager instance
 failover_manager = FailoverManager()
+metrics.describe("provider_failovers_total", "Provider attempts abandoned for the next provider")
+metrics.register_collector(failover_manager.collect_metrics)
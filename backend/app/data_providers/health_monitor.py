@@ -6,6 +6,8 @@ Tracks latency, error rates, and availability.
 Implements circuit breaker pattern for automatic failover.
 """
 import asyncio
+import math
+from bisect import bisect_left, insort
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -13,6 +15,8 @@ from typing import Optional, Callable, Awaitable
 from collections import defaultdict, deque
 from loguru import logger
 
+from app.core.metrics import LatencyHistogram, metrics as metrics_registry
+
 
 class CircuitState(str, Enum):
     """Circuit breaker states."""
@@ -46,6 +50,10 @@ class HealthMetrics:
     
     # Latency tracking (last N requests)
     latencies: deque = field(default_factory=lambda: deque(maxlen=100))
+    # Histogram of the same window, for percentiles without sorting
+    latency_window: LatencyHistogram = field(default_factory=LatencyHistogram)
+    # Same window kept in order, for exact percentiles in status views
+    sorted_latencies: list = field(default_factory=list)
     
     # Error tracking
     total_requests: int = 0
@@ -68,21 +76,40 @@ class HealthMetrics:
     is_available: bool = True
     status_message: str = "OK"
     
+    def add_latency(self, latency_ms: float) -> None:
+        """Record a latency, dropping the oldest one once the window is full."""
+        if len(self.latencies) == self.latencies.maxlen:
+            oldest = self.latencies[0]
+            self.latency_window.remove(oldest)
+            del self.sorted_latencies[bisect_left(self.sorted_latencies, oldest)]
+        self.latencies.append(latency_ms)
+        self.latency_window.observe(latency_ms)
+        insort(self.sorted_latencies, latency_ms)
+    
+    def latency_quantile(self, q: float) -> float:
+        """
+        Approximate latency quantile over the window.
+        
+        Interpolated inside a histogram bucket (buckets are sqrt(2) wide,
+        so the value can be off by up to ~20%); cheap enough for the
+        per-request hedge delay. Status views use the exact properties below.
+        """
+        return self.latency_window.quantile(q)
+    
     @property
     def avg_latency_ms(self) -> float:
-        """Calculate average latency."""
+        """Calculate average latency (exact, over the window)."""
         if not self.latencies:
             return 0.0
-        return sum(self.latencies) / len(self.latencies)
+        return math.fsum(self.latencies) / len(self.latencies)
     
     @property
     def p95_latency_ms(self) -> float:
-        """Calculate 95th percentile latency."""
-        if not self.latencies:
+        """Calculate 95th percentile latency (exact, over the window)."""
+        if not self.sorted_latencies:
             return 0.0
-        sorted_latencies = sorted(self.latencies)
-        idx = int(len(sorted_latencies) * 0.95)
-        return sorted_latencies[min(idx, len(sorted_latencies) - 1)]
+        idx = int(len(self.sorted_latencies) * 0.95)
+        return self.sorted_latencies[min(idx, len(self.sorted_latencies) - 1)]
     
     @property
     def error_rate(self) -> float:
@@ -129,8 +156,26 @@ class ProviderHealthMonitor:
         """
         self._status_callbacks.append(callback)
     
-    async def record_success(self, provider: str, latency_ms: float) -> None:
-        """Record a successful request."""
+    async def record_success(
+        self,
+        provider: str,
+        latency_ms: float,
+        operation: str = "request"
+    ) -> None:
+        """
+        Record a successful request.
+        
+        Args:
+            provider: Provider name
+            latency_ms: Request latency
+            operation: Operation label for the exported metrics (e.g. data type)
+        """
+        metrics_registry.observe(
+            "provider_request_latency_ms", latency_ms, provider=provider, operation=operation
+        )
+        metrics_registry.inc(
+            "provider_requests_total", provider=provider, operation=operation, outcome="success"
+        )
         async with self._locks[provider]:
             metrics = self._get_or_create_metrics(provider)
             config = self._configs.get(provider, HealthConfig())
@@ -143,7 +188,7 @@ class ProviderHealthMonitor:
             metrics.last_success = datetime.utcnow()
             
             # Record latency
-            metrics.latencies.append(latency_ms)
+            metrics.add_latency(latency_ms)
             
             # Handle circuit breaker state
             if metrics.circuit_state == CircuitState.HALF_OPEN:
@@ -159,8 +204,28 @@ class ProviderHealthMonitor:
             # Update overall health status
             await self._update_health_status(provider, metrics, config)
     
-    async def record_failure(self, provider: str, error: Optional[str] = None) -> None:
+    async def record_lower_bound_latency(self, provider: str, latency_ms: float) -> None:
+        """
+        Record the elapsed time of a request abandoned before it answered.
+        
+        Used for a hedged primary that lost and was cancelled: its latency
+        was at least latency_ms. Keeping it in the window stops the p95
+        from drifting down to the requests that happened to be fast.
+        Request counters and the exported histogram are left unchanged.
+        """
+        async with self._locks[provider]:
+            self._get_or_create_metrics(provider).add_latency(latency_ms)
+    
+    async def record_failure(
+        self,
+        provider: str,
+        error: Optional[str] = None,
+        operation: str = "request"
+    ) -> None:
         """Record a failed request."""
+        metrics_registry.inc(
+            "provider_requests_total", provider=provider, operation=operation, outcome="failure"
+        )
         async with self._locks[provider]:
             metrics = self._get_or_create_metrics(provider)
             config = self._configs.get(provider, HealthConfig())
@@ -342,6 +407,40 @@ class ProviderHealthMonitor:
             if metrics.is_healthy and metrics.is_available
         ]
     
+    def get_latency_quantile(self, provider: str, q: float) -> Optional[float]:
+        """Recent latency quantile (ms), or None without samples."""
+        metrics = self._metrics.get(provider)
+        if not metrics or not metrics.latencies:
+            return None
+        return metrics.latency_quantile(q)
+    
+    def get_sample_count(self, provider: str) -> int:
+        """Number of latencies in the recent window."""
+        metrics = self._metrics.get(provider)
+        return len(metrics.latencies) if metrics else 0
+    
+    def collect_metrics(self):
+        """Metric families for the /metrics endpoint (recent window per provider)."""
+        providers = list(self._metrics.items())
+        yield (
+            "provider_recent_latency_p95_ms", "gauge",
+            "p95 latency of the last 100 successful requests",
+            [({"provider": p}, m.p95_latency_ms) for p, m in providers if m.latencies],
+        )
+        yield (
+            "provider_error_rate", "gauge", "Failed / total requests",
+            [({"provider": p}, m.error_rate) for p, m in providers],
+        )
+        yield (
+            "provider_circuit_open", "gauge", "1 if the circuit breaker is not closed",
+            [({"provider": p}, float(m.circuit_state != CircuitState.CLOSED)) for p, m in providers],
+        )
+    
+    def get_latency_samples(self, provider: str) -> list[float]:
+        """Recent latencies (ms) of successful requests, oldest first."""
+        metrics = self._metrics.get(provider)
+        return list(metrics.latencies) if metrics else []
+    
     def reset_metrics(self, provider: str) -> None:
         """Reset metrics for a provider."""
         if provider in self._metrics:
@@ -351,3 +450,6 @@ class ProviderHealthMonitor:
 
 # Global health monitor instance
 health_monitor = ProviderHealthMonitor()
+metrics_registry.describe("provider_request_latency_ms", "Provider request latency in milliseconds")
+metrics_registry.describe("provider_requests_total", "Provider requests by outcome")
+metrics_registry.register_collector(health_monitor.collect_metrics)
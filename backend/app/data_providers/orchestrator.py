@@ -47,6 +47,9 @@ class OrchestratorConfig:
     
     # Timeouts
     request_timeout: float = 30.0
+    
+    # Request coalescing: concurrent callers for the same data share one provider call
+    coalesce_requests: bool = True
 
 
 class ProviderOrchestrator:
@@ -73,6 +76,82 @@ class ProviderOrchestrator:
         self.config = config or OrchestratorConfig()
         self._initialized = False
         self._semaphore = asyncio.Semaphore(self.config.max_parallel_requests)
+        
+        # In-flight provider requests keyed by (data type, symbol, ...)
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._dedup_stats = {
+            "leader_requests": 0,
+            "coalesced_requests": 0,
+            "batch_merged_symbols": 0,
+        }
+    
+    # ==================== Request Coalescing ====================
+    
+    @staticmethod
+    def _quote_key(symbol: str, market_type: MarketType) -> tuple:
+        """In-flight table key for a quote request."""
+        return ("quote", symbol, market_type.value)
+    
+    @staticmethod
+    def _historical_key(
+        symbol: str,
+        timeframe: TimeFrame,
+        start_str: str,
+        end_str: str,
+        market_type: MarketType,
+    ) -> tuple:
+        """In-flight table key for a historical request."""
+        return ("historical", symbol, timeframe.value, start_str, end_str, market_type.value)
+    
+    def _register_inflight(self, key: tuple, future: asyncio.Future) -> asyncio.Future:
+        """
+        Track a pending provider request so concurrent callers can join it.
+        
+        The entry is removed as soon as the future settles. Exceptions are
+        marked as retrieved so a request nobody ended up awaiting doesn't
+        log "exception was never retrieved".
+        """
+        self._inflight[key] = future
+        
+        def _done(fut: asyncio.Future) -> None:
+            if self._inflight.get(key) is fut:
+                del self._inflight[key]
+            if not fut.cancelled():
+                fut.exception()
+        
+        future.add_done_callback(_done)
+        return future
+    
+    async def _single_flight(self, key: tuple, fetch) -> Any:
+        """
+        Run `fetch()` once per key, sharing the result with concurrent callers.
+        
+        The shared task is shielded so that a cancelled caller does not
+        cancel the fetch for everyone else waiting on it.
+        """
+        if not self.config.coalesce_requests:
+            return await fetch()
+        
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._dedup_stats["coalesced_requests"] += 1
+            return await asyncio.shield(pending)
+        
+        self._dedup_stats["leader_requests"] += 1
+        task = self._register_inflight(key, asyncio.ensure_future(fetch()))
+        return await asyncio.shield(task)
+    
+    def get_dedup_stats(self) -> dict[str, Any]:
+        """Get request coalescing statistics."""
+        leaders = self._dedup_stats["leader_requests"]
+        joined = self._dedup_stats["coalesced_requests"] + self._dedup_stats["batch_merged_symbols"]
+        total = leaders + joined
+        
+        return {
+            **self._dedup_stats,
+            "in_flight": len(self._inflight),
+            "dedup_rate": round(joined / total * 100, 2) if total > 0 else 0,
+        }
     
     async def initialize(self) -> None:
         """Initialize all registered providers."""
@@ -88,11 +167,19 @@ class ProviderOrchestrator:
                 logger.error(f"Failed to initialize provider {name}: {e}")
                 await health_monitor.record_failure(name, str(e))
         
+        # Keep this worker's L1 quote cache coherent with the others
+        try:
+            await cache_manager.start_invalidation_listener()
+        except Exception as e:
+            logger.error(f"Failed to start cache invalidation listener: {e}")
+        
         self._initialized = True
         logger.info("Provider orchestrator initialized")
     
     async def shutdown(self) -> None:
         """Shutdown all providers."""
+        await cache_manager.stop_invalidation_listener()
+        
         for name, provider in failover_manager._providers.items():
             try:
                 await provider.close()
@@ -172,6 +259,13 @@ class ProviderOrchestrator:
                 logger.debug(f"Cache hit for quote: {symbol}")
                 return cached
         
+        return await self._single_flight(
+            self._quote_key(symbol, market_type),
+            lambda: self._fetch_quote(symbol, market_type),
+        )
+    
+    async def _fetch_quote(self, symbol: str, market_type: MarketType) -> Quote:
+        """Fetch a quote from the providers and cache it."""
         # Fetch from provider with failover
         async def fetch_quote(provider: BaseAdapter) -> Quote:
             provider_symbol = data_normalizer.get_provider_symbol(symbol, provider.name)
@@ -236,9 +330,60 @@ class ProviderOrchestrator:
         if not symbols_to_fetch:
             return result
         
+        # Join fetches already in flight for these symbols; claim the rest
+        # so concurrent single-symbol callers can wait on this batch
+        joined: dict[str, asyncio.Future] = {}
+        claimed: dict[str, asyncio.Future] = {}
+        loop = asyncio.get_running_loop()
+        
+        for symbol in dict.fromkeys(symbols_to_fetch):
+            key = self._quote_key(symbol, market_type)
+            pending = self._inflight.get(key) if self.config.coalesce_requests else None
+            if pending is not None:
+                joined[symbol] = pending
+            else:
+                claimed[symbol] = loop.create_future()
+                if self.config.coalesce_requests:
+                    self._register_inflight(key, claimed[symbol])
+        
+        if joined:
+            self._dedup_stats["batch_merged_symbols"] += len(joined)
+        if claimed:
+            self._dedup_stats["leader_requests"] += 1
+        
+        try:
+            await self._fetch_quote_batches(list(claimed), market_type, claimed, result)
+        finally:
+            # Anything the provider didn't return (or a cancelled batch) must
+            # still settle so callers waiting on it don't hang
+            for symbol, future in claimed.items():
+                if not future.done():
+                    future.set_exception(
+                        ProviderError("orchestrator", f"No quote returned for {symbol}")
+                    )
+        
+        if joined:
+            shared = await asyncio.gather(
+                *(asyncio.shield(f) for f in joined.values()),
+                return_exceptions=True,
+            )
+            for symbol, quote in zip(joined, shared):
+                if isinstance(quote, Quote):
+                    result[symbol] = quote
+        
+        return result
+    
+    async def _fetch_quote_batches(
+        self,
+        symbols: list[str],
+        market_type: MarketType,
+        futures: dict[str, asyncio.Future],
+        result: dict[str, Quote],
+    ) -> None:
+        """Fetch quotes in provider-sized batches, resolving per-symbol futures."""
         # Fetch in batches
-        for i in range(0, len(symbols_to_fetch), self.config.batch_size):
-            batch = symbols_to_fetch[i:i + self.config.batch_size]
+        for i in range(0, len(symbols), self.config.batch_size):
+            batch = symbols[i:i + self.config.batch_size]
             
             async def fetch_quotes(provider: BaseAdapter) -> list[Quote]:
                 provider_symbols = [
@@ -266,6 +411,9 @@ class ProviderOrchestrator:
                 
                 for quote in quotes:
                     result[quote.symbol] = quote
+                    future = futures.get(quote.symbol)
+                    if future is not None and not future.done():
+                        future.set_result(quote)
                 
                 # Cache results
                 if self.config.enable_cache and self.config.cache_quotes:
@@ -273,8 +421,9 @@ class ProviderOrchestrator:
                     
             except ProviderError as e:
                 logger.error(f"Failed to fetch batch quotes: {e}")
-        
-        return result
+                for symbol in batch:
+                    if not futures[symbol].done():
+                        futures[symbol].set_exception(e)
     
     # ==================== Historical Data Operations ====================
     
@@ -319,6 +468,25 @@ class ProviderOrchestrator:
                 logger.debug(f"Cache hit for historical: {symbol}")
                 return cached
         
+        return await self._single_flight(
+            self._historical_key(symbol, timeframe, start_str, end_str, market_type),
+            lambda: self._fetch_historical(
+                symbol, timeframe, start_date, end_date, market_type
+            ),
+        )
+    
+    async def _fetch_historical(
+        self,
+        symbol: str,
+        timeframe: TimeFrame,
+        start_date: date,
+        end_date: date,
+        market_type: MarketType,
+    ) -> list[OHLCV]:
+        """Fetch historical bars from the providers, check gaps and cache them."""
+        start_str = start_date.isoformat()
+        end_str = end_date.isoformat()
+        
         # Fetch from provider with failover
         async def fetch_historical(provider: BaseAdapter) -> list[OHLCV]:
             provider_symbol = data_normalizer.get_provider_symbol(symbol, provider.name)
@@ -564,10 +732,12 @@ class ProviderOrchestrator:
             "config": {
                 "enable_cache": self.config.enable_cache,
                 "max_parallel_requests": self.config.max_parallel_requests,
+                "coalesce_requests": self.config.coalesce_requests,
                 "validate_data": self.config.validate_data,
             },
             "providers": failover_manager.get_status(),
             "cache": cache_manager.get_stats(),
+            "dedup": self.get_dedup_stats(),
             "health": health_monitor.get_all_health(),
             "budgets": budget_tracker.get_all_stats(),
         }
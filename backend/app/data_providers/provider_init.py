@@ -8,6 +8,7 @@ from decimal import Decimal
 from typing import Optional
 from loguru import logger
 
+from app.config import settings
 from app.data_providers import orchestrator, rate_limiter, budget_tracker, failover_manager
 from app.data_providers.rate_limiter import RateLimitConfig
 from app.data_providers.budget_tracker import BudgetConfig
@@ -139,6 +140,7 @@ async def initialize_providers(api_keys: dict[str, str]) -> dict[str, bool]:
         Dictionary mapping provider names to initialization status
     """
     results = {}
+    failover_manager.config.hedge_requests = settings.PROVIDER_HEDGING
     
     # Map of provider names to (adapter_class, config_factory)
     provider_factories = {
@@ -256,7 +258,7 @@ async def initialize_providers(api_keys: dict[str, str]) -> dict[str, bool]:
 async def shutdown_providers():
     """Shutdown all providers gracefully."""
     try:
-        await orchestrator.close()
+        await orchestrator.shutdown()
         logger.info("All providers shut down")
     except Exception as e:
         logger.error(f"Error shutting down providers: {e}")
@@ -3,13 +3,30 @@ Rate Limiter
 
 Implements token bucket algorithm with per-provider rate limiting.
 Supports multiple rate limit windows (per second, minute, day).
+
+Limits are shared through Redis when a client is attached (use_redis):
+every API worker and the bot scheduler draw from the same provider
+quota. One Lua script checks and records all limits of a provider
+atomically, using Redis server time:
+- Burst control: GCRA (one "theoretical arrival time" per provider)
+- Minute/hour/day windows: sliding window counters (count of the
+  current and previous fixed window, the previous one weighted by its
+  overlap with the sliding window)
+Both need O(1) memory per provider and window. If Redis is unreachable
+the limiter falls back to the same algorithms in process memory and
+retries Redis after REDIS_RETRY_SECONDS.
 """
 import asyncio
+import math
+import time
 from collections import defaultdict
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime
+from typing import Any, Optional
 from loguru import logger
+from redis.exceptions import RedisError
+
+from app.core.metrics import metrics
 
 
 @dataclass
@@ -60,43 +77,165 @@ class TokenBucket:
         return needed / self.fill_rate
 
 
+def sliding_window_wait(
+    limit: int,
+    window_seconds: float,
+    window_start: float,
+    current: float,
+    previous: float,
+    now: float,
+    tokens: int = 1
+) -> float:
+    """
+    Seconds until `tokens` more requests fit in a sliding window counter.
+    
+    The count in the sliding window is estimated as
+    previous * (overlap of the previous fixed window) + current.
+    Mirrored by the Lua script in _SHARED_ACQUIRE_SCRIPT.
+    """
+    elapsed = now - window_start
+    used = previous * (window_seconds - elapsed) / window_seconds + current
+    if used + tokens <= limit:
+        return 0.0
+    if current + tokens <= limit:
+        # Wait for the previous window's share to decay
+        return max(0.0, window_seconds - (limit - current - tokens) * window_seconds / previous - elapsed)
+    if tokens > limit:
+        return float("inf")
+    # Current window is full: wait for it to roll over and decay in turn
+    return window_seconds - elapsed + window_seconds * (1 - (limit - tokens) / current)
+
+
 @dataclass
 class WindowCounter:
-    """Sliding window counter for rate limiting."""
+    """
+    Sliding window counter for rate limiting.
+    
+    Keeps two counts (current and previous fixed window) instead of a
+    timestamp per request, so memory and work per check are O(1) even
+    for a 24h window.
+    """
     limit: int
     window_seconds: int
-    requests: list[datetime] = field(default_factory=list)
+    window_start: float = 0.0
+    current: int = 0
+    previous: int = 0
+    
+    def _roll(self) -> float:
+        """Advance to the fixed window containing now; returns now (epoch seconds)."""
+        now = time.time()
+        start = now - now % self.window_seconds
+        if start > self.window_start:
+            adjacent = start - self.window_start == self.window_seconds
+            self.previous = self.current if adjacent else 0
+            self.current = 0
+            self.window_start = start
+        return now
+    
+    def _used(self, now: float) -> float:
+        weight = (self.window_seconds - (now - self.window_start)) / self.window_seconds
+        return self.previous * weight + self.current
     
     def can_proceed(self) -> bool:
         """Check if we can make a request within the limit."""
-        self._cleanup()
-        return len(self.requests) < self.limit
+        return self.time_until_available() == 0.0
     
-    def record_request(self) -> None:
+    def record_request(self, tokens: int = 1) -> None:
         """Record a new request."""
-        self._cleanup()
-        self.requests.append(datetime.utcnow())
+        self._roll()
+        self.current += tokens
     
-    def _cleanup(self) -> None:
-        """Remove expired requests from the window."""
-        cutoff = datetime.utcnow() - timedelta(seconds=self.window_seconds)
-        self.requests = [r for r in self.requests if r > cutoff]
-    
-    def time_until_available(self) -> float:
+    def time_until_available(self, tokens: int = 1) -> float:
         """Calculate seconds until a slot is available."""
-        self._cleanup()
-        if len(self.requests) < self.limit:
-            return 0.0
-        
-        oldest = min(self.requests)
-        wait_until = oldest + timedelta(seconds=self.window_seconds)
-        wait_time = (wait_until - datetime.utcnow()).total_seconds()
-        return max(0.0, wait_time)
+        now = self._roll()
+        return sliding_window_wait(
+            self.limit, self.window_seconds, self.window_start,
+            self.current, self.previous, now, tokens
+        )
     
     def remaining(self) -> int:
         """Get remaining requests in current window."""
-        self._cleanup()
-        return max(0, self.limit - len(self.requests))
+        now = self._roll()
+        return max(0, math.floor(self.limit - self._used(now)))
+
+
+# Atomic check-and-record of all limits of one provider.
+# KEYS[1]: GCRA key, KEYS[2..]: one hash per window (start, curr, prev)
+# ARGV: tokens, burst capacity, fill rate (tokens/s), then limit and
+#       window seconds per window key
+# Returns: {allowed, wait_ms, next_wait_ms, remaining per window}
+_SHARED_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local tokens = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local interval = 1 / tonumber(ARGV[3])
+
+local function window_wait(limit, size, start, curr, prev, n)
+  local elapsed = now - start
+  local used = prev * (size - elapsed) / size + curr
+  if used + n <= limit then return 0, used end
+  if curr + n <= limit then
+    return math.max(0, size - (limit - curr - n) * size / prev - elapsed), used
+  end
+  if n > limit then return 86400 * 365, used end
+  return size - elapsed + size * (1 - (limit - n) / curr), used
+end
+
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then tat = now end
+local new_tat = tat + tokens * interval
+local wait = math.max(0, new_tat - now - capacity * interval)
+
+local windows = {}
+for i = 2, #KEYS do
+  local limit = tonumber(ARGV[2 * i])
+  local size = tonumber(ARGV[2 * i + 1])
+  local state = redis.call('HMGET', KEYS[i], 'start', 'curr', 'prev')
+  local start = tonumber(state[1]) or 0
+  local curr = tonumber(state[2]) or 0
+  local prev = tonumber(state[3]) or 0
+  local current_start = now - math.fmod(now, size)
+  if current_start > start then
+    if current_start - start == size then prev = curr else prev = 0 end
+    curr = 0
+    start = current_start
+  end
+  windows[i] = {limit, size, start, curr, prev}
+  wait = math.max(wait, (window_wait(limit, size, start, curr, prev, tokens)))
+end
+
+local allowed = 0
+if wait == 0 then
+  allowed = 1
+  tat = new_tat
+  redis.call('SET', KEYS[1], tostring(tat), 'PX', math.ceil((tat - now + interval) * 1000) + 1000)
+  for i = 2, #KEYS do
+    local w = windows[i]
+    w[4] = w[4] + tokens
+    redis.call('HSET', KEYS[i], 'start', tostring(w[3]), 'curr', w[4], 'prev', w[5])
+    redis.call('EXPIRE', KEYS[i], 2 * w[2])
+  end
+end
+
+-- Wait for one more request after this call (for non-blocking checks)
+local next_wait = math.max(0, tat + interval - now - capacity * interval)
+local result = {allowed, math.ceil(wait * 1000), 0}
+for i = 2, #KEYS do
+  local w = windows[i]
+  local ww, used = window_wait(w[1], w[2], w[3], w[4], w[5], 1)
+  next_wait = math.max(next_wait, ww)
+  result[#result + 1] = math.max(0, math.floor(w[1] - used))
+end
+result[3] = math.ceil(next_wait * 1000)
+return result
+"""
+
+# Seconds to stay in local mode after a Redis error
+REDIS_RETRY_SECONDS = 30.0
+
+# Names of the window counters, in script argument order
+_WINDOWS = (("per_minute", 60), ("per_hour", 3600), ("per_day", 86400))
 
 
 class RateLimiter:
@@ -105,9 +244,17 @@ class RateLimiter:
     
     Uses a combination of token bucket (for burst control) and
     sliding window counters (for hard limits per time period).
+    
+    With a Redis client attached the limits are enforced across all
+    processes; without one (or while Redis is down) per process.
     """
     
-    def __init__(self):
+    def __init__(self, redis: Any = None, key_prefix: str = "ratelimit"):
+        """
+        Args:
+            redis: redis.asyncio client for shared limits (None = local only)
+            key_prefix: Prefix of the Redis keys
+        """
         self._buckets: dict[str, TokenBucket] = {}
         self._minute_counters: dict[str, WindowCounter] = {}
         self._hour_counters: dict[str, WindowCounter] = {}
@@ -115,6 +262,29 @@ class RateLimiter:
         self._configs: dict[str, RateLimitConfig] = {}
         self._locks: dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
         
+        self.key_prefix = key_prefix
+        self._redis = None
+        self._script = None
+        self._redis_retry_at = 0.0
+        # Last shared state seen per provider: remaining per window and
+        # the epoch time at which the next request would be allowed
+        self._shared: dict[str, dict] = {}
+        self._stats = {"shared_acquires": 0, "local_acquires": 0, "redis_errors": 0}
+        if redis is not None:
+            self.use_redis(redis)
+    
+    def use_redis(self, redis: Any) -> None:
+        """Share limits through Redis (None switches back to local mode)."""
+        self._redis = redis
+        self._script = redis.register_script(_SHARED_ACQUIRE_SCRIPT) if redis is not None else None
+        self._redis_retry_at = 0.0
+        self._shared.clear()
+    
+    @property
+    def is_shared(self) -> bool:
+        """True while limits are enforced through Redis."""
+        return self._redis is not None and time.monotonic() >= self._redis_retry_at
+        
     def configure(self, provider: str, config: RateLimitConfig) -> None:
         """Configure rate limits for a provider."""
         self._configs[provider] = config
@@ -167,11 +337,25 @@ class RateLimiter:
             return True
         
         async with self._locks[provider]:
+            if self.is_shared:
+                try:
+                    return await self._acquire_shared(provider, tokens)
+                except (RedisError, OSError, asyncio.TimeoutError) as e:
+                    self._stats["redis_errors"] += 1
+                    self._redis_retry_at = time.monotonic() + REDIS_RETRY_SECONDS
+                    self._shared.clear()
+                    logger.warning(
+                        f"Rate limiter: Redis unavailable ({e}), "
+                        f"using local limits for {REDIS_RETRY_SECONDS:.0f}s"
+                    )
+            
+            self._stats["local_acquires"] += 1
             # Check all limits
             wait_time = self._calculate_wait_time(provider, tokens)
             
             if wait_time > 0:
                 logger.debug(f"Rate limit: waiting {wait_time:.2f}s for {provider}")
+                self._record_wait(provider, wait_time, "local")
                 await asyncio.sleep(wait_time)
             
             # Consume from bucket and record in counters
@@ -193,6 +377,51 @@ class RateLimiter:
             
             return True
     
+    @staticmethod
+    def _record_wait(provider: str, seconds: float, backend: str) -> None:
+        metrics.inc("provider_rate_limit_waits_total", provider=provider, backend=backend)
+        metrics.inc("provider_rate_limit_wait_seconds_total", seconds, provider=provider, backend=backend)
+    
+    def _shared_keys_and_args(self, provider: str, tokens: int) -> tuple[list, list]:
+        config = self._configs[provider]
+        bucket = self._buckets[provider]
+        keys = [f"{self.key_prefix}:{provider}:gcra"]
+        args = [tokens, bucket.capacity, bucket.fill_rate]
+        for name, seconds in _WINDOWS:
+            limit = getattr(config, f"requests_{name}")
+            if limit:
+                keys.append(f"{self.key_prefix}:{provider}:{seconds}")
+                args.extend([limit, seconds])
+        return keys, args
+    
+    async def _acquire_shared(self, provider: str, tokens: int) -> bool:
+        """Acquire through the Redis script, waiting until all limits allow it."""
+        keys, args = self._shared_keys_and_args(provider, tokens)
+        names = [name for name, _ in _WINDOWS if getattr(self._configs[provider], f"requests_{name}")]
+        
+        while True:
+            allowed, wait_ms, next_wait_ms, *remaining = await self._script(keys=keys, args=args)
+            self._shared[provider] = {
+                "remaining": dict(zip(names, (int(r) for r in remaining))),
+                "available_at": time.time() + int(next_wait_ms if allowed else wait_ms) / 1000,
+            }
+            if allowed:
+                break
+            logger.debug(f"Rate limit: waiting {int(wait_ms) / 1000:.2f}s for {provider} (shared)")
+            self._record_wait(provider, int(wait_ms) / 1000, "redis")
+            await asyncio.sleep(int(wait_ms) / 1000)
+        
+        self._stats["shared_acquires"] += 1
+        # Mirror locally so a fallback starts from this process's share
+        bucket = self._buckets.get(provider)
+        if bucket:
+            bucket.consume(tokens)
+        for counters in (self._minute_counters, self._hour_counters, self._day_counters):
+            counter = counters.get(provider)
+            if counter:
+                counter.record_request(tokens)
+        return True
+    
     def can_proceed(self, provider: str) -> bool:
         """
         Check if a request can proceed without waiting.
@@ -210,6 +439,11 @@ class RateLimiter:
     
     def _calculate_wait_time(self, provider: str, tokens: int = 1) -> float:
         """Calculate how long to wait before a request can proceed."""
+        shared = self._shared.get(provider) if self.is_shared else None
+        if shared is not None:
+            # As of this process's last shared acquire
+            return max(0.0, shared["available_at"] - time.time())
+        
         wait_times = []
         
         bucket = self._buckets.get(provider)
@@ -240,6 +474,10 @@ class RateLimiter:
         Returns:
             Dictionary with remaining requests per window
         """
+        shared = self._shared.get(provider) if self.is_shared else None
+        if shared is not None:
+            return dict(shared["remaining"])
+        
         result = {}
         
         minute_counter = self._minute_counters.get(provider)
@@ -266,6 +504,7 @@ class RateLimiter:
         
         return {
             "configured": True,
+            "backend": "redis" if self.is_shared else "local",
             "limits": {
                 "per_minute": config.requests_per_minute,
                 "per_hour": config.requests_per_hour,
@@ -284,8 +523,26 @@ class RateLimiter:
                 limit=self._day_counters[provider].limit,
                 window_seconds=86400,
             )
+            self._shared.pop(provider, None)
+            if self.is_shared:
+                try:
+                    asyncio.get_running_loop().create_task(self._reset_shared(provider))
+                except RuntimeError:
+                    logger.warning(f"No event loop: shared daily limit for {provider} not reset")
             logger.info(f"Daily rate limit reset for {provider}")
+    
+    async def _reset_shared(self, provider: str) -> None:
+        try:
+            await self._redis.delete(f"{self.key_prefix}:{provider}:86400")
+        except (RedisError, OSError) as e:
+            logger.warning(f"Could not reset shared daily limit for {provider}: {e}")
+    
+    def get_backend_stats(self) -> dict:
+        """Backend mode and shared/local acquire counters."""
+        return {**self._stats, "backend": "redis" if self.is_shared else "local"}
 
 
 # Global rate limiter instance
 rate_limiter = RateLimiter()
+metrics.describe("provider_rate_limit_waits_total", "Requests delayed by a provider rate limit")
+metrics.describe("provider_rate_limit_wait_seconds_total", "Time spent waiting for provider rate limits")
@@ -20,6 +20,7 @@ from app.db.models.bot_signal import (
 from app.db.models.market_universe import MarketUniverse, MarketRegion, AssetType
 from app.db.models.price_bar import PriceBar, TimeFrame
 from app.db.models.exchange_rate import ExchangeRate
+from app.db.models.portfolio_snapshot import PortfolioDailySnapshot
 
 __all__ = [
     "User",
@@ -53,4 +54,6 @@ __all__ = [
     "TimeFrame",
     # Exchange Rates
     "ExchangeRate",
+    # Portfolio Snapshots
+    "PortfolioDailySnapshot",
 ]
@@ -0,0 +1,62 @@
+"""
+PaperTrading Platform - Portfolio Daily Snapshot Model
+
+One row per portfolio per trading day with the end-of-day NAV split into
+cash and positions value, plus the external cash flow of the day.
+
+Rows are appended nightly from trades + price_bars, starting from the
+holdings stored on the previous snapshot, so history is never replayed.
+All amounts are in the PORTFOLIO currency.
+"""
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import (
+    Column, Integer, Date, Float, Numeric, DateTime, ForeignKey,
+    UniqueConstraint, Index, JSON
+)
+
+from app.db.database import Base
+
+
+class PortfolioDailySnapshot(Base):
+    """
+    End-of-day portfolio valuation.
+
+    Attributes:
+        snapshot_date: Trading day the valuation refers to
+        nav: Net asset value (cash + positions_value)
+        cash: Cash balance after the day's trades
+        positions_value: Market value of holdings at the day's close
+        net_flow: External cash flow (deposits - withdrawals) of the day
+        daily_return: Time-weighted return vs previous snapshot, net of flows
+        holdings: {symbol: [quantity, native_currency]} at end of day, the
+            starting point for the next incremental append
+    """
+
+    __tablename__ = "portfolio_daily_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    portfolio_id = Column(Integer, ForeignKey("portfolios.id", ondelete="CASCADE"), nullable=False)
+    snapshot_date = Column(Date, nullable=False)
+
+    # Valuation (PORTFOLIO currency)
+    nav = Column(Numeric(15, 2), nullable=False, default=Decimal("0"))
+    cash = Column(Numeric(15, 2), nullable=False, default=Decimal("0"))
+    positions_value = Column(Numeric(15, 2), nullable=False, default=Decimal("0"))
+    net_flow = Column(Numeric(15, 2), nullable=False, default=Decimal("0"))
+
+    # Derived
+    daily_return = Column(Float, nullable=True)
+    trade_count = Column(Integer, nullable=False, default=0)
+    holdings = Column(JSON, nullable=False, default=dict)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint('portfolio_id', 'snapshot_date', name='uq_portfolio_snapshots_day'),
+        Index('ix_portfolio_snapshots_portfolio_date', 'portfolio_id', 'snapshot_date'),
+    )
+
+    def __repr__(self):
+        return f"<PortfolioDailySnapshot portfolio={self.portfolio_id} {self.snapshot_date} nav={self.nav}>"
@@ -10,6 +10,9 @@ from app.config import settings
 class RedisClient:
     """Async Redis client wrapper."""
     
+    # Max keys per MGET / pipeline round-trip in batch methods
+    BATCH_CHUNK_SIZE = 1000
+    
     def __init__(self):
         self._client: redis.Redis | None = None
     
@@ -62,12 +65,20 @@ class RedisClient:
         """Get multiple cached quotes."""
         import json
         keys = [f"quote:{s.upper()}" for s in symbols]
-        values = await self._client.mget(keys)
+        values = await self.mget(keys)
         return {
             symbols[i]: json.loads(v) if v else None 
             for i, v in enumerate(values)
         }
     
+    async def set_quotes(self, quotes: dict[str, dict], ttl: int = 1800) -> bool:
+        """Cache many quotes in pipelined SETEX calls (symbol -> quote data)."""
+        import json
+        return await self.setex_many(
+            {f"quote:{symbol.upper()}": json.dumps(data) for symbol, data in quotes.items()},
+            ttl,
+        )
+    
     # =========================
     # Rate Limit Methods
     # =========================
@@ -119,6 +130,39 @@ class RedisClient:
             await self._client.set(key, value)
         return True
     
+    # =========================
+    # Batch Methods
+    # =========================
+    async def mget(self, keys: list[str]) -> list[str | None]:
+        """
+        Get many values with chunked MGET calls.
+        
+        Returns a list aligned with `keys` (None for missing keys, or for
+        every key if Redis is not initialized).
+        """
+        if not self._client or not keys:
+            return [None] * len(keys)
+        
+        values: list[str | None] = []
+        for i in range(0, len(keys), self.BATCH_CHUNK_SIZE):
+            values.extend(await self._client.mget(keys[i:i + self.BATCH_CHUNK_SIZE]))
+        return values
+    
+    async def setex_many(self, items: dict[str, str], ttl: int) -> bool:
+        """Set many values with the same TTL in pipelined SETEX calls."""
+        if not self._client:
+            return False
+        if not items:
+            return True
+        
+        entries = list(items.items())
+        for i in range(0, len(entries), self.BATCH_CHUNK_SIZE):
+            pipe = self._client.pipeline(transaction=False)
+            for key, value in entries[i:i + self.BATCH_CHUNK_SIZE]:
+                pipe.setex(key, ttl, value)
+            await pipe.execute()
+        return True
+    
     # =========================
     # Pub/Sub Methods
     # =========================
@@ -6,10 +6,20 @@ Repository pattern implementations for database operations.
 from app.db.repositories.user import UserRepository
 from app.db.repositories.position import PositionRepository, get_position_repository
 from app.db.repositories.exchange_rate import ExchangeRateRepository
+from app.db.repositories.price_bar import (
+    PriceBarRepository,
+    get_price_bar_repository,
+    make_bar_row,
+    load_price_matrix,
+)
 
 __all__ = [
     "UserRepository",
     "PositionRepository",
     "get_position_repository",
     "ExchangeRateRepository",
+    "PriceBarRepository",
+    "get_price_bar_repository",
+    "make_bar_row",
+    "load_price_matrix",
 ]
@@ -0,0 +1,311 @@
+"""
+Price Bar Repository
+
+Bulk write operations and batched range reads for the price_bars table.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert, ARRAY
+from sqlalchemy import func, select, and_, any_, bindparam, String
+from loguru import logger
+
+from app.db.models.price_bar import PriceBar, TimeFrame
+
+
+# Columns written by bulk upserts, in statement order
+BAR_COLUMNS = (
+    "symbol", "timeframe", "timestamp",
+    "open", "high", "low", "close", "volume",
+    "adjusted_close", "vwap", "trade_count", "source",
+)
+
+# Columns left untouched on conflict when the incoming value is NULL
+# (a provider that does not report them must not wipe existing data)
+NULLABLE_COLUMNS = ("volume", "adjusted_close", "vwap", "trade_count", "source")
+
+# asyncpg caps a statement at 32767 bind parameters
+MAX_BIND_PARAMS = 32767
+
+
+def make_bar_row(
+    symbol: str,
+    timestamp: datetime,
+    open: Any,
+    high: Any,
+    low: Any,
+    close: Any,
+    volume: Optional[Any] = None,
+    adjusted_close: Optional[Any] = None,
+    source: Optional[str] = None,
+    timeframe: TimeFrame = TimeFrame.D1,
+    vwap: Optional[Any] = None,
+    trade_count: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Build a price_bars row for bulk_upsert.
+
+    Decimals are converted to float. Timezone-aware timestamps keep their
+    exchange-local wall-clock time and drop tzinfo: daily bars are stored
+    at local midnight of their trading day, which is what the collectors
+    have always written and what ix_price_bars_unique deduplicates on.
+    """
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.replace(tzinfo=None)
+
+    return {
+        "symbol": symbol.upper(),
+        "timeframe": timeframe,
+        "timestamp": timestamp,
+        "open": float(open),
+        "high": float(high),
+        "low": float(low),
+        "close": float(close),
+        "volume": int(volume) if volume is not None else None,
+        "adjusted_close": float(adjusted_close) if adjusted_close is not None else None,
+        "vwap": float(vwap) if vwap is not None else None,
+        "trade_count": int(trade_count) if trade_count is not None else None,
+        "source": source,
+    }
+
+
+class PriceBarRepository:
+    """
+    Repository for PriceBar bulk ingestion.
+
+    Writes many bars per statement with a multi-row
+    INSERT ... VALUES ... ON CONFLICT on ix_price_bars_unique.
+    """
+
+    # Rows per statement, kept under the bind parameter limit
+    CHUNK_SIZE = MAX_BIND_PARAMS // len(BAR_COLUMNS)
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def bulk_upsert(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        update_existing: bool = True,
+        chunk_size: Optional[int] = None,
+    ) -> int:
+        """
+        Insert or update many price bars.
+
+        Rows sharing (symbol, timeframe, timestamp) are collapsed to the
+        last one, since Postgres rejects a statement that touches the same
+        conflict key twice. Does not commit.
+
+        Args:
+            rows: Row dicts, typically from make_bar_row
+            update_existing: Overwrite existing bars (False = keep them)
+            chunk_size: Rows per statement (default: CHUNK_SIZE)
+
+        Returns:
+            Number of rows written
+        """
+        unique: Dict[tuple, Dict[str, Any]] = {}
+        for row in rows:
+            key = (row["symbol"], row.get("timeframe", TimeFrame.D1), row["timestamp"])
+            unique[key] = row
+
+        if not unique:
+            return 0
+
+        values = [
+            {col: row.get(col) for col in BAR_COLUMNS} | {"timeframe": key[1]}
+            for key, row in unique.items()
+        ]
+        size = min(chunk_size or self.CHUNK_SIZE, self.CHUNK_SIZE)
+
+        for i in range(0, len(values), size):
+            await self.db.execute(self._upsert_statement(values[i:i + size], update_existing))
+
+        logger.debug(f"Upserted {len(values)} price bars in {(len(values) - 1) // size + 1} statement(s)")
+        return len(values)
+
+    @staticmethod
+    def _upsert_statement(values: List[Dict[str, Any]], update_existing: bool):
+        """Build one multi-row INSERT ... ON CONFLICT statement."""
+        stmt = insert(PriceBar).values(values)
+        index_elements = ["symbol", "timeframe", "timestamp"]
+
+        if not update_existing:
+            return stmt.on_conflict_do_nothing(index_elements=index_elements)
+
+        set_ = {
+            col: stmt.excluded[col]
+            for col in ("open", "high", "low", "close")
+        }
+        for col in NULLABLE_COLUMNS:
+            set_[col] = func.coalesce(stmt.excluded[col], getattr(PriceBar, col))
+
+        return stmt.on_conflict_do_update(index_elements=index_elements, set_=set_)
+
+
+# ==================== Batched Reads ====================
+
+# Numeric columns that can be pivoted into a price matrix
+PRICE_FIELDS = ("open", "high", "low", "close", "volume", "adjusted_close", "vwap")
+
+# Rows fetched per round trip when streaming a range query
+STREAM_BATCH_SIZE = 10_000
+
+
+def _as_date(value: Union[date, datetime]) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def bar_range_query(
+    symbols: Sequence[str],
+    start_date: Union[date, datetime],
+    end_date: Union[date, datetime],
+    fields: Sequence[str] = ("close",),
+    timeframe: TimeFrame = TimeFrame.D1,
+):
+    """
+    Build the SELECT for all bars of many symbols over a date range.
+
+    The filter is `symbol = ANY(:symbols)` plus a half-open range on the
+    raw timestamp column, so ix_price_bars_symbol_tf_ts is usable (wrapping
+    the column in date() is not). end_date is inclusive.
+    """
+    start_ts = datetime.combine(_as_date(start_date), time.min)
+    end_ts = datetime.combine(_as_date(end_date) + timedelta(days=1), time.min)
+    symbols_param = bindparam("symbols", [s.upper() for s in symbols], type_=ARRAY(String))
+
+    return (
+        select(PriceBar.symbol, PriceBar.timestamp, *(getattr(PriceBar, f) for f in fields))
+        .where(
+            and_(
+                PriceBar.symbol == any_(symbols_param),
+                PriceBar.timeframe == timeframe,
+                PriceBar.timestamp >= start_ts,
+                PriceBar.timestamp < end_ts,
+            )
+        )
+    )
+
+
+class _BarPivot:
+    """Accumulates streamed (symbol, timestamp, *fields) rows for pivot_bars."""
+
+    def __init__(self, symbols: Sequence[str], fields: Sequence[str]):
+        # First spelling wins if the caller passes the same symbol twice
+        self.columns: Dict[str, str] = {}
+        for symbol in symbols:
+            self.columns.setdefault(symbol.upper(), symbol)
+        self.col_index = {key: i for i, key in enumerate(self.columns)}
+        self.fields = tuple(fields)
+        self.sym_idx: List[int] = []
+        self.stamps: List[Any] = []
+        self.values: List[Tuple] = []
+
+    def add(self, rows: Iterable[Sequence[Any]]) -> None:
+        for row in rows:
+            col = self.col_index.get(row[0].upper())
+            if col is None:
+                continue
+            self.sym_idx.append(col)
+            self.stamps.append(row[1])
+            self.values.append(tuple(row[2:]))
+
+    def frames(self) -> Dict[str, pd.DataFrame]:
+        labels = list(self.columns.values())
+        if not self.stamps:
+            return {
+                f: pd.DataFrame(np.empty((0, len(labels))), index=pd.DatetimeIndex([]), columns=labels)
+                for f in self.fields
+            }
+
+        ts = np.array(self.stamps, dtype="datetime64[ns]")
+        dates, date_idx = np.unique(ts, return_inverse=True)
+        sym_arr = np.asarray(self.sym_idx, dtype=np.intp)
+        # None (NULL) becomes NaN
+        data = np.array(self.values, dtype=np.float64).reshape(len(self.values), len(self.fields))
+
+        index = pd.DatetimeIndex(dates)
+        result = {}
+        for k, field in enumerate(self.fields):
+            matrix = np.full((len(dates), len(labels)), np.nan)
+            matrix[date_idx, sym_arr] = data[:, k]
+            result[field] = pd.DataFrame(matrix, index=index, columns=labels)
+        return result
+
+
+def pivot_bars(
+    rows: Iterable[Sequence[Any]],
+    symbols: Sequence[str],
+    fields: Sequence[str] = ("close",),
+) -> Dict[str, pd.DataFrame]:
+    """
+    Pivot (symbol, timestamp, *fields) rows into dense date x symbol matrices.
+
+    Rows may arrive in any order. Each field becomes a float64 DataFrame
+    indexed by the sorted union of timestamps, with one column per
+    requested symbol (in request order, original spelling) and NaN where
+    a symbol has no bar.
+
+    Args:
+        rows: Row tuples as selected by bar_range_query
+        symbols: Requested symbols; matching is case-insensitive
+        fields: Value columns present in each row after the timestamp
+
+    Returns:
+        Dict field -> DataFrame
+    """
+    pivot = _BarPivot(symbols, fields)
+    pivot.add(rows)
+    return pivot.frames()
+
+
+async def load_price_matrix(
+    db: AsyncSession,
+    symbols: Sequence[str],
+    start_date: Union[date, datetime],
+    end_date: Union[date, datetime],
+    fields: Sequence[str] = ("close",),
+    timeframe: TimeFrame = TimeFrame.D1,
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Load bars for many symbols in one query as date x symbol matrices.
+
+    Rows are streamed in batches of batch_size and pivoted directly, so
+    no per-symbol query or per-symbol DataFrame is built.
+
+    Args:
+        db: Database session
+        symbols: Ticker symbols
+        start_date: First day (inclusive)
+        end_date: Last day (inclusive)
+        fields: Columns to load, from PRICE_FIELDS
+        timeframe: Bar timeframe
+        batch_size: Rows per streamed batch
+
+    Returns:
+        Dict field -> float64 DataFrame (dates x symbols), see pivot_bars
+    """
+    unknown = [f for f in fields if f not in PRICE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unsupported price fields: {unknown}")
+
+    if not symbols:
+        return pivot_bars([], [], fields)
+
+    query = bar_range_query(symbols, start_date, end_date, fields, timeframe)
+    result = await db.stream(query.execution_options(yield_per=batch_size))
+
+    pivot = _BarPivot(symbols, fields)
+    async for partition in result.partitions():
+        pivot.add(partition)
+
+    logger.debug(f"Loaded {len(pivot.stamps)} price bars for {len(symbols)} symbols in one query")
+    return pivot.frames()
+
+
+def get_price_bar_repository(db: AsyncSession) -> PriceBarRepository:
+    """Factory function to create PriceBarRepository."""
+    return PriceBarRepository(db)
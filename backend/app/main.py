@@ -4,6 +4,7 @@ PaperTrading Platform - Main Application Entry Point
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from loguru import logger
 
 from app.config import settings
@@ -12,6 +13,8 @@ from app.api.v1.websockets import market_stream_router
 from app.db.database import engine, init_db
 from app.db.redis_client import redis_client
 from app.data_providers.provider_init import initialize_providers, shutdown_providers
+from app.core.compute_executor import ComputeQueueFull, ComputeTimeout, get_compute_executor
+from app.core.metrics import metrics as metrics_registry
 
 
 async def load_api_keys_from_settings() -> dict[str, str]:
@@ -83,6 +86,11 @@ async def lifespan(app: FastAPI):
     await redis_client.initialize()
     logger.info("✅ Redis connected")
     
+    # Provider rate limits shared by all workers and the scheduler
+    if settings.RATE_LIMIT_SHARED:
+        from app.data_providers.rate_limiter import rate_limiter
+        rate_limiter.use_redis(redis_client.client)
+    
     # Seed Market Universe (if empty)
     try:
         from app.db.database import async_session_maker
@@ -99,6 +107,13 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️ Market universe seed skipped: {e}")
     
+    # Preload the FX rate matrix (all pairs, one query)
+    from app.services.fx_rate_matrix import fx_rate_matrix
+    if await fx_rate_matrix.load():
+        logger.info(f"💱 FX rate matrix loaded: {fx_rate_matrix.get_stats()['pairs']} pairs")
+    # Reload when another worker publishes new rates
+    await fx_rate_matrix.start_update_listener()
+    
     # Initialize data providers
     try:
         api_keys = await load_api_keys_from_settings()
@@ -118,7 +133,11 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"⚠️ Bot initialization error (non-fatal): {e}")
     
-    # TODO: Load ML models
+    # Start compute workers (warm: modules imported, ML models loaded)
+    try:
+        await get_compute_executor().start()
+    except Exception as e:
+        logger.error(f"⚠️ Compute executor start failed, running CPU work inline: {e}")
     
     logger.info("✅ PaperTrading Platform started successfully!")
     
@@ -135,6 +154,11 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Bot shutdown error: {e}")
     
+    await get_compute_executor().shutdown()
+    
+    from app.services.fx_rate_matrix import fx_rate_matrix
+    await fx_rate_matrix.stop_update_listener()
+    
     await shutdown_providers()
     await redis_client.close()
     await engine.dispose()
@@ -195,6 +219,26 @@ def create_application() -> FastAPI:
             "version": "1.0.0"
         }
     
+    # CPU-bound work rejected or timed out by the compute executor
+    from fastapi.responses import JSONResponse
+    
+    @app.exception_handler(ComputeQueueFull)
+    async def compute_queue_full_handler(request, exc: ComputeQueueFull):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Server busy, please retry shortly"},
+            headers={"Retry-After": "2"}
+        )
+    
+    @app.exception_handler(ComputeTimeout)
+    async def compute_timeout_handler(request, exc: ComputeTimeout):
+        return JSONResponse(status_code=504, content={"detail": str(exc)})
+    
+    @app.get("/metrics/compute", tags=["Health"])
+    async def compute_metrics():
+        """Compute executor queue depth, counters and task latency."""
+        return get_compute_executor().get_stats()
+    
     @app.get("/ready", tags=["Health"])
     async def readiness_check():
         """Readiness check - verifies all dependencies are available."""
@@ -229,23 +273,27 @@ def create_application() -> FastAPI:
             "checks": checks
         }
     
-    @app.get("/metrics", tags=["Health"])
+    @app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
     async def metrics():
-        """Basic metrics endpoint."""
+        """Metrics in the Prometheus text exposition format."""
         import psutil
         import os
         
-        return {
-            "process": {
-                "pid": os.getpid(),
-                "memory_mb": psutil.Process().memory_info().rss / 1024 / 1024,
-                "cpu_percent": psutil.Process().cpu_percent(),
-            },
-            "system": {
-                "cpu_percent": psutil.cpu_percent(),
-                "memory_percent": psutil.virtual_memory().percent,
-            }
-        }
+        process = psutil.Process()
+        gauges = [
+            ("process_resident_memory_bytes", "Resident memory size", process.memory_info().rss),
+            ("process_cpu_percent", "Process CPU usage", process.cpu_percent()),
+            ("system_cpu_percent", "System CPU usage", psutil.cpu_percent()),
+            ("system_memory_percent", "System memory usage", psutil.virtual_memory().percent),
+        ]
+        lines = []
+        for name, help_text, value in gauges:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f'{name}{{pid="{os.getpid()}"}} {value}']
+        
+        return PlainTextResponse(
+            "\n".join(lines) + "\n" + metrics_registry.render(),
+            media_type="text/plain; version=0.0.4",
+        )
     
     return app
 
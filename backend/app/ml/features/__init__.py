@@ -13,6 +13,17 @@ from app.ml.features.technical_features import (
     calculate_technical_features,
 )
 
+from app.ml.features.streaming_indicators import (
+    IndicatorState,
+    StreamingIndicatorEngine,
+)
+
+from app.ml.features.panel_features import (
+    FeaturePanel,
+    compute_panel_features,
+    compute_panel_from_frames,
+)
+
 from app.ml.features.fundamental_features import (
     FundamentalFeatures,
     FundamentalFeaturesCalculator,
@@ -28,6 +39,12 @@ from app.ml.features.market_features import (
     SECTOR_ETF_MAPPING,
 )
 
+from app.ml.features.columnar_store import (
+    ColumnarFeatureBackend,
+    FeatureRow,
+    FeatureWindow,
+)
+
 from app.ml.features.feature_store import (
     FeatureStore,
     FeatureRecord,
@@ -50,6 +67,11 @@ __all__ = [
     'TechnicalFeatures',
     'TechnicalFeaturesCalculator',
     'calculate_technical_features',
+    'IndicatorState',
+    'StreamingIndicatorEngine',
+    'FeaturePanel',
+    'compute_panel_features',
+    'compute_panel_from_frames',
     # Fundamental
     'FundamentalFeatures',
     'FundamentalFeaturesCalculator',
@@ -66,6 +88,9 @@ __all__ = [
     'FeatureRecord',
     'CombinedFeatures',
     'InMemoryFeatureCache',
+    'ColumnarFeatureBackend',
+    'FeatureRow',
+    'FeatureWindow',
     'get_feature_store',
     # Pipeline
     'FeaturePipeline',
@@ -0,0 +1,536 @@
+"""
+Columnar Feature Backend
+
+Persistent storage for feature history as memory-mapped .npy shards:
+
+    <root>/symbols.json                               symbol -> id (list index)
+    <root>/<feature_type>/v<version>/schema.json      column names and types
+    <root>/<feature_type>/v<version>/<YYYY-MM>/       one shard per month
+        dates.npy       datetime64[D], sorted
+        symbol_ids.npy  int32
+        values.npy      float64 (rows x columns), NaN = missing
+
+Rows inside a shard are sorted by (date, symbol id), so a date range is a
+contiguous slice of the memory map (no copy) and a point-in-time lookup is
+a binary search plus a scan of one month. Shards are rewritten atomically
+on flush(); readers holding an old memory map keep a consistent view.
+
+Numeric, boolean and integer fields of the feature dataclasses are stored;
+text fields (e.g. market regime labels) are not.
+
+Several processes (API workers, scheduler) may share a root directory:
+symbol ids are assigned and shards merged under an exclusive file lock
+(<root>/.lock), and symbols.json is reloaded under that lock first.
+Readers pick up symbols registered by other processes when the file
+changes.
+"""
+import fcntl
+import json
+import os
+import shutil
+import tempfile
+import typing
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from app.ml.features.technical_features import TechnicalFeatures
+from app.ml.features.fundamental_features import FundamentalFeatures
+from app.ml.features.market_features import MarketFeatures
+
+
+FEATURE_CLASSES = {
+    'technical': TechnicalFeatures,
+    'fundamental': FundamentalFeatures,
+    'market': MarketFeatures,
+}
+
+DateLike = Union[str, date, datetime, np.datetime64]
+
+
+def _to_day(value: DateLike) -> np.datetime64:
+    """Calendar day of a date, datetime or ISO timestamp."""
+    if isinstance(value, str):
+        value = value[:10]
+    elif isinstance(value, datetime):
+        value = value.date()
+    return np.datetime64(value, 'D')
+
+
+def _partition(day: np.datetime64) -> str:
+    return str(day.astype('datetime64[M]'))
+
+
+def schema_for(feature_type: str) -> Dict[str, List[str]]:
+    """Stored columns of a feature dataclass (numeric/boolean fields, in field order)."""
+    cls = FEATURE_CLASSES[feature_type]
+    hints = typing.get_type_hints(cls)
+    schema = {'columns': [], 'booleans': [], 'integers': []}
+    for f in fields(cls):
+        if f.name in ('symbol', 'timestamp'):
+            continue
+        hint = hints[f.name]
+        if hint in (Optional[float], float):
+            schema['columns'].append(f.name)
+        elif hint in (Optional[bool], bool):
+            schema['columns'].append(f.name)
+            schema['booleans'].append(f.name)
+        elif hint in (Optional[int], int):
+            schema['columns'].append(f.name)
+            schema['integers'].append(f.name)
+    return schema
+
+
+@dataclass
+class FeatureRow:
+    """One stored row (point-in-time lookup result)."""
+    symbol: str
+    date: np.datetime64
+    features: Dict[str, Any]
+
+
+@dataclass
+class FeatureWindow:
+    """
+    Feature rows for a date range, sorted by (date, symbol).
+
+    values is a read-only view of the memory-mapped shard when the window
+    falls in one shard and no symbol filter is applied; otherwise it is a
+    single concatenated copy.
+    """
+    feature_names: List[str]
+    dates: np.ndarray       # datetime64[D]
+    symbols: np.ndarray     # str
+    values: np.ndarray      # rows x features
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def to_frame(self) -> pd.DataFrame:
+        index = pd.MultiIndex.from_arrays([self.dates, self.symbols], names=['date', 'symbol'])
+        return pd.DataFrame(self.values, index=index, columns=self.feature_names)
+
+
+@dataclass
+class _Shard:
+    dates: np.ndarray
+    symbol_ids: np.ndarray
+    values: np.ndarray
+    stamp: Tuple[int, int]
+
+
+class ColumnarFeatureBackend:
+    """
+    Persistent, columnar feature history with memory-mapped reads.
+
+    Usage:
+        backend = ColumnarFeatureBackend("/data/features")
+        backend.write("technical", "AAPL", "2024-01-15", features.to_dict())
+        backend.flush()
+
+        row = backend.as_of("technical", "AAPL", "2024-01-31")
+        window = backend.window("technical", "2023-01-01", "2023-12-31")
+        X = window.values  # zero-copy when inside one monthly shard
+    """
+
+    def __init__(self, root_dir: Union[str, Path], version: str = "1.0"):
+        """
+        Args:
+            root_dir: Storage directory (created if missing)
+            version: Feature version; each version has its own shards
+        """
+        self.root = Path(root_dir)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.version = version
+
+        self._symbols: List[str] = []
+        self._symbol_ids: Dict[str, int] = {}
+        self._symbols_stamp: Optional[Tuple[int, int]] = None
+        self._reload_symbols()
+        self._schemas: Dict[str, Dict[str, List[str]]] = {}
+        self._shards: Dict[Path, _Shard] = {}
+
+        # feature_type -> partition -> {(day, symbol): row}; symbol ids are
+        # only assigned under the lock in flush()
+        self._pending: Dict[str, Dict[str, Dict[Tuple[np.datetime64, str], np.ndarray]]] = \
+            defaultdict(lambda: defaultdict(dict))
+        self._stats = {
+            'rows_written': 0,
+            'shards_written': 0,
+            'shard_opens': 0,
+        }
+
+    # ==================== Layout ====================
+
+    def _type_dir(self, feature_type: str) -> Path:
+        return self.root / feature_type / f"v{self.version}"
+
+    @staticmethod
+    def _read_json(path: Path, default):
+        if not path.exists():
+            return default
+        with open(path) as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write_json(path: Path, data):
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    def schema(self, feature_type: str) -> Dict[str, List[str]]:
+        """Column schema of a feature type (persisted on first write)."""
+        if feature_type not in self._schemas:
+            path = self._type_dir(feature_type) / "schema.json"
+            schema = self._read_json(path, None)
+            if schema is None:
+                schema = schema_for(feature_type)
+            self._schemas[feature_type] = schema
+        return self._schemas[feature_type]
+
+    def columns(self, feature_type: str) -> List[str]:
+        return self.schema(feature_type)['columns']
+
+    @contextmanager
+    def _locked(self):
+        """Exclusive inter-process lock on the root directory."""
+        with open(self.root / ".lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _reload_symbols(self) -> None:
+        """Re-read symbols.json if another process replaced it."""
+        path = self.root / "symbols.json"
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return
+        stamp = (st.st_ino, st.st_mtime_ns)
+        if stamp != self._symbols_stamp:
+            # The registry only grows, so ids already known stay valid
+            self._symbols = self._read_json(path, [])
+            self._symbol_ids = {s: i for i, s in enumerate(self._symbols)}
+            self._symbols_stamp = stamp
+
+    def _symbol_id(self, symbol: str) -> int:
+        """Id of a symbol, registering it if new (call under _locked())."""
+        sid = self._symbol_ids.get(symbol)
+        if sid is None:
+            sid = self._symbol_ids[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+        return sid
+
+    def _partitions(self, feature_type: str) -> List[str]:
+        type_dir = self._type_dir(feature_type)
+        if not type_dir.exists():
+            return []
+        return sorted(
+            p.name for p in type_dir.iterdir()
+            if p.is_dir() and (p / "values.npy").exists()
+        )
+
+    def _open(self, feature_type: str, partition: str) -> Optional[_Shard]:
+        """Memory-map a shard (cached until the files are replaced)."""
+        path = self._type_dir(feature_type) / partition
+        values_path = path / "values.npy"
+        try:
+            st = os.stat(values_path)
+        except FileNotFoundError:
+            return None
+
+        stamp = (st.st_ino, st.st_mtime_ns)
+        shard = self._shards.get(path)
+        if shard is None or shard.stamp != stamp:
+            shard = _Shard(
+                dates=np.load(path / "dates.npy", mmap_mode='r'),
+                symbol_ids=np.load(path / "symbol_ids.npy", mmap_mode='r'),
+                values=np.load(values_path, mmap_mode='r'),
+                stamp=stamp,
+            )
+            self._shards[path] = shard
+            self._stats['shard_opens'] += 1
+        return shard
+
+    # ==================== Writes ====================
+
+    def write(
+        self,
+        feature_type: str,
+        symbol: str,
+        timestamp: DateLike,
+        features: Dict[str, Any]
+    ) -> None:
+        """Buffer one row; rows for the same (symbol, day) replace earlier ones."""
+        columns = self.columns(feature_type)
+        row = np.full(len(columns), np.nan)
+        for i, name in enumerate(columns):
+            value = features.get(name)
+            if value is not None:
+                row[i] = float(value)
+
+        day = _to_day(timestamp)
+        self._pending[feature_type][_partition(day)][(day, symbol.upper())] = row
+
+    def write_frame(self, feature_type: str, frame: pd.DataFrame) -> None:
+        """
+        Buffer many rows from a DataFrame indexed by (date, symbol).
+
+        Columns not in the schema are ignored; missing columns are NaN.
+        """
+        columns = self.columns(feature_type)
+        values = frame.reindex(columns=columns).to_numpy(dtype=float)
+        days = frame.index.get_level_values(0).values.astype('datetime64[D]')
+        symbols = [str(s).upper() for s in frame.index.get_level_values(1)]
+
+        pending = self._pending[feature_type]
+        for day, symbol, row in zip(days, symbols, values):
+            pending[_partition(day)][(day, symbol)] = row
+
+    @property
+    def pending_rows(self) -> int:
+        return sum(
+            len(rows) for partitions in self._pending.values() for rows in partitions.values()
+        )
+
+    def flush(self) -> int:
+        """
+        Merge buffered rows into their monthly shards.
+
+        Returns:
+            Number of rows written
+        """
+        if not self._pending:
+            return 0
+
+        written = 0
+        with self._locked():
+            # Ids are assigned against the registry as other processes left it
+            self._reload_symbols()
+            known = len(self._symbols)
+            pending = {
+                feature_type: {
+                    partition: {(day, self._symbol_id(symbol)): row for (day, symbol), row in rows.items()}
+                    for partition, rows in partitions.items()
+                }
+                for feature_type, partitions in self._pending.items()
+            }
+            if len(self._symbols) > known:
+                # Registered before any shard refers to the new ids
+                self._write_json(self.root / "symbols.json", self._symbols)
+                self._symbols_stamp = None
+                self._reload_symbols()
+
+            for feature_type, partitions in pending.items():
+                type_dir = self._type_dir(feature_type)
+                type_dir.mkdir(parents=True, exist_ok=True)
+                schema_path = type_dir / "schema.json"
+                if not schema_path.exists():
+                    self._write_json(schema_path, self.schema(feature_type))
+
+                for partition, rows in partitions.items():
+                    self._merge_partition(feature_type, partition, rows)
+                    written += len(rows)
+
+        self._pending.clear()
+        if written:
+            self._stats['rows_written'] += written
+            logger.debug(f"Flushed {written} feature rows to {self.root}")
+        return written
+
+    def _merge_partition(
+        self,
+        feature_type: str,
+        partition: str,
+        rows: Dict[Tuple[np.datetime64, int], np.ndarray]
+    ) -> None:
+        keys = list(rows)
+        dates = np.array([k[0] for k in keys], dtype='datetime64[D]')
+        sids = np.array([k[1] for k in keys], dtype=np.int32)
+        values = np.vstack(list(rows.values()))
+
+        shard = self._open(feature_type, partition)
+        if shard is not None:
+            # New rows come last so they win on duplicate keys
+            dates = np.concatenate([shard.dates, dates])
+            sids = np.concatenate([shard.symbol_ids, sids])
+            values = np.vstack([shard.values, values])
+
+        # Keep the last row per (date, symbol), sorted by (date, symbol)
+        key = dates.astype(np.int64) * (len(self._symbols) + 1) + sids
+        _, last = np.unique(key[::-1], return_index=True)
+        keep = len(key) - 1 - last
+        order = keep[np.lexsort((sids[keep], dates[keep]))]
+
+        final = self._type_dir(feature_type) / partition
+        tmp = Path(tempfile.mkdtemp(prefix=f".{partition}-", dir=final.parent))
+        np.save(tmp / "dates.npy", dates[order])
+        np.save(tmp / "symbol_ids.npy", sids[order])
+        np.save(tmp / "values.npy", np.ascontiguousarray(values[order]))
+
+        if final.exists():
+            old = final.with_name(f".{partition}-old-{os.getpid()}")
+            os.replace(final, old)
+            os.replace(tmp, final)
+            shutil.rmtree(old, ignore_errors=True)
+        else:
+            os.replace(tmp, final)
+        self._stats['shards_written'] += 1
+
+    # ==================== Reads ====================
+
+    def _decode(self, feature_type: str, row: np.ndarray) -> Dict[str, Any]:
+        schema = self.schema(feature_type)
+        booleans, integers = set(schema['booleans']), set(schema['integers'])
+        features = {}
+        for name, value in zip(schema['columns'], row):
+            if np.isnan(value):
+                continue
+            if name in booleans:
+                features[name] = bool(value)
+            elif name in integers:
+                features[name] = int(value)
+            else:
+                features[name] = float(value)
+        return features
+
+    def as_of(
+        self,
+        feature_type: str,
+        symbol: str,
+        as_of: Optional[DateLike] = None
+    ) -> Optional[FeatureRow]:
+        """
+        Latest stored row for symbol on or before as_of (point-in-time).
+
+        Args:
+            feature_type: 'technical', 'fundamental' or 'market'
+            symbol: Stock symbol
+            as_of: Cut-off day (default: latest row)
+        """
+        self._reload_symbols()
+        sid = self._symbol_ids.get(symbol.upper())
+        if sid is None:
+            return None
+
+        day = _to_day(as_of) if as_of is not None else None
+        for partition in reversed(self._partitions(feature_type)):
+            if day is not None and partition > _partition(day):
+                continue
+            shard = self._open(feature_type, partition)
+            if shard is None:
+                continue
+            end = len(shard.dates) if day is None else int(np.searchsorted(shard.dates, day, side='right'))
+            matches = np.flatnonzero(shard.symbol_ids[:end] == sid)
+            if len(matches):
+                i = matches[-1]
+                return FeatureRow(
+                    symbol=symbol.upper(),
+                    date=shard.dates[i],
+                    features=self._decode(feature_type, shard.values[i]),
+                )
+        return None
+
+    def history(
+        self,
+        feature_type: str,
+        symbol: str,
+        start: Optional[DateLike] = None,
+        end: Optional[DateLike] = None
+    ) -> List[FeatureRow]:
+        """All stored rows for one symbol in [start, end], oldest first."""
+        window = self.window(feature_type, start, end, symbols=[symbol])
+        return [
+            FeatureRow(symbol=symbol.upper(), date=d, features=self._decode(feature_type, row))
+            for d, row in zip(window.dates, window.values)
+        ]
+
+    def window(
+        self,
+        feature_type: str,
+        start: Optional[DateLike] = None,
+        end: Optional[DateLike] = None,
+        symbols: Optional[Sequence[str]] = None
+    ) -> FeatureWindow:
+        """
+        Rows with start <= date <= end, for training-window slicing.
+
+        Args:
+            feature_type: Feature type
+            start: First day (default: all history)
+            end: Last day (default: all history)
+            symbols: Restrict to these symbols (forces a copy)
+        """
+        start_day = _to_day(start) if start is not None else None
+        end_day = _to_day(end) if end is not None else None
+        self._reload_symbols()
+        sid_filter = None
+        if symbols is not None:
+            sid_filter = np.array(
+                [self._symbol_ids[s.upper()] for s in symbols if s.upper() in self._symbol_ids],
+                dtype=np.int32
+            )
+
+        parts = []
+        for partition in self._partitions(feature_type):
+            if start_day is not None and partition < _partition(start_day):
+                continue
+            if end_day is not None and partition > _partition(end_day):
+                break
+            shard = self._open(feature_type, partition)
+            if shard is None:
+                continue
+            lo = 0 if start_day is None else int(np.searchsorted(shard.dates, start_day, side='left'))
+            hi = len(shard.dates) if end_day is None else int(np.searchsorted(shard.dates, end_day, side='right'))
+            dates, sids, values = shard.dates[lo:hi], shard.symbol_ids[lo:hi], shard.values[lo:hi]
+            if sid_filter is not None:
+                mask = np.isin(sids, sid_filter)
+                dates, sids, values = dates[mask], sids[mask], values[mask]
+            if len(dates):
+                parts.append((dates, sids, values))
+
+        columns = self.columns(feature_type)
+        if not parts:
+            return FeatureWindow(
+                feature_names=columns,
+                dates=np.array([], dtype='datetime64[D]'),
+                symbols=np.array([], dtype=str),
+                values=np.empty((0, len(columns))),
+            )
+
+        if len(parts) == 1:
+            dates, sids, values = parts[0]
+        else:
+            dates = np.concatenate([p[0] for p in parts])
+            sids = np.concatenate([p[1] for p in parts])
+            values = np.concatenate([p[2] for p in parts])
+
+        # Shards only refer to ids registered before they were written
+        self._reload_symbols()
+        return FeatureWindow(
+            feature_names=columns,
+            dates=np.asarray(dates),
+            symbols=np.array(self._symbols, dtype=object)[sids],
+            values=values,
+        )
+
+    def stats(self) -> dict:
+        """Get backend statistics."""
+        return {
+            **self._stats,
+            'root_dir': str(self.root),
+            'version': self.version,
+            'symbols': len(self._symbols),
+            'pending_rows': self.pending_rows,
+            'open_shards': len(self._shards),
+        }
@@ -2,8 +2,8 @@
 Feature Store
 
 Manages storage and retrieval of ML features:
-- In-memory caching for real-time access
-- Database persistence for historical features
+- In-memory caching for real-time access (hot tier)
+- Persistent columnar history with memory-mapped reads (optional backend)
 - Feature versioning and metadata
 """
 from typing import Optional, Dict, List, Any, Union
@@ -13,9 +13,12 @@ from collections import defaultdict
 import json
 from loguru import logger
 
+from app.config import settings
+
 from app.ml.features.technical_features import TechnicalFeatures, TechnicalFeaturesCalculator
 from app.ml.features.fundamental_features import FundamentalFeatures, FundamentalFeaturesCalculator
 from app.ml.features.market_features import MarketFeatures, MarketFeaturesCalculator
+from app.ml.features.columnar_store import ColumnarFeatureBackend, FeatureRow, FeatureWindow
 
 
 @dataclass
@@ -193,8 +196,12 @@ class FeatureStore:
     - Historical feature storage
     - Feature retrieval for training and inference
     
+    With a ColumnarFeatureBackend, history is persisted as memory-mapped
+    shards and survives restarts; the in-memory cache stays in front of it
+    for latest-value reads.
+    
     Usage:
-        store = FeatureStore()
+        store = FeatureStore(backend=ColumnarFeatureBackend("/data/features"))
         
         # Store calculated features
         store.store_features(
@@ -207,19 +214,34 @@ class FeatureStore:
         # Retrieve features
         features = store.get_features("AAPL")
         vector = features.to_feature_vector()
+        
+        # Point-in-time and training windows (backend only)
+        past = store.get_features_as_of("AAPL", "2024-01-31")
+        window = store.get_training_window("2023-01-01", "2023-12-31")
     """
     
     def __init__(
         self,
         cache_ttl_minutes: int = 60,
         max_cached_symbols: int = 1000,
+        backend: Optional[ColumnarFeatureBackend] = None,
+        flush_rows: int = 10_000,
     ):
+        """
+        Args:
+            cache_ttl_minutes: Hot tier TTL
+            max_cached_symbols: Hot tier capacity
+            backend: Persistent history (None keeps history in memory)
+            flush_rows: Flush the backend once this many rows are buffered
+        """
         self.cache = InMemoryFeatureCache(
             ttl_minutes=cache_ttl_minutes,
             max_symbols=max_cached_symbols,
         )
+        self.backend = backend
+        self.flush_rows = flush_rows
         
-        # Historical storage (in-memory for now, can be replaced with DB)
+        # Historical storage when no backend is configured
         self._history: Dict[str, List[FeatureRecord]] = defaultdict(list)
         self._max_history_per_symbol = 252  # ~1 year of daily features
     
@@ -304,6 +326,8 @@ class FeatureStore:
             CombinedFeatures or None if not found
         """
         cached = self.cache.get(symbol)
+        if not cached and self.backend is not None:
+            cached = self._load_latest(symbol)
         if not cached:
             return None
         
@@ -368,10 +392,15 @@ class FeatureStore:
         Returns:
             List of FeatureRecord sorted by timestamp
         """
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        
+        if self.backend is not None:
+            rows = self.backend.history(feature_type, symbol, start=cutoff.date() + timedelta(days=1))
+            return [self._row_to_record(feature_type, row) for row in rows]
+        
         if symbol not in self._history:
             return []
         
-        cutoff = datetime.utcnow() - timedelta(days=days)
         records = [
             r for r in self._history[symbol]
             if r.feature_type == feature_type
@@ -408,8 +437,88 @@ class FeatureStore:
         
         return vectors, valid_symbols
     
+    def get_features_as_of(
+        self,
+        symbol: str,
+        as_of: Union[str, datetime],
+        include: Optional[List[str]] = None,
+    ) -> Optional[CombinedFeatures]:
+        """
+        Point-in-time features: latest stored values on or before as_of.
+        
+        Requires a backend (no look-ahead when building training sets).
+        
+        Args:
+            symbol: Stock symbol
+            as_of: Cut-off date
+            include: Feature types to include
+        
+        Returns:
+            CombinedFeatures or None if nothing was stored by then
+        """
+        if self.backend is None:
+            raise RuntimeError("Point-in-time lookups require a persistent backend")
+        
+        include = include or ['technical', 'fundamental', 'market']
+        combined = None
+        for feature_type in include:
+            row = self.backend.as_of(feature_type, symbol, as_of)
+            if row is None:
+                continue
+            record = self._row_to_record(feature_type, row)
+            if combined is None:
+                combined = CombinedFeatures(symbol=symbol, timestamp=record.timestamp)
+            setattr(combined, feature_type, self._RECORD_CONVERTERS[feature_type](self, record))
+        return combined
+    
+    def get_training_window(
+        self,
+        start: Union[str, datetime],
+        end: Union[str, datetime],
+        symbols: Optional[List[str]] = None,
+        feature_type: str = 'technical',
+    ) -> FeatureWindow:
+        """
+        Stored feature rows between start and end (inclusive).
+        
+        window.values is a NumPy array (a zero-copy memory-mapped view when
+        the range lies in one shard and no symbol filter is given).
+        """
+        if self.backend is None:
+            raise RuntimeError("Training windows require a persistent backend")
+        return self.backend.window(feature_type, start, end, symbols)
+    
+    def flush(self) -> int:
+        """Write buffered history to the backend."""
+        if self.backend is None:
+            return 0
+        return self.backend.flush()
+    
+    def _load_latest(self, symbol: str) -> Optional[Dict[str, FeatureRecord]]:
+        """Warm the hot tier from the backend after a cache miss."""
+        for feature_type in ('technical', 'fundamental', 'market'):
+            row = self.backend.as_of(feature_type, symbol)
+            if row is not None:
+                self.cache.set(symbol, feature_type, self._row_to_record(feature_type, row))
+        return self.cache.get(symbol)
+    
+    def _row_to_record(self, feature_type: str, row: FeatureRow) -> FeatureRecord:
+        return FeatureRecord(
+            symbol=row.symbol,
+            timestamp=str(row.date),
+            feature_type=feature_type,
+            features=row.features,
+            version=self.backend.version,
+        )
+    
     def _add_to_history(self, symbol: str, record: FeatureRecord) -> None:
         """Add record to history, maintaining max size."""
+        if self.backend is not None:
+            self.backend.write(record.feature_type, symbol, record.timestamp, record.features)
+            if self.backend.pending_rows >= self.flush_rows:
+                self.backend.flush()
+            return
+        
         self._history[symbol].append(record)
         
         # Trim if needed
@@ -450,6 +559,12 @@ class FeatureStore:
                if k not in ('symbol', 'timestamp')}
         )
     
+    _RECORD_CONVERTERS = {
+        'technical': _record_to_technical,
+        'fundamental': _record_to_fundamental,
+        'market': _record_to_market,
+    }
+    
     def invalidate(self, symbol: str) -> None:
         """Invalidate all cached features for a symbol."""
         self.cache.invalidate(symbol)
@@ -473,6 +588,7 @@ class FeatureStore:
                 'symbols': len(self._history),
                 'total_records': sum(len(v) for v in self._history.values()),
             },
+            'backend': self.backend.stats() if self.backend is not None else None,
         }
     
     @staticmethod
@@ -482,7 +598,9 @@ class FeatureStore:
 
 
 # Global feature store instance
-feature_store = FeatureStore()
+feature_store = FeatureStore(
+    backend=ColumnarFeatureBackend(settings.ML_FEATURE_STORE_PATH) if settings.ML_FEATURE_STORE_PATH else None
+)
 
 
 def get_feature_store() -> FeatureStore:
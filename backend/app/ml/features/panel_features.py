@@ -0,0 +1,385 @@
+"""
+Panel Technical Features
+
+Vectorized counterpart of TechnicalFeaturesCalculator for a whole
+universe at once: takes aligned (date x symbol) OHLCV arrays and computes
+every technical feature for every symbol and every date with NumPy column
+operations (cumulative sums, sliding windows, linear filters) instead of
+calling calculate_all per symbol per date.
+
+The value at row t equals calculate_all on the first t + 1 bars of that
+symbol (to floating point tolerance), including its warm-up thresholds
+and simplifications. Missing values are NaN; booleans are 1.0 / 0.0.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+from app.ml.features.technical_features import (
+    TechnicalFeatures,
+    TechnicalFeaturesCalculator,
+)
+
+
+FEATURE_NAMES = TechnicalFeaturesCalculator.get_feature_names()
+BOOLEAN_FEATURES = ('golden_cross', 'death_cross')
+
+
+@dataclass
+class FeaturePanel:
+    """Technical features for all dates and symbols."""
+    dates: List
+    symbols: List[str]
+    feature_names: List[str]
+    values: np.ndarray  # (dates, symbols, features)
+
+    def feature(self, name: str) -> np.ndarray:
+        """(dates x symbols) matrix of one feature."""
+        return self.values[:, :, self.feature_names.index(name)]
+
+    def to_frame(self, dropna: bool = False) -> pd.DataFrame:
+        """
+        Long feature matrix: one row per (date, symbol), one column per feature.
+
+        Args:
+            dropna: Drop rows where any computed feature is missing (warm-up rows)
+        """
+        index = pd.MultiIndex.from_product([self.dates, self.symbols], names=['date', 'symbol'])
+        frame = pd.DataFrame(
+            self.values.reshape(-1, len(self.feature_names)),
+            index=index,
+            columns=self.feature_names
+        )
+        if dropna:
+            frame = frame.dropna(how='all', axis=1).dropna()
+        return frame
+
+    def latest(self, timestamp: Optional[str] = None) -> Dict[str, TechnicalFeatures]:
+        """TechnicalFeatures for the last date of every symbol."""
+        timestamp = timestamp or str(self.dates[-1])
+        result = {}
+        for j, symbol in enumerate(self.symbols):
+            features = TechnicalFeatures(symbol=symbol, timestamp=timestamp)
+            for name, value in zip(self.feature_names, self.values[-1, j]):
+                if np.isnan(value):
+                    continue
+                setattr(features, name, bool(value) if name in BOOLEAN_FEATURES else float(value))
+            result[symbol] = features
+        return result
+
+
+# ==================== Column Helpers ====================
+
+def _shift(x: np.ndarray, k: int) -> np.ndarray:
+    """x shifted down by k rows (NaN-filled)."""
+    out = np.full_like(x, np.nan)
+    if k < len(x):
+        out[k:] = x[:len(x) - k]
+    return out
+
+
+def _windows(x: np.ndarray, window: int) -> np.ndarray:
+    """Trailing windows: (rows - window + 1, symbols, window) view."""
+    return sliding_window_view(x, window, axis=0)
+
+
+def _rolling(x: np.ndarray, window: int, reducer) -> np.ndarray:
+    """reducer over each trailing window, aligned to the window's last row."""
+    out = np.full_like(x, np.nan)
+    if len(x) >= window:
+        out[window - 1:] = reducer(_windows(x, window), axis=-1)
+    return out
+
+
+def _rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean via cumulative sums."""
+    out = np.full_like(x, np.nan)
+    if len(x) >= window:
+        csum = np.cumsum(np.vstack([np.zeros((1, x.shape[1])), x]), axis=0)
+        out[window - 1:] = (csum[window:] - csum[:-window]) / window
+    return out
+
+
+def _windowed_ema(x: np.ndarray, period: int) -> np.ndarray:
+    """
+    EMA over the last `period` values, seeded with the window's first value.
+
+    Same as TechnicalFeaturesCalculator._calculate_ema, i.e. a FIR filter
+    with weights (1 - a)^(p-1) for the oldest value and a (1 - a)^k for
+    the k-th most recent.
+    """
+    alpha = 2 / (period + 1)
+    weights = alpha * (1 - alpha) ** np.arange(period - 1, -1, -1)
+    weights[0] = (1 - alpha) ** (period - 1)
+    out = np.full_like(x, np.nan)
+    if len(x) >= period:
+        out[period - 1:] = _windows(x, period) @ weights
+    return out
+
+
+def _seeded_ema(x: np.ndarray, period: int) -> np.ndarray:
+    """Running EMA seeded with the first row (TechnicalFeaturesCalculator._ema_manual)."""
+    if len(x) == 0:
+        return x.copy()
+    alpha = 2 / (period + 1)
+    return lfilter([alpha], [1, -(1 - alpha)], x, axis=0, zi=((1 - alpha) * x[:1]))[0]
+
+
+def _truthy(x: np.ndarray) -> np.ndarray:
+    """Non-missing and non-zero (Python truthiness of Optional[float])."""
+    return ~np.isnan(x) & (x != 0)
+
+
+# ==================== Panel Computation ====================
+
+def compute_panel_features(
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    volume: np.ndarray,
+    dates: Optional[Sequence] = None,
+    symbols: Optional[Sequence[str]] = None
+) -> FeaturePanel:
+    """
+    Compute every technical feature for all dates and symbols.
+
+    Symbols whose history starts later (leading NaN closes, e.g. recent
+    listings) are computed from their own first bar, as calculate_all on
+    that symbol's history would be. Gaps inside a history must be filled
+    upstream (see compute_panel_from_frames).
+
+    Args:
+        close, high, low, volume: (dates x symbols) arrays of daily bars
+        dates: Row labels (default: 0..T-1)
+        symbols: Column labels (default: 0..N-1 as strings)
+
+    Returns:
+        FeaturePanel with values of shape (dates, symbols, features)
+    """
+    close = np.asarray(close, dtype=float)
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    volume = np.asarray(volume, dtype=float)
+    if close.ndim == 1:
+        close, high, low, volume = (a[:, None] for a in (close, high, low, volume))
+    if not close.shape == high.shape == low.shape == volume.shape:
+        raise ValueError("close, high, low and volume must have the same (dates x symbols) shape")
+
+    T, N = close.shape
+    dates = list(dates) if dates is not None else list(range(T))
+    symbols = [str(s) for s in symbols] if symbols is not None else [str(j) for j in range(N)]
+    if len(dates) != T or len(symbols) != N:
+        raise ValueError("dates/symbols do not match the array shape")
+
+    # Shift late-starting columns up so every history starts at row 0; all
+    # features are causal, so shifting the results back down is exact
+    start = np.where(np.isnan(close).all(axis=0), T, np.argmax(~np.isnan(close), axis=0))
+    if start.any():
+        source = np.arange(T)[:, None] + start
+        close, high, low, volume = (_take_rows(a, source) for a in (close, high, low, volume))
+
+    values = _compute_features(close, high, low, volume)
+
+    if start.any():
+        values = _take_rows(values, np.arange(T)[:, None] - start)
+
+    return FeaturePanel(dates=dates, symbols=symbols, feature_names=list(FEATURE_NAMES), values=values)
+
+
+def compute_panel_from_frames(frames: Dict[str, pd.DataFrame]) -> FeaturePanel:
+    """
+    Compute panel features from date x symbol DataFrames.
+
+    Accepts the output of load_price_matrix(..., fields=("close", "high",
+    "low", "volume")). Missing bars inside a symbol's history are filled
+    with the previous bar's prices and zero volume.
+    """
+    close = frames['close']
+    prices = {
+        field: frames[field].reindex(index=close.index, columns=close.columns)
+        for field in ('close', 'high', 'low')
+    }
+    started = close.notna().cummax()
+    for field, frame in prices.items():
+        prices[field] = frame.ffill().where(started)
+    volume = frames['volume'].reindex(index=close.index, columns=close.columns).fillna(0.0).where(started)
+
+    return compute_panel_features(
+        prices['close'].to_numpy(), prices['high'].to_numpy(), prices['low'].to_numpy(), volume.to_numpy(),
+        dates=list(close.index), symbols=list(close.columns)
+    )
+
+
+def _take_rows(x: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Per-column row gather; rows outside [0, T) become NaN."""
+    T = len(x)
+    inside = (rows >= 0) & (rows < T)
+    index = np.clip(rows, 0, T - 1)
+    if x.ndim == 3:
+        index = index[:, :, None]
+    out = np.take_along_axis(x, index, axis=0)
+    out[~inside] = np.nan
+    return out
+
+
+def _compute_features(
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    volume: np.ndarray
+) -> np.ndarray:
+    """(dates, symbols, features) for histories that all start at row 0."""
+    T, N = close.shape
+
+    # Number of bars available at each row
+    n = np.arange(1, T + 1)[:, None]
+    f: Dict[str, np.ndarray] = {}
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        prev_close = _shift(close, 1)
+        delta = close - prev_close
+        typical_price = (close + high + low) / 3
+
+        # --- Momentum ---
+        gains = np.where(delta > 0, delta, 0.0)[1:]
+        losses = np.where(delta < 0, -delta, 0.0)[1:]
+        for period in (14, 7):
+            avg_gain = _seeded_ema(gains, period)
+            avg_loss = _seeded_ema(losses, period)
+            rsi = np.full_like(close, np.nan)
+            rsi[1:] = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+            rsi[:period] = np.nan
+            f[f'rsi_{period}'] = rsi
+
+        lowest_low = _rolling(low, 14, np.min)
+        highest_high = _rolling(high, 14, np.max)
+        flat = highest_high == lowest_low
+        f['stochastic_k'] = np.where(flat, 50.0, (close - lowest_low) / (highest_high - lowest_low) * 100)
+        f['stochastic_d'] = f['stochastic_k']
+        f['williams_r'] = np.where(flat, -50.0, (highest_high - close) / (highest_high - lowest_low) * -100)
+        for name in ('stochastic_k', 'stochastic_d', 'williams_r'):
+            f[name][np.isnan(lowest_low)] = np.nan
+
+        f['roc_10'] = (close / _shift(close, 10) - 1) * 100
+        f['roc_20'] = (close / _shift(close, 20) - 1) * 100
+        f['momentum_10'] = close - _shift(close, 10)
+
+        # --- Trend ---
+        ema = {period: _windowed_ema(close, period) for period in (12, 20, 26, 50)}
+        macd_line = ema[12] - ema[26]
+        signal_line = macd_line * 0.2 + macd_line * 0.8
+        f['macd_line'] = macd_line
+        f['macd_signal'] = signal_line
+        f['macd_histogram'] = macd_line - signal_line
+
+        true_range = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+        true_range[0] = np.nan
+        high_diff = high - _shift(high, 1)
+        low_diff = _shift(low, 1) - low
+        plus_dm = np.where((high_diff > low_diff) & (high_diff > 0), high_diff, 0.0)
+        minus_dm = np.where((low_diff > high_diff) & (low_diff > 0), low_diff, 0.0)
+
+        atr_14 = _rolling_mean(true_range[1:], 14)
+        atr_14 = np.vstack([np.full((1, N), np.nan), atr_14])
+        smooth_plus = np.vstack([np.full((1, N), np.nan), _rolling_mean(plus_dm[1:], 14)])
+        smooth_minus = np.vstack([np.full((1, N), np.nan), _rolling_mean(minus_dm[1:], 14)])
+        valid_atr = ~np.isnan(atr_14) & (atr_14 != 0)
+        plus_di = np.where(valid_atr, smooth_plus / atr_14 * 100, np.nan)
+        minus_di = np.where(valid_atr, smooth_minus / atr_14 * 100, np.nan)
+        di_sum = plus_di + minus_di
+        f['adx_14'] = np.where(di_sum == 0, 0.0, np.abs(plus_di - minus_di) / di_sum * 100)
+        f['adx_14'][~valid_atr] = np.nan
+        f['plus_di'] = plus_di
+        f['minus_di'] = minus_di
+
+        aroon_up = np.full_like(close, np.nan)
+        aroon_down = np.full_like(close, np.nan)
+        if T >= 25:
+            # argmax/argmin return the first occurrence, like the batch calculator
+            aroon_up[24:] = (np.argmax(_windows(high, 25), axis=-1) + 1) / 25 * 100
+            aroon_down[24:] = (np.argmin(_windows(low, 25), axis=-1) + 1) / 25 * 100
+        f['aroon_up'] = aroon_up
+        f['aroon_down'] = aroon_down
+        f['aroon_oscillator'] = np.where(
+            _truthy(aroon_up) & _truthy(aroon_down), aroon_up - aroon_down, np.nan
+        )
+
+        cci = np.full_like(close, np.nan)
+        if T >= 20:
+            tp_windows = _windows(typical_price, 20)
+            sma_tp = tp_windows.mean(axis=-1)
+            mean_deviation = np.abs(tp_windows - sma_tp[..., None]).mean(axis=-1)
+            cci[19:] = np.where(
+                mean_deviation == 0, 0.0,
+                (typical_price[19:] - sma_tp) / (0.015 * mean_deviation)
+            )
+        f['cci_20'] = cci
+
+        # --- Moving averages ---
+        for period in (10, 20, 50, 200):
+            f[f'sma_{period}'] = _rolling_mean(close, period)
+        for period in (12, 26, 50):
+            f[f'ema_{period}'] = ema[period]
+
+        # --- Volatility ---
+        bb_middle = f['sma_20']
+        bb_std = _rolling(close, 20, np.std)
+        bb_upper = bb_middle + 2.0 * bb_std
+        bb_lower = bb_middle - 2.0 * bb_std
+        f['bb_upper'], f['bb_middle'], f['bb_lower'] = bb_upper, bb_middle, bb_lower
+        has_bands = _truthy(bb_upper) & _truthy(bb_lower) & _truthy(bb_middle)
+        f['bb_width'] = np.where(has_bands, (bb_upper - bb_lower) / bb_middle * 100, np.nan)
+        f['bb_percent_b'] = np.where(
+            has_bands & (bb_upper != bb_lower),
+            (close - bb_lower) / (bb_upper - bb_lower) * 100,
+            np.nan
+        )
+
+        f['atr_14'] = atr_14
+        f['atr_percent'] = np.where(_truthy(atr_14) & (close > 0), atr_14 / close * 100, np.nan)
+
+        atr_20 = np.vstack([np.full((1, N), np.nan), _rolling_mean(true_range[1:], 20)])
+        f['keltner_upper'] = ema[20] + 2.0 * atr_20
+        f['keltner_lower'] = ema[20] - 2.0 * atr_20
+
+        log_returns = np.log(close / prev_close)
+        f['volatility_20'] = _rolling(log_returns, 20, np.std) * np.sqrt(252) * 100
+
+        # --- Volume ---
+        obv = np.cumsum(np.nan_to_num(np.sign(delta)) * volume, axis=0)
+        obv[0] = np.nan
+        f['obv'] = obv
+        f['obv_sma_20'] = np.full_like(close, np.nan)
+
+        raw_flow = typical_price * volume
+        tp_change = typical_price - _shift(typical_price, 1)
+        positive_flow = np.where(tp_change > 0, raw_flow, 0.0)
+        negative_flow = np.where(tp_change < 0, raw_flow, 0.0)
+        positive_mf = np.vstack([np.full((1, N), np.nan), _rolling(positive_flow[1:], 14, np.sum)])
+        negative_mf = np.vstack([np.full((1, N), np.nan), _rolling(negative_flow[1:], 14, np.sum)])
+        f['mfi_14'] = np.where(negative_mf == 0, 100.0, 100 - 100 / (1 + positive_mf / negative_mf))
+        f['mfi_14'][np.isnan(negative_mf)] = np.nan
+
+        f['vwap'] = np.cumsum(typical_price * volume, axis=0) / np.cumsum(volume, axis=0)
+        f['volume_sma_20'] = _rolling_mean(volume, 20)
+        f['volume_ratio'] = np.where(f['volume_sma_20'] > 0, volume / f['volume_sma_20'], np.nan)
+
+        # --- Price position relative to MAs ---
+        for period in (20, 50, 200):
+            sma = f[f'sma_{period}']
+            f[f'price_vs_sma_{period}'] = np.where(_truthy(sma), (close / sma - 1) * 100, np.nan)
+
+        # --- Cross signals ---
+        sma_50, sma_200 = f['sma_50'], f['sma_200']
+        prev_50, prev_200 = _shift(sma_50, 1), _shift(sma_200, 1)
+        has_cross = (
+            _truthy(sma_50) & _truthy(sma_200) & (n > 200) & _truthy(prev_50) & _truthy(prev_200)
+        )
+        f['golden_cross'] = np.where(has_cross, (prev_50 <= prev_200) & (sma_50 > sma_200), np.nan)
+        f['death_cross'] = np.where(has_cross, (prev_50 >= prev_200) & (sma_50 < sma_200), np.nan)
+
+    return np.stack([f[name] for name in FEATURE_NAMES], axis=-1)
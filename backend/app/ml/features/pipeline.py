@@ -7,11 +7,13 @@ Orchestrates feature calculation and storage:
 - Historical backfill
 - Quality validation
 """
-from typing import Optional, List, Dict, Any, Callable
+from typing import Optional, List, Dict, Any, Callable, Union
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 import asyncio
+import numpy as np
+import pandas as pd
 from loguru import logger
 
 from app.ml.features.technical_features import (
@@ -19,6 +21,12 @@ from app.ml.features.technical_features import (
     TechnicalFeatures,
     calculate_technical_features,
 )
+from app.ml.features.streaming_indicators import StreamingIndicatorEngine
+from app.ml.features.panel_features import (
+    FeaturePanel,
+    compute_panel_features,
+    compute_panel_from_frames,
+)
 from app.ml.features.fundamental_features import (
     FundamentalFeaturesCalculator,
     FundamentalFeatures,
@@ -143,6 +151,9 @@ class FeaturePipeline:
         
         # Batch process
         result = await pipeline.process_batch(["AAPL", "MSFT", "GOOGL"], ...)
+        
+        # Whole-universe feature matrix (training sets)
+        matrix = pipeline.process_panel(price_frames).to_frame()
     """
     
     def __init__(
@@ -173,6 +184,8 @@ class FeaturePipeline:
         sector_returns: Optional[List[float]] = None,
         fundamental_data: Optional[Dict[str, Any]] = None,
         market_data: Optional[Dict[str, Any]] = None,
+        technical: Optional[TechnicalFeatures] = None,
+        timestamp: Optional[str] = None,
     ) -> tuple[CombinedFeatures, FeatureQuality]:
         """
         Process a single symbol and calculate all features.
@@ -187,19 +200,24 @@ class FeaturePipeline:
             sector_returns: Sector ETF daily returns
             fundamental_data: Financial statement data
             market_data: Market regime data
+            technical: Precomputed technical features (e.g. from a
+                StreamingIndicatorEngine); skips the full recalculation
+            timestamp: As-of timestamp of the features (default: now)
         
         Returns:
             Tuple of (CombinedFeatures, FeatureQuality)
         """
-        timestamp = datetime.utcnow().isoformat()
-        technical = None
+        timestamp = timestamp or datetime.utcnow().isoformat()
         fundamental = None
         market = None
         quality_errors = []
         
         # Calculate technical features
         try:
-            if len(prices) >= self.config.min_data_points:
+            if len(prices) < self.config.min_data_points:
+                technical = None
+                quality_errors.append(f"Insufficient price data: {len(prices)} points")
+            elif technical is None:
                 technical = calculate_technical_features(
                     symbol=symbol,
                     timestamp=timestamp,
@@ -208,8 +226,6 @@ class FeaturePipeline:
                     lows=lows,
                     volumes=volumes,
                 )
-            else:
-                quality_errors.append(f"Insufficient price data: {len(prices)} points")
         except Exception as e:
             logger.error(f"Technical feature error for {symbol}: {e}")
             quality_errors.append(f"Technical calculation error: {str(e)}")
@@ -307,6 +323,9 @@ class FeaturePipeline:
         errors = []
         quality_reports = []
         
+        # Technical features for aligned histories in one vectorized pass
+        panel_technical = self._panel_technical(symbols, price_data)
+        
         for symbol in symbols:
             try:
                 # Get price data for symbol
@@ -340,6 +359,7 @@ class FeaturePipeline:
                     sector_returns=sym_sector_returns,
                     fundamental_data=sym_fundamental,
                     market_data=market_data,
+                    technical=panel_technical.get(symbol),
                 )
                 
                 processed += 1
@@ -364,6 +384,7 @@ class FeaturePipeline:
                     except:
                         pass
         
+        self.store.flush()
         duration = (datetime.utcnow() - start_time).total_seconds()
         
         return PipelineResult(
@@ -376,6 +397,68 @@ class FeaturePipeline:
             quality_reports=quality_reports,
         )
     
+    def process_panel(
+        self,
+        price_data: Union[Dict[str, pd.DataFrame], Dict[str, Dict[str, List[float]]]],
+        symbols: Optional[List[str]] = None,
+        dates: Optional[List[Any]] = None,
+    ) -> FeaturePanel:
+        """
+        Compute technical features for every symbol and date at once.
+        
+        Intended for training-set generation over the whole universe:
+        features are computed with column operations over a
+        (date x symbol) tensor instead of per-symbol calculate_all calls.
+        
+        Args:
+            price_data: Either date x symbol DataFrames keyed by field
+                ('close', 'high', 'low', 'volume'), as returned by
+                load_price_matrix, or the process_batch format
+                {'AAPL': {'prices': [...], 'highs': [...], ...}} with
+                equal-length, date-aligned lists
+            symbols: Symbols to include (process_batch format only)
+            dates: Row labels (process_batch format only)
+        
+        Returns:
+            FeaturePanel (use .to_frame() for a (date, symbol) x feature matrix)
+        """
+        if 'close' in price_data and isinstance(price_data['close'], pd.DataFrame):
+            return compute_panel_from_frames(price_data)
+        
+        symbols = symbols or list(price_data.keys())
+        columns = {
+            key: np.column_stack([price_data[s][key] for s in symbols]).astype(float)
+            for key in ('prices', 'highs', 'lows', 'volumes')
+        }
+        return compute_panel_features(
+            columns['prices'], columns['highs'], columns['lows'], columns['volumes'],
+            dates=dates, symbols=symbols
+        )
+    
+    def _panel_technical(
+        self,
+        symbols: List[str],
+        price_data: Dict[str, Dict[str, List[float]]],
+    ) -> Dict[str, TechnicalFeatures]:
+        """Latest technical features via panel mode when histories are aligned."""
+        aligned = [
+            s for s in symbols
+            if price_data.get(s) and all(
+                len(price_data[s].get(key, [])) == len(price_data[s].get('prices', []))
+                for key in ('highs', 'lows', 'volumes')
+            )
+        ]
+        lengths = {len(price_data[s]['prices']) for s in aligned}
+        if len(aligned) < 2 or len(lengths) != 1 or lengths.pop() < self.config.min_data_points:
+            return {}
+        
+        try:
+            panel = self.process_panel(price_data, symbols=aligned)
+        except Exception as e:
+            logger.warning(f"Panel feature computation failed, falling back to per-symbol: {e}")
+            return {}
+        return panel.latest(timestamp=datetime.utcnow().isoformat())
+    
     async def backfill_historical(
         self,
         symbol: str,
@@ -398,6 +481,10 @@ class FeaturePipeline:
         # Sort dates
         dates = sorted(historical_prices.keys())
         
+        # Technical indicators are updated bar by bar instead of being
+        # recomputed over the growing history for every date
+        indicators = StreamingIndicatorEngine()
+        
         # Need rolling window of data
         all_prices = []
         all_highs = []
@@ -410,6 +497,9 @@ class FeaturePipeline:
             all_highs.append(day_data.get('high', 0))
             all_lows.append(day_data.get('low', 0))
             all_volumes.append(day_data.get('volume', 0))
+            technical = indicators.update(
+                symbol, str(date), all_prices[-1], all_highs[-1], all_lows[-1], all_volumes[-1]
+            )
             
             # Only calculate once we have enough data
             if len(all_prices) >= self.config.min_data_points:
@@ -425,11 +515,14 @@ class FeaturePipeline:
                         lows=all_lows.copy(),
                         volumes=all_volumes.copy(),
                         spy_returns=spy_ret,
+                        technical=technical,
+                        timestamp=str(date),
                     )
                     results.append(combined)
                 except Exception as e:
                     logger.warning(f"Backfill error for {symbol} on {date}: {e}")
         
+        self.store.flush()
         logger.info(f"Backfilled {len(results)} feature sets for {symbol}")
         return results
     
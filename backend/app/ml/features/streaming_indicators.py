@@ -0,0 +1,542 @@
+"""
+Streaming Technical Indicators
+
+Incremental counterpart of TechnicalFeaturesCalculator: each symbol keeps
+a small fixed-size state that is updated from one new bar instead of
+recomputing every indicator over the full price history.
+
+- EMA accumulators for RSI and the moving averages
+- Running sums for the SMAs and volume SMA
+- Bounded ring buffers (deque with maxlen) for the short windowed
+  indicators (ATR, ADX, MFI, Aroon, CCI, Bollinger, <= 25 bars each)
+- Cumulative accumulators for OBV and VWAP
+
+Outputs match TechnicalFeaturesCalculator.calculate_all on the same
+history (to floating point tolerance), so the two can be mixed. State is
+JSON-serializable and can be persisted to Redis so that any worker can
+resume a symbol where another one stopped.
+"""
+import json
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from app.ml.features.technical_features import TechnicalFeatures
+
+
+RSI_PERIODS = (7, 14)
+SMA_PERIODS = (10, 20, 50, 200)
+EMA_PERIODS = (12, 20, 26, 50)
+
+# Ring buffer sizes (longest lookback of the indicators that use them)
+CLOSE_WINDOW = max(SMA_PERIODS)
+RANGE_WINDOW = 25   # Aroon
+TP_WINDOW = 20      # CCI
+TR_WINDOW = 20      # ATR 14 / Keltner ATR 20
+DM_WINDOW = 14      # ADX
+FLOW_WINDOW = 14    # MFI
+RETURN_WINDOW = 20  # Volatility
+VOLUME_WINDOW = 20  # Volume SMA
+
+_BUFFERS = {
+    'closes': CLOSE_WINDOW,
+    'highs': RANGE_WINDOW,
+    'lows': RANGE_WINDOW,
+    'typical_prices': TP_WINDOW,
+    'true_ranges': TR_WINDOW,
+    'plus_dm': DM_WINDOW,
+    'minus_dm': DM_WINDOW,
+    'money_flows': FLOW_WINDOW,
+    'log_returns': RETURN_WINDOW,
+    'volumes': VOLUME_WINDOW,
+}
+
+
+def _tail(buffer: deque, n: int) -> List[float]:
+    """Last n values of a ring buffer."""
+    return list(buffer)[-n:]
+
+
+def _roll(total: float, buffer: deque, value: float, window: int) -> float:
+    """Update a running sum over the last `window` values before `value` is appended."""
+    if len(buffer) >= window:
+        total -= buffer[-window]
+    return total + value
+
+
+@dataclass
+class IndicatorState:
+    """
+    Per-symbol incremental indicator state.
+
+    Memory is bounded by the ring buffer sizes, independent of how many
+    bars have been seen.
+    """
+    bars: int = 0
+    last_timestamp: Optional[str] = None
+    last_close: Optional[float] = None
+    last_high: Optional[float] = None
+    last_low: Optional[float] = None
+    last_typical_price: Optional[float] = None
+
+    # Ring buffers
+    closes: deque = field(default_factory=lambda: deque(maxlen=CLOSE_WINDOW))
+    highs: deque = field(default_factory=lambda: deque(maxlen=RANGE_WINDOW))
+    lows: deque = field(default_factory=lambda: deque(maxlen=RANGE_WINDOW))
+    typical_prices: deque = field(default_factory=lambda: deque(maxlen=TP_WINDOW))
+    true_ranges: deque = field(default_factory=lambda: deque(maxlen=TR_WINDOW))
+    plus_dm: deque = field(default_factory=lambda: deque(maxlen=DM_WINDOW))
+    minus_dm: deque = field(default_factory=lambda: deque(maxlen=DM_WINDOW))
+    money_flows: deque = field(default_factory=lambda: deque(maxlen=FLOW_WINDOW))
+    log_returns: deque = field(default_factory=lambda: deque(maxlen=RETURN_WINDOW))
+    volumes: deque = field(default_factory=lambda: deque(maxlen=VOLUME_WINDOW))
+
+    # Accumulators
+    rsi_averages: Dict[int, List[float]] = field(default_factory=dict)  # period -> [avg_gain, avg_loss]
+    sma_sums: Dict[int, float] = field(default_factory=lambda: dict.fromkeys(SMA_PERIODS, 0.0))
+    ema_sums: Dict[int, float] = field(default_factory=lambda: dict.fromkeys(EMA_PERIODS, 0.0))
+    volume_sum: float = 0.0
+    obv: float = 0.0
+    cum_tp_volume: float = 0.0
+    cum_volume: float = 0.0
+    prev_sma_50: Optional[float] = None
+    prev_sma_200: Optional[float] = None
+
+    # ==================== Update ====================
+
+    def push(self, close: float, high: float, low: float, volume: float):
+        """Fold one bar into the state (O(1) per indicator)."""
+        close, high, low, volume = float(close), float(high), float(low), float(volume)
+        typical_price = (close + high + low) / 3
+
+        # SMA 50/200 before this bar, for the cross signals
+        self.prev_sma_50 = self._sma(50)
+        self.prev_sma_200 = self._sma(200)
+
+        if self.last_close is not None:
+            prev_close = self.last_close
+
+            # RSI: EMA of gains/losses, seeded with the first delta
+            delta = close - prev_close
+            gain, loss = max(delta, 0.0), max(-delta, 0.0)
+            for period in RSI_PERIODS:
+                averages = self.rsi_averages.get(period)
+                if averages is None:
+                    self.rsi_averages[period] = [gain, loss]
+                else:
+                    alpha = 2 / (period + 1)
+                    averages[0] = gain * alpha + averages[0] * (1 - alpha)
+                    averages[1] = loss * alpha + averages[1] * (1 - alpha)
+
+            # True range and directional movement
+            self.true_ranges.append(max(high - low, abs(high - prev_close), abs(low - prev_close)))
+            high_diff = high - self.last_high
+            low_diff = self.last_low - low
+            self.plus_dm.append(high_diff if high_diff > low_diff and high_diff > 0 else 0.0)
+            self.minus_dm.append(low_diff if low_diff > high_diff and low_diff > 0 else 0.0)
+
+            # Money flow signed by typical price direction
+            raw_flow = typical_price * volume
+            if typical_price > self.last_typical_price:
+                self.money_flows.append(raw_flow)
+            elif typical_price < self.last_typical_price:
+                self.money_flows.append(-raw_flow)
+            else:
+                self.money_flows.append(0.0)
+
+            # OBV
+            if close > prev_close:
+                self.obv += volume
+            elif close < prev_close:
+                self.obv -= volume
+
+            self.log_returns.append(math.log(close / prev_close))
+
+        # Running SMA sums (subtract the value leaving each window)
+        for period in SMA_PERIODS:
+            self.sma_sums[period] = _roll(self.sma_sums[period], self.closes, close, period)
+        self.volume_sum = _roll(self.volume_sum, self.volumes, volume, VOLUME_WINDOW)
+
+        self.closes.append(close)
+        self.highs.append(high)
+        self.lows.append(low)
+        self.typical_prices.append(typical_price)
+        self.volumes.append(volume)
+
+        # Windowed EMAs: the batch calculator seeds each EMA with the first
+        # value of its lookback window, which equals
+        #   S + (1 - a)^(p-1) * window[0],  S = sum_{k<p-1} a (1 - a)^k x[t-k]
+        # S is updated recursively, dropping the term that leaves the window.
+        for period in EMA_PERIODS:
+            alpha = 2 / (period + 1)
+            total = alpha * close + (1 - alpha) * self.ema_sums[period]
+            if len(self.closes) >= period:
+                total -= alpha * (1 - alpha) ** (period - 1) * self.closes[-period]
+            self.ema_sums[period] = total
+
+        self.cum_tp_volume += typical_price * volume
+        self.cum_volume += volume
+
+        self.last_close = close
+        self.last_high = high
+        self.last_low = low
+        self.last_typical_price = typical_price
+        self.bars += 1
+
+    # ==================== Indicator Values ====================
+
+    def _sma(self, period: int) -> Optional[float]:
+        if len(self.closes) < period:
+            return None
+        return self.sma_sums[period] / period
+
+    def _ema(self, period: int) -> Optional[float]:
+        if len(self.closes) < period:
+            return None
+        alpha = 2 / (period + 1)
+        return self.ema_sums[period] + (1 - alpha) ** (period - 1) * self.closes[-period]
+
+    def _rsi(self, period: int) -> Optional[float]:
+        if self.bars < period + 1:
+            return None
+        avg_gain, avg_loss = self.rsi_averages[period]
+        if avg_loss == 0:
+            return 100.0
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+    def _atr(self, period: int) -> Optional[float]:
+        if self.bars < period + 1:
+            return None
+        return sum(_tail(self.true_ranges, period)) / period
+
+    def snapshot(self, symbol: str, timestamp: Optional[str] = None) -> TechnicalFeatures:
+        """
+        Indicator values after the last pushed bar.
+
+        Mirrors TechnicalFeaturesCalculator.calculate_all, including its
+        warm-up thresholds and simplifications.
+        """
+        features = TechnicalFeatures(symbol=symbol, timestamp=timestamp or self.last_timestamp or "")
+        if self.bars == 0:
+            return features
+
+        n = self.bars
+        close = self.last_close
+
+        # Momentum
+        features.rsi_14 = self._rsi(14)
+        features.rsi_7 = self._rsi(7)
+
+        if n >= 14:
+            lowest_low = min(_tail(self.lows, 14))
+            highest_high = max(_tail(self.highs, 14))
+            if highest_high == lowest_low:
+                features.stochastic_k = 50.0
+                features.williams_r = -50.0
+            else:
+                features.stochastic_k = (close - lowest_low) / (highest_high - lowest_low) * 100
+                features.williams_r = (highest_high - close) / (highest_high - lowest_low) * -100
+            features.stochastic_d = features.stochastic_k
+
+        for period, name in ((10, 'roc_10'), (20, 'roc_20')):
+            if n > period:
+                setattr(features, name, (close / self.closes[-period - 1] - 1) * 100)
+        if n > 10:
+            features.momentum_10 = close - self.closes[-11]
+
+        # Trend
+        ema_12, ema_26 = self._ema(12), self._ema(26)
+        if ema_12 is not None and ema_26 is not None:
+            macd_line = ema_12 - ema_26
+            signal_line = macd_line * 0.2 + macd_line * 0.8
+            features.macd_line = macd_line
+            features.macd_signal = signal_line
+            features.macd_histogram = macd_line - signal_line
+
+        atr_14 = self._atr(14)
+        if atr_14:
+            plus_di = sum(self.plus_dm) / DM_WINDOW / atr_14 * 100
+            minus_di = sum(self.minus_dm) / DM_WINDOW / atr_14 * 100
+            di_sum = plus_di + minus_di
+            features.adx_14 = 0.0 if di_sum == 0 else abs(plus_di - minus_di) / di_sum * 100
+            features.plus_di = plus_di
+            features.minus_di = minus_di
+
+        if n >= RANGE_WINDOW:
+            highs, lows = list(self.highs), list(self.lows)
+            days_since_high = RANGE_WINDOW - highs.index(max(highs)) - 1
+            days_since_low = RANGE_WINDOW - lows.index(min(lows)) - 1
+            features.aroon_up = (RANGE_WINDOW - days_since_high) / RANGE_WINDOW * 100
+            features.aroon_down = (RANGE_WINDOW - days_since_low) / RANGE_WINDOW * 100
+            if features.aroon_up and features.aroon_down:
+                features.aroon_oscillator = features.aroon_up - features.aroon_down
+
+        if n >= TP_WINDOW:
+            tp = np.fromiter(self.typical_prices, dtype=float)
+            sma_tp = np.mean(tp)
+            mean_deviation = np.mean(np.abs(tp - sma_tp))
+            features.cci_20 = 0.0 if mean_deviation == 0 else float((tp[-1] - sma_tp) / (0.015 * mean_deviation))
+
+        # Moving averages
+        for period in SMA_PERIODS:
+            setattr(features, f'sma_{period}', self._sma(period))
+        for period in (12, 26, 50):
+            setattr(features, f'ema_{period}', self._ema(period))
+
+        # Volatility
+        if n >= 20:
+            window = np.fromiter(_tail(self.closes, 20), dtype=float)
+            bb_middle = float(np.mean(window))
+            bb_std = float(np.std(window))
+            features.bb_upper = bb_middle + 2.0 * bb_std
+            features.bb_middle = bb_middle
+            features.bb_lower = bb_middle - 2.0 * bb_std
+            if features.bb_upper and features.bb_lower and bb_middle:
+                features.bb_width = (features.bb_upper - features.bb_lower) / bb_middle * 100
+                if features.bb_upper != features.bb_lower:
+                    features.bb_percent_b = (close - features.bb_lower) / (features.bb_upper - features.bb_lower) * 100
+
+        features.atr_14 = atr_14
+        if atr_14 and close > 0:
+            features.atr_percent = atr_14 / close * 100
+
+        ema_20, atr_20 = self._ema(20), self._atr(20)
+        if ema_20 is not None and atr_20 is not None:
+            features.keltner_upper = ema_20 + 2.0 * atr_20
+            features.keltner_lower = ema_20 - 2.0 * atr_20
+
+        if n >= RETURN_WINDOW + 1:
+            features.volatility_20 = float(np.std(np.fromiter(self.log_returns, dtype=float)) * np.sqrt(252) * 100)
+
+        # Volume
+        if n >= 2:
+            features.obv = self.obv
+        if n >= FLOW_WINDOW + 1:
+            positive_mf = sum(f for f in self.money_flows if f > 0)
+            negative_mf = -sum(f for f in self.money_flows if f < 0)
+            features.mfi_14 = 100.0 if negative_mf == 0 else 100 - (100 / (1 + positive_mf / negative_mf))
+        if self.cum_volume:
+            features.vwap = self.cum_tp_volume / self.cum_volume
+        if n >= VOLUME_WINDOW:
+            features.volume_sma_20 = self.volume_sum / VOLUME_WINDOW
+            if features.volume_sma_20 > 0:
+                features.volume_ratio = self.volumes[-1] / features.volume_sma_20
+
+        # Price position relative to MAs
+        for period in (20, 50, 200):
+            sma = getattr(features, f'sma_{period}')
+            if sma:
+                setattr(features, f'price_vs_sma_{period}', (close / sma - 1) * 100)
+
+        # Cross signals
+        if features.sma_50 and features.sma_200 and n > 200:
+            if self.prev_sma_50 and self.prev_sma_200:
+                features.golden_cross = (
+                    self.prev_sma_50 <= self.prev_sma_200 and
+                    features.sma_50 > features.sma_200
+                )
+                features.death_cross = (
+                    self.prev_sma_50 >= self.prev_sma_200 and
+                    features.sma_50 < features.sma_200
+                )
+
+        return features
+
+    # ==================== Serialization ====================
+
+    def to_dict(self) -> dict:
+        data = {
+            name: value for name, value in self.__dict__.items()
+            if name not in _BUFFERS
+        }
+        data.update({name: list(getattr(self, name)) for name in _BUFFERS})
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IndicatorState":
+        data = dict(data)
+        buffers = {
+            name: deque(data.pop(name, []), maxlen=size)
+            for name, size in _BUFFERS.items()
+        }
+        # JSON object keys are strings
+        for name in ('rsi_averages', 'sma_sums', 'ema_sums'):
+            if name in data:
+                data[name] = {int(k): v for k, v in data[name].items()}
+        return cls(**data, **buffers)
+
+
+class StreamingIndicatorEngine:
+    """
+    Incremental technical indicators for many symbols.
+
+    Usage:
+        engine = StreamingIndicatorEngine(redis=redis_client)
+        await engine.load(["AAPL", "MSFT"])          # resume persisted state
+        engine.warm_up("NVDA", closes, highs, lows, volumes)  # or seed from history
+        features = engine.update("AAPL", "2024-01-16", close, high, low, volume)
+        await engine.save()
+    """
+
+    KEY_PREFIX = "indicators:"
+
+    def __init__(self, redis: Optional[Any] = None, ttl_seconds: int = 7 * 24 * 3600):
+        """
+        Args:
+            redis: RedisClient used by save()/load() (optional)
+            ttl_seconds: TTL of persisted state
+        """
+        self.redis = redis
+        self.ttl_seconds = ttl_seconds
+        self._states: Dict[str, IndicatorState] = {}
+        self._dirty: set = set()
+        self._stats = {
+            'updates': 0,
+            'duplicates': 0,
+            'saved': 0,
+            'loaded': 0,
+        }
+
+    def _key(self, symbol: str) -> str:
+        return f"{self.KEY_PREFIX}{symbol.upper()}"
+
+    def get_state(self, symbol: str) -> Optional[IndicatorState]:
+        return self._states.get(symbol.upper())
+
+    def reset(self, symbol: str):
+        """Drop a symbol's state (e.g. after a split or corrected history)."""
+        self._states.pop(symbol.upper(), None)
+        self._dirty.discard(symbol.upper())
+
+    def update(
+        self,
+        symbol: str,
+        timestamp: str,
+        close: float,
+        high: float,
+        low: float,
+        volume: float
+    ) -> TechnicalFeatures:
+        """
+        Apply one new bar and return the updated indicators.
+
+        Bars with a timestamp not after the last applied one are ignored,
+        so replaying the latest bar after a restart is harmless.
+        """
+        symbol = symbol.upper()
+        state = self._states.get(symbol)
+        if state is None:
+            state = self._states[symbol] = IndicatorState()
+
+        if state.last_timestamp is not None and str(timestamp) <= state.last_timestamp:
+            self._stats['duplicates'] += 1
+            return state.snapshot(symbol)
+
+        state.push(close, high, low, volume)
+        state.last_timestamp = str(timestamp)
+        self._dirty.add(symbol)
+        self._stats['updates'] += 1
+        return state.snapshot(symbol, str(timestamp))
+
+    def warm_up(
+        self,
+        symbol: str,
+        prices: List[float],
+        highs: List[float],
+        lows: List[float],
+        volumes: List[float],
+        timestamps: Optional[List[str]] = None
+    ) -> Optional[TechnicalFeatures]:
+        """
+        Rebuild a symbol's state from its full history (one pass).
+
+        Returns:
+            Indicators after the last bar, or None for empty history
+        """
+        self.reset(symbol)
+        if len(prices) == 0:
+            return None
+
+        symbol = symbol.upper()
+        state = self._states[symbol] = IndicatorState()
+        for close, high, low, volume in zip(prices, highs, lows, volumes):
+            state.push(close, high, low, volume)
+        state.last_timestamp = str(timestamps[-1]) if timestamps is not None and len(timestamps) else None
+        self._dirty.add(symbol)
+        return state.snapshot(symbol)
+
+    # ==================== Persistence ====================
+
+    async def save(self, symbols: Optional[List[str]] = None) -> int:
+        """
+        Persist state to Redis (changed symbols by default).
+
+        Returns:
+            Number of symbols written
+        """
+        if self.redis is None:
+            return 0
+
+        targets = [s.upper() for s in symbols] if symbols is not None else sorted(self._dirty)
+        items = {
+            self._key(symbol): json.dumps(self._states[symbol].to_dict())
+            for symbol in targets if symbol in self._states
+        }
+        if not items:
+            return 0
+
+        try:
+            if not await self.redis.setex_many(items, self.ttl_seconds):
+                return 0
+        except Exception as e:
+            logger.warning(f"Failed to persist indicator state: {e}")
+            return 0
+
+        self._dirty.difference_update(targets)
+        self._stats['saved'] += len(items)
+        return len(items)
+
+    async def load(self, symbols: List[str]) -> int:
+        """
+        Restore state from Redis for symbols not held in memory.
+
+        Returns:
+            Number of symbols restored
+        """
+        if self.redis is None:
+            return 0
+
+        missing = [s.upper() for s in symbols if s.upper() not in self._states]
+        if not missing:
+            return 0
+
+        try:
+            values = await self.redis.mget([self._key(s) for s in missing])
+        except Exception as e:
+            logger.warning(f"Failed to load indicator state: {e}")
+            return 0
+
+        loaded = 0
+        for symbol, value in zip(missing, values):
+            if not value:
+                continue
+            try:
+                self._states[symbol] = IndicatorState.from_dict(json.loads(value))
+                loaded += 1
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Discarding invalid indicator state for {symbol}: {e}")
+
+        self._stats['loaded'] += loaded
+        return loaded
+
+    def get_stats(self) -> dict:
+        """Get engine statistics."""
+        return {
+            **self._stats,
+            'symbols': len(self._states),
+            'unsaved': len(self._dirty),
+        }
@@ -362,35 +362,17 @@ class TechnicalFeaturesCalculator:
         if len(prices) < period + 1:
             return None, None, None
         
-        # Calculate True Range and Directional Movement
-        tr_list = []
-        plus_dm_list = []
-        minus_dm_list = []
-        
-        for i in range(1, len(prices)):
-            high_diff = highs[i] - highs[i-1]
-            low_diff = lows[i-1] - lows[i]
-            
-            plus_dm = high_diff if high_diff > low_diff and high_diff > 0 else 0
-            minus_dm = low_diff if low_diff > high_diff and low_diff > 0 else 0
-            
-            tr = max(
-                highs[i] - lows[i],
-                abs(highs[i] - prices[i-1]),
-                abs(lows[i] - prices[i-1])
-            )
-            
-            tr_list.append(tr)
-            plus_dm_list.append(plus_dm)
-            minus_dm_list.append(minus_dm)
+        # Directional Movement over the last period bars
+        high_diff = np.diff(highs[-period - 1:])
+        low_diff = -np.diff(lows[-period - 1:])
         
-        if len(tr_list) < period:
-            return None, None, None
+        plus_dm = np.where((high_diff > low_diff) & (high_diff > 0), high_diff, 0.0)
+        minus_dm = np.where((low_diff > high_diff) & (low_diff > 0), low_diff, 0.0)
         
         # Smoothed averages
-        atr = np.mean(tr_list[-period:])
-        smooth_plus_dm = np.mean(plus_dm_list[-period:])
-        smooth_minus_dm = np.mean(minus_dm_list[-period:])
+        atr = float(np.mean(self._true_range(prices, highs, lows)[-period:]))
+        smooth_plus_dm = np.mean(plus_dm)
+        smooth_minus_dm = np.mean(minus_dm)
         
         if atr == 0:
             return None, None, None
@@ -514,19 +496,18 @@ class TechnicalFeaturesCalculator:
         if len(prices) < period + 1:
             return None
         
-        tr_list = []
-        for i in range(1, len(prices)):
-            tr = max(
-                highs[i] - lows[i],
-                abs(highs[i] - prices[i-1]),
-                abs(lows[i] - prices[i-1])
-            )
-            tr_list.append(tr)
-        
-        if len(tr_list) < period:
-            return None
-        
-        return float(np.mean(tr_list[-period:]))
+        return float(np.mean(self._true_range(prices, highs, lows)[-period:]))
+    
+    @staticmethod
+    def _true_range(prices: np.ndarray, highs: np.ndarray, lows: np.ndarray) -> np.ndarray:
+        """True Range for every bar after the first."""
+        n = len(prices)
+        prev_close = prices[:-1]
+        return np.maximum.reduce([
+            highs[1:n] - lows[1:n],
+            np.abs(highs[1:n] - prev_close),
+            np.abs(lows[1:n] - prev_close),
+        ])
     
     def _calculate_keltner_channels(
         self,
@@ -562,14 +543,8 @@ class TechnicalFeaturesCalculator:
         if len(prices) < 2 or len(volumes) < 2:
             return None
         
-        obv = 0.0
-        for i in range(1, len(prices)):
-            if prices[i] > prices[i-1]:
-                obv += volumes[i]
-            elif prices[i] < prices[i-1]:
-                obv -= volumes[i]
-        
-        return float(obv)
+        direction = np.sign(np.diff(prices))
+        return float(np.sum(direction * volumes[1:len(prices)]))
     
     def _calculate_mfi(
         self,
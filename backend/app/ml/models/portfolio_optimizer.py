@@ -250,48 +250,33 @@ class PortfolioOptimizer:
         Returns:
             List of portfolios on the efficient frontier
         """
+        from app.core.optimizer.frontier import EfficientFrontierSolver
+        
         constraints = constraints or PortfolioConstraints()
         
-        # Calculate return range
         expected_returns = np.mean(returns, axis=0) * self.trading_days
-        min_ret = np.min(expected_returns)
-        max_ret = np.max(expected_returns)
-        
-        # Get minimum volatility portfolio
-        min_vol_portfolio = self.optimize(
-            returns, symbols,
-            OptimizationObjective.MIN_VOLATILITY,
-            constraints
-        )
-        min_frontier_ret = min_vol_portfolio.expected_return
+        cov_matrix = np.cov(returns.T) * self.trading_days
+        lower = constraints.min_weight if constraints.long_only else -constraints.max_weight
         
-        # Generate target returns
-        target_returns = np.linspace(min_frontier_ret, max_ret * 0.95, n_portfolios)
+        # Minimum volatility up to 95% of the best single-asset return,
+        # traced parametrically instead of one optimization per point
+        try:
+            solver = EfficientFrontierSolver(
+                expected_returns, cov_matrix, lower=lower, upper=constraints.max_weight
+            )
+        except ValueError as e:
+            logger.warning(f"Efficient frontier skipped: {e}")
+            return []
+        trace = solver.trace(n_portfolios, max_target=np.max(expected_returns) * 0.95)
         
         frontier = []
-        for target_ret in target_returns:
-            constraints_copy = PortfolioConstraints(
-                min_weight=constraints.min_weight,
-                max_weight=constraints.max_weight,
-                long_only=constraints.long_only,
-                target_return=target_ret
-            )
-            
-            try:
-                portfolio = self.optimize(
-                    returns, symbols,
-                    OptimizationObjective.TARGET_RETURN,
-                    constraints_copy
-                )
-                
-                frontier.append({
-                    'return': portfolio.expected_return,
-                    'volatility': portfolio.volatility,
-                    'sharpe': portfolio.sharpe_ratio,
-                    'weights': portfolio.weights
-                })
-            except Exception:
-                continue
+        for weights, ret, vol in zip(trace.weights, trace.returns, trace.volatilities):
+            frontier.append({
+                'return': float(ret),
+                'volatility': float(vol),
+                'sharpe': float((ret - self.risk_free_rate) / vol) if vol > 0 else 0.0,
+                'weights': {sym: float(w) for sym, w in zip(symbols, weights) if abs(w) > 1e-6}
+            })
         
         return frontier
     
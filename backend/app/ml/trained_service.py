@@ -371,46 +371,91 @@ class TrainedModelService:
         
         return features.dropna()
     
-    async def predict(
+    def calculate_last_features(self, frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Calculate features for many symbols and keep each one's latest row.
+        
+        Features are still computed per symbol with calculate_features (the
+        ta indicators must match the training pipeline exactly); only the
+        latest rows are collected into one frame for batched scoring.
+        
+        Args:
+            frames: symbol -> OHLCV DataFrame
+            
+        Returns:
+            DataFrame indexed by symbol (symbols without enough data omitted)
+        """
+        rows = []
+        for symbol, df in frames.items():
+            if df is None or not len(df):
+                continue
+            try:
+                features = self.calculate_features(df)
+            except Exception as e:
+                logger.warning(f"Feature calculation failed for {symbol}: {e}")
+                continue
+            if len(features) < 1:
+                logger.warning(f"Not enough data to calculate features for {symbol}")
+                continue
+            rows.append(features.iloc[-1:].assign(symbol=symbol))
+        
+        if not rows:
+            return pd.DataFrame()
+        return pd.concat(rows).set_index('symbol')
+    
+    def _feature_cols(self, features_df: pd.DataFrame) -> List[str]:
+        """Model input columns present in features_df."""
+        # Get feature columns (exclude non-feature columns)
+        exclude_cols = ['Open', 'High', 'Low', 'Close', 'Volume', 'Adj Close', 
+                       'Date', 'Symbol', 'Target', 'Future_Return']
+        feature_cols = [c for c in features_df.columns if c not in exclude_cols]
+        
+        # If we have saved feature columns, use those
+        if self.feature_columns:
+            feature_cols = [c for c in self.feature_columns if c in features_df.columns]
+        
+        return feature_cols
+    
+    async def predict_batch(
         self,
-        df: pd.DataFrame,
-        symbol: str,
-        current_price: float
-    ) -> Optional[TrainedPrediction]:
+        frames: Dict[str, pd.DataFrame],
+        prices: Dict[str, float]
+    ) -> Dict[str, TrainedPrediction]:
+        """Make predictions for many symbols with one model call (see predict_batch_sync)."""
+        return self.predict_batch_sync(frames, prices)
+    
+    def predict_batch_sync(
+        self,
+        frames: Dict[str, pd.DataFrame],
+        prices: Dict[str, float]
+    ) -> Dict[str, TrainedPrediction]:
         """
-        Make prediction using trained model.
+        Make predictions for many symbols with one model call.
+        
+        Features are computed per symbol, the latest rows are stacked
+        into a single matrix, scaled once and scored with a single
+        predict_proba call.
         
         Args:
-            df: DataFrame with OHLCV data (at least 50 rows)
-            symbol: Stock symbol
-            current_price: Current price
+            frames: symbol -> OHLCV DataFrame (at least 50 rows each)
+            prices: symbol -> current price
             
         Returns:
-            TrainedPrediction or None
+            symbol -> TrainedPrediction (failed symbols omitted)
         """
         if self.rf_model is None:
             logger.debug("No trained model available")
-            return None
+            return {}
         
         try:
-            # Calculate features
-            features_df = self.calculate_features(df)
-            
-            if len(features_df) < 1:
-                logger.warning(f"Not enough data to calculate features for {symbol}")
-                return None
-            
-            # Get feature columns (exclude non-feature columns)
-            exclude_cols = ['Open', 'High', 'Low', 'Close', 'Volume', 'Adj Close', 
-                           'Date', 'Symbol', 'Target', 'Future_Return']
-            feature_cols = [c for c in features_df.columns if c not in exclude_cols]
-            
-            # If we have saved feature columns, use those
-            if self.feature_columns:
-                feature_cols = [c for c in self.feature_columns if c in features_df.columns]
+            features_df = self.calculate_last_features(
+                {symbol: df for symbol, df in frames.items() if symbol in prices}
+            )
+            if features_df.empty:
+                return {}
             
-            # Get last row for prediction
-            X = features_df[feature_cols].iloc[[-1]].fillna(0)
+            feature_cols = self._feature_cols(features_df)
+            X = features_df[feature_cols].fillna(0)
             
             # Apply scaler if available
             if self.feature_scaler is not None:
@@ -422,57 +467,90 @@ class TrainedModelService:
             else:
                 X_scaled = X.values
             
-            # Make prediction
-            pred = self.rf_model.predict(X_scaled)[0]
-            proba = self.rf_model.predict_proba(X_scaled)[0]
-            
-            prob_down = proba[0]
-            prob_up = proba[1] if len(proba) > 1 else 1 - proba[0]
-            
-            # Determine signal
-            if prob_up > 0.6:
-                signal = "BUY"
-            elif prob_down > 0.6:
-                signal = "SELL"
-            else:
-                signal = "HOLD"
+            # Make predictions
+            proba = np.asarray(self.rf_model.predict_proba(X_scaled))
             
-            confidence = max(prob_up, prob_down)
+            prob_down = proba[:, 0]
+            prob_up = proba[:, 1] if proba.shape[1] > 1 else 1 - proba[:, 0]
             
-            # Calculate price targets
-            expected_move = (prob_up - 0.5) * 0.1  # Scale probability to expected move
-            price_target = current_price * (1 + expected_move)
-            
-            if signal == "BUY":
-                stop_loss = current_price * 0.97
-                take_profit = current_price * 1.05
-            elif signal == "SELL":
-                stop_loss = current_price * 1.03
-                take_profit = current_price * 0.95
-            else:
-                stop_loss = None
-                take_profit = None
-            
-            return TrainedPrediction(
-                symbol=symbol,
-                signal=signal,
-                confidence=round(confidence, 3),
-                probability_up=round(prob_up, 3),
-                probability_down=round(prob_down, 3),
-                model_type="RandomForest",
-                price=round(current_price, 2),
-                price_target=round(price_target, 2) if price_target else None,
-                stop_loss=round(stop_loss, 2) if stop_loss else None,
-                take_profit=round(take_profit, 2) if take_profit else None,
-                features_used=len(feature_cols),
-                timestamp=datetime.utcnow()
-            )
+            return {
+                symbol: self._build_prediction(
+                    symbol, float(up), float(down), prices[symbol], len(feature_cols)
+                )
+                for symbol, up, down in zip(features_df.index, prob_up, prob_down)
+            }
             
         except Exception as e:
-            logger.error(f"Error making prediction for {symbol}: {e}")
-            import traceback
-            traceback.print_exc()
-            return None
+            logger.error(f"Error making batch prediction for {len(frames)} symbols: {e}")
+            return {}
+    
+    async def predict(
+        self,
+        df: pd.DataFrame,
+        symbol: str,
+        current_price: float
+    ) -> Optional[TrainedPrediction]:
+        """
+        Make prediction using trained model.
+        
+        Args:
+            df: DataFrame with OHLCV data (at least 50 rows)
+            symbol: Stock symbol
+            current_price: Current price
+            
+        Returns:
+            TrainedPrediction or None
+        """
+        predictions = await self.predict_batch({symbol: df}, {symbol: current_price})
+        return predictions.get(symbol)
+    
+    def _build_prediction(
+        self,
+        symbol: str,
+        prob_up: float,
+        prob_down: float,
+        current_price: float,
+        features_used: int
+    ) -> TrainedPrediction:
+        """Turn class probabilities into a TrainedPrediction."""
+        # Determine signal
+        if prob_up > 0.6:
+            signal = "BUY"
+        elif prob_down > 0.6:
+            signal = "SELL"
+        else:
+            signal = "HOLD"
+        
+        confidence = max(prob_up, prob_down)
+        
+        # Calculate price targets
+        expected_move = (prob_up - 0.5) * 0.1  # Scale probability to expected move
+        price_target = current_price * (1 + expected_move)
+        
+        if signal == "BUY":
+            stop_loss = current_price * 0.97
+            take_profit = current_price * 1.05
+        elif signal == "SELL":
+            stop_loss = current_price * 1.03
+            take_profit = current_price * 0.95
+        else:
+            stop_loss = None
+            take_profit = None
+        
+        return TrainedPrediction(
+            symbol=symbol,
+            signal=signal,
+            confidence=round(confidence, 3),
+            probability_up=round(prob_up, 3),
+            probability_down=round(prob_down, 3),
+            model_type="RandomForest",
+            price=round(current_price, 2),
+            price_target=round(price_target, 2) if price_target else None,
+            stop_loss=round(stop_loss, 2) if stop_loss else None,
+            take_profit=round(take_profit, 2) if take_profit else None,
+            features_used=features_used,
+            timestamp=datetime.utcnow()
+        )
     
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about loaded models."""
@@ -504,3 +582,16 @@ def get_trained_model_service() -> TrainedModelService:
         logger.info(f"Trained model loading results: {results}")
     
     return _trained_service
+
+
+def predict_batch_in_worker(
+    frames: Dict[str, pd.DataFrame],
+    prices: Dict[str, float]
+) -> Dict[str, TrainedPrediction]:
+    """
+    Batched prediction with the process-wide service.
+    
+    Entry point for the compute executor: each worker loads the models
+    once (at start-up) and reuses them for every batch.
+    """
+    return get_trained_model_service().predict_batch_sync(frames, prices)
@@ -7,6 +7,7 @@ Contains training infrastructure:
 - Hyperparameter optimization
 - Backtesting framework
 - Model evaluation
+- Parallel fold/trial execution
 """
 from .pipeline import (
     TrainingPipeline,
@@ -44,6 +45,13 @@ from .backtester import (
     Trade,
     run_backtest
 )
+from .executor import (
+    FoldExecutor,
+    ExecutorBackend,
+    SharedArray,
+    TaskTiming,
+    get_executor
+)
 from .evaluation import (
     ModelEvaluator,
     EvaluationResult,
@@ -88,6 +96,12 @@ __all__ = [
     'Position',
     'Trade',
     'run_backtest',
+    # Execution
+    'FoldExecutor',
+    'ExecutorBackend',
+    'SharedArray',
+    'TaskTiming',
+    'get_executor',
     # Evaluation
     'ModelEvaluator',
     'EvaluationResult',
@@ -4,9 +4,11 @@ Backtesting Framework
 Framework for testing ML models and trading strategies on historical data:
 - Walk-forward backtesting
 - Event-driven simulation
+- Vectorized multi-asset simulation (date x symbol arrays)
 - Performance metrics calculation
 - Transaction cost modeling
 """
+import copy
 import numpy as np
 import pandas as pd
 from typing import Optional, List, Dict, Any, Tuple, Callable
@@ -16,6 +18,8 @@ from enum import Enum
 from abc import ABC, abstractmethod
 from loguru import logger
 
+from .executor import FoldExecutor
+
 
 class OrderSide(str, Enum):
     """Order side."""
@@ -188,6 +192,46 @@ class BaseStrategy(ABC):
     def on_bar(self, timestamp: datetime, data: Dict[str, Any]):
         """Called on each new bar of data."""
         pass
+    
+    def generate_signal_matrix(
+        self,
+        data: pd.DataFrame,
+        symbols: List[str],
+        predictions: Optional[Dict[str, Any]] = None,
+        start: int = 0
+    ) -> np.ndarray:
+        """
+        Generate target positions for every bar at once (vectorized engine).
+        
+        The default replays generate_signals bar by bar on the growing
+        history, exactly as the event loop does; strategies whose signals
+        can be computed from whole columns should override it.
+        
+        Args:
+            data: Market data (sorted by date)
+            symbols: Symbols, in the column order of the result
+            predictions: symbol -> batched model output (one entry per bar)
+            start: First bar to generate signals for
+            
+        Returns:
+            Array (bars x symbols) of target positions, NaN = no order
+        """
+        signals = np.full((len(data), len(symbols)), np.nan)
+        col = {s: j for j, s in enumerate(symbols)}
+        
+        for i in range(start, len(data)):
+            bar_predictions = {}
+            for symbol, out in (predictions or {}).items():
+                pred = _prediction_at(out, i)
+                if pred is not None:
+                    bar_predictions[symbol] = pred
+            for symbol, signal in self.generate_signals(data.iloc[:i + 1], bar_predictions).items():
+                if symbol in col:
+                    signals[i, col[symbol]] = signal
+            row = data.iloc[i]
+            self.on_bar(data.index[i], dict(row))
+        
+        return signals
 
 
 class MLStrategy(BaseStrategy):
@@ -212,32 +256,81 @@ class MLStrategy(BaseStrategy):
         
         if predictions:
             for symbol, pred in predictions.items():
-                if hasattr(pred, 'confidence'):
-                    confidence = pred.confidence
-                elif hasattr(pred, 'probability_up'):
-                    confidence = abs(pred.probability_up - 0.5) * 2
-                else:
-                    confidence = 0.5
-                
-                # Generate signal based on prediction
-                if hasattr(pred, 'direction'):
-                    direction = pred.direction.value if hasattr(pred.direction, 'value') else pred.direction
-                    if 'up' in str(direction).lower() and confidence >= self.threshold:
-                        signals[symbol] = 1.0
-                    elif 'down' in str(direction).lower() and confidence >= self.threshold:
-                        signals[symbol] = -1.0
-                    else:
-                        signals[symbol] = 0.0
-                elif hasattr(pred, 'trend'):
-                    trend = pred.trend.value if hasattr(pred.trend, 'value') else pred.trend
-                    if 'up' in str(trend).lower() and confidence >= self.threshold:
-                        signals[symbol] = 1.0 if 'strong' in str(trend).lower() else 0.5
-                    elif 'down' in str(trend).lower() and confidence >= self.threshold:
-                        signals[symbol] = -1.0 if 'strong' in str(trend).lower() else -0.5
-                    else:
-                        signals[symbol] = 0.0
+                signal = self._signal_for(pred)
+                if signal is not None:
+                    signals[symbol] = signal
+        
+        return signals
+    
+    def generate_signal_matrix(
+        self,
+        data: pd.DataFrame,
+        symbols: List[str],
+        predictions: Optional[Dict[str, Any]] = None,
+        start: int = 0
+    ) -> np.ndarray:
+        # Signals depend on predictions only, so no history replay is needed
+        signals = np.full((len(data), len(symbols)), np.nan)
+        
+        for j, symbol in enumerate(symbols):
+            out = (predictions or {}).get(symbol)
+            if out is None:
+                continue
+            for i in range(start, len(data)):
+                signal = self._signal_for(_prediction_at(out, i))
+                if signal is not None:
+                    signals[i, j] = signal
         
         return signals
+    
+    def _signal_for(self, pred: Any) -> Optional[float]:
+        """Map one prediction to a target position (None = no signal)."""
+        if hasattr(pred, 'confidence'):
+            confidence = pred.confidence
+        elif hasattr(pred, 'probability_up'):
+            confidence = abs(pred.probability_up - 0.5) * 2
+        else:
+            confidence = 0.5
+        
+        # Generate signal based on prediction
+        if hasattr(pred, 'direction'):
+            direction = pred.direction.value if hasattr(pred.direction, 'value') else pred.direction
+            if 'up' in str(direction).lower() and confidence >= self.threshold:
+                return 1.0
+            elif 'down' in str(direction).lower() and confidence >= self.threshold:
+                return -1.0
+            return 0.0
+        elif hasattr(pred, 'trend'):
+            trend = pred.trend.value if hasattr(pred.trend, 'value') else pred.trend
+            if 'up' in str(trend).lower() and confidence >= self.threshold:
+                return 1.0 if 'strong' in str(trend).lower() else 0.5
+            elif 'down' in str(trend).lower() and confidence >= self.threshold:
+                return -1.0 if 'strong' in str(trend).lower() else -0.5
+            return 0.0
+        
+        return None
+
+
+def _prediction_at(out: Any, i: int) -> Any:
+    """
+    Per-bar view of a batched model output.
+    
+    Arrays are sliced to length 1 so the strategy sees the same object a
+    single-row model.predict call returns; lists are indexed, matching the
+    event loop's pred[0] unwrapping.
+    """
+    if isinstance(out, list):
+        return out[i]
+    return out[i:i + 1]
+
+
+def _batch_predict(model: Any, features: Any) -> Optional[Any]:
+    """Run model.predict once over all rows; None if the model fails."""
+    try:
+        return model.predict(features)
+    except Exception as e:
+        logger.debug(f"Batch prediction error: {e}")
+        return None
 
 
 class Backtester:
@@ -246,6 +339,7 @@ class Backtester:
     
     Features:
     - Event-driven simulation
+    - Vectorized simulation (run(..., vectorized=True))
     - Transaction cost modeling
     - Position sizing
     - Risk management
@@ -317,12 +411,10 @@ class Backtester:
                 return None
             self.cash -= cost
         else:  # SELL
-            # Check if we have the position
-            if order.symbol in self.positions:
-                pos = self.positions[order.symbol]
-                if order.quantity > pos.quantity and not self.config.allow_short:
-                    logger.warning(f"Cannot sell more than owned: {order.quantity} > {pos.quantity}")
-                    return None
+            held = self.positions[order.symbol].quantity if order.symbol in self.positions else 0.0
+            if order.quantity > held and not self.config.allow_short:
+                logger.warning(f"Cannot sell more than owned: {order.quantity} > {held}")
+                return None
         
         # Execute
         order.filled = True
@@ -350,57 +442,48 @@ class Backtester:
         return trade
     
     def _update_position(self, order: Order) -> float:
-        """Update position after order execution and return PnL."""
+        """
+        Update position after order execution and return PnL.
+        
+        Positions are signed (negative = short). An order against the open
+        side realizes PnL on the closed quantity; any excess opens a new
+        position on the other side at the fill price.
+        """
         pnl = 0.0
         symbol = order.symbol
         fill_price = order.fill_price or 0.0
+        delta = order.quantity if order.side == OrderSide.BUY else -order.quantity
         
-        if order.side == OrderSide.BUY:
-            if symbol in self.positions:
-                # Add to existing position
-                pos = self.positions[symbol]
-                total_quantity = pos.quantity + order.quantity
-                avg_price = (pos.entry_price * pos.quantity + fill_price * order.quantity) / total_quantity
-                pos.quantity = total_quantity
-                pos.entry_price = avg_price
-            else:
-                # New position
-                self.positions[symbol] = Position(
-                    symbol=symbol,
-                    quantity=order.quantity,
-                    entry_price=fill_price,
-                    entry_timestamp=self.current_timestamp or datetime.utcnow(),
-                    current_price=fill_price
-                )
-        else:  # SELL
-            if symbol in self.positions:
-                pos = self.positions[symbol]
-                # Calculate PnL
-                pnl = (fill_price - pos.entry_price) * min(order.quantity, pos.quantity)
-                pnl -= order.commission
-                
-                # Update or close position
-                if order.quantity >= pos.quantity:
-                    # Full close
-                    self.cash += pos.quantity * fill_price - order.commission
-                    del self.positions[symbol]
-                else:
-                    # Partial close
-                    pos.quantity -= order.quantity
-                    self.cash += order.quantity * fill_price - order.commission
-            else:
-                # Short position
-                if self.config.allow_short:
-                    self.positions[symbol] = Position(
-                        symbol=symbol,
-                        quantity=-order.quantity,
-                        entry_price=fill_price,
-                        entry_timestamp=self.current_timestamp or datetime.utcnow(),
-                        current_price=fill_price
-                    )
-                    self.cash += order.quantity * fill_price - order.commission
+        if order.side == OrderSide.SELL:
+            self.cash += order.quantity * fill_price - order.commission
+        
+        pos = self.positions.get(symbol)
+        if pos is None:
+            self.positions[symbol] = Position(
+                symbol=symbol,
+                quantity=delta,
+                entry_price=fill_price,
+                entry_timestamp=self.current_timestamp or datetime.utcnow(),
+                current_price=fill_price
+            )
+            return pnl
+        
+        q_old, q_new = pos.quantity, pos.quantity + delta
+        if np.sign(delta) != np.sign(q_old):
+            # Reducing (or flipping) an open position
+            closed = min(abs(delta), abs(q_old))
+            pnl = (fill_price - pos.entry_price) * closed * np.sign(q_old) - order.commission
+            if abs(delta) > abs(q_old):
+                pos.entry_price = fill_price
+                pos.entry_timestamp = self.current_timestamp or datetime.utcnow()
+            elif q_new == 0:
+                del self.positions[symbol]
+                return float(pnl)
+        else:
+            pos.entry_price = (pos.entry_price * abs(q_old) + fill_price * abs(delta)) / abs(q_new)
         
-        return pnl
+        pos.quantity = q_new
+        return float(pnl)
     
     def _update_positions(self, prices: Dict[str, float]):
         """Update position values with current prices."""
@@ -413,7 +496,9 @@ class Backtester:
         self,
         data: pd.DataFrame,
         strategy: BaseStrategy,
-        model: Optional[Any] = None
+        model: Optional[Any] = None,
+        vectorized: bool = False,
+        features: Optional[Any] = None
     ) -> BacktestMetrics:
         """
         Run backtest.
@@ -422,10 +507,15 @@ class Backtester:
             data: OHLCV data with datetime index
             strategy: Trading strategy
             model: Optional ML model for predictions
+            vectorized: Use the vectorized engine (see run_vectorized)
+            features: Model features for the vectorized engine
             
         Returns:
             BacktestMetrics with results
         """
+        if vectorized:
+            return self.run_vectorized(data, strategy, model, features)
+        
         self.reset()
         
         # Ensure data is sorted by date
@@ -468,6 +558,9 @@ class Backtester:
                 predictions
             )
             
+            # Size every order from the same pre-trade equity
+            bar_equity = self.equity
+            
             # Execute signals
             for symbol, signal in signals.items():
                 current_price = prices.get(symbol, 100)
@@ -475,8 +568,10 @@ class Backtester:
                 current_qty = current_pos.quantity if current_pos else 0
                 
                 # Calculate target position
-                target_value = self.equity * self.config.max_position_size * signal
+                target_value = bar_equity * self.config.max_position_size * signal
                 target_qty = target_value / current_price if current_price > 0 else 0
+                if not self.config.allow_short:
+                    target_qty = max(target_qty, 0)
                 
                 # Calculate trade quantity
                 trade_qty = target_qty - current_qty
@@ -491,7 +586,8 @@ class Backtester:
                     )
                     self._execute_order(order, current_price)
             
-            # Record equity
+            # Record equity (new positions marked at the close, not the fill)
+            self._update_positions(prices)
             self.equity_history.append((timestamp, self.equity))
             
             # Strategy callback
@@ -500,6 +596,217 @@ class Backtester:
         # Calculate final metrics
         return self._calculate_metrics(data)
     
+    # ==================== Vectorized Engine ====================
+    
+    def run_vectorized(
+        self,
+        data: pd.DataFrame,
+        strategy: BaseStrategy,
+        model: Optional[Any] = None,
+        features: Optional[Any] = None
+    ) -> BacktestMetrics:
+        """
+        Run backtest on date x symbol arrays.
+        
+        Model predictions are computed in one batched call, the strategy
+        turns them into a target-position matrix, and the simulation only
+        steps through time with array operations across symbols. Fills,
+        costs and metrics match run() for the same signals.
+        
+        Args:
+            data: Single-symbol OHLCV ('close' column) or a wide frame with
+                '<SYMBOL>_close' columns, datetime index
+            strategy: Trading strategy
+            model: Optional ML model for predictions
+            features: Model features; an array (bars x features) for a
+                single symbol or dict symbol -> array. Defaults to the data
+                rows, as in run().
+            
+        Returns:
+            BacktestMetrics with results
+        """
+        self.reset()
+        
+        data = data.sort_index()
+        symbols, prices = self._price_matrix(data)
+        
+        predictions = self._predict_all(model, symbols, data, features)
+        signals = strategy.generate_signal_matrix(data, symbols, predictions)
+        
+        self._simulate(data.index, symbols, prices, signals)
+        return self._calculate_metrics(data)
+    
+    def _price_matrix(self, data: pd.DataFrame) -> Tuple[List[str], np.ndarray]:
+        """Extract symbols and a (bars x symbols) close price array from data."""
+        if 'symbol' in data.columns:
+            symbols = data['symbol'].unique().tolist()
+        else:
+            symbols = [c[:-len('_close')] for c in data.columns if str(c).endswith('_close')] or ['default']
+        
+        if 'close' in data.columns:
+            symbols = symbols[:1]
+            prices = data[['close']].to_numpy(dtype=np.float64)
+        else:
+            columns = [
+                data[f'{s}_close'] if f'{s}_close' in data.columns else pd.Series(100.0, index=data.index)
+                for s in symbols
+            ]
+            prices = np.column_stack([c.to_numpy(dtype=np.float64) for c in columns])
+        
+        return symbols, prices
+    
+    def _predict_all(
+        self,
+        model: Optional[Any],
+        symbols: List[str],
+        data: pd.DataFrame,
+        features: Optional[Any]
+    ) -> Dict[str, Any]:
+        """Batched model predictions, symbol -> one output per bar."""
+        if model is None or not hasattr(model, 'predict'):
+            return {}
+        
+        if features is None:
+            features = data.values
+        if not isinstance(features, dict):
+            features = {symbols[0]: features}
+        
+        # One call for every symbol and bar
+        names = [s for s in symbols if s in features]
+        if not names:
+            return {}
+        stacked = np.concatenate([np.asarray(features[s]) for s in names])
+        out = _batch_predict(model, stacked)
+        if out is None:
+            return {}
+        
+        predictions = {}
+        offset = 0
+        for s in names:
+            n = len(features[s])
+            predictions[s] = out[offset:offset + n]
+            offset += n
+        return predictions
+    
+    def _simulate(
+        self,
+        timestamps: pd.Index,
+        symbols: List[str],
+        prices: np.ndarray,
+        signals: np.ndarray
+    ):
+        """
+        Execute a target-position matrix.
+        
+        Orders on a bar are sized from the bar's pre-trade equity and filled
+        at the close +/- slippage; buys that exceed the remaining cash are
+        rejected in symbol order, as in the event loop. Shorts, covers and
+        flips use the same signed-position accounting as _update_position,
+        and negative targets are clipped to flat when shorting is disabled.
+        """
+        cfg = self.config
+        n_symbols = len(symbols)
+        qty = np.zeros(n_symbols)
+        entry = np.zeros(n_symbols)
+        entry_time: List[Optional[datetime]] = [None] * n_symbols
+        mark = np.zeros(n_symbols)
+        cash = float(self.cash)
+        
+        for i, timestamp in enumerate(timestamps):
+            self.current_timestamp = timestamp
+            price = prices[i]
+            known = ~np.isnan(price)
+            mark = np.where(known, price, mark)
+            equity = cash + float(np.dot(qty, mark))
+            
+            signal = signals[i]
+            active = ~np.isnan(signal) & known
+            if active.any():
+                px = np.where(known, price, 0.0)
+                safe_px = np.where(px > 0, px, 1.0)
+                target = np.where(px > 0, equity * cfg.max_position_size * np.nan_to_num(signal) / safe_px, 0.0)
+                if not cfg.allow_short:
+                    target = np.maximum(target, 0.0)
+                delta = np.where(active, target - qty, 0.0)
+                trade = np.abs(delta) > 0.01
+                
+                if trade.any():
+                    buy = delta > 0
+                    slip = np.where(buy, px * cfg.slippage_rate, -px * cfg.slippage_rate)
+                    fill = px + slip
+                    commission = np.abs(delta) * fill * cfg.commission_rate
+                    cash_flow = np.where(trade, -delta * fill - commission, 0.0)
+                    
+                    # Cash before each order, in symbol order
+                    cash_before = cash + np.cumsum(cash_flow) - cash_flow
+                    rejected = trade & buy & (-cash_flow > cash_before)
+                    if rejected.any():
+                        trade = self._accept_orders(cash, trade, buy, cash_flow)
+                        cash_flow = np.where(trade, cash_flow, 0.0)
+                    
+                    cash += float(cash_flow.sum())
+                    
+                    for j in np.flatnonzero(trade):
+                        pnl = 0.0
+                        q_old, q_new = qty[j], qty[j] + delta[j]
+                        if q_old != 0 and np.sign(delta[j]) != np.sign(q_old):
+                            # Reducing (or flipping) an open position
+                            closed = min(abs(delta[j]), abs(q_old))
+                            pnl = (fill[j] - entry[j]) * closed * np.sign(q_old) - commission[j]
+                            if abs(delta[j]) > abs(q_old):
+                                entry[j], entry_time[j] = fill[j], timestamp
+                            elif q_new == 0:
+                                entry[j], entry_time[j] = 0.0, None
+                        elif q_old == 0:
+                            entry[j], entry_time[j] = fill[j], timestamp
+                        else:
+                            entry[j] = (entry[j] * abs(q_old) + fill[j] * abs(delta[j])) / abs(q_new)
+                        
+                        qty[j] = q_new
+                        self.trades.append(Trade(
+                            symbol=symbols[j],
+                            side=OrderSide.BUY if buy[j] else OrderSide.SELL,
+                            quantity=float(abs(delta[j])),
+                            price=float(fill[j]),
+                            timestamp=timestamp,
+                            commission=float(commission[j]),
+                            slippage=float(abs(slip[j])),
+                            pnl=float(pnl)
+                        ))
+            
+            self.equity_history.append((timestamp, cash + float(np.dot(qty, mark))))
+        
+        # Expose final state like the event loop
+        self.cash = cash
+        self.positions = {
+            symbols[j]: Position(
+                symbol=symbols[j],
+                quantity=float(qty[j]),
+                entry_price=float(entry[j]),
+                entry_timestamp=entry_time[j],
+                current_price=float(mark[j]),
+                unrealized_pnl=float((mark[j] - entry[j]) * qty[j])
+            )
+            for j in np.flatnonzero(qty)
+        }
+    
+    @staticmethod
+    def _accept_orders(
+        cash: float,
+        trade: np.ndarray,
+        buy: np.ndarray,
+        cash_flow: np.ndarray
+    ) -> np.ndarray:
+        """Walk one bar's orders in symbol order, dropping unaffordable buys."""
+        accepted = trade.copy()
+        for j in np.flatnonzero(trade):
+            if buy[j] and -cash_flow[j] > cash:
+                logger.warning(f"Insufficient funds for order: {-cash_flow[j]} > {cash}")
+                accepted[j] = False
+                continue
+            cash += cash_flow[j]
+        return accepted
+    
     def _calculate_metrics(self, data: pd.DataFrame) -> BacktestMetrics:
         """Calculate comprehensive performance metrics."""
         metrics = BacktestMetrics()
@@ -508,31 +815,29 @@ class Backtester:
             return metrics
         
         # Extract equity curve
-        equity_curve = [e[1] for e in self.equity_history]
-        metrics.equity_curve = equity_curve
+        equity = np.array([e[1] for e in self.equity_history], dtype=np.float64)
+        metrics.equity_curve = equity.tolist()
         
         # Returns
-        initial = equity_curve[0]
-        final = equity_curve[-1]
-        metrics.total_return = (final - initial) / initial if initial > 0 else 0
+        initial = equity[0]
+        final = equity[-1]
+        metrics.total_return = float((final - initial) / initial) if initial > 0 else 0
         
         # Daily returns
-        returns = []
-        for i in range(1, len(equity_curve)):
-            r = (equity_curve[i] - equity_curve[i-1]) / equity_curve[i-1] if equity_curve[i-1] > 0 else 0
-            returns.append(r)
-        metrics.returns = returns
+        prev = equity[:-1]
+        returns = np.where(prev > 0, np.diff(equity) / np.where(prev > 0, prev, 1.0), 0.0)
+        metrics.returns = returns.tolist()
         
         # Annualized return
-        n_days = len(equity_curve)
+        n_days = len(equity)
         if n_days > 1:
             metrics.annualized_return = (
                 (1 + metrics.total_return) ** (self.config.trading_days_per_year / n_days) - 1
             )
         
         # Volatility
-        if returns:
-            metrics.volatility = np.std(returns) * np.sqrt(self.config.trading_days_per_year)
+        if len(returns):
+            metrics.volatility = float(np.std(returns) * np.sqrt(self.config.trading_days_per_year))
         
         # Sharpe Ratio
         if metrics.volatility > 0:
@@ -540,39 +845,36 @@ class Backtester:
             metrics.sharpe_ratio = excess_return / metrics.volatility
         
         # Sortino Ratio (downside volatility)
-        negative_returns = [r for r in returns if r < 0]
-        if negative_returns:
+        negative_returns = returns[returns < 0]
+        if len(negative_returns):
             downside_vol = np.std(negative_returns) * np.sqrt(self.config.trading_days_per_year)
             if downside_vol > 0:
-                metrics.sortino_ratio = (metrics.annualized_return - self.config.risk_free_rate) / downside_vol
+                metrics.sortino_ratio = float(
+                    (metrics.annualized_return - self.config.risk_free_rate) / downside_vol
+                )
         
         # Drawdown analysis
-        drawdowns = self._calculate_drawdowns(equity_curve)
-        metrics.drawdowns = drawdowns
-        metrics.max_drawdown = min(drawdowns) if drawdowns else 0
-        metrics.average_drawdown = np.mean([d for d in drawdowns if d < 0]) if any(d < 0 for d in drawdowns) else 0
-        
-        # Max drawdown duration
-        if drawdowns:
-            max_duration = 0
-            current_duration = 0
-            for dd in drawdowns:
-                if dd < 0:
-                    current_duration += 1
-                    max_duration = max(max_duration, current_duration)
-                else:
-                    current_duration = 0
-            metrics.max_drawdown_duration = max_duration
+        drawdowns = self._drawdown_array(equity)
+        metrics.drawdowns = drawdowns.tolist()
+        metrics.max_drawdown = float(drawdowns.min())
+        underwater = drawdowns < 0
+        metrics.average_drawdown = float(drawdowns[underwater].mean()) if underwater.any() else 0
+        
+        # Max drawdown duration (longest run of bars under water)
+        if underwater.any():
+            run_ids = np.cumsum(~underwater)
+            metrics.max_drawdown_duration = int(np.bincount(run_ids[underwater]).max())
         
         # Calmar Ratio
         if metrics.max_drawdown < 0:
             metrics.calmar_ratio = metrics.annualized_return / abs(metrics.max_drawdown)
         
         # Trade analysis
-        metrics.total_trades = len(self.trades)
+        pnl = np.array([t.pnl for t in self.trades], dtype=np.float64)
+        metrics.total_trades = len(pnl)
         
-        winning = [t for t in self.trades if t.pnl > 0]
-        losing = [t for t in self.trades if t.pnl < 0]
+        winning = pnl[pnl > 0]
+        losing = pnl[pnl < 0]
         
         metrics.winning_trades = len(winning)
         metrics.losing_trades = len(losing)
@@ -580,33 +882,32 @@ class Backtester:
         if metrics.total_trades > 0:
             metrics.win_rate = metrics.winning_trades / metrics.total_trades
         
-        if winning:
-            metrics.average_win = np.mean([t.pnl for t in winning])
-            metrics.largest_win = max(t.pnl for t in winning)
+        if len(winning):
+            metrics.average_win = float(winning.mean())
+            metrics.largest_win = float(winning.max())
         
-        if losing:
-            metrics.average_loss = np.mean([t.pnl for t in losing])
-            metrics.largest_loss = min(t.pnl for t in losing)
+        if len(losing):
+            metrics.average_loss = float(losing.mean())
+            metrics.largest_loss = float(losing.min())
         
         # Profit factor
-        total_wins = sum(t.pnl for t in winning) if winning else 0
-        total_losses = abs(sum(t.pnl for t in losing)) if losing else 1
+        total_wins = float(winning.sum()) if len(winning) else 0
+        total_losses = abs(float(losing.sum())) if len(losing) else 1
         metrics.profit_factor = total_wins / total_losses if total_losses > 0 else float('inf')
         
         return metrics
     
     def _calculate_drawdowns(self, equity_curve: List[float]) -> List[float]:
         """Calculate drawdown series."""
-        drawdowns = []
-        peak = equity_curve[0] if equity_curve else 0
-        
-        for value in equity_curve:
-            if value > peak:
-                peak = value
-            drawdown = (value - peak) / peak if peak > 0 else 0
-            drawdowns.append(drawdown)
-        
-        return drawdowns
+        return self._drawdown_array(np.asarray(equity_curve, dtype=np.float64)).tolist()
+    
+    @staticmethod
+    def _drawdown_array(equity: np.ndarray) -> np.ndarray:
+        """Drawdown from the running peak for each bar."""
+        if not len(equity):
+            return equity
+        peak = np.maximum.accumulate(equity)
+        return np.where(peak > 0, (equity - peak) / np.where(peak > 0, peak, 1.0), 0.0)
 
 
 class WalkForwardBacktester(Backtester):
@@ -621,12 +922,23 @@ class WalkForwardBacktester(Backtester):
         config: Optional[BacktestConfig] = None,
         train_window: int = 252,  # 1 year
         test_window: int = 63,    # 3 months
-        retrain_frequency: int = 21  # Monthly
+        retrain_frequency: int = 21,  # Monthly
+        executor: Optional[FoldExecutor] = None
     ):
+        """
+        Args:
+            config: Backtest configuration
+            train_window: Bars in each training window
+            test_window: Out-of-sample bars per fold
+            retrain_frequency: Bars between retrains
+            executor: Fit folds in parallel on this executor (vectorized
+                mode only); each fold trains its own copy of the model
+        """
         super().__init__(config)
         self.train_window = train_window
         self.test_window = test_window
         self.retrain_frequency = retrain_frequency
+        self.executor = executor
         
         self.models_used: List[Dict[str, Any]] = []
     
@@ -636,7 +948,8 @@ class WalkForwardBacktester(Backtester):
         strategy: BaseStrategy,
         model: Optional[Any] = None,
         X: Optional[np.ndarray] = None,
-        y: Optional[np.ndarray] = None
+        y: Optional[np.ndarray] = None,
+        vectorized: bool = True
     ) -> BacktestMetrics:
         """
         Run walk-forward backtest.
@@ -647,13 +960,18 @@ class WalkForwardBacktester(Backtester):
             model: ML model (must have fit/predict methods)
             X: Features for model training
             y: Targets for model training
+            vectorized: Predict each fold in one batch and simulate with the
+                vectorized engine (False = bar-by-bar event loop)
         """
         self.reset()
         self.models_used = []
         
         if model is None or X is None or y is None:
             # Fallback to regular backtest
-            return super().run(data, strategy, model)
+            return super().run(data, strategy, model, vectorized=vectorized)
+        
+        if vectorized:
+            return self._run_vectorized_folds(data, strategy, model, X, y)
         
         data = data.sort_index()
         n_samples = len(data)
@@ -708,13 +1026,16 @@ class WalkForwardBacktester(Backtester):
             # Generate and execute signals
             signals = strategy.generate_signals(data.iloc[:i+1], predictions)
             
+            bar_equity = self.equity
             for symbol, signal in signals.items():
                 current_price = prices.get(symbol, 100)
                 current_pos = self.positions.get(symbol)
                 current_qty = current_pos.quantity if current_pos else 0
                 
-                target_value = self.equity * self.config.max_position_size * signal
+                target_value = bar_equity * self.config.max_position_size * signal
                 target_qty = target_value / current_price if current_price > 0 else 0
+                if not self.config.allow_short:
+                    target_qty = max(target_qty, 0)
                 trade_qty = target_qty - current_qty
                 
                 if abs(trade_qty) > 0.01:
@@ -722,11 +1043,149 @@ class WalkForwardBacktester(Backtester):
                     order = Order(symbol=symbol, side=side, quantity=abs(trade_qty))
                     self._execute_order(order, current_price)
             
+            self._update_positions(prices)
             self.equity_history.append((timestamp, self.equity))
         
         return self._calculate_metrics(data)
 
 
+    def _run_vectorized_folds(
+        self,
+        data: pd.DataFrame,
+        strategy: BaseStrategy,
+        model: Any,
+        X: np.ndarray,
+        y: np.ndarray
+    ) -> BacktestMetrics:
+        """
+        Walk-forward with one fit and one batched predict per fold.
+        
+        Retraining follows the event loop's schedule (every
+        retrain_frequency bars, retrying on the next bar after a failed
+        fit), then the whole out-of-sample span is simulated at once.
+        """
+        data = data.sort_index()
+        n_samples = len(data)
+        
+        if self.executor is not None:
+            predictions = self._predict_folds_parallel(model, X, y, n_samples)
+            return self._simulate_folds(data, strategy, predictions)
+        
+        predictions: List[Any] = [None] * n_samples
+        
+        current_model = None
+        last_train_idx = 0
+        i = self.train_window
+        
+        while i < n_samples:
+            if (i - last_train_idx) >= self.retrain_frequency or current_model is None:
+                train_start = max(0, i - self.train_window)
+                try:
+                    if hasattr(model, 'fit'):
+                        model.fit(X[train_start:i], y[train_start:i])
+                        current_model = model
+                        last_train_idx = i
+                        
+                        self.models_used.append({
+                            'train_start': train_start,
+                            'train_end': i,
+                            'test_start': i
+                        })
+                except Exception as e:
+                    logger.warning(f"Model training failed: {e}")
+            
+            if current_model is None:
+                i += 1
+                continue
+            
+            # Bars until the next retrain attempt
+            fold_end = min(max(last_train_idx + self.retrain_frequency, i + 1), n_samples)
+            out = _batch_predict(current_model, X[i:fold_end])
+            if out is not None:
+                for k in range(fold_end - i):
+                    predictions[i + k] = _prediction_at(out, k)
+            i = fold_end
+        
+        return self._simulate_folds(data, strategy, predictions)
+    
+    def _predict_folds_parallel(
+        self,
+        model: Any,
+        X: np.ndarray,
+        y: np.ndarray,
+        n_samples: int
+    ) -> List[Any]:
+        """
+        Fit and predict every fold independently on the executor.
+        
+        Folds start every retrain_frequency bars; a fold whose fit fails
+        gets no predictions (there is no previous model to fall back on).
+        """
+        starts = list(range(self.train_window, n_samples, self.retrain_frequency))
+        tasks = [
+            {
+                'model': copy.deepcopy(model),
+                'train_start': max(0, start - self.train_window),
+                'test_start': start,
+                'test_end': min(start + self.retrain_frequency, n_samples)
+            }
+            for start in starts
+        ]
+        
+        shared = self.executor.share(X=np.asarray(X), y=np.asarray(y))
+        outcomes = self.executor.map(_fit_predict_fold, tasks, shared)
+        
+        predictions: List[Any] = [None] * n_samples
+        for task, (out, error), timing in zip(tasks, outcomes, self.executor.timings):
+            if error:
+                logger.warning(f"Model training failed: {error}")
+                continue
+            
+            self.models_used.append({
+                'train_start': task['train_start'],
+                'train_end': task['test_start'],
+                'test_start': task['test_start'],
+                'duration_seconds': timing.seconds
+            })
+            if out is not None:
+                for k in range(task['test_end'] - task['test_start']):
+                    predictions[task['test_start'] + k] = _prediction_at(out, k)
+        
+        return predictions
+    
+    def _simulate_folds(
+        self,
+        data: pd.DataFrame,
+        strategy: BaseStrategy,
+        predictions: List[Any]
+    ) -> BacktestMetrics:
+        """Simulate the out-of-sample span from per-bar fold predictions."""
+        n_samples = len(data)
+        symbols = ['default']
+        prices = (
+            data[['close']].to_numpy(dtype=np.float64) if 'close' in data.columns
+            else np.full((n_samples, 1), 100.0)
+        )
+        signals = strategy.generate_signal_matrix(
+            data, symbols, {'default': predictions}, start=self.train_window
+        )
+        
+        start = self.train_window
+        self._simulate(data.index[start:], symbols, prices[start:], signals[start:])
+        return self._calculate_metrics(data)
+
+
+def _fit_predict_fold(task: Dict[str, Any], X: np.ndarray, y: np.ndarray) -> Tuple[Any, Optional[str]]:
+    """Executor task: fit one walk-forward fold, predict its test bars in one call."""
+    model = task['model']
+    try:
+        model.fit(X[task['train_start']:task['test_start']], y[task['train_start']:task['test_start']])
+    except Exception as e:
+        return None, str(e)
+    
+    return _batch_predict(model, X[task['test_start']:task['test_end']]), None
+
+
 def run_backtest(
     data: pd.DataFrame,
     strategy: BaseStrategy,
@@ -734,7 +1193,8 @@ def run_backtest(
     config: Optional[BacktestConfig] = None,
     walk_forward: bool = False,
     X: Optional[np.ndarray] = None,
-    y: Optional[np.ndarray] = None
+    y: Optional[np.ndarray] = None,
+    vectorized: bool = False
 ) -> BacktestMetrics:
     """
     Convenience function to run a backtest.
@@ -747,6 +1207,8 @@ def run_backtest(
         walk_forward: Use walk-forward testing
         X: Features for walk-forward training
         y: Targets for walk-forward training
+        vectorized: Use the vectorized engine (walk-forward always
+            predicts per fold)
         
     Returns:
         BacktestMetrics
@@ -756,4 +1218,4 @@ def run_backtest(
         return backtester.run(data, strategy, model, X, y)
     else:
         backtester = Backtester(config)
-        return backtester.run(data, strategy, model)
+        return backtester.run(data, strategy, model, vectorized=vectorized)
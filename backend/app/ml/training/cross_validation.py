@@ -14,6 +14,8 @@ from datetime import datetime, timedelta
 from abc import ABC, abstractmethod
 from loguru import logger
 
+from .executor import FoldExecutor
+
 
 @dataclass
 class CVSplit:
@@ -401,15 +403,18 @@ class CrossValidator:
     def __init__(
         self,
         cv_strategy: BaseCrossValidator,
-        scoring: str = 'accuracy'
+        scoring: str = 'accuracy',
+        executor: Optional[FoldExecutor] = None
     ):
         """
         Args:
             cv_strategy: Cross-validation strategy to use
             scoring: Metric to optimize ('accuracy', 'f1', 'roc_auc', etc.)
+            executor: Runs the folds (default: serial, in-process)
         """
         self.cv_strategy = cv_strategy
         self.scoring = scoring
+        self.executor = executor or FoldExecutor()
         self.results_: Optional[CVResult] = None
         
     def cross_validate(
@@ -440,44 +445,51 @@ class CrossValidator:
         model_kwargs = model_kwargs or {}
         fit_kwargs = fit_kwargs or {}
         
-        scores = []
-        fold_details = []
+        splits = list(self.cv_strategy.split(X, y, dates))
+        tasks = [
+            {
+                'model_class': model_class,
+                'model_kwargs': model_kwargs,
+                'fit_kwargs': fit_kwargs,
+                'scoring': self.scoring,
+                'train_indices': split.train_indices,
+                'test_indices': split.test_indices
+            }
+            for split in splits
+        ]
+        
+        if verbose:
+            logger.info(
+                f"Running {len(splits)} folds on {self.executor.backend.value} backend "
+                f"({self.executor.n_workers} workers)"
+            )
         
-        for split in self.cv_strategy.split(X, y, dates):
+        # X and y go to the workers once, not with every fold
+        shared = self.executor.share(X=X, y=y)
+        scores = self.executor.map(_fit_and_score_fold, tasks, shared)
+        timings = self.executor.timings
+        
+        fold_details = []
+        for split, score, timing in zip(splits, scores, timings):
             if verbose:
                 logger.info(
                     f"Fold {split.fold + 1}/{self.cv_strategy.get_n_splits()}: "
-                    f"train={split.train_size}, test={split.test_size}"
+                    f"train={split.train_size}, test={split.test_size}, "
+                    f"score={score:.4f} ({timing.seconds:.2f}s)"
                 )
             
-            # Get data for this fold
-            X_train = X[split.train_indices]
-            y_train = y[split.train_indices]
-            X_test = X[split.test_indices]
-            y_test = y[split.test_indices]
-            
-            # Train model
-            model = model_class(**model_kwargs)
-            model.fit(X_train, y_train, **fit_kwargs)
-            
-            # Evaluate
-            score = self._evaluate_fold(model, X_test, y_test)
-            scores.append(score)
-            
             # Store details
             fold_details.append({
                 'fold': split.fold,
                 'train_size': split.train_size,
                 'test_size': split.test_size,
                 'score': score,
+                'duration_seconds': timing.seconds,
                 'train_start': split.train_start.isoformat() if split.train_start else None,
                 'train_end': split.train_end.isoformat() if split.train_end else None,
                 'test_start': split.test_start.isoformat() if split.test_start else None,
                 'test_end': split.test_end.isoformat() if split.test_end else None
             })
-            
-            if verbose:
-                logger.info(f"  Score: {score:.4f}")
         
         # Aggregate results
         self.results_ = CVResult(
@@ -504,40 +516,60 @@ class CrossValidator:
         y_test: np.ndarray
     ) -> float:
         """Evaluate a single fold."""
-        try:
-            if hasattr(model, 'evaluate'):
-                # Our custom models
-                metrics = model.evaluate(X_test, y_test)
-                return metrics.get(self.scoring, metrics.get('accuracy', 0.5))
-            
-            elif hasattr(model, 'score'):
-                # sklearn models
-                return model.score(X_test, y_test)
-            
-            elif hasattr(model, 'predict_proba'):
-                # Calculate metric manually
-                from sklearn.metrics import accuracy_score, roc_auc_score, f1_score
-                
-                y_pred = model.predict(X_test)
-                
-                if self.scoring == 'accuracy':
-                    return accuracy_score(y_test, y_pred)
-                elif self.scoring == 'roc_auc':
-                    y_proba = model.predict_proba(X_test)
-                    if y_proba.shape[1] == 2:
-                        return roc_auc_score(y_test, y_proba[:, 1])
-                    return roc_auc_score(y_test, y_proba, multi_class='ovr')
-                elif self.scoring == 'f1':
-                    return f1_score(y_test, y_pred, average='weighted')
-                else:
-                    return accuracy_score(y_test, y_pred)
-            
+        return score_model(model, X_test, y_test, self.scoring)
+
+
+def score_model(
+    model: Any,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+    scoring: str = 'accuracy'
+) -> float:
+    """Score a fitted model on held-out data (0.5 if it cannot be scored)."""
+    try:
+        if hasattr(model, 'evaluate'):
+            # Our custom models
+            metrics = model.evaluate(X_test, y_test)
+            return metrics.get(scoring, metrics.get('accuracy', 0.5))
+        
+        elif hasattr(model, 'score'):
+            # sklearn models
+            return model.score(X_test, y_test)
+        
+        elif hasattr(model, 'predict_proba'):
+            # Calculate metric manually
+            from sklearn.metrics import accuracy_score, roc_auc_score, f1_score
+            
+            y_pred = model.predict(X_test)
+            
+            if scoring == 'accuracy':
+                return accuracy_score(y_test, y_pred)
+            elif scoring == 'roc_auc':
+                y_proba = model.predict_proba(X_test)
+                if y_proba.shape[1] == 2:
+                    return roc_auc_score(y_test, y_proba[:, 1])
+                return roc_auc_score(y_test, y_proba, multi_class='ovr')
+            elif scoring == 'f1':
+                return f1_score(y_test, y_pred, average='weighted')
             else:
-                return 0.5
-                
-        except Exception as e:
-            logger.warning(f"Error evaluating fold: {e}")
+                return accuracy_score(y_test, y_pred)
+        
+        else:
             return 0.5
+            
+    except Exception as e:
+        logger.warning(f"Error evaluating fold: {e}")
+        return 0.5
+
+
+def _fit_and_score_fold(task: Dict[str, Any], X: np.ndarray, y: np.ndarray) -> float:
+    """Executor task: train a fresh model on one fold and score it."""
+    train, test = task['train_indices'], task['test_indices']
+    
+    model = task['model_class'](**task['model_kwargs'])
+    model.fit(X[train], y[train], **task['fit_kwargs'])
+    
+    return score_model(model, X[test], y[test], task['scoring'])
 
 
 def create_cv_strategy(
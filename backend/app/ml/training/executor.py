@@ -0,0 +1,221 @@
+"""
+Fold Executor
+
+Runs independent training tasks (CV folds, walk-forward folds, HPO
+trials) on a pluggable backend:
+- serial: in-process, one task at a time (default)
+- thread: ThreadPoolExecutor, for models that release the GIL
+- process: ProcessPoolExecutor, for pure-Python / GIL-bound models
+
+Large arrays are shared once instead of being pickled into every task:
+the process backend writes them to memory-mapped .npy files that workers
+open read-only; serial and thread backends pass the arrays through.
+
+Results always come back in task order, so the outcome does not depend on
+the backend as long as each task is deterministic on its own (seed models
+explicitly, do not rely on the global numpy RNG).
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+
+
+class ExecutorBackend(str, Enum):
+    """Execution backend."""
+    SERIAL = "serial"
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+@dataclass(frozen=True)
+class SharedArray:
+    """Picklable handle to an array stored as a .npy file."""
+    path: str
+    shape: tuple
+    dtype: str
+
+    def load(self) -> np.ndarray:
+        """Open the array read-only (memory-mapped, cached per process)."""
+        array = _OPEN_ARRAYS.get(self.path)
+        if array is None:
+            array = np.load(self.path, mmap_mode='r')
+            _OPEN_ARRAYS[self.path] = array
+        return array
+
+
+# Memory maps opened by this process, keyed by file path
+_OPEN_ARRAYS: Dict[str, np.ndarray] = {}
+
+
+@dataclass
+class TaskTiming:
+    """Wall-clock timing of one task."""
+    task: int
+    seconds: float
+    worker: str
+
+    def to_dict(self) -> dict:
+        return {
+            'task': self.task,
+            'seconds': self.seconds,
+            'worker': self.worker
+        }
+
+
+def _resolve(shared: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        name: value.load() if isinstance(value, SharedArray) else value
+        for name, value in shared.items()
+    }
+
+
+def _run_task(fn: Callable, index: int, task: Any, shared: Dict[str, Any]):
+    """Worker entry point: run fn(task, **arrays) and time it."""
+    started = time.perf_counter()
+    result = fn(task, **_resolve(shared))
+    worker = f"{os.getpid()}/{threading.current_thread().name}"
+    return index, result, time.perf_counter() - started, worker
+
+
+class FoldExecutor:
+    """
+    Map a function over independent tasks on a configurable backend.
+
+    Usage:
+        with FoldExecutor("process", max_workers=8) as executor:
+            shared = executor.share(X=X, y=y)
+            scores = executor.map(fit_fold, folds, shared)
+            executor.timings  # per-task wall-clock seconds of the last map()
+
+    fn must be a module-level function for the process backend; it is
+    called as fn(task, **arrays) with the shared arrays (read-only memory
+    maps on the process backend).
+    """
+
+    def __init__(
+        self,
+        backend: ExecutorBackend = ExecutorBackend.SERIAL,
+        max_workers: Optional[int] = None,
+        temp_dir: Optional[str] = None
+    ):
+        """
+        Args:
+            backend: Execution backend
+            max_workers: Worker count for thread/process (default: all cores)
+            temp_dir: Directory for shared .npy files (default: system temp)
+        """
+        self.backend = ExecutorBackend(backend)
+        self.max_workers = max_workers
+        self.temp_dir = temp_dir
+        self.timings: List[TaskTiming] = []
+        self._share_dir: Optional[str] = None
+
+    def __enter__(self) -> "FoldExecutor":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def n_workers(self) -> int:
+        if self.backend == ExecutorBackend.SERIAL:
+            return 1
+        return self.max_workers or os.cpu_count() or 1
+
+    def share(self, **arrays: np.ndarray) -> Dict[str, Any]:
+        """
+        Make arrays available to workers without per-task pickling.
+
+        Returns:
+            name -> array (serial/thread) or SharedArray handle (process)
+        """
+        if self.backend != ExecutorBackend.PROCESS:
+            return dict(arrays)
+
+        if self._share_dir is None:
+            self._share_dir = tempfile.mkdtemp(prefix="fold_executor_", dir=self.temp_dir)
+
+        shared = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            path = os.path.join(self._share_dir, f"{name}_{len(os.listdir(self._share_dir))}.npy")
+            np.save(path, array)
+            shared[name] = SharedArray(path=path, shape=array.shape, dtype=str(array.dtype))
+        return shared
+
+    def map(
+        self,
+        fn: Callable,
+        tasks: Sequence[Any],
+        shared: Optional[Dict[str, Any]] = None
+    ) -> List[Any]:
+        """
+        Run fn(task, **shared) for every task.
+
+        Args:
+            fn: Task function
+            tasks: Task payloads (kept small: indices, params, models)
+            shared: Output of share()
+
+        Returns:
+            Results in task order; self.timings holds one entry per task
+        """
+        shared = shared or {}
+        self.timings = []
+        tasks = list(tasks)
+        if not tasks:
+            return []
+
+        started = time.perf_counter()
+
+        if self.backend == ExecutorBackend.SERIAL or len(tasks) == 1:
+            outputs = [_run_task(fn, i, task, shared) for i, task in enumerate(tasks)]
+        else:
+            pool_class = ThreadPoolExecutor if self.backend == ExecutorBackend.THREAD else ProcessPoolExecutor
+            with pool_class(max_workers=min(self.n_workers, len(tasks))) as pool:
+                futures = [pool.submit(_run_task, fn, i, task, shared) for i, task in enumerate(tasks)]
+                outputs = [future.result() for future in futures]
+
+        results: List[Any] = [None] * len(tasks)
+        for index, result, seconds, worker in sorted(outputs, key=lambda o: o[0]):
+            results[index] = result
+            self.timings.append(TaskTiming(task=index, seconds=seconds, worker=worker))
+
+        logger.debug(
+            f"Executed {len(tasks)} tasks on {self.backend.value} backend "
+            f"({self.n_workers} workers) in {time.perf_counter() - started:.2f}s"
+        )
+        return results
+
+    def close(self):
+        """Remove shared files."""
+        if self._share_dir is not None:
+            for path in list(_OPEN_ARRAYS):
+                if path.startswith(self._share_dir):
+                    del _OPEN_ARRAYS[path]
+            shutil.rmtree(self._share_dir, ignore_errors=True)
+            self._share_dir = None
+
+
+def get_executor(
+    backend: str = "serial",
+    n_jobs: Optional[int] = None
+) -> FoldExecutor:
+    """
+    Factory function to create a FoldExecutor.
+
+    Args:
+        backend: 'serial', 'thread' or 'process'
+        n_jobs: Worker count (None/-1 = all cores)
+    """
+    max_workers = None if n_jobs is None or n_jobs < 0 else n_jobs
+    return FoldExecutor(backend=ExecutorBackend(backend), max_workers=max_workers)
@@ -15,9 +15,12 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
+import copy
 import json
 from loguru import logger
 
+from .executor import FoldExecutor, get_executor
+
 
 class TrainingStatus(str, Enum):
     """Training job status."""
@@ -73,6 +76,10 @@ class TrainingConfig:
     use_hpo: bool = False
     hpo_trials: int = 20
     
+    # Parallelism for CV folds and HPO trials
+    executor_backend: str = "serial"  # "serial", "thread" or "process"
+    n_jobs: int = -1  # Workers for thread/process (-1 = all cores)
+    
     # Output
     model_output_dir: str = "models/trained"
     save_checkpoints: bool = True
@@ -94,6 +101,8 @@ class TrainingConfig:
             'learning_rate': self.learning_rate,
             'use_cv': self.use_cv,
             'n_cv_folds': self.n_cv_folds,
+            'executor_backend': self.executor_backend,
+            'n_jobs': self.n_jobs,
             'model_output_dir': self.model_output_dir
         }
 
@@ -117,6 +126,7 @@ class TrainingMetrics:
     cv_scores: List[float] = field(default_factory=list)
     cv_mean: Optional[float] = None
     cv_std: Optional[float] = None
+    cv_fold_seconds: List[float] = field(default_factory=list)
     
     def to_dict(self) -> dict:
         return {
@@ -131,7 +141,8 @@ class TrainingMetrics:
             'test_roc_auc': self.test_roc_auc,
             'cv_scores': self.cv_scores,
             'cv_mean': self.cv_mean,
-            'cv_std': self.cv_std
+            'cv_std': self.cv_std,
+            'cv_fold_seconds': self.cv_fold_seconds
         }
 
 
@@ -237,6 +248,7 @@ class TrainingPipeline:
         self.config = config or TrainingConfig()
         self.jobs: Dict[str, TrainingJob] = {}
         self.current_job: Optional[TrainingJob] = None
+        self.executor: FoldExecutor = get_executor(self.config.executor_backend, self.config.n_jobs)
         
         # Callbacks for progress reporting
         self.on_epoch_end: Optional[Callable] = None
@@ -328,7 +340,9 @@ class TrainingPipeline:
         try:
             from sklearn.feature_selection import mutual_info_classif, SelectKBest
             
-            selector = SelectKBest(mutual_info_classif, k=min(k, X.shape[1]))
+            # Fixed random_state: MI estimation adds noise, keep runs reproducible
+            score_func = lambda X_, y_: mutual_info_classif(X_, y_, random_state=0)
+            selector = SelectKBest(score_func, k=min(k, X.shape[1]))
             X_selected = selector.fit_transform(X, y)
             
             # Get selected feature names
@@ -391,28 +405,26 @@ class TrainingPipeline:
             gap=5  # 5-day gap to avoid look-ahead
         )
         
-        scores = []
+        folds = list(cv.split(X))
+        tasks = [
+            {'model_class': model_class, 'model_kwargs': model_kwargs, 'train': train_idx, 'test': test_idx}
+            for train_idx, test_idx in folds
+        ]
         
-        for fold, (train_idx, test_idx) in enumerate(cv.split(X)):
-            logger.info(f"CV Fold {fold + 1}/{self.config.n_cv_folds}")
-            
-            X_train, X_test = X[train_idx], X[test_idx]
-            y_train, y_test = y[train_idx], y[test_idx]
-            
-            # Create and train model
-            model = model_class(**model_kwargs)
-            model.fit(X_train, y_train, verbose=0)
-            
-            # Evaluate
-            metrics = model.evaluate(X_test, y_test)
-            score = metrics.get('roc_auc', metrics.get('accuracy', 0.5))
-            scores.append(score)
-            
-            logger.info(f"Fold {fold + 1} score: {score:.4f}")
+        logger.info(f"CV: {len(folds)} folds on {self.executor.backend.value} backend")
+        
+        shared = self.executor.share(X=X, y=y)
+        scores = self.executor.map(_pipeline_cv_fold, tasks, shared)
+        
+        for fold, (score, timing) in enumerate(zip(scores, self.executor.timings)):
+            logger.info(f"Fold {fold + 1}/{self.config.n_cv_folds} score: {score:.4f} ({timing.seconds:.2f}s)")
             
             if self.on_fold_end:
                 self.on_fold_end(fold, score)
         
+        if self.current_job:
+            self.current_job.metrics.cv_fold_seconds = [t.seconds for t in self.executor.timings]
+        
         return scores
     
     def train_model(
@@ -502,7 +514,8 @@ class TrainingPipeline:
     def run(
         self,
         model_class: Type,
-        model_kwargs: Optional[Dict] = None
+        model_kwargs: Optional[Dict] = None,
+        data: Optional[tuple] = None
     ) -> TrainingJob:
         """
         Run the full training pipeline.
@@ -510,6 +523,7 @@ class TrainingPipeline:
         Args:
             model_class: Model class to train
             model_kwargs: Arguments to pass to model constructor
+            data: Preloaded (features, targets, feature_names); loaded if None
             
         Returns:
             Completed TrainingJob
@@ -524,7 +538,7 @@ class TrainingPipeline:
             job.started_at = datetime.utcnow()
             
             # Load data
-            X, y, feature_names = self.load_data()
+            X, y, feature_names = data if data is not None else self.load_data()
             
             # Feature selection
             X_selected, selected_features = self.select_features(X, y, feature_names)
@@ -589,8 +603,14 @@ class HyperparameterOptimizer:
     Hyperparameter optimization using Optuna or random search.
     """
     
-    def __init__(self, pipeline: TrainingPipeline):
+    def __init__(self, pipeline: TrainingPipeline, executor: Optional[FoldExecutor] = None):
+        """
+        Args:
+            pipeline: Pipeline whose config and job registry trials use
+            executor: Runs the trials (default: the pipeline's executor)
+        """
         self.pipeline = pipeline
+        self.executor = executor or pipeline.executor
     
     def get_search_space(self, model_type: str) -> Dict[str, Any]:
         """Define hyperparameter search space."""
@@ -608,48 +628,102 @@ class HyperparameterOptimizer:
     def random_search(
         self,
         model_class: Type,
-        n_trials: int = 10
+        n_trials: int = 10,
+        seed: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Perform random search for hyperparameters.
         
+        All trial parameters are drawn up front and the data is loaded
+        once and shared with the workers, so with a seed the outcome is
+        the same on every executor backend.
+        
+        Args:
+            model_class: Model class to tune
+            n_trials: Number of trials
+            seed: Seed for parameter sampling
+        
         Returns:
             Best hyperparameters found
         """
         search_space = self.get_search_space(model_class.__name__)
+        rng = np.random.RandomState(seed) if seed is not None else np.random
+        
+        trial_params = [
+            {key: rng.choice(values) for key, values in search_space.items()}
+            for _ in range(n_trials)
+        ]
+        
+        X, y, feature_names = self.pipeline.load_data()
+        
+        # Trials run their own pipeline; keep their CV in-process
+        trial_config = copy.copy(self.pipeline.config)
+        trial_config.executor_backend = "serial"
+        
+        tasks = [
+            {
+                'trial': trial,
+                'params': params,
+                'model_class': model_class,
+                'config': trial_config,
+                'feature_names': feature_names
+            }
+            for trial, params in enumerate(trial_params)
+        ]
+        
+        logger.info(f"HPO: {n_trials} trials on {self.executor.backend.value} backend")
+        
+        shared = self.executor.share(X=X, y=y)
+        outcomes = self.executor.map(_run_hpo_trial, tasks, shared)
         
         best_score = 0
         best_params = {}
         
-        for trial in range(n_trials):
-            # Sample random parameters
-            params = {
-                key: np.random.choice(values)
-                for key, values in search_space.items()
-            }
+        for task, (job, error), timing in zip(tasks, outcomes, self.executor.timings):
+            trial, params = task['trial'], task['params']
+            logger.info(f"HPO Trial {trial + 1}/{n_trials}: {params} ({timing.seconds:.2f}s)")
             
-            logger.info(f"HPO Trial {trial + 1}/{n_trials}: {params}")
+            if error:
+                logger.warning(f"Trial {trial + 1} failed: {error}")
+                continue
             
-            # Create model config from params
-            # This would need to be customized per model type
+            self.pipeline.jobs[job.job_id] = job
+            score = job.metrics.cv_mean or job.metrics.test_roc_auc or 0
             
-            # For now, use default and track score
-            try:
-                job = self.pipeline.run(model_class)
-                score = job.metrics.cv_mean or job.metrics.test_roc_auc or 0
-                
-                if score > best_score:
-                    best_score = score
-                    best_params = params
-                    logger.info(f"New best score: {best_score:.4f}")
-                    
-            except Exception as e:
-                logger.warning(f"Trial {trial + 1} failed: {e}")
+            if score > best_score:
+                best_score = score
+                best_params = params
+                logger.info(f"New best score: {best_score:.4f}")
         
         logger.info(f"Best parameters: {best_params} (score: {best_score:.4f})")
         return best_params
 
 
+def _pipeline_cv_fold(task: Dict[str, Any], X: np.ndarray, y: np.ndarray) -> float:
+    """Executor task: train and score one TrainingPipeline CV fold."""
+    train, test = task['train'], task['test']
+    
+    model = task['model_class'](**task['model_kwargs'])
+    model.fit(X[train], y[train], verbose=0)
+    
+    metrics = model.evaluate(X[test], y[test])
+    return metrics.get('roc_auc', metrics.get('accuracy', 0.5))
+
+
+def _run_hpo_trial(task: Dict[str, Any], X: np.ndarray, y: np.ndarray) -> tuple:
+    """Executor task: run one HPO trial; returns (job, error message)."""
+    pipeline = TrainingPipeline(task['config'])
+    try:
+        # Create model config from params
+        # This would need to be customized per model type
+        
+        # For now, use default and track score
+        job = pipeline.run(task['model_class'], data=(X, y, task['feature_names']))
+        return job, None
+    except Exception as e:
+        return None, str(e)
+
+
 # Convenience function
 def train_price_predictor(
     symbols: Optional[List[str]] = None,
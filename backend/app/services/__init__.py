@@ -3,6 +3,7 @@ PaperTrading Platform - Services Package
 """
 from app.services.email_service import email_service, EmailService
 from app.services.fx_rate_updater import fx_rate_updater, FxRateUpdaterService, update_exchange_rates
+from app.services.fx_rate_matrix import fx_rate_matrix, FxRateMatrix
 
 __all__ = [
     "email_service",
@@ -10,4 +11,6 @@ __all__ = [
     "fx_rate_updater",
     "FxRateUpdaterService",
     "update_exchange_rates",
+    "fx_rate_matrix",
+    "FxRateMatrix",
 ]
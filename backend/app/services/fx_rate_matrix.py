@@ -0,0 +1,358 @@
+"""
+PaperTrading Platform - FX Rate Matrix
+
+In-memory matrix of every exchange rate, so currency conversion is a
+dictionary read instead of a database query per position:
+
+- Bulk load: all rows of the exchange_rates table in ONE query
+- Cross rates: pairs missing from the table are derived from their
+  inverse or through a pivot currency (EUR, the ECB base)
+- Versioning: every change of the rates bumps `version`; the FX updater
+  publishes freshly fetched rates directly after writing them and
+  broadcasts the bump over Redis pub/sub, so the other workers reload
+  from the database right away. The matrix also reloads once it is older
+  than max_age (covers missed broadcasts)
+- Vectorized conversion: rates_to() / convert_many() convert a whole
+  list of amounts with one numpy multiply
+
+Usage:
+    rate = await fx_rate_matrix.get_rate("USD", "EUR")   # Decimal or None
+    values = await fx_rate_matrix.convert_many(amounts, currencies, "EUR")
+"""
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from loguru import logger
+
+from app.db.redis_client import redis_client
+
+
+# ECB reference rates are EUR based
+PIVOT_CURRENCY = "EUR"
+
+# Reload from the database after this many seconds
+DEFAULT_MAX_AGE = 900.0
+
+# Precision of the exchange_rates.rate column
+RATE_QUANTUM = Decimal("0.0000000001")
+
+# Pub/sub channel announcing new rates to the other workers
+UPDATE_CHANNEL = "fx:rates:updated"
+
+
+def build_rate_table(
+    pairs: Iterable[Tuple[str, str, Decimal]],
+    pivot: str = PIVOT_CURRENCY
+) -> Dict[Tuple[str, str], Decimal]:
+    """
+    Complete rate table from the stored pairs.
+
+    Preference order for a pair: stored rate, inverse of the stored
+    opposite pair, cross rate through the pivot currency.
+
+    Args:
+        pairs: (base, quote, rate) with 1 base = rate quote
+        pivot: Currency used to derive cross rates
+
+    Returns:
+        Dict (base, quote) -> rate, including identity pairs
+    """
+    direct: Dict[Tuple[str, str], Decimal] = {}
+    for base, quote, rate in pairs:
+        rate = Decimal(str(rate))
+        if rate > 0:
+            direct[(base.upper(), quote.upper())] = rate
+
+    currencies = sorted({c for pair in direct for c in pair} | {pivot})
+
+    def known(base: str, quote: str) -> Optional[Decimal]:
+        if base == quote:
+            return Decimal("1")
+        if (base, quote) in direct:
+            return direct[(base, quote)]
+        if (quote, base) in direct:
+            return (Decimal("1") / direct[(quote, base)]).quantize(RATE_QUANTUM, rounding=ROUND_HALF_UP)
+        return None
+
+    table: Dict[Tuple[str, str], Decimal] = {}
+    for base in currencies:
+        for quote in currencies:
+            rate = known(base, quote)
+            if rate is None:
+                to_pivot, from_pivot = known(base, pivot), known(pivot, quote)
+                if to_pivot is not None and from_pivot is not None:
+                    rate = (to_pivot * from_pivot).quantize(RATE_QUANTUM, rounding=ROUND_HALF_UP)
+            if rate is not None:
+                table[(base, quote)] = rate
+    return table
+
+
+class FxRateMatrix:
+    """
+    Versioned in-memory exchange rate matrix.
+
+    Holds the rates twice: as Decimals for the money columns (exact,
+    same values as the table) and as a float matrix for vectorized
+    conversion.
+    """
+
+    def __init__(self, max_age: float = DEFAULT_MAX_AGE, pivot: str = PIVOT_CURRENCY):
+        """
+        Args:
+            max_age: Seconds before the matrix is reloaded from the database
+            pivot: Currency used to derive missing cross rates
+        """
+        self.max_age = max_age
+        self.pivot = pivot
+        self.version = 0
+        self.loaded_at: Optional[datetime] = None
+        self.currencies: List[str] = []
+        self.matrix = np.empty((0, 0))
+        self._index: Dict[str, int] = {}
+        self._rates: Dict[Tuple[str, str], Decimal] = {}
+        self._expires = 0.0
+        self._lock = asyncio.Lock()
+        self._stats = {
+            "loads": 0, "load_errors": 0, "publishes": 0, "lookups": 0, "misses": 0,
+            "remote_updates": 0,
+        }
+        # Identifies this process so it can skip its own broadcasts
+        self._instance_id = uuid.uuid4().hex
+        self._listener_task: Optional[asyncio.Task] = None
+
+    # ==================== Loading ====================
+
+    def publish(self, pairs: Iterable) -> bool:
+        """
+        Replace the rates (e.g. right after the FX updater wrote them).
+
+        Args:
+            pairs: (base, quote, rate) tuples or dicts with base_currency,
+                quote_currency and rate keys
+
+        Returns:
+            True if any rate changed (and the version was bumped)
+        """
+        rows = [
+            (p["base_currency"], p["quote_currency"], p["rate"]) if isinstance(p, dict) else tuple(p)
+            for p in pairs
+        ]
+        # Same precision as the rate column, so publishing freshly fetched
+        # floats and reloading them from the database give equal tables
+        rows = [
+            (base, quote, Decimal(str(rate)).quantize(RATE_QUANTUM, rounding=ROUND_HALF_UP))
+            for base, quote, rate in rows
+        ]
+        table = build_rate_table(rows, self.pivot)
+        self._expires = time.monotonic() + self.max_age
+        self._stats["publishes"] += 1
+        if table == self._rates:
+            return False
+
+        currencies = sorted({c for pair in table for c in pair})
+        index = {c: i for i, c in enumerate(currencies)}
+        matrix = np.full((len(currencies), len(currencies)), np.nan)
+        for (base, quote), rate in table.items():
+            matrix[index[base], index[quote]] = float(rate)
+
+        # Swap in one step so readers never see a half-built matrix
+        self._rates, self._index, self.currencies, self.matrix = table, index, currencies, matrix
+        self.version += 1
+        self.loaded_at = datetime.utcnow()
+        logger.info(f"FX matrix v{self.version}: {len(table)} pairs over {len(currencies)} currencies")
+        return True
+
+    async def load(self, db=None) -> bool:
+        """
+        Load every stored pair in one query.
+
+        Args:
+            db: Session to use (default: a new one)
+
+        Returns:
+            True if the load succeeded
+        """
+        from app.db.repositories.exchange_rate import ExchangeRateRepository
+
+        try:
+            if db is not None:
+                rows = await ExchangeRateRepository(db).get_all_rates()
+            else:
+                from app.db.database import get_db
+                rows = []
+                async for session in get_db():
+                    rows = await ExchangeRateRepository(session).get_all_rates()
+            self._stats["loads"] += 1
+            self.publish((r.base_currency, r.quote_currency, r.rate) for r in rows)
+            return True
+        except Exception as e:
+            self._stats["load_errors"] += 1
+            # Keep serving the previous rates; retry after a short pause
+            self._expires = time.monotonic() + min(self.max_age, 30.0)
+            logger.error(f"Error loading FX rate matrix: {e}")
+            return False
+
+    async def ensure_loaded(self) -> None:
+        """Load or refresh the matrix if it is missing or older than max_age."""
+        if time.monotonic() < self._expires:
+            return
+        async with self._lock:
+            if time.monotonic() >= self._expires:
+                await self.load()
+
+    def invalidate(self) -> None:
+        """Force a reload on the next lookup."""
+        self._expires = 0.0
+
+    # ==================== Worker Coherence ====================
+
+    def _update_message(self) -> str:
+        return json.dumps({"origin": self._instance_id, "version": self.version})
+
+    async def broadcast_update(self) -> None:
+        """Tell the other workers that new rates were written to the database."""
+        try:
+            await redis_client.publish(UPDATE_CHANNEL, self._update_message())
+        except Exception as e:
+            # They still reload once their matrix is older than max_age
+            logger.warning(f"FX matrix update broadcast failed: {e}")
+
+    async def handle_update(self, message: str) -> None:
+        """Reload after a broadcast from another worker."""
+        try:
+            payload = json.loads(message)
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring malformed FX matrix update: {message!r}")
+            return
+
+        if payload.get("origin") == self._instance_id:
+            return
+
+        self._stats["remote_updates"] += 1
+        self.invalidate()
+        await self.ensure_loaded()
+
+    async def start_update_listener(self) -> None:
+        """Start the background task that reloads on remote updates."""
+        if self._listener_task and not self._listener_task.done():
+            return
+        self._listener_task = asyncio.create_task(self._listen_updates())
+
+    async def stop_update_listener(self) -> None:
+        """Stop the update listener."""
+        if self._listener_task:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+
+    async def _listen_updates(self) -> None:
+        """Subscribe to the update channel, resubscribing after errors."""
+        while True:
+            pubsub = None
+            try:
+                pubsub = redis_client.pubsub()
+                await pubsub.subscribe(UPDATE_CHANNEL)
+                logger.info(f"FX matrix update listener subscribed to {UPDATE_CHANNEL}")
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        await self.handle_update(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"FX matrix update listener error: {e}")
+                # Updates may have been missed while disconnected
+                self.invalidate()
+                await asyncio.sleep(1.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.unsubscribe(UPDATE_CHANNEL)
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+    # ==================== Lookups ====================
+
+    def rate(self, from_currency: str, to_currency: str) -> Optional[Decimal]:
+        """Rate from the current matrix without refreshing it."""
+        from_currency, to_currency = from_currency.upper(), to_currency.upper()
+        if from_currency == to_currency:
+            return Decimal("1")
+        self._stats["lookups"] += 1
+        rate = self._rates.get((from_currency, to_currency))
+        if rate is None:
+            self._stats["misses"] += 1
+        return rate
+
+    async def get_rate(self, from_currency: str, to_currency: str) -> Optional[Decimal]:
+        """
+        Exchange rate (multiply by this to convert).
+
+        Returns:
+            Decimal rate, or None if the pair cannot be derived
+        """
+        if from_currency.upper() != to_currency.upper():
+            await self.ensure_loaded()
+        return self.rate(from_currency, to_currency)
+
+    async def rates_to(self, currencies: Sequence[str], to_currency: str) -> np.ndarray:
+        """
+        Rate from each currency to to_currency, as a float array.
+
+        Unknown pairs are NaN.
+        """
+        await self.ensure_loaded()
+        index, matrix = self._index, self.matrix
+        currencies = [c.upper() for c in currencies]
+        to_currency = to_currency.upper()
+
+        j = index.get(to_currency)
+        rows = np.array([index.get(c, -1) for c in currencies], dtype=int)
+        rates = np.full(len(rows), np.nan)
+        if j is not None:
+            known = rows >= 0
+            rates[known] = matrix[rows[known], j]
+        rates[np.array([c == to_currency for c in currencies], dtype=bool)] = 1.0
+        return rates
+
+    async def convert_many(
+        self,
+        amounts: Sequence[float],
+        currencies: Sequence[str],
+        to_currency: str
+    ) -> np.ndarray:
+        """
+        Convert many amounts, each in its own currency, with one multiply.
+
+        Args:
+            amounts: Amounts in their native currencies
+            currencies: Native currency of each amount
+            to_currency: Target currency
+
+        Returns:
+            Converted amounts (NaN where the rate is unknown)
+        """
+        return np.asarray(amounts, dtype=float) * await self.rates_to(currencies, to_currency)
+
+    def get_stats(self) -> dict:
+        """Get matrix statistics."""
+        return {
+            **self._stats,
+            "version": self.version,
+            "pairs": len(self._rates),
+            "currencies": self.currencies,
+            "loaded_at": self.loaded_at.isoformat() if self.loaded_at else None,
+        }
+
+
+# Singleton instance
+fx_rate_matrix = FxRateMatrix()
@@ -206,6 +206,11 @@ class FxRateUpdaterService:
             count = await repo.bulk_upsert_rates(rates, source="frankfurter")
             
             logger.info(f"Updated {count} exchange rates in database")
+            
+            # Publish to the in-memory matrix used for conversions
+            from app.services.fx_rate_matrix import fx_rate_matrix
+            if fx_rate_matrix.publish(rates):
+                await fx_rate_matrix.broadcast_update()
             return count
         
         return 0
@@ -23,12 +23,12 @@ from collections import defaultdict
 from loguru import logger
 
 from sqlalchemy import select, func, delete
-from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.database import async_session_maker
 from app.db.models.market_universe import MarketUniverse
 from app.db.models.price_bar import PriceBar, TimeFrame
+from app.db.repositories.price_bar import PriceBarRepository, make_bar_row
 from app.data_providers.orchestrator import ProviderOrchestrator
 from app.data_providers.adapters.base import (
     TimeFrame as ProviderTimeFrame,
@@ -321,48 +321,32 @@ class HistoricalDataCollector:
     
     async def _store_bars(self, symbol: str, bars: List[OHLCV]) -> int:
         """
-        Store OHLCV bars in the database using upsert.
+        Store OHLCV bars in the database with one bulk upsert.
         
         Returns number of rows inserted/updated.
         """
         if not bars:
             return 0
         
+        rows = [
+            make_bar_row(
+                symbol=symbol,
+                timestamp=bar.timestamp,
+                open=bar.open,
+                high=bar.high,
+                low=bar.low,
+                close=bar.close,
+                volume=bar.volume,
+                adjusted_close=bar.adjusted_close,
+                source=bar.provider,
+                vwap=bar.vwap,
+                trade_count=bar.trade_count,
+            )
+            for bar in bars
+        ]
+        
         async with async_session_maker() as db:
-            inserted_count = 0
-            
-            for bar in bars:
-                # Convert timezone-aware timestamp to naive UTC
-                ts = bar.timestamp
-                if ts.tzinfo is not None:
-                    ts = ts.replace(tzinfo=None)
-                
-                # Use PostgreSQL upsert (INSERT ... ON CONFLICT UPDATE)
-                stmt = insert(PriceBar).values(
-                    symbol=symbol.upper(),
-                    timeframe=TimeFrame.D1,
-                    timestamp=ts,
-                    open=float(bar.open),
-                    high=float(bar.high),
-                    low=float(bar.low),
-                    close=float(bar.close),
-                    volume=bar.volume,
-                    source=bar.provider
-                ).on_conflict_do_update(
-                    index_elements=['symbol', 'timeframe', 'timestamp'],
-                    set_={
-                        'open': float(bar.open),
-                        'high': float(bar.high),
-                        'low': float(bar.low),
-                        'close': float(bar.close),
-                        'volume': bar.volume,
-                        'source': bar.provider
-                    }
-                )
-                
-                await db.execute(stmt)
-                inserted_count += 1
-            
+            inserted_count = await PriceBarRepository(db).bulk_upsert(rows)
             await db.commit()
             
         return inserted_count
@@ -533,16 +517,14 @@ class HistoricalDataCollector:
         data,
         stats: Dict
     ) -> int:
-        """Insert OHLCV bars for a single symbol from DataFrame."""
-        count = 0
+        """Upsert OHLCV bars for a single symbol from DataFrame."""
+        rows = []
         
         for idx, row in data.iterrows():
             try:
                 # Skip rows with NaN values
                 if row.isna().all():
                     continue
-                    
-                ts = idx.to_pydatetime().replace(tzinfo=None)
                 
                 # Handle column names (may be lowercase or capitalized)
                 open_val = row.get('Open') or row.get('open')
@@ -554,33 +536,21 @@ class HistoricalDataCollector:
                 if open_val is None or close_val is None:
                     continue
                 
-                stmt = insert(PriceBar).values(
+                rows.append(make_bar_row(
                     symbol=symbol,
-                    timeframe=TimeFrame.D1,
-                    timestamp=ts,
-                    open=float(open_val),
-                    high=float(high_val),
-                    low=float(low_val),
-                    close=float(close_val),
+                    timestamp=idx.to_pydatetime(),
+                    open=open_val,
+                    high=high_val,
+                    low=low_val,
+                    close=close_val,
                     volume=int(volume_val) if volume_val else 0,
-                    source='yfinance'
-                ).on_conflict_do_update(
-                    index_elements=['symbol', 'timeframe', 'timestamp'],
-                    set_={
-                        'open': float(open_val),
-                        'high': float(high_val),
-                        'low': float(low_val),
-                        'close': float(close_val),
-                        'volume': int(volume_val) if volume_val else 0,
-                        'source': 'yfinance'
-                    }
-                )
-                await db.execute(stmt)
-                count += 1
+                    source='yfinance',
+                ))
                 
             except Exception as e:
-                logger.debug(f"Error inserting bar for {symbol} at {idx}: {e}")
+                logger.debug(f"Error preparing bar for {symbol} at {idx}: {e}")
         
+        count = await PriceBarRepository(db).bulk_upsert(rows)
         stats["bars_inserted"] += count
         return count
 
@@ -0,0 +1,471 @@
+"""
+Portfolio Snapshot Service
+
+Maintains the portfolio_daily_snapshots table: one end-of-day NAV row per
+portfolio per weekday, built from executed trades and price_bars closes.
+
+Incremental by design:
+- The nightly job starts from each portfolio's latest snapshot (cash and
+  holdings are stored on it) and only applies trades/closes after that day
+- Backfill starts from portfolio inception (initial_capital as first flow)
+- Analytics read one indexed (portfolio_id, snapshot_date) range
+
+APPROACH B - Dynamic FX:
+- Holdings are valued in NATIVE currency and converted with the FX rate
+  current at build time, like positions.market_value. Nightly rows thus
+  carry that day's rate; backfilled history uses today's rate.
+"""
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+from collections import defaultdict
+
+import numpy as np
+from sqlalchemy import select, delete, func, and_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from loguru import logger
+
+from app.db.models.portfolio import Portfolio
+from app.db.models.portfolio_snapshot import PortfolioDailySnapshot
+from app.db.models.price_bar import PriceBar, TimeFrame
+from app.db.models.trade import Trade, TradeType, TradeStatus
+
+
+# Days of closes loaded before the first new day, so a holding whose market
+# was closed (holiday) still has a price to carry forward
+PRICE_LOOKBACK_DAYS = 10
+
+# Rows per INSERT ... ON CONFLICT statement
+UPSERT_CHUNK_SIZE = 2000
+
+
+@dataclass
+class SnapshotState:
+    """Portfolio state at the end of the last materialized day."""
+    cash: Decimal = Decimal("0")
+    holdings: Dict[str, Tuple[Decimal, str]] = field(default_factory=dict)
+    prev_nav: Optional[Decimal] = None
+
+    @classmethod
+    def from_snapshot(cls, snapshot: PortfolioDailySnapshot) -> "SnapshotState":
+        holdings = {
+            symbol: (Decimal(qty), currency)
+            for symbol, (qty, currency) in (snapshot.holdings or {}).items()
+        }
+        return cls(cash=Decimal(snapshot.cash), holdings=holdings, prev_nav=Decimal(snapshot.nav))
+
+
+def build_snapshots(
+    portfolio_id: int,
+    state: SnapshotState,
+    start: date,
+    end: date,
+    trades: Iterable[Trade],
+    closes: Dict[str, List[Tuple[date, float]]],
+    fx_rates: Dict[str, Decimal],
+    inception_flow: Optional[Decimal] = None,
+) -> List[dict]:
+    """
+    Roll a portfolio forward one day at a time from `state`.
+
+    Args:
+        portfolio_id: Portfolio ID
+        state: Cash/holdings at the end of the day before `start` (mutated)
+        start: First day to materialize
+        end: Last day to materialize
+        trades: Executed trades on or after `start`, sorted by executed_at
+        closes: {symbol: [(day, close), ...]} sorted, may start before `start`
+        fx_rates: {native_currency: rate to portfolio currency}
+        inception_flow: Initial capital booked as a flow on `start`
+
+    Returns:
+        Snapshot row dicts for every weekday in [start, end]; trades and
+        flows dated on a weekend are counted on the following weekday
+    """
+    pending = sorted(trades, key=lambda t: t.executed_at)
+    trade_idx = 0
+    price_idx = {symbol: 0 for symbol in closes}
+    last_price: Dict[str, Decimal] = {}
+    rows = []
+
+    # Flows and trades on weekend days roll into the next weekday's row
+    flow = Decimal("0")
+    day_trades = 0
+
+    day = start
+    while day <= end:
+        if inception_flow is not None and day == start:
+            flow += inception_flow
+            state.cash += inception_flow
+
+        while trade_idx < len(pending) and pending[trade_idx].executed_at.date() <= day:
+            _apply_trade(state, pending[trade_idx], last_price)
+            trade_idx += 1
+            day_trades += 1
+
+        # Carry the latest close on or before `day`
+        for symbol, series in closes.items():
+            i = price_idx[symbol]
+            while i < len(series) and series[i][0] <= day:
+                last_price[symbol] = Decimal(str(series[i][1]))
+                i += 1
+            price_idx[symbol] = i
+
+        if day.weekday() < 5:
+            positions_value = Decimal("0")
+            for symbol, (qty, currency) in state.holdings.items():
+                price = last_price.get(symbol)
+                if price is None:
+                    continue
+                positions_value += qty * price * fx_rates.get(currency, Decimal("1"))
+
+            positions_value = positions_value.quantize(Decimal("0.01"))
+            nav = state.cash + positions_value
+            daily_return = None
+            if state.prev_nav is not None and state.prev_nav > 0:
+                daily_return = float((nav - flow) / state.prev_nav - 1)
+
+            rows.append({
+                "portfolio_id": portfolio_id,
+                "snapshot_date": day,
+                "nav": nav,
+                "cash": state.cash,
+                "positions_value": positions_value,
+                "net_flow": flow,
+                "daily_return": daily_return,
+                "trade_count": day_trades,
+                "holdings": {s: [str(q), c] for s, (q, c) in state.holdings.items()},
+            })
+            state.prev_nav = nav
+            flow = Decimal("0")
+            day_trades = 0
+
+        day += timedelta(days=1)
+
+    return rows
+
+
+def _apply_trade(state: SnapshotState, trade: Trade, last_price: Dict[str, Decimal]) -> None:
+    """Apply one executed trade; amounts on trades are in PORTFOLIO currency."""
+    quantity = trade.executed_quantity or trade.quantity or Decimal("0")
+    total_value = trade.total_value or Decimal("0")
+    commission = trade.commission or Decimal("0")
+    qty, currency = state.holdings.get(trade.symbol, (Decimal("0"), trade.native_currency or "USD"))
+
+    if trade.trade_type == TradeType.BUY:
+        state.cash -= total_value + commission
+        qty += quantity
+    else:
+        state.cash += total_value - commission
+        qty -= quantity
+
+    if qty > 0:
+        state.holdings[trade.symbol] = (qty, currency)
+    else:
+        state.holdings.pop(trade.symbol, None)
+
+    # Fill price until a close is available for the symbol
+    if trade.executed_price is not None and trade.symbol not in last_price:
+        last_price[trade.symbol] = Decimal(trade.executed_price)
+
+
+class PortfolioSnapshotService:
+    """
+    Builds and reads portfolio_daily_snapshots.
+
+    Usage:
+        service = PortfolioSnapshotService(db)
+        stats = await service.update_all()                 # nightly append
+        stats = await service.update_all(rebuild=True)     # full backfill
+        returns, dates = await service.get_return_series(portfolio_id, start, end)
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    # ==================== Build ====================
+
+    async def update_all(
+        self,
+        through: Optional[date] = None,
+        portfolio_ids: Optional[List[int]] = None,
+        rebuild: bool = False,
+    ) -> Dict:
+        """
+        Append snapshots up to `through` for every (or the given) portfolio.
+
+        Args:
+            through: Last day to materialize (default and upper bound:
+                yesterday UTC; a day is only built once it is over, because
+                the next run starts the day after the latest snapshot)
+            portfolio_ids: Restrict to these portfolios (default: all active)
+            rebuild: Drop existing snapshots and rebuild from inception
+
+        Returns:
+            Stats dict
+        """
+        started = time.perf_counter()
+        last_closed = datetime.utcnow().date() - timedelta(days=1)
+        through = min(through or last_closed, last_closed)
+        stats = {"portfolios": 0, "rows_written": 0, "up_to_date": 0, "failed": 0}
+
+        query = select(Portfolio)
+        if portfolio_ids:
+            query = query.where(Portfolio.id.in_(portfolio_ids))
+        else:
+            query = query.where(Portfolio.is_active == True)
+        portfolios = (await self.db.execute(query)).scalars().all()
+        stats["portfolios"] = len(portfolios)
+        if not portfolios:
+            return stats
+
+        ids = [p.id for p in portfolios]
+        if rebuild:
+            await self.db.execute(
+                delete(PortfolioDailySnapshot).where(PortfolioDailySnapshot.portfolio_id.in_(ids))
+            )
+            latest = {}
+        else:
+            latest = await self._latest_snapshots(ids)
+
+        for portfolio in portfolios:
+            try:
+                written = await self._update_portfolio(portfolio, latest.get(portfolio.id), through)
+                if written:
+                    stats["rows_written"] += written
+                else:
+                    stats["up_to_date"] += 1
+            except Exception as e:
+                logger.error(f"Snapshot update failed for portfolio {portfolio.id}: {e}")
+                stats["failed"] += 1
+
+        await self.db.commit()
+        stats["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(f"Portfolio snapshots: {stats}")
+        return stats
+
+    async def _update_portfolio(
+        self,
+        portfolio: Portfolio,
+        last: Optional[PortfolioDailySnapshot],
+        through: date,
+    ) -> int:
+        """Materialize the days after `last` (or since inception) for one portfolio."""
+        if last is not None:
+            start = last.snapshot_date + timedelta(days=1)
+            state = SnapshotState.from_snapshot(last)
+            inception_flow = None
+        else:
+            start = await self._inception_date(portfolio)
+            state = SnapshotState()
+            inception_flow = Decimal(portfolio.initial_capital or 0)
+
+        if start > through:
+            return 0
+
+        trades = await self._load_trades(portfolio.id, start, through)
+        symbols = set(state.holdings) | {t.symbol for t in trades}
+        closes = await self._load_closes(symbols, start - timedelta(days=PRICE_LOOKBACK_DAYS), through)
+
+        currencies = {c for _, c in state.holdings.values()} | {t.native_currency or "USD" for t in trades}
+        fx_rates = await self._load_fx_rates(currencies, portfolio.currency or "USD")
+
+        rows = build_snapshots(
+            portfolio.id, state, start, through, trades, closes, fx_rates, inception_flow
+        )
+        await self._upsert(rows)
+        return len(rows)
+
+    async def _latest_snapshots(self, portfolio_ids: List[int]) -> Dict[int, PortfolioDailySnapshot]:
+        """Latest snapshot per portfolio in one query."""
+        latest_day = (
+            select(
+                PortfolioDailySnapshot.portfolio_id,
+                func.max(PortfolioDailySnapshot.snapshot_date).label("day"),
+            )
+            .where(PortfolioDailySnapshot.portfolio_id.in_(portfolio_ids))
+            .group_by(PortfolioDailySnapshot.portfolio_id)
+            .subquery()
+        )
+        result = await self.db.execute(
+            select(PortfolioDailySnapshot).join(
+                latest_day,
+                and_(
+                    PortfolioDailySnapshot.portfolio_id == latest_day.c.portfolio_id,
+                    PortfolioDailySnapshot.snapshot_date == latest_day.c.day,
+                ),
+            )
+        )
+        return {s.portfolio_id: s for s in result.scalars().all()}
+
+    async def _inception_date(self, portfolio: Portfolio) -> date:
+        """Portfolio creation day, or its first trade if that is earlier."""
+        first_trade = (await self.db.execute(
+            select(func.min(Trade.executed_at)).where(Trade.portfolio_id == portfolio.id)
+        )).scalar()
+        candidates = [d.date() for d in (portfolio.created_at, first_trade) if d is not None]
+        return min(candidates) if candidates else datetime.utcnow().date()
+
+    async def _load_trades(self, portfolio_id: int, start: date, end: date) -> List[Trade]:
+        """Executed (or partially filled) trades in [start, end]."""
+        result = await self.db.execute(
+            select(Trade)
+            .where(
+                Trade.portfolio_id == portfolio_id,
+                Trade.status.in_([TradeStatus.EXECUTED, TradeStatus.PARTIAL]),
+                Trade.executed_at >= datetime.combine(start, datetime.min.time()),
+                Trade.executed_at < datetime.combine(end + timedelta(days=1), datetime.min.time()),
+            )
+            .order_by(Trade.executed_at)
+        )
+        return list(result.scalars().all())
+
+    async def _load_closes(
+        self,
+        symbols: Iterable[str],
+        start: date,
+        end: date,
+    ) -> Dict[str, List[Tuple[date, float]]]:
+        """Daily closes for all symbols in one range query."""
+        symbols = sorted(set(symbols))
+        if not symbols:
+            return {}
+
+        result = await self.db.execute(
+            select(PriceBar.symbol, PriceBar.timestamp, PriceBar.close)
+            .where(
+                PriceBar.symbol.in_(symbols),
+                PriceBar.timeframe == TimeFrame.D1,
+                PriceBar.timestamp >= datetime.combine(start, datetime.min.time()),
+                PriceBar.timestamp < datetime.combine(end + timedelta(days=1), datetime.min.time()),
+            )
+            .order_by(PriceBar.symbol, PriceBar.timestamp)
+        )
+        closes: Dict[str, List[Tuple[date, float]]] = defaultdict(list)
+        for symbol, ts, close in result.all():
+            closes[symbol].append((ts.date(), close))
+        return dict(closes)
+
+    async def _load_fx_rates(self, currencies: Iterable[str], portfolio_currency: str) -> Dict[str, Decimal]:
+        """Current rate from each native currency to the portfolio currency."""
+        from app.utils.currency import get_exchange_rate
+
+        rates = {}
+        for currency in set(currencies):
+            if currency == portfolio_currency:
+                rates[currency] = Decimal("1")
+            else:
+                rates[currency] = await get_exchange_rate(currency, portfolio_currency)
+        return rates
+
+    async def _upsert(self, rows: List[dict]) -> None:
+        """Write snapshot rows, replacing any existing row for the same day."""
+        for i in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            stmt = insert(PortfolioDailySnapshot).values(rows[i:i + UPSERT_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_portfolio_snapshots_day",
+                set_={
+                    col: stmt.excluded[col]
+                    for col in (
+                        "nav", "cash", "positions_value", "net_flow",
+                        "daily_return", "trade_count", "holdings",
+                    )
+                },
+            )
+            await self.db.execute(stmt)
+
+    # ==================== Read ====================
+
+    async def get_return_series(
+        self,
+        portfolio_id: int,
+        start: datetime,
+        end: datetime,
+    ) -> Tuple[np.ndarray, List[datetime]]:
+        """
+        Daily time-weighted returns from the snapshot table.
+
+        Args:
+            portfolio_id: Portfolio ID
+            start: Range start
+            end: Range end
+
+        Returns:
+            (returns array, list of datetimes) for days with a prior NAV
+        """
+        result = await self.db.execute(
+            select(PortfolioDailySnapshot.snapshot_date, PortfolioDailySnapshot.daily_return)
+            .where(
+                PortfolioDailySnapshot.portfolio_id == portfolio_id,
+                PortfolioDailySnapshot.snapshot_date >= _as_date(start),
+                PortfolioDailySnapshot.snapshot_date <= _as_date(end),
+                PortfolioDailySnapshot.daily_return.is_not(None),
+            )
+            .order_by(PortfolioDailySnapshot.snapshot_date)
+        )
+        rows = result.all()
+        returns = np.array([r for _, r in rows], dtype=float)
+        dates = [datetime.combine(d, datetime.min.time()) for d, _ in rows]
+        return returns, dates
+
+    async def get_benchmark_returns(
+        self,
+        symbol: str,
+        start: datetime,
+        end: datetime,
+        dates: Optional[List[datetime]] = None,
+    ) -> np.ndarray:
+        """
+        Daily benchmark returns from price_bars.
+
+        With `dates`, closes are carried forward onto those days so the
+        result aligns element-wise with a portfolio return series.
+        """
+        lookback = _as_date(start) - timedelta(days=PRICE_LOOKBACK_DAYS)
+        closes = (await self._load_closes([symbol.upper()], lookback, _as_date(end))).get(symbol.upper(), [])
+        if len(closes) < 2:
+            return np.empty(0)
+
+        days = np.array([d for d, _ in closes], dtype="datetime64[D]")
+        values = np.array([c for _, c in closes], dtype=float)
+
+        if not dates:
+            # Returns of every bar in range, the first one vs the last close before it
+            first = int(np.searchsorted(days, np.datetime64(_as_date(start), "D")))
+            prices = values[max(first - 1, 0):]
+            return np.diff(prices) / prices[:-1]
+
+        targets = np.array(
+            [_as_date(dates[0]) - timedelta(days=1)] + [_as_date(d) for d in dates],
+            dtype="datetime64[D]",
+        )
+        idx = np.searchsorted(days, targets, side="right") - 1
+        prices = np.where(idx >= 0, values[np.clip(idx, 0, None)], np.nan)
+        returns = np.diff(prices) / prices[:-1]
+        return np.nan_to_num(returns, nan=0.0)
+
+
+def _as_date(value) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+async def run_portfolio_snapshot_update(db: AsyncSession) -> Dict:
+    """
+    Nightly job: append the snapshot of the day that just closed for every
+    active portfolio.
+
+    Args:
+        db: Database session
+
+    Returns:
+        Stats dict
+    """
+    try:
+        return await PortfolioSnapshotService(db).update_all()
+    except Exception as e:
+        logger.error(f"Portfolio snapshot update failed: {e}")
+        await db.rollback()
+        return {"portfolios": 0, "rows_written": 0, "up_to_date": 0, "failed": 0}
@@ -2,7 +2,9 @@
 Currency Conversion Service
 
 Provides currency conversion using cached exchange rates from database.
-Rates are updated hourly by the fx_rate_update scheduled job.
+Rates are updated hourly by the fx_rate_update scheduled job and served
+from the in-memory FX rate matrix (app.services.fx_rate_matrix), so a
+conversion is a dictionary read, not a query.
 
 SINGLE CURRENCY MODEL:
 This module provides the unified convert() function that should be used
@@ -42,7 +44,10 @@ async def get_exchange_rate_from_db(
     to_currency: str,
 ) -> Optional[Decimal]:
     """
-    Get exchange rate from database.
+    Get exchange rate from the database-backed FX rate matrix.
+    
+    The matrix holds every pair of the exchange_rates table (loaded in
+    one query) plus derived cross rates.
     
     Args:
         from_currency: Source currency code
@@ -51,22 +56,12 @@ async def get_exchange_rate_from_db(
     Returns:
         Decimal rate or None if not found
     """
-    from app.db.database import get_db
-    from app.db.repositories.exchange_rate import ExchangeRateRepository
+    from app.services.fx_rate_matrix import fx_rate_matrix
     
     if from_currency == to_currency:
         return Decimal("1.0")
     
-    try:
-        async for db in get_db():
-            repo = ExchangeRateRepository(db)
-            rate_obj = await repo.get_rate(from_currency, to_currency)
-            if rate_obj:
-                return rate_obj.rate
-            return None
-    except Exception as e:
-        logger.error(f"Error fetching rate from DB: {e}")
-        return None
+    return await fx_rate_matrix.get_rate(from_currency, to_currency)
 
 
 async def fetch_exchange_rates(base: str = "USD") -> dict[str, float]:
@@ -231,6 +226,34 @@ async def get_exchange_rate(from_currency: str, to_currency: str) -> Decimal:
     
     # Try database first
     rate = await get_exchange_rate_from_db(from_currency, to_currency)
+    return _rate_or_fallback(rate, from_currency, to_currency)
+
+
+def lookup_exchange_rate(from_currency: str, to_currency: str) -> Decimal:
+    """
+    Get the exchange rate from the already loaded FX rate matrix.
+    
+    Same rounding and fallback as get_exchange_rate(), without any I/O:
+    await fx_rate_matrix.ensure_loaded() once before a batch of lookups.
+    
+    Args:
+        from_currency: Source currency code
+        to_currency: Target currency code
+        
+    Returns:
+        Decimal exchange rate (multiply by this to convert)
+    """
+    from app.services.fx_rate_matrix import fx_rate_matrix
+    
+    if from_currency == to_currency:
+        return Decimal("1.0")
+    
+    rate = fx_rate_matrix.rate(from_currency, to_currency)
+    return _rate_or_fallback(rate, from_currency, to_currency)
+
+
+def _rate_or_fallback(rate: Optional[Decimal], from_currency: str, to_currency: str) -> Decimal:
+    """Round a stored rate, or fall back to the hardcoded rates if there is none."""
     if rate:
         return rate.quantize(Decimal("0.000001"), rounding=ROUND_HALF_UP)
     
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Portfolio Snapshot Backfill
+
+Builds portfolio_daily_snapshots for existing portfolios from their trades
+and price_bars. By default it only appends the days missing since each
+portfolio's latest snapshot (inception for portfolios without one), which
+is what the nightly job does; --rebuild recomputes everything.
+
+Run scripts/download_historical_data.py first so price_bars covers the
+portfolios' history.
+
+Usage:
+    python scripts/backfill_portfolio_snapshots.py
+
+    # Or with custom settings:
+    python scripts/backfill_portfolio_snapshots.py --portfolio 12 --portfolio 15 --rebuild
+"""
+import asyncio
+import argparse
+import sys
+from datetime import datetime
+from loguru import logger
+
+# Add parent to path for imports
+sys.path.insert(0, '/app')
+
+from app.db.database import get_db
+from app.services.portfolio_snapshots import PortfolioSnapshotService
+
+
+# Configure logger
+logger.remove()
+logger.add(
+    sys.stdout,
+    format="<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | {message}",
+    level="INFO"
+)
+
+
+async def main(portfolio_ids=None, rebuild: bool = False, through: str = None):
+    """Backfill snapshots for all (or selected) portfolios."""
+    through_date = datetime.strptime(through, '%Y-%m-%d').date() if through else None
+
+    logger.info(f"=" * 60)
+    logger.info(f"PORTFOLIO SNAPSHOT BACKFILL")
+    logger.info(f"=" * 60)
+    logger.info(f"Portfolios: {portfolio_ids or 'all active'}")
+    logger.info(f"Mode: {'rebuild from inception' if rebuild else 'append missing days'}")
+
+    stats = {}
+    async for db in get_db():
+        stats = await PortfolioSnapshotService(db).update_all(
+            through=through_date,
+            portfolio_ids=portfolio_ids,
+            rebuild=rebuild
+        )
+        break
+
+    logger.info(f"Portfolios: {stats.get('portfolios', 0)}")
+    logger.info(f"Rows written: {stats.get('rows_written', 0):,}")
+    logger.info(f"Already up to date: {stats.get('up_to_date', 0)}")
+    logger.info(f"Failed: {stats.get('failed', 0)}")
+    logger.info(f"Duration: {stats.get('duration_ms', 0)}ms")
+
+    return stats
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Backfill portfolio daily snapshots')
+    parser.add_argument('--portfolio', type=int, action='append', dest='portfolio_ids',
+                        help='Portfolio ID (repeatable, includes inactive portfolios)')
+    parser.add_argument('--rebuild', action='store_true', help='Delete and rebuild from inception')
+    parser.add_argument('--through', type=str, default=None, help='Last day to build (YYYY-MM-DD)')
+
+    args = parser.parse_args()
+
+    asyncio.run(main(
+        portfolio_ids=args.portfolio_ids,
+        rebuild=args.rebuild,
+        through=args.through
+    ))
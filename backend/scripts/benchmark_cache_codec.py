@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Cache Codec Benchmark
+
+Compares the JSON cache format with the packed binary codec for OHLCV
+series and quote batches: encode/decode throughput and the size of the
+value stored in Redis.
+
+Usage:
+    python scripts/benchmark_cache_codec.py
+
+    # Or with custom settings:
+    python scripts/benchmark_cache_codec.py --symbols 500 --bars 252 --repeat 3
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Callable
+
+import numpy as np
+
+# Add backend to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.data_providers.adapters.base import Quote, OHLCV
+from app.data_providers.cache_manager import CacheSerializer, CacheConfig
+
+
+def make_series(symbol: str, bars: int, rng: np.random.Generator) -> list[OHLCV]:
+    """Generate a random daily bar series."""
+    start = datetime(2024, 1, 2, tzinfo=timezone.utc)
+    closes = 100 * np.cumprod(1 + rng.normal(0, 0.01, bars))
+
+    return [
+        OHLCV(
+            symbol=symbol,
+            timestamp=start + timedelta(days=i),
+            open=Decimal(str(round(c * 0.995, 4))),
+            high=Decimal(str(round(c * 1.01, 4))),
+            low=Decimal(str(round(c * 0.99, 4))),
+            close=Decimal(str(round(c, 4))),
+            volume=int(rng.integers(1e5, 1e7)),
+            provider="yfinance",
+            adjusted_close=Decimal(str(round(c, 4))),
+        )
+        for i, c in enumerate(closes)
+    ]
+
+
+def make_quotes(count: int, rng: np.random.Generator) -> list[Quote]:
+    """Generate a batch of random quotes."""
+    now = datetime.now(timezone.utc)
+    quotes = []
+    for i in range(count):
+        price = round(float(rng.uniform(10, 500)), 2)
+        quotes.append(Quote(
+            symbol=f"SYM{i}",
+            price=Decimal(str(price)),
+            bid=Decimal(str(round(price - 0.01, 2))),
+            ask=Decimal(str(round(price + 0.01, 2))),
+            volume=int(rng.integers(1e5, 1e7)),
+            timestamp=now,
+            provider="finnhub",
+            change=Decimal("1.25"),
+            change_percent=Decimal("0.42"),
+            prev_close=Decimal(str(round(price - 1.25, 2))),
+            exchange="NASDAQ",
+        ))
+    return quotes
+
+
+def timed(fn: Callable, repeat: int) -> tuple[float, object]:
+    """Best-of-N wall time in seconds and the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def report(label: str, rows: int, json_enc, json_dec, bin_enc, bin_dec, json_size, bin_size) -> None:
+    print(f"\n{label} ({rows:,} rows)")
+    print(f"  {'':10}{'encode':>12}{'decode':>12}{'payload':>14}")
+    print(f"  {'json':10}{json_enc * 1000:>10.1f}ms{json_dec * 1000:>10.1f}ms{json_size:>12,} B")
+    print(f"  {'binary':10}{bin_enc * 1000:>10.1f}ms{bin_dec * 1000:>10.1f}ms{bin_size:>12,} B")
+    print(
+        f"  speedup: encode x{json_enc / bin_enc:.1f}, decode x{json_dec / bin_dec:.1f}, "
+        f"size x{json_size / bin_size:.1f} smaller"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark cache serialization formats")
+    parser.add_argument("--symbols", type=int, default=500, help="Number of bar series")
+    parser.add_argument("--bars", type=int, default=252, help="Bars per series")
+    parser.add_argument("--quotes", type=int, default=500, help="Quotes per batch")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    threshold = CacheConfig().compress_threshold
+    series = [make_series(f"SYM{i}", args.bars, rng) for i in range(args.symbols)]
+
+    json_enc, json_payloads = timed(
+        lambda: [CacheSerializer.serialize_ohlcv_list(s) for s in series], args.repeat
+    )
+    bin_enc, bin_payloads = timed(
+        lambda: [CacheSerializer.pack_ohlcv_list(s, threshold) for s in series], args.repeat
+    )
+    json_dec, _ = timed(
+        lambda: [CacheSerializer.deserialize_ohlcv_list(p) for p in json_payloads], args.repeat
+    )
+    bin_dec, _ = timed(
+        lambda: [CacheSerializer.deserialize_ohlcv_list(p) for p in bin_payloads], args.repeat
+    )
+    # Reader used before the codec: parse, re-dump and re-parse every bar
+    legacy_dec, _ = timed(
+        lambda: [
+            [CacheSerializer.deserialize_ohlcv(json.dumps(d)) for d in json.loads(p)]
+            for p in json_payloads
+        ],
+        args.repeat,
+    )
+    report(
+        f"OHLCV: {args.symbols} series x {args.bars} bars",
+        args.symbols * args.bars,
+        json_enc, json_dec, bin_enc, bin_dec,
+        sum(len(p) for p in json_payloads),
+        sum(len(p) for p in bin_payloads),
+    )
+    print(f"  pre-codec JSON reader: {legacy_dec * 1000:.1f}ms (decode x{legacy_dec / bin_dec:.1f} vs binary)")
+
+    quotes = make_quotes(args.quotes, rng)
+    json_enc, json_payloads = timed(
+        lambda: [CacheSerializer.serialize_quote(q) for q in quotes], args.repeat
+    )
+    bin_enc, bin_payload = timed(
+        lambda: CacheSerializer.pack_quotes(quotes, threshold), args.repeat
+    )
+    json_dec, _ = timed(
+        lambda: [CacheSerializer.deserialize_quote(p) for p in json_payloads], args.repeat
+    )
+    bin_dec, _ = timed(
+        lambda: CacheSerializer.deserialize_quotes(bin_payload), args.repeat
+    )
+    report(
+        "Quotes: one batch",
+        args.quotes,
+        json_enc, json_dec, bin_enc, bin_dec,
+        sum(len(p) for p in json_payloads),
+        len(bin_payload),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Rolling Metrics Benchmark
+
+Compares the per-index window loops previously used by PerformanceAnalytics,
+BenchmarkService and the VaR history endpoint with the vectorized engine in
+app/core/analytics/rolling.py, and checks both give the same numbers.
+
+Usage:
+    python scripts/benchmark_rolling_metrics.py
+
+    # Or with custom settings:
+    python scripts/benchmark_rolling_metrics.py --years 10 --windows 20 60 126 252
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Callable
+
+import numpy as np
+
+# Add backend to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.analytics import rolling
+from app.core.analytics.benchmarking import BenchmarkService
+
+TRADING_DAYS = 252
+RISK_FREE = 0.02
+
+
+# ==================== Former loop implementations ====================
+
+def loop_performance(returns: np.ndarray, window: int) -> dict:
+    """PerformanceAnalytics.calculate_rolling_metrics before vectorization."""
+    results = {}
+    for metric in ('return', 'volatility', 'sharpe'):
+        values = []
+        for i in range(window - 1, len(returns)):
+            w = returns[i - window + 1:i + 1]
+            if metric == 'return':
+                value = np.prod(1 + w) - 1
+            elif metric == 'volatility':
+                value = np.std(w) * np.sqrt(TRADING_DAYS)
+            else:
+                ann_ret = (np.prod(1 + w) - 1) * (TRADING_DAYS / window)
+                ann_vol = np.std(w) * np.sqrt(TRADING_DAYS)
+                value = (ann_ret - RISK_FREE) / ann_vol if ann_vol > 0 else 0
+            values.append(value)
+        results[metric] = np.array(values)
+    return results
+
+
+def loop_benchmark(port: np.ndarray, bench: np.ndarray, window: int) -> dict:
+    """BenchmarkService.calculate_rolling_comparison before vectorization."""
+    results = {}
+    for metric in ('excess_return', 'beta', 'tracking_error', 'information_ratio'):
+        values = []
+        for i in range(window - 1, len(port)):
+            pw = port[i - window + 1:i + 1]
+            bw = bench[i - window + 1:i + 1]
+            if metric == 'excess_return':
+                value = (np.prod(1 + pw) - 1) - (np.prod(1 + bw) - 1)
+            elif metric == 'beta':
+                var = np.var(bw)
+                value = np.cov(pw, bw)[0, 1] / var if var > 0 else 1.0
+            elif metric == 'tracking_error':
+                value = np.std(pw - bw) * np.sqrt(TRADING_DAYS)
+            else:
+                diff = pw - bw
+                te = np.std(diff) * np.sqrt(TRADING_DAYS)
+                value = np.mean(diff) * TRADING_DAYS / te if te > 0 else 0
+            values.append(value)
+        results[metric] = np.array(values)
+    return results
+
+
+def loop_var(returns: np.ndarray, window: int, confidence: float = 0.95) -> np.ndarray:
+    """The /risk/{id}/var-history loop (historical VaR per window)."""
+    return np.array([
+        -np.percentile(returns[i - window + 1:i + 1], (1 - confidence) * 100)
+        for i in range(window - 1, len(returns))
+    ])
+
+
+# ==================== Harness ====================
+
+def timed(fn: Callable, repeat: int) -> tuple[float, object]:
+    """Best-of-N wall time in seconds and the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def max_diff(a: dict, b: dict) -> float:
+    return max(float(np.max(np.abs(np.asarray(a[k]) - np.asarray(b[k])))) for k in a)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark rolling metric engines")
+    parser.add_argument("--years", type=int, default=10, help="Years of daily data")
+    parser.add_argument("--windows", type=int, nargs="+", default=[20, 60, 126, 252])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    n = args.years * TRADING_DAYS
+    bench = rng.normal(0.0004, 0.011, n)
+    port = 0.9 * bench + rng.normal(0.0001, 0.007, n)
+    service = BenchmarkService(risk_free_rate=RISK_FREE, trading_days=TRADING_DAYS)
+
+    print(f"{n:,} daily returns ({args.years} years)")
+    print(f"  {'window':>6}  {'suite':<12}{'loop':>11}{'vector':>11}{'speedup':>10}{'max |diff|':>13}")
+
+    for window in args.windows:
+        suites = [
+            (
+                "performance",
+                lambda: loop_performance(port, window),
+                lambda: rolling.compute_rolling_metrics(
+                    port, window, trading_days=TRADING_DAYS, risk_free_rate=RISK_FREE
+                ),
+            ),
+            (
+                "benchmark",
+                lambda: loop_benchmark(port, bench, window),
+                lambda: {
+                    k: np.asarray(v.values)
+                    for k, v in service.calculate_rolling_comparison(port, bench, window=window).items()
+                },
+            ),
+            (
+                "var",
+                lambda: {"var": loop_var(port, window)},
+                lambda: {"var": rolling.rolling_historical_var(port, window)},
+            ),
+        ]
+
+        for name, slow, fast in suites:
+            t_loop, expected = timed(slow, args.repeat)
+            t_vec, actual = timed(fast, args.repeat)
+            print(
+                f"  {window:>6}  {name:<12}{t_loop * 1000:>9.1f}ms{t_vec * 1000:>9.2f}ms"
+                f"{t_loop / t_vec:>9.0f}x{max_diff(expected, actual):>13.1e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -26,6 +26,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 sys.path.insert(0, '/app')
 
 from app.db.database import get_db
+from app.db.repositories.price_bar import PriceBarRepository, make_bar_row
 
 
 # Configure logger
@@ -112,62 +113,31 @@ async def delete_existing_data(db: AsyncSession, symbols: List[str]) -> int:
 
 
 async def insert_bars(db: AsyncSession, symbol: str, df: pd.DataFrame) -> int:
-    """Insert OHLCV bars into price_bars table."""
+    """Insert OHLCV bars into price_bars table (existing bars are kept)."""
     if df.empty:
         return 0
     
-    inserted = 0
-    batch_size = 500
-    
-    # Prepare data
     rows = []
     for idx, row in df.iterrows():
-        timestamp = idx.to_pydatetime() if hasattr(idx, 'to_pydatetime') else idx
-        rows.append({
-            'symbol': symbol,
-            'timeframe': 'D1',  # Enum value for daily
-            'timestamp': timestamp,
-            'open': float(row['Open']) if pd.notna(row['Open']) else None,
-            'high': float(row['High']) if pd.notna(row['High']) else None,
-            'low': float(row['Low']) if pd.notna(row['Low']) else None,
-            'close': float(row['Close']) if pd.notna(row['Close']) else None,
-            'volume': int(row['Volume']) if pd.notna(row['Volume']) else 0,
-            'adjusted_close': float(row.get('Adj Close', row['Close'])) if pd.notna(row.get('Adj Close', row['Close'])) else None,
-            'source': 'yfinance'
-        })
-    
-    # Insert in batches
-    for i in range(0, len(rows), batch_size):
-        batch = rows[i:i + batch_size]
+        if pd.isna(row['Open']) or pd.isna(row['High']) or pd.isna(row['Low']) or pd.isna(row['Close']):
+            continue
         
-        values_list = []
-        for r in batch:
-            ts = r['timestamp'].strftime('%Y-%m-%d %H:%M:%S')
-            values_list.append(
-                f"('{r['symbol']}', 'D1', '{ts}', "
-                f"{r['open'] if r['open'] else 'NULL'}, "
-                f"{r['high'] if r['high'] else 'NULL'}, "
-                f"{r['low'] if r['low'] else 'NULL'}, "
-                f"{r['close'] if r['close'] else 'NULL'}, "
-                f"{r['volume']}, "
-                f"{r['adjusted_close'] if r['adjusted_close'] else 'NULL'}, "
-                f"'{r['source']}')"
-            )
-        
-        query = text(f"""
-            INSERT INTO price_bars 
-            (symbol, timeframe, timestamp, open, high, low, close, volume, adjusted_close, source)
-            VALUES {', '.join(values_list)}
-            ON CONFLICT DO NOTHING
-        """)
-        
-        try:
-            await db.execute(query)
-            inserted += len(batch)
-        except Exception as e:
-            logger.warning(f"Insert error for {symbol}: {e}")
+        timestamp = idx.to_pydatetime() if hasattr(idx, 'to_pydatetime') else idx
+        adj_close = row.get('Adj Close', row['Close'])
+        rows.append(make_bar_row(
+            symbol=symbol,
+            timestamp=timestamp,
+            open=row['Open'],
+            high=row['High'],
+            low=row['Low'],
+            close=row['Close'],
+            volume=int(row['Volume']) if pd.notna(row['Volume']) else 0,
+            adjusted_close=adj_close if pd.notna(adj_close) else None,
+            source='yfinance',
+        ))
     
-    return inserted
+    # Multi-row INSERT ... ON CONFLICT DO NOTHING, chunked by the repository
+    return await PriceBarRepository(db).bulk_upsert(rows, update_existing=False)
 
 
 def download_batch(yf_symbols: List[str], start_date: str, end_date: str) -> Dict[str, pd.DataFrame]:
@@ -0,0 +1,207 @@
+"""
+Unit Tests - Backtester
+Tests for the vectorized engine, cross-checked against the event loop.
+"""
+import pytest
+import numpy as np
+import pandas as pd
+from types import SimpleNamespace
+
+from app.ml.training.backtester import (
+    Backtester,
+    WalkForwardBacktester,
+    BacktestConfig,
+    BaseStrategy,
+    MLStrategy,
+)
+
+
+def make_prices(n: int = 160, seed: int = 7) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2023-01-02", periods=n, freq="B")
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0.0005, 0.015, n))), index=index)
+
+
+class MovingAverageStrategy(BaseStrategy):
+    """Long when close > 10-bar mean, flat otherwise (replayed per bar)."""
+
+    def generate_signals(self, data, predictions=None):
+        if len(data) < 10:
+            return {}
+        close = data["close"]
+        return {"default": 1.0 if close.iloc[-1] > close.iloc[-10:].mean() else 0.0}
+
+
+class LongShortStrategy(BaseStrategy):
+    """Long above the 10-bar mean, short below (+/-1 every bar)."""
+
+    def generate_signals(self, data, predictions=None):
+        if len(data) < 10:
+            return {}
+        close = data["close"]
+        return {"default": 1.0 if close.iloc[-1] > close.iloc[-10:].mean() else -1.0}
+
+
+class WideMomentumStrategy(BaseStrategy):
+    """Multi-asset long/flat momentum with a vectorized signal matrix."""
+
+    def __init__(self, symbols):
+        self.symbols = symbols
+
+    def generate_signals(self, data, predictions=None):
+        if len(data) < 6:
+            return {}
+        return {
+            s: float(data[f"{s}_close"].iloc[-1] > data[f"{s}_close"].iloc[-6])
+            for s in self.symbols
+        }
+
+    def generate_signal_matrix(self, data, symbols, predictions=None, start=0):
+        closes = np.column_stack([data[f"{s}_close"].to_numpy() for s in symbols])
+        signals = np.full(closes.shape, np.nan)
+        signals[5:] = (closes[5:] > closes[:-5]).astype(float)
+        signals[:start] = np.nan
+        return signals
+
+
+class DirectionModel:
+    """Predicts up (else neutral) when the last feature rose; counts predict calls."""
+
+    def __init__(self):
+        self.predict_calls = 0
+        self.fit_calls = 0
+
+    def fit(self, X, y):
+        self.fit_calls += 1
+
+    def predict(self, X):
+        self.predict_calls += 1
+        X = np.asarray(X, dtype=float)
+        return [
+            SimpleNamespace(direction="up" if row[-1] > row[0] else "neutral", confidence=0.9)
+            for row in X
+        ]
+
+
+def assert_same_metrics(a, b):
+    expected = b.to_dict()
+    for key, value in a.to_dict().items():
+        assert value == pytest.approx(expected[key], rel=1e-9, abs=1e-9), key
+    np.testing.assert_allclose(a.equity_curve, b.equity_curve, rtol=1e-12)
+
+
+class TestVectorizedBacktest:
+    """Tests for Backtester.run_vectorized."""
+
+    def test_matches_event_loop_single_symbol(self):
+        data = pd.DataFrame({"close": make_prices()})
+        config = BacktestConfig(max_position_size=0.5)
+
+        loop = Backtester(config).run(data, MovingAverageStrategy())
+        fast = Backtester(config).run(data, MovingAverageStrategy(), vectorized=True)
+
+        assert loop.total_trades > 5
+        assert_same_metrics(fast, loop)
+
+    def test_matches_event_loop_multi_asset(self):
+        symbols = ["AAA", "BBB", "CCC"]
+        data = pd.DataFrame({f"{s}_close": make_prices(seed=i) for i, s in enumerate(symbols)})
+        # The event loop reads the symbol list from a 'symbol' column
+        loop_data = data.assign(symbol=(symbols * len(data))[:len(data)])
+        config = BacktestConfig(max_position_size=0.3)
+
+        loop = Backtester(config).run(loop_data, WideMomentumStrategy(symbols))
+        fast = Backtester(config).run_vectorized(data, WideMomentumStrategy(symbols))
+
+        assert loop.total_trades > 10
+        assert_same_metrics(fast, loop)
+
+    def test_insufficient_cash_rejected_in_symbol_order(self):
+        symbols = ["AAA", "BBB"]
+        data = pd.DataFrame({f"{s}_close": make_prices(seed=i) for i, s in enumerate(symbols)})
+        loop_data = data.assign(symbol=(symbols * len(data))[:len(data)])
+        config = BacktestConfig(max_position_size=0.6)
+
+        loop_bt, fast_bt = Backtester(config), Backtester(config)
+        loop = loop_bt.run(loop_data, WideMomentumStrategy(symbols))
+        fast = fast_bt.run_vectorized(data, WideMomentumStrategy(symbols))
+
+        assert_same_metrics(fast, loop)
+        assert fast_bt.cash >= 0
+
+    def test_model_predictions_batched(self):
+        data = pd.DataFrame({"close": make_prices(80)})
+        data["lag"] = data["close"].shift(1).bfill()
+        model = DirectionModel()
+
+        loop = Backtester().run(data, MLStrategy(model, threshold=0.6), model=DirectionModel())
+        fast = Backtester().run(data, MLStrategy(model, threshold=0.6), model=model, vectorized=True)
+
+        assert model.predict_calls == 1
+        assert_same_metrics(fast, loop)
+
+    @pytest.mark.parametrize("allow_short", [True, False])
+    def test_long_short_signals_match_event_loop(self, allow_short):
+        data = pd.DataFrame({"close": make_prices()})
+        config = BacktestConfig(allow_short=allow_short)
+
+        loop_bt, fast_bt = Backtester(config), Backtester(config)
+        loop = loop_bt.run(data, LongShortStrategy())
+        fast = fast_bt.run(data, LongShortStrategy(), vectorized=True)
+
+        assert loop.total_trades > 10
+        assert_same_metrics(fast, loop)
+        assert {s: p.quantity for s, p in fast_bt.positions.items()} == pytest.approx(
+            {s: p.quantity for s, p in loop_bt.positions.items()}
+        )
+        if not allow_short:
+            assert all(t.quantity > 0 for t in loop_bt.trades)
+            assert all(p.quantity > 0 for p in loop_bt.positions.values())
+
+    def test_short_round_trip(self):
+        """Flips and covers are handled as close + open in both engines."""
+        index = pd.date_range("2024-01-01", periods=4, freq="B")
+        data = pd.DataFrame({"close": [100.0, 90.0, 90.0, 95.0]}, index=index)
+
+        class Scripted(BaseStrategy):
+            def generate_signals(self, data, predictions=None):
+                return {"default": [-1.0, 0.0, 1.0, 0.0][len(data) - 1]}
+
+        config = BacktestConfig(max_position_size=0.5, commission_rate=0.0, slippage_rate=0.0)
+        backtester = Backtester(config)
+        metrics = backtester.run_vectorized(data, Scripted())
+        assert_same_metrics(metrics, Backtester(config).run(data, Scripted()))
+
+        # Short 500 @ 100, cover @ 90 (+5000), long 611.1 @ 90, sell @ 95
+        assert metrics.total_trades == 4
+        assert backtester.trades[1].pnl == pytest.approx(5000.0)
+        assert backtester.trades[3].pnl == pytest.approx(105000 * 0.5 / 90 * 5)
+        assert backtester.positions == {}
+
+    def test_final_positions_exposed(self):
+        data = pd.DataFrame({"close": make_prices()})
+        backtester = Backtester()
+        backtester.run_vectorized(data, MovingAverageStrategy())
+
+        equity = backtester.cash + sum(p.market_value for p in backtester.positions.values())
+        assert equity == pytest.approx(backtester.equity_history[-1][1])
+
+
+class TestWalkForwardVectorized:
+    """Tests for per-fold batched walk-forward."""
+
+    def test_matches_event_loop(self):
+        data = pd.DataFrame({"close": make_prices(200)})
+        X = np.column_stack([data["close"].shift(1).bfill(), data["close"]])
+        y = np.zeros(len(data))
+
+        wf_loop = WalkForwardBacktester(train_window=60, retrain_frequency=20)
+        wf_fast = WalkForwardBacktester(train_window=60, retrain_frequency=20)
+        loop_model, fast_model = DirectionModel(), DirectionModel()
+
+        loop = wf_loop.run(data, MLStrategy(loop_model), loop_model, X, y, vectorized=False)
+        fast = wf_fast.run(data, MLStrategy(fast_model), fast_model, X, y)
+
+        assert wf_fast.models_used == wf_loop.models_used
+        assert fast_model.predict_calls == len(wf_fast.models_used) == 7
+        assert_same_metrics(fast, loop)
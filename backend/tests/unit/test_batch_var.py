@@ -0,0 +1,104 @@
+"""
+Unit Tests - Batch VaR
+Tests the many-portfolio VaR/CVaR engine against single-series calculate_var.
+"""
+import numpy as np
+import pytest
+from scipy import stats
+
+from app.core.analytics.risk_metrics import RiskMetrics, VaRMethod
+
+
+LEVELS = (0.95, 0.975, 0.99)
+
+
+@pytest.fixture
+def inputs():
+    rng = np.random.default_rng(11)
+    returns = rng.standard_t(4, (500, 12)) * 0.01
+    returns[::7, 3] = 0.0  # Ties at the tail threshold
+    weights = rng.dirichlet(np.ones(12), 20)
+    return returns, weights
+
+
+class TestCalculateVarBatch:
+    """Tests for RiskMetrics.calculate_var_batch."""
+
+    @pytest.mark.parametrize("method", [
+        VaRMethod.HISTORICAL, VaRMethod.PARAMETRIC, VaRMethod.CORNISH_FISHER
+    ])
+    def test_matches_single_series(self, inputs, method):
+        returns, weights = inputs
+        risk = RiskMetrics()
+
+        batch = risk.calculate_var_batch(returns, weights, LEVELS, [method], time_horizon=5)
+
+        assert batch.var[method].shape == (20, 3)
+        for i in (0, 7, 19):
+            for j, level in enumerate(LEVELS):
+                single = risk.calculate_var(returns @ weights[i], level, method, time_horizon=5)
+                assert batch.var[method][i, j] == pytest.approx(single.var_value)
+                if method != VaRMethod.PARAMETRIC:
+                    assert batch.cvar[method][i, j] == pytest.approx(single.cvar_value)
+
+    def test_parametric_cvar_closed_form(self, inputs):
+        returns, weights = inputs
+        batch = RiskMetrics().calculate_var_batch(returns, weights, LEVELS, [VaRMethod.PARAMETRIC])
+
+        pnl = returns @ weights[3]
+        for j, level in enumerate(LEVELS):
+            z = stats.norm.ppf(1 - level)
+            expected = -(pnl.mean() - pnl.std() * stats.norm.pdf(z) / (1 - level))
+            assert batch.cvar[VaRMethod.PARAMETRIC][3, j] == pytest.approx(expected)
+        assert np.all(batch.cvar[VaRMethod.PARAMETRIC] > batch.var[VaRMethod.PARAMETRIC])
+
+    def test_monte_carlo_shares_scenarios(self, inputs):
+        returns, weights = inputs
+        risk = RiskMetrics()
+        # Duplicate portfolio: identical results only if scenarios are shared
+        weights = np.vstack([weights, weights[:1]])
+
+        batch = risk.calculate_var_batch(
+            returns, weights, LEVELS, [VaRMethod.MONTE_CARLO, VaRMethod.PARAMETRIC],
+            n_simulations=50000, seed=3
+        )
+        mc = batch.var[VaRMethod.MONTE_CARLO]
+
+        np.testing.assert_array_equal(mc[0], mc[-1])
+        np.testing.assert_allclose(mc, batch.var[VaRMethod.PARAMETRIC], rtol=0.05)
+        assert batch.n_simulations == 50000
+        again = risk.calculate_var_batch(returns, weights, LEVELS, [VaRMethod.MONTE_CARLO],
+                                         n_simulations=50000, seed=3)
+        np.testing.assert_array_equal(again.var[VaRMethod.MONTE_CARLO], mc)
+
+    def test_singular_covariance_and_results(self, inputs):
+        returns, weights = inputs
+        returns = np.hstack([returns, returns[:, :1]])
+        weights = np.hstack([weights, np.zeros((20, 1))])
+
+        batch = RiskMetrics().calculate_var_batch(returns, weights, (0.95,), list(VaRMethod), seed=1)
+        results = batch.to_var_results(0)
+
+        assert np.all(np.isfinite(batch.var[VaRMethod.MONTE_CARLO]))
+        assert len(results) == 4
+        assert {r.method for r in results} == set(VaRMethod)
+        assert batch.to_dict()['var']['historical'][0][0] == results[0].var_value
+
+    def test_shape_mismatch(self, inputs):
+        returns, weights = inputs
+        with pytest.raises(ValueError):
+            RiskMetrics().calculate_var_batch(returns, weights[:, :5])
+
+    def test_vectorized_marginal_var(self, inputs):
+        returns, weights = inputs
+        risk = RiskMetrics()
+        w = weights[0]
+
+        result = risk.calculate_var(returns, 0.95, weights=w)
+
+        cov = np.cov(returns.T)
+        z = stats.norm.ppf(0.95)
+        vol = np.sqrt(w @ cov @ w)
+        for i in range(len(w)):
+            assert result.marginal_var[f"asset_{i}"] == pytest.approx(z * cov[i] @ w / vol)
+        assert sum(result.component_var.values()) == pytest.approx(z * vol)
@@ -0,0 +1,148 @@
+"""
+Unit Tests - Cache Codec
+Tests for the packed binary cache format and JSON fallback reading.
+"""
+import pytest
+from decimal import Decimal
+from datetime import datetime, timezone, timedelta
+
+from app.data_providers import cache_codec
+from app.data_providers.adapters.base import Quote, OHLCV, MarketType, TimeFrame
+from app.data_providers.cache_manager import CacheSerializer
+
+
+def make_bar(i: int, **overrides) -> OHLCV:
+    values = dict(
+        symbol="AAPL",
+        timestamp=datetime(2024, 1, 2, tzinfo=timezone.utc) + timedelta(days=i),
+        open=Decimal("189.5"),
+        high=Decimal("191.25"),
+        low=Decimal("188.1"),
+        close=Decimal("190.0") + i,
+        volume=1_000_000 + i,
+        provider="yfinance",
+        timeframe=TimeFrame.DAY,
+        adjusted_close=Decimal("189.97"),
+    )
+    values.update(overrides)
+    return OHLCV(**values)
+
+
+def make_quote(symbol: str, **overrides) -> Quote:
+    values = dict(
+        symbol=symbol,
+        price=Decimal("101.37"),
+        bid=Decimal("101.36"),
+        ask=Decimal("101.38"),
+        volume=12345,
+        timestamp=datetime(2024, 3, 1, 15, 30, tzinfo=timezone.utc),
+        provider="finnhub",
+        market_type=MarketType.US_STOCK,
+        change_percent=Decimal("0.42"),
+        exchange="NASDAQ",
+    )
+    values.update(overrides)
+    return Quote(**values)
+
+
+class TestOHLCVCodec:
+    """Tests for packed OHLCV series."""
+
+    def test_roundtrip_matches_json_path(self):
+        """Packed and JSON formats should decode to identical bars."""
+        bars = [make_bar(i) for i in range(30)]
+
+        packed = CacheSerializer.deserialize_ohlcv_list(CacheSerializer.pack_ohlcv_list(bars))
+        legacy = CacheSerializer.deserialize_ohlcv_list(CacheSerializer.serialize_ohlcv_list(bars))
+
+        assert packed == legacy
+        assert packed[5].close == Decimal("195.0")
+        assert packed[0].timestamp.tzinfo is not None
+
+    def test_optional_fields_and_naive_timestamps(self):
+        """None fields and naive datetimes should survive the round-trip."""
+        bar = make_bar(
+            0,
+            timestamp=datetime(2024, 1, 2, 9, 30),
+            adjusted_close=None,
+            vwap=Decimal("190.12"),
+            trade_count=None,
+            timeframe=TimeFrame.MINUTE_5,
+        )
+
+        decoded = cache_codec.decode_ohlcv_list(cache_codec.encode_ohlcv_list([bar]))[0]
+
+        assert decoded.timestamp == datetime(2024, 1, 2, 9, 30)
+        assert decoded.timestamp.tzinfo is None
+        assert decoded.adjusted_close is None
+        assert decoded.vwap == Decimal("190.12")
+        assert decoded.trade_count is None
+        assert decoded.timeframe == bar.timeframe
+
+    def test_compression_above_threshold(self):
+        """Large payloads should be compressed and still decode."""
+        bars = [make_bar(i) for i in range(200)]
+
+        plain = cache_codec.encode_ohlcv_list(bars)
+        compressed = cache_codec.encode_ohlcv_list(bars, compress_threshold=1024)
+
+        assert len(compressed) < len(plain)
+        assert cache_codec.decode_ohlcv_list(compressed) == cache_codec.decode_ohlcv_list(plain)
+
+    def test_smaller_than_json(self):
+        """The packed format should be smaller than JSON."""
+        bars = [make_bar(i) for i in range(252)]
+
+        assert len(CacheSerializer.pack_ohlcv_list(bars)) < len(
+            CacheSerializer.serialize_ohlcv_list(bars)
+        ) / 2
+
+    def test_empty_list(self):
+        assert cache_codec.decode_ohlcv_list(cache_codec.encode_ohlcv_list([])) == []
+
+    def test_single_bar_readable_as_latest_bar(self):
+        """A packed one-bar series should deserialize through deserialize_ohlcv."""
+        bar = make_bar(0)
+        assert CacheSerializer.deserialize_ohlcv(CacheSerializer.pack_ohlcv_list([bar])) == bar
+
+
+class TestQuoteCodec:
+    """Tests for packed quote batches."""
+
+    def test_batch_roundtrip(self):
+        quotes = [
+            make_quote("AAPL"),
+            make_quote(
+                "ENI.MI", currency="EUR", exchange=None, bid=None, ask=None,
+                market_type=MarketType.EU_STOCK,
+            ),
+        ]
+
+        decoded = CacheSerializer.deserialize_quotes(CacheSerializer.pack_quotes(quotes))
+
+        assert decoded == quotes
+
+    def test_single_quote_fallback_reads_json(self):
+        """Entries written as JSON before the codec existed must still be readable."""
+        quote = make_quote("MSFT")
+
+        assert CacheSerializer.deserialize_quote(CacheSerializer.serialize_quote(quote)) == quote
+        assert CacheSerializer.deserialize_quote(CacheSerializer.pack_quotes([quote])) == quote
+
+    def test_accepts_raw_bytes(self):
+        """Clients without decode_responses hand back bytes."""
+        encoded = cache_codec.encode_quotes([make_quote("AAPL")])
+        assert cache_codec.decode_quotes(encoded.encode())[0].symbol == "AAPL"
+
+
+class TestCodecErrors:
+    """Tests for malformed blobs."""
+
+    def test_rejects_wrong_kind(self):
+        encoded = cache_codec.encode_quotes([make_quote("AAPL")])
+        with pytest.raises(cache_codec.CacheCodecError):
+            cache_codec.decode_ohlcv_list(encoded)
+
+    def test_is_packed(self):
+        assert cache_codec.is_packed(cache_codec.encode_ohlcv_list([make_bar(0)]))
+        assert not cache_codec.is_packed('{"symbol": "AAPL"}')
@@ -0,0 +1,211 @@
+"""
+Unit Tests - Cache Manager
+Tests for the in-process L1 quote tier and its pub/sub invalidation.
+"""
+import asyncio
+import json
+import pytest
+from decimal import Decimal
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.data_providers.adapters.base import Quote
+from app.data_providers.cache_manager import (
+    CacheManager,
+    CacheConfig,
+    CacheSerializer,
+    LRUCache,
+)
+
+
+def make_quote(symbol: str, price: str = "100.00") -> Quote:
+    return Quote(
+        symbol=symbol,
+        price=Decimal(price),
+        timestamp=datetime(2024, 3, 1, 15, 30, tzinfo=timezone.utc),
+        provider="test",
+    )
+
+
+@pytest.fixture
+def mock_redis():
+    """Redis client stand-in with a pipeline."""
+    client = MagicMock()
+    client.get = AsyncMock(return_value=None)
+    client.mget = AsyncMock(return_value=[])
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[])
+    client.pipeline.return_value = pipe
+
+    redis = MagicMock()
+    redis.client = client
+    redis.publish = AsyncMock()
+
+    with patch("app.data_providers.cache_manager.redis_client", redis):
+        yield redis
+
+
+class TestLRUCache:
+    """Tests for the bounded TTL-aware LRU."""
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_expired_entries_purged_before_eviction(self):
+        cache = LRUCache(max_size=2, ttl=60)
+        cache.set("old", 1, ttl=-1)
+        cache.set("a", 2)
+        cache.set("b", 3)
+
+        assert cache.get("a") == 2
+        assert cache.get("b") == 3
+        stats = cache.get_stats()
+        assert stats["evictions"] == 0
+        assert stats["expirations"] == 1
+
+    def test_expired_entry_is_a_miss(self):
+        cache = LRUCache(max_size=10, ttl=-1)
+        cache.set("a", 1)
+
+        assert cache.get("a") is None
+        assert cache.get_stats()["misses"] == 1
+
+    def test_zero_size_disables_cache(self):
+        cache = LRUCache(max_size=0, ttl=60)
+        cache.set("a", 1)
+        assert len(cache) == 0
+
+
+class TestTwoTierQuotes:
+    """Tests for L1 in front of Redis."""
+
+    @pytest.mark.asyncio
+    async def test_l1_hit_skips_redis(self, mock_redis):
+        manager = CacheManager()
+        await manager.set_quote(make_quote("AAPL"))
+
+        quote = await manager.get_quote("aapl")
+
+        assert quote.price == Decimal("100.00")
+        mock_redis.client.get.assert_not_awaited()
+        assert manager.get_stats()["l1"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_populates_l1(self, mock_redis):
+        manager = CacheManager()
+        mock_redis.client.get.return_value = CacheSerializer.serialize_quote(make_quote("MSFT"))
+
+        await manager.get_quote("MSFT")
+        await manager.get_quote("MSFT")
+
+        assert mock_redis.client.get.await_count == 1
+        stats = manager.get_stats()
+        assert stats["hits"] == 1
+        assert stats["l1"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_get_quotes_only_fetches_l1_misses(self, mock_redis):
+        manager = CacheManager()
+        await manager.set_quote(make_quote("AAPL"))
+        mock_redis.client.mget.return_value = [None]
+
+        result = await manager.get_quotes(["AAPL", "MSFT"])
+
+        mock_redis.client.mget.assert_awaited_once_with(["market:quote:MSFT"])
+        assert result["AAPL"].symbol == "AAPL"
+        assert result["MSFT"] is None
+
+    @pytest.mark.asyncio
+    async def test_returned_quotes_are_copies(self, mock_redis):
+        manager = CacheManager()
+        await manager.set_quote(make_quote("AAPL"))
+
+        quote = await manager.get_quote("AAPL")
+        quote.price = Decimal("0")
+
+        assert (await manager.get_quote("AAPL")).price == Decimal("100.00")
+
+    @pytest.mark.asyncio
+    async def test_writes_publish_invalidation(self, mock_redis):
+        manager = CacheManager()
+        await manager.set_quotes([make_quote("AAPL"), make_quote("MSFT")])
+
+        pipe = mock_redis.client.pipeline.return_value
+        channel, message = pipe.publish.call_args.args
+        assert channel == "market:invalidate"
+        assert json.loads(message)["symbols"] == ["AAPL", "MSFT"]
+
+    @pytest.mark.asyncio
+    async def test_l1_disabled(self, mock_redis):
+        manager = CacheManager(CacheConfig(l1_enabled=False))
+        await manager.set_quote(make_quote("AAPL"))
+        await manager.get_quote("AAPL")
+
+        mock_redis.client.get.assert_awaited_once()
+        mock_redis.client.pipeline.return_value.publish.assert_not_called()
+
+
+class TestInvalidation:
+    """Tests for applying remote invalidations."""
+
+    @pytest.mark.asyncio
+    async def test_remote_invalidation_drops_entry(self, mock_redis):
+        worker_a = CacheManager()
+        worker_b = CacheManager()
+        await worker_b.set_quote(make_quote("AAPL"))
+
+        worker_b.handle_invalidation(worker_a._invalidation_message(["AAPL"]))
+
+        await worker_b.get_quote("AAPL")
+        mock_redis.client.get.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_own_invalidation_ignored(self, mock_redis):
+        manager = CacheManager()
+        await manager.set_quote(make_quote("AAPL"))
+
+        manager.handle_invalidation(manager._invalidation_message(["AAPL"]))
+
+        assert manager.get_stats()["l1"]["size"] == 1
+
+    @pytest.mark.asyncio
+    async def test_clear_all_message(self, mock_redis):
+        manager = CacheManager()
+        await manager.set_quotes([make_quote("AAPL"), make_quote("MSFT")])
+
+        manager.handle_invalidation(CacheManager()._invalidation_message(None))
+
+        assert manager.get_stats()["l1"]["size"] == 0
+
+    def test_malformed_message_ignored(self):
+        manager = CacheManager()
+        manager.handle_invalidation("not json")
+
+    @pytest.mark.asyncio
+    async def test_listener_retries_when_pubsub_fails(self, mock_redis):
+        manager = CacheManager()
+        await manager.set_quote(make_quote("AAPL"))
+
+        async def listen():
+            yield {"type": "message", "data": CacheManager()._invalidation_message(["AAPL"])}
+            raise asyncio.CancelledError
+
+        pubsub = MagicMock(subscribe=AsyncMock(), unsubscribe=AsyncMock(), aclose=AsyncMock())
+        pubsub.listen = listen
+        mock_redis.pubsub = MagicMock(side_effect=[ConnectionError("down"), pubsub])
+
+        with patch("app.data_providers.cache_manager.asyncio.sleep", AsyncMock()):
+            with pytest.raises(asyncio.CancelledError):
+                await manager._listen_invalidations()
+
+        assert mock_redis.pubsub.call_count == 2
+        pubsub.aclose.assert_awaited_once()
+        assert manager.get_stats()["l1"]["size"] == 0
@@ -0,0 +1,143 @@
+"""
+Unit Tests - Columnar Feature Store
+Tests for the persistent memory-mapped feature backend.
+"""
+import multiprocessing
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from app.ml.features import (
+    ColumnarFeatureBackend,
+    FeatureStore,
+    TechnicalFeatures,
+    compute_panel_features,
+)
+
+
+def technical(symbol: str, day: str, rsi: float, golden: bool = False) -> TechnicalFeatures:
+    return TechnicalFeatures(symbol=symbol, timestamp=day, rsi_14=rsi, sma_20=100.0 + rsi, golden_cross=golden)
+
+
+def _flush_symbols(root, worker: int) -> None:
+    """Child process: write and flush a few rows per symbol, one flush per day."""
+    backend = ColumnarFeatureBackend(root)
+    for day in ("2024-01-02", "2024-01-03", "2024-01-04"):
+        for j in range(5):
+            backend.write("technical", f"S{worker}_{j}", day, {"rsi_14": worker * 10 + j})
+        backend.flush()
+
+
+class TestColumnarFeatureBackend:
+    """Tests for ColumnarFeatureBackend."""
+
+    def test_point_in_time_lookup(self, tmp_path):
+        backend = ColumnarFeatureBackend(tmp_path)
+        for day, rsi in [("2024-01-30", 40.0), ("2024-02-02", 55.0), ("2024-03-01", 70.0)]:
+            backend.write("technical", "AAPL", day, technical("AAPL", day, rsi).to_dict())
+        backend.write("technical", "MSFT", "2024-02-05", technical("MSFT", "2024-02-05", 10.0).to_dict())
+        assert backend.flush() == 4
+
+        assert backend.as_of("technical", "AAPL", "2024-01-29") is None
+        assert backend.as_of("technical", "AAPL", "2024-02-01").features["rsi_14"] == 40.0
+        row = backend.as_of("technical", "AAPL", "2024-02-28")
+        assert row.date == np.datetime64("2024-02-02")
+        assert row.features["golden_cross"] is False
+        assert backend.as_of("technical", "AAPL").features["rsi_14"] == 70.0
+
+    def test_two_instances_share_symbol_registry(self, tmp_path):
+        """Separate processes (API worker, scheduler) on one directory."""
+        worker = ColumnarFeatureBackend(tmp_path)
+        scheduler = ColumnarFeatureBackend(tmp_path)
+        worker.write("technical", "AAPL", "2024-01-02", {"rsi_14": 40.0})
+        scheduler.write("technical", "MSFT", "2024-01-02", {"rsi_14": 60.0})
+        scheduler.write("technical", "NVDA", "2024-01-03", {"rsi_14": 80.0})
+
+        worker.flush()
+        scheduler.flush()
+
+        for backend in (worker, scheduler):
+            assert backend.as_of("technical", "AAPL").features["rsi_14"] == 40.0
+            assert backend.as_of("technical", "MSFT").features["rsi_14"] == 60.0
+            assert backend.as_of("technical", "NVDA").features["rsi_14"] == 80.0
+            window = backend.window("technical", "2024-01-01", "2024-01-31")
+            assert list(window.symbols) == ["AAPL", "MSFT", "NVDA"]
+
+    def test_concurrent_process_flushes(self, tmp_path):
+        ctx = multiprocessing.get_context("fork")
+        procs = [ctx.Process(target=_flush_symbols, args=(tmp_path, i)) for i in range(4)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join(30)
+            assert proc.exitcode == 0
+
+        backend = ColumnarFeatureBackend(tmp_path)
+        window = backend.window("technical")
+        assert len(window) == 4 * 5 * 3
+        for i in range(4):
+            for j in range(5):
+                assert backend.as_of("technical", f"S{i}_{j}").features["rsi_14"] == i * 10 + j
+
+    def test_persists_and_overwrites_same_day(self, tmp_path):
+        backend = ColumnarFeatureBackend(tmp_path)
+        backend.write("technical", "AAPL", "2024-01-02T15:00:00", {"rsi_14": 40.0})
+        backend.flush()
+        backend.write("technical", "AAPL", "2024-01-02T21:00:00", {"rsi_14": 45.0})
+        backend.flush()
+
+        reopened = ColumnarFeatureBackend(tmp_path)
+        history = reopened.history("technical", "AAPL")
+        assert [r.features["rsi_14"] for r in history] == [45.0]
+
+    def test_training_window_is_zero_copy(self, tmp_path):
+        rng = np.random.default_rng(0)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (90, 3)), axis=0))
+        dates = pd.date_range("2024-01-01", periods=90, freq="D")
+        panel = compute_panel_features(close, close * 1.01, close * 0.99, np.ones_like(close),
+                                       dates=dates, symbols=["A", "B", "C"])
+        backend = ColumnarFeatureBackend(tmp_path)
+        backend.write_frame("technical", panel.to_frame())
+        backend.flush()
+
+        window = backend.window("technical", "2024-02-05", "2024-02-20")
+        assert len(window) == 16 * 3
+        assert isinstance(window.values.base, np.memmap) or isinstance(window.values, np.memmap)
+        assert not window.values.flags.writeable
+        np.testing.assert_allclose(
+            window.to_frame().loc[(np.datetime64("2024-02-10"), "B"), "rsi_14"],
+            panel.to_frame().loc[(dates[40], "B"), "rsi_14"],
+        )
+
+        across = backend.window("technical", "2024-01-25", "2024-03-05", symbols=["C"])
+        assert len(across) == 41
+        assert set(across.symbols) == {"C"}
+
+
+class TestFeatureStoreBackend:
+    """FeatureStore with the columnar backend behind the hot tier."""
+
+    def test_history_survives_restart(self, tmp_path):
+        store = FeatureStore(backend=ColumnarFeatureBackend(tmp_path))
+        store.store_features("AAPL", "2024-01-02", technical=technical("AAPL", "2024-01-02", 40.0))
+        store.store_features("AAPL", "2024-01-03", technical=technical("AAPL", "2024-01-03", 60.0, golden=True))
+        store.flush()
+
+        restarted = FeatureStore(backend=ColumnarFeatureBackend(tmp_path))
+        latest = restarted.get_features("AAPL")
+        assert latest.technical.rsi_14 == 60.0
+        assert latest.technical.golden_cross is True
+        assert restarted.cache.get("AAPL", "technical") is not None
+
+        past = restarted.get_features_as_of("AAPL", "2024-01-02")
+        assert past.technical.rsi_14 == 40.0
+        assert past.timestamp == "2024-01-02"
+
+    def test_in_memory_store_unchanged(self):
+        store = FeatureStore()
+        store.store_features("AAPL", technical=technical("AAPL", "", 50.0))
+
+        assert store.get_features("AAPL").technical.rsi_14 == 50.0
+        with pytest.raises(RuntimeError):
+            store.get_features_as_of("AAPL", "2024-01-01")
@@ -0,0 +1,90 @@
+"""
+Unit Tests - Compute Executor
+Tests for the bounded process pool used by CPU-bound endpoints.
+"""
+import asyncio
+import os
+import time
+
+import pytest
+
+from app.core.compute_executor import (
+    ComputeExecutor,
+    ComputeQueueFull,
+    ComputeTimeout,
+)
+
+
+# Module-level so worker processes can unpickle them
+def square(x):
+    return x * x
+
+
+def sleep_then_pid(seconds):
+    time.sleep(seconds)
+    return os.getpid()
+
+
+def fail():
+    raise ValueError("boom")
+
+
+@pytest.fixture
+async def executor():
+    executor = ComputeExecutor(max_workers=1, max_queue=1, default_timeout=30, preload=())
+    await executor.start()
+    yield executor
+    await executor.shutdown()
+
+
+class TestComputeExecutor:
+    """Tests for ComputeExecutor."""
+
+    async def test_runs_in_worker_process(self, executor):
+        results = await asyncio.gather(executor.run(square, 3), executor.run(square, 4))
+        pid = await executor.run(sleep_then_pid, 0)
+
+        assert results == [9, 16]
+        assert pid != os.getpid()
+        stats = executor.get_stats()
+        assert stats['completed'] == 3
+        assert stats['in_flight'] == 0
+        assert stats['latency']['p50_ms'] is not None
+
+    async def test_rejects_when_full(self, executor):
+        running = [asyncio.create_task(executor.run(sleep_then_pid, 0.5)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        assert executor.get_stats()['queue_depth'] == 1
+        with pytest.raises(ComputeQueueFull):
+            await executor.run(square, 2)
+
+        await asyncio.gather(*running)
+        assert await executor.run(square, 2) == 4
+        assert executor.get_stats()['rejected'] == 1
+
+    async def test_timeout_cancels_queued_task(self, executor):
+        busy = asyncio.create_task(executor.run(sleep_then_pid, 0.5))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ComputeTimeout):
+            await executor.run(square, 5, timeout=0.05)
+
+        await busy
+        stats = executor.get_stats()
+        assert stats['timeouts'] == 1
+        assert stats['cancelled'] == 1
+        assert stats['in_flight'] == 0
+
+    async def test_worker_errors_propagate(self, executor):
+        with pytest.raises(ValueError, match="boom"):
+            await executor.run(fail)
+
+        assert executor.get_stats()['failed'] == 1
+
+    async def test_inline_when_disabled(self):
+        executor = ComputeExecutor(max_workers=0)
+        await executor.start()
+
+        assert await executor.run(sleep_then_pid, 0) == os.getpid()
+        assert executor.get_stats()['inline'] == 1
@@ -0,0 +1,138 @@
+"""
+Unit Tests - Efficient Frontier
+Tests for the critical-line frontier solver and its SLSQP fallback.
+"""
+import pytest
+import numpy as np
+
+from app.core.optimizer.frontier import EfficientFrontierSolver
+from app.core.optimizer.risk_models import RiskModel
+from app.core.optimizer.strategies import (
+    MeanVarianceOptimizer,
+    OptimizationConstraints,
+    OptimizationObjective,
+)
+from app.ml.models.portfolio_optimizer import PortfolioOptimizer
+
+
+def make_inputs(n_assets: int = 12, seed: int = 3):
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0004, 0.015, (400, n_assets))
+    mu = rng.normal(0.10, 0.06, n_assets)
+    cov = np.cov(returns.T) * 252
+    return returns, mu, cov
+
+
+class TestEfficientFrontierSolver:
+    """Tests for EfficientFrontierSolver."""
+
+    @pytest.mark.parametrize("upper", [1.0, 0.25])
+    def test_critical_line_matches_slsqp(self, upper):
+        _, mu, cov = make_inputs()
+        solver = EfficientFrontierSolver(mu, cov, lower=0.0, upper=upper)
+
+        cla = solver.trace(40)
+        slsqp = solver._trace_slsqp(40)
+
+        assert cla.method == "critical_line"
+        assert slsqp.failed == []
+        np.testing.assert_allclose(cla.returns, slsqp.returns, atol=1e-6)
+        # Closed form is never worse than the iterative solution
+        assert np.all(cla.volatilities <= slsqp.volatilities + 1e-7)
+        np.testing.assert_allclose(cla.volatilities, slsqp.volatilities, atol=1e-6)
+
+    def test_points_are_feasible_and_ordered(self):
+        _, mu, cov = make_inputs(30)
+        trace = EfficientFrontierSolver(mu, cov, lower=0.01, upper=0.1).trace(60)
+
+        assert len(trace) == 60
+        assert np.all(trace.weights >= 0.01 - 1e-9)
+        assert np.all(trace.weights <= 0.1 + 1e-9)
+        np.testing.assert_allclose(trace.weights.sum(axis=1), 1.0)
+        assert np.all(np.diff(trace.returns) > 0)
+        assert np.all(np.diff(trace.volatilities) >= -1e-12)
+
+    def test_min_variance_end_matches_solver(self):
+        _, mu, cov = make_inputs()
+        solver = EfficientFrontierSolver(mu, cov)
+
+        trace = solver.trace(10)
+        result = solver.solve()
+
+        assert trace.volatilities[0] == pytest.approx(np.sqrt(result.fun), abs=1e-6)
+
+    @pytest.mark.parametrize("mu", [
+        [0.1] * 6,
+        [0.1, 0.1, 0.05, 0.05, 0.02, 0.02],
+    ])
+    def test_tied_returns(self, mu):
+        _, _, cov = make_inputs(6)
+        solver = EfficientFrontierSolver(np.array(mu), cov)
+
+        trace = solver.trace(20)
+        slsqp = solver._trace_slsqp(20)
+
+        assert trace.method == "critical_line"
+        assert trace.volatilities[0] == pytest.approx(np.sqrt(solver.solve().fun), abs=1e-6)
+        np.testing.assert_allclose(trace.volatilities, slsqp.volatilities, atol=1e-6)
+
+    def test_min_variance_mismatch_falls_back_to_slsqp(self, monkeypatch):
+        _, mu, cov = make_inputs(6)
+        solver = EfficientFrontierSolver(mu, cov)
+        # A "frontier" that stops at the maximum return corner
+        monkeypatch.setattr(
+            "app.core.optimizer.frontier.critical_line",
+            lambda mu, cov, lower, upper: [np.eye(len(mu))[np.argmax(mu)]]
+        )
+
+        trace = solver.trace(10)
+
+        assert trace.method == "slsqp"
+        assert trace.volatilities[0] == pytest.approx(np.sqrt(solver.solve().fun), abs=1e-6)
+
+    def test_singular_covariance_falls_back_to_slsqp(self):
+        _, mu, cov = make_inputs(4)
+        cov = np.pad(cov, ((0, 1), (0, 1)))
+        cov[4] = cov[3]
+        cov[:, 4] = cov[:, 3]
+        mu = np.append(mu, mu[3] + 0.01)
+
+        trace = EfficientFrontierSolver(mu, cov, upper=0.6).trace(15)
+
+        assert trace.method in ("critical_line", "slsqp")
+        assert np.all(trace.weights <= 0.6 + 1e-6)
+        np.testing.assert_allclose(trace.weights.sum(axis=1), 1.0, atol=1e-6)
+
+    def test_infeasible_bounds(self):
+        _, mu, cov = make_inputs(5)
+        with pytest.raises(ValueError):
+            EfficientFrontierSolver(mu, cov, upper=0.1)
+
+
+class TestFrontierIntegration:
+    """Tests for the optimizers built on the frontier solver."""
+
+    def test_mean_variance_frontier(self):
+        _, mu, cov = make_inputs()
+        optimizer = MeanVarianceOptimizer(RiskModel())
+
+        frontier = optimizer.efficient_frontier(mu, cov, n_points=50,
+                                                constraints=OptimizationConstraints(max_weight=0.3))
+        min_var = optimizer.optimize(mu, cov, OptimizationObjective.MIN_VARIANCE,
+                                     OptimizationConstraints(max_weight=0.3))
+
+        assert len(frontier) == 50
+        assert all(r.success for r in frontier)
+        assert frontier[0].expected_volatility <= min_var.expected_volatility + 1e-6
+        assert frontier[-1].expected_return == pytest.approx(np.sort(mu)[-4:][::-1] @ [0.3, 0.3, 0.3, 0.1])
+
+    def test_ml_optimizer_frontier(self):
+        returns, _, _ = make_inputs(8)
+        symbols = [f"S{i}" for i in range(8)]
+
+        frontier = PortfolioOptimizer().calculate_efficient_frontier(returns, symbols, n_portfolios=25)
+
+        assert len(frontier) == 25
+        best = np.max(returns.mean(axis=0) * 252)
+        assert frontier[-1]["return"] <= best * 0.95 + 1e-9
+        assert all(sum(p["weights"].values()) == pytest.approx(1.0) for p in frontier)
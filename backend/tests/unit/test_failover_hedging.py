@@ -0,0 +1,155 @@
+"""
+Unit Tests - Failover Hedging
+Tests for hedged (speculative) provider requests in FailoverManager.
+"""
+import asyncio
+import itertools
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.data_providers.adapters.base import DataType, MarketType, ProviderError
+from app.data_providers.failover import FailoverConfig, FailoverManager
+from app.data_providers.health_monitor import health_monitor
+
+
+_names = itertools.count()
+
+
+def make_provider(priority: int) -> SimpleNamespace:
+    """Minimal adapter with a unique name (the health monitor is global)."""
+    return SimpleNamespace(
+        name=f"hedge_test_{next(_names)}",
+        config=SimpleNamespace(
+            priority=priority,
+            supported_markets=[MarketType.US_STOCK],
+            supported_data_types=[DataType.QUOTE],
+        ),
+    )
+
+
+def make_manager(*providers, **config) -> FailoverManager:
+    config = {
+        "hedge_requests": True,
+        "hedge_default_delay_ms": 20.0,
+        "retry_delay_base": 0.0,
+        "prefer_low_latency": False,
+        **config,
+    }
+    manager = FailoverManager(FailoverConfig(**config))
+    for provider in providers:
+        manager.register_provider(provider)
+    return manager
+
+
+def operation(delays: dict, results: dict, calls: list, cancelled: list):
+    async def run(provider):
+        calls.append(provider.name)
+        try:
+            await asyncio.sleep(delays[provider.name])
+        except asyncio.CancelledError:
+            cancelled.append(provider.name)
+            raise
+        result = results[provider.name]
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return run
+
+
+class TestHedgedRequests:
+    """Tests for FailoverManager hedging."""
+    
+    async def test_fast_primary_is_not_hedged(self):
+        primary, backup = make_provider(1), make_provider(2)
+        manager = make_manager(primary, backup)
+        calls, cancelled = [], []
+        op = operation({primary.name: 0.0, backup.name: 0.0}, {primary.name: "p", backup.name: "b"}, calls, cancelled)
+        
+        assert await manager.execute_with_failover(op, MarketType.US_STOCK, DataType.QUOTE) == "p"
+        assert calls == [primary.name]
+        assert manager.get_hedge_stats()["hedged"] == 0
+    
+    def test_hedge_delay_without_samples(self):
+        primary = make_provider(1)
+        manager = make_manager(primary, hedge_min_samples=0)
+        
+        assert manager._hedge_delay_ms(primary.name) == 20.0
+    
+    async def test_slow_primary_loses_to_hedge(self):
+        primary, backup = make_provider(1), make_provider(2)
+        manager = make_manager(primary, backup)
+        for latency in [10.0] * 39 + [3000.0]:
+            await health_monitor.record_success(primary.name, latency)
+        calls, cancelled = [], []
+        op = operation({primary.name: 2.0, backup.name: 0.0}, {primary.name: "p", backup.name: "b"}, calls, cancelled)
+        
+        result = await asyncio.wait_for(
+            manager.execute_with_failover(op, MarketType.US_STOCK, DataType.QUOTE), timeout=1.0
+        )
+        await asyncio.sleep(0)
+        
+        assert result == "b"
+        assert calls == [primary.name, backup.name]
+        assert cancelled == [primary.name]
+        stats = manager.get_hedge_stats()
+        assert stats["hedged"] == 1 and stats["hedge_wins"] == 1
+        # Only the 3s sample is slower than the hedge latency
+        assert 2900 < stats["latency_saved_ms"] < 3000
+    
+    async def test_hedge_delay_stable_under_slow_primary(self):
+        primary, backup = make_provider(1), make_provider(2)
+        manager = make_manager(primary, backup, hedge_min_delay_ms=1.0)
+        # 1 in 10 primary requests is slow
+        pattern = [0.001] * 9 + [0.5]
+        for delay in pattern * 10:
+            await health_monitor.record_success(primary.name, 50.0 if delay > 0.1 else 1.0)
+        initial = manager._hedge_delay_ms(primary.name)
+        
+        for delay in pattern * 10:
+            op = operation({primary.name: delay, backup.name: 0.0}, {primary.name: "p", backup.name: "b"}, [], [])
+            await manager.execute_with_failover(op, MarketType.US_STOCK, DataType.QUOTE)
+        
+        # The cancelled slow primaries stay in the window as lower bounds,
+        # instead of leaving only the fast answers behind
+        assert manager.get_hedge_stats()["hedge_wins"] == 10
+        assert manager._hedge_delay_ms(primary.name) > initial / 2
+    
+    async def test_primary_can_still_win(self):
+        primary, backup = make_provider(1), make_provider(2)
+        manager = make_manager(primary, backup)
+        calls, cancelled = [], []
+        op = operation({primary.name: 0.05, backup.name: 1.0}, {primary.name: "p", backup.name: "b"}, calls, cancelled)
+        
+        assert await manager.execute_with_failover(op, MarketType.US_STOCK, DataType.QUOTE) == "p"
+        await asyncio.sleep(0)
+        
+        assert cancelled == [backup.name]
+        assert manager.get_hedge_stats()["primary_wins"] == 1
+    
+    async def test_failed_hedge_falls_back_to_failover(self):
+        primary, backup, third = make_provider(1), make_provider(2), make_provider(3)
+        manager = make_manager(primary, backup, third)
+        calls, cancelled = [], []
+        op = operation(
+            {primary.name: 0.05, backup.name: 0.0, third.name: 0.0},
+            {primary.name: ProviderError(primary.name, "boom"), backup.name: ProviderError(backup.name, "boom"), third.name: "t"},
+            calls, cancelled,
+        )
+        
+        assert await manager.execute_with_failover(op, MarketType.US_STOCK, DataType.QUOTE) == "t"
+        assert calls == [primary.name, backup.name, third.name]
+    
+    async def test_hedge_respects_rate_limits(self):
+        primary, backup = make_provider(1), make_provider(2)
+        manager = make_manager(primary, backup)
+        calls, cancelled = [], []
+        op = operation({primary.name: 0.05, backup.name: 0.0}, {primary.name: "p", backup.name: "b"}, calls, cancelled)
+        
+        with patch(
+            "app.data_providers.failover.rate_limiter.can_proceed",
+            side_effect=lambda name: name != backup.name,
+        ):
+            assert await manager.execute_with_failover(op, MarketType.US_STOCK, DataType.QUOTE) == "p"
+        
+        assert calls == [primary.name]
+        assert manager.get_hedge_stats()["no_candidate"] == 1
@@ -0,0 +1,151 @@
+"""
+Unit Tests - Fold Executor
+Tests for parallel fold/trial execution and backend determinism.
+"""
+import os
+import pytest
+import numpy as np
+import pandas as pd
+
+from app.ml.training import (
+    FoldExecutor,
+    SharedArray,
+    CrossValidator,
+    TimeSeriesSplit,
+    TrainingConfig,
+    TrainingPipeline,
+    HyperparameterOptimizer,
+    WalkForwardBacktester,
+    MLStrategy,
+)
+
+BACKENDS = ["serial", "thread", "process"]
+
+
+class LeastSquaresClassifier:
+    """Tiny deterministic model, picklable for the process backend."""
+
+    def __init__(self, ridge: float = 1e-3):
+        self.ridge = ridge
+        self.coef_ = None
+
+    def fit(self, X, y, X_val=None, y_val=None, verbose=0):
+        X = np.asarray(X, dtype=float)
+        target = np.asarray(y, dtype=float) * 2 - 1
+        self.coef_ = np.linalg.solve(X.T @ X + self.ridge * np.eye(X.shape[1]), X.T @ target)
+        return {}
+
+    def predict(self, X):
+        return (np.asarray(X, dtype=float) @ self.coef_ > 0).astype(int)
+
+    def score(self, X, y):
+        return float(np.mean(self.predict(X) == y))
+
+    def evaluate(self, X, y):
+        return {"roc_auc": self.score(X, y)}
+
+    def save(self, path):
+        pass
+
+
+def square_sum(task, X):
+    return float(task * X.sum()), isinstance(X, np.memmap)
+
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(3)
+    X = rng.normal(size=(600, 6))
+    y = (X[:, 0] + 0.5 * X[:, 1] + rng.normal(scale=0.5, size=600) > 0).astype(int)
+    return X, y
+
+
+class TestFoldExecutor:
+    """Tests for FoldExecutor."""
+
+    @pytest.mark.parametrize("backend", BACKENDS)
+    def test_results_in_task_order_with_timings(self, backend):
+        X = np.arange(12.0).reshape(3, 4)
+
+        with FoldExecutor(backend, max_workers=2) as executor:
+            shared = executor.share(X=X)
+            results = executor.map(square_sum, [1, 2, 3], shared)
+
+        assert [r[0] for r in results] == [66.0, 132.0, 198.0]
+        assert [t.task for t in executor.timings] == [0, 1, 2]
+        assert all(t.seconds >= 0 for t in executor.timings)
+
+    def test_process_backend_shares_memory_map(self):
+        X = np.ones((5, 3))
+
+        with FoldExecutor("process", max_workers=2) as executor:
+            shared = executor.share(X=X)
+            results = executor.map(square_sum, [1, 2], shared)
+            path = shared["X"].path
+
+        assert isinstance(shared["X"], SharedArray)
+        assert all(is_memmap for _, is_memmap in results)
+        # Temporary files removed on close
+        assert not os.path.exists(path)
+
+
+class TestParallelCrossValidation:
+    """CV and walk-forward produce identical results on every backend."""
+
+    def test_cross_validator_backend_independent(self, dataset):
+        X, y = dataset
+        results = {}
+        for backend in BACKENDS:
+            with FoldExecutor(backend, max_workers=2) as executor:
+                cv = CrossValidator(TimeSeriesSplit(n_splits=4), executor=executor)
+                results[backend] = cv.cross_validate(LeastSquaresClassifier, X, y, verbose=False)
+
+        assert results["serial"].scores == results["thread"].scores == results["process"].scores
+        assert all("duration_seconds" in d for d in results["process"].fold_details)
+
+    def test_pipeline_cv_and_hpo_backend_independent(self, dataset, tmp_path):
+        X, y = dataset
+        scores = {}
+        for backend in ["serial", "thread"]:
+            config = TrainingConfig(
+                symbols=["AAA"], model_output_dir=str(tmp_path), feature_selection_k=5,
+                n_cv_folds=3, executor_backend=backend, n_jobs=2,
+            )
+            pipeline = TrainingPipeline(config)
+            scores[backend] = pipeline.cross_validate(LeastSquaresClassifier, X, y)
+
+            HyperparameterOptimizer(pipeline).random_search(LeastSquaresClassifier, n_trials=2, seed=1)
+            assert len(pipeline.jobs) == 2
+            cv_means = sorted(job.metrics.cv_mean for job in pipeline.jobs.values())
+            scores[f"{backend}_hpo"] = cv_means
+
+        assert scores["serial"] == scores["thread"]
+        assert scores["serial_hpo"] == scores["thread_hpo"]
+
+    def test_walk_forward_folds_parallel(self, dataset):
+        X, y = dataset
+
+        class Direction:
+            def __init__(self, value):
+                self.direction = "up" if value else "neutral"
+                self.confidence = 0.9
+
+        class UpModel(LeastSquaresClassifier):
+            def predict(self, X):
+                return [Direction(v) for v in super().predict(X)]
+
+        index = pd.date_range("2022-01-03", periods=len(X), freq="B")
+        data = pd.DataFrame({"close": 100 + np.cumsum(X[:, 0])}, index=index)
+
+        metrics = {}
+        for backend in ["serial", "thread"]:
+            wf = WalkForwardBacktester(
+                train_window=200, retrain_frequency=50,
+                executor=FoldExecutor(backend, max_workers=4),
+            )
+            model = UpModel()
+            metrics[backend] = wf.run(data, MLStrategy(model), model, X, y)
+            assert len(wf.models_used) == 8
+
+        assert metrics["serial"].equity_curve == metrics["thread"].equity_curve
+        assert metrics["serial"].total_trades > 0
@@ -0,0 +1,163 @@
+"""
+Unit Tests - FX Rate Matrix
+Tests for the in-memory exchange rate matrix and cross-rate derivation.
+"""
+import asyncio
+import pytest
+import numpy as np
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.services.fx_rate_matrix import FxRateMatrix, build_rate_table
+from app.utils.currency import get_exchange_rate, lookup_exchange_rate
+
+
+def stored_rows():
+    """EUR-based rows plus one direct non-EUR pair."""
+    rows = [("EUR", "USD", "1.05"), ("EUR", "GBP", "0.84"), ("EUR", "JPY", "160"), ("USD", "CHF", "0.88")]
+    return [MagicMock(base_currency=b, quote_currency=q, rate=Decimal(r)) for b, q, r in rows]
+
+
+class TestBuildRateTable:
+    """Tests for cross-rate derivation."""
+    
+    def test_direct_inverse_and_cross_rates(self):
+        table = build_rate_table([("EUR", "USD", Decimal("1.05")), ("EUR", "GBP", Decimal("0.84"))])
+        
+        assert table[("EUR", "USD")] == Decimal("1.05")
+        assert table[("USD", "EUR")] == (Decimal(1) / Decimal("1.05")).quantize(Decimal("1e-10"))
+        assert float(table[("USD", "GBP")]) == pytest.approx(0.84 / 1.05)
+        assert table[("GBP", "GBP")] == Decimal("1")
+        assert len(table) == 9
+    
+    def test_stored_pair_wins_over_cross_rate(self):
+        table = build_rate_table([
+            ("EUR", "USD", Decimal("1.05")),
+            ("EUR", "CHF", Decimal("0.94")),
+            ("USD", "CHF", Decimal("0.90")),
+        ])
+        
+        assert table[("USD", "CHF")] == Decimal("0.90")
+        assert table[("CHF", "USD")] == (Decimal(1) / Decimal("0.90")).quantize(Decimal("1e-10"))
+
+
+class TestFxRateMatrix:
+    """Tests for FxRateMatrix."""
+    
+    async def test_single_query_then_dictionary_reads(self):
+        matrix = FxRateMatrix()
+        repo = MagicMock(get_all_rates=AsyncMock(return_value=stored_rows()))
+        
+        with patch("app.db.repositories.exchange_rate.ExchangeRateRepository", return_value=repo):
+            assert await matrix.load(db=MagicMock())
+            for _ in range(10):
+                assert float(await matrix.get_rate("USD", "JPY")) == pytest.approx(160 / 1.05)
+        
+        repo.get_all_rates.assert_awaited_once()
+        assert matrix.version == 1
+        assert await matrix.get_rate("usd", "chf") == Decimal("0.88")
+        assert await matrix.get_rate("USD", "XXX") is None
+    
+    async def test_publish_bumps_version_only_on_change(self):
+        matrix = FxRateMatrix()
+        rates = [{"base_currency": "EUR", "quote_currency": "USD", "rate": Decimal("1.05")}]
+        
+        assert matrix.publish(rates)
+        assert not matrix.publish(rates)
+        assert matrix.publish([{**rates[0], "rate": Decimal("1.10")}])
+        
+        assert matrix.version == 2
+        assert matrix.rate("EUR", "USD") == Decimal("1.10")
+    
+    async def test_published_floats_match_stored_rates(self):
+        matrix = FxRateMatrix()
+        
+        assert matrix.publish([("EUR", "USD", 1 / 0.9523)])
+        # The rate column keeps 10 decimals; reloading it is not a change
+        assert not matrix.publish([("EUR", "USD", Decimal("1.0500892576"))])
+        assert matrix.version == 1
+    
+    async def test_stale_matrix_reloads(self):
+        matrix = FxRateMatrix(max_age=0)
+        
+        with patch.object(matrix, "load", AsyncMock(return_value=True)) as load:
+            await matrix.get_rate("EUR", "USD")
+            await matrix.get_rate("EUR", "USD")
+            await matrix.get_rate("EUR", "EUR")
+        
+        assert load.await_count == 2
+    
+    async def test_convert_many_is_vectorized(self):
+        matrix = FxRateMatrix()
+        matrix.publish((r.base_currency, r.quote_currency, r.rate) for r in stored_rows())
+        
+        converted = await matrix.convert_many([100.0, 50.0, 1600.0, 7.0], ["USD", "EUR", "JPY", "AUD"], "EUR")
+        
+        np.testing.assert_allclose(converted[:3], [100 / 1.05, 50.0, 10.0])
+        assert np.isnan(converted[3])
+    
+    async def test_get_exchange_rate_uses_matrix(self):
+        matrix = FxRateMatrix()
+        matrix.publish([("EUR", "USD", Decimal("1.05"))])
+        
+        with patch("app.services.fx_rate_matrix.fx_rate_matrix", matrix):
+            assert await get_exchange_rate("EUR", "USD") == Decimal("1.050000")
+            assert await get_exchange_rate("USD", "EUR") == Decimal("0.952381")
+    
+    def test_lookup_exchange_rate_falls_back(self):
+        matrix = FxRateMatrix()
+        matrix.publish([("EUR", "USD", Decimal("1.05"))])
+        
+        with patch("app.services.fx_rate_matrix.fx_rate_matrix", matrix):
+            assert lookup_exchange_rate("USD", "EUR") == Decimal("0.952381")
+            assert lookup_exchange_rate("USD", "USD") == Decimal("1.0")
+            # Pair not derivable from the matrix: hardcoded emergency rate
+            assert lookup_exchange_rate("GBP", "CHF") == Decimal("1.09")
+
+
+class TestWorkerCoherence:
+    """Tests for the pub/sub version broadcast between workers."""
+    
+    async def test_remote_update_reloads(self):
+        writer, reader = FxRateMatrix(), FxRateMatrix()
+        reader.publish([("EUR", "USD", Decimal("1.05"))])
+        redis = MagicMock(publish=AsyncMock())
+        
+        with patch("app.services.fx_rate_matrix.redis_client", redis):
+            writer.publish([("EUR", "USD", Decimal("1.10"))])
+            await writer.broadcast_update()
+        channel, message = redis.publish.await_args.args
+        
+        async def load():
+            reader.publish([("EUR", "USD", Decimal("1.10"))])
+            return True
+        
+        with patch.object(reader, "load", AsyncMock(side_effect=load)) as reload:
+            await writer.handle_update(message)
+            await reader.handle_update(message)
+        
+        assert channel == "fx:rates:updated"
+        reload.assert_awaited_once()
+        assert reader.rate("EUR", "USD") == Decimal("1.10")
+        assert reader.version == 2
+    
+    async def test_listener_resubscribes_after_error(self):
+        writer, reader = FxRateMatrix(), FxRateMatrix()
+        
+        async def listen():
+            yield {"type": "message", "data": writer._update_message()}
+            raise asyncio.CancelledError
+        
+        pubsub = MagicMock(subscribe=AsyncMock(), unsubscribe=AsyncMock(), aclose=AsyncMock())
+        pubsub.listen = listen
+        redis = MagicMock(pubsub=MagicMock(side_effect=[ConnectionError("down"), pubsub]))
+        
+        with patch("app.services.fx_rate_matrix.redis_client", redis), \
+                patch("app.services.fx_rate_matrix.asyncio.sleep", AsyncMock()), \
+                patch.object(reader, "load", AsyncMock(return_value=True)) as reload:
+            with pytest.raises(asyncio.CancelledError):
+                await reader._listen_updates()
+        
+        assert redis.pubsub.call_count == 2
+        pubsub.aclose.assert_awaited_once()
+        reload.assert_awaited_once()
@@ -0,0 +1,118 @@
+"""
+Unit Tests - Global Price Updater
+Tests for the universe-wide price snapshot.
+"""
+import pytest
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.bot.services.global_price_updater import GlobalPriceUpdater, run_global_price_update
+from app.services.fx_rate_matrix import FxRateMatrix
+
+
+def snapshot_rows():
+    """(position_id, symbol, native_ccy, qty, avg_cost, portfolio_id, portfolio_ccy, user_id)."""
+    return [
+        (1, "AAPL", "USD", Decimal("10"), Decimal("150"), 100, "EUR", 1),
+        (2, "AAPL", "USD", Decimal("5"), Decimal("200"), 200, "EUR", 2),
+        (3, "ENI.MI", "EUR", Decimal("100"), Decimal("14"), 100, "EUR", 1),
+        (4, "MSFT", "USD", Decimal("3"), Decimal("0"), 300, "USD", 3),
+        (5, "GONE", "USD", Decimal("1"), Decimal("10"), 300, "USD", 3),
+    ]
+
+
+@pytest.fixture
+def fx_matrix():
+    matrix = FxRateMatrix()
+    matrix.publish([("USD", "EUR", Decimal("0.9"))])
+    with patch("app.services.fx_rate_matrix.fx_rate_matrix", matrix):
+        yield matrix
+
+
+@pytest.fixture
+def db():
+    session = MagicMock()
+    select_result = MagicMock()
+    select_result.all.return_value = snapshot_rows()
+    session.execute = AsyncMock(side_effect=[select_result, MagicMock()])
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    return session
+
+
+class TestPriceSnapshot:
+    """Tests for GlobalPriceUpdater.update_all_prices."""
+
+    @pytest.mark.asyncio
+    async def test_prices_each_symbol_once_and_converts_per_currency(self, db, fx_matrix):
+        updater = GlobalPriceUpdater(db)
+        resolve = AsyncMock(return_value={"AAPL": 200.0, "ENI.MI": 15.0, "MSFT": 400.0})
+        rate = MagicMock(side_effect=fx_matrix.rate)
+
+        with patch.object(updater, "_resolve_prices", resolve), \
+                patch.object(fx_matrix, "rate", rate):
+            stats = await updater.update_all_prices()
+
+        assert resolve.await_args.args[0] == ["AAPL", "ENI.MI", "GONE", "MSFT"]
+        # One matrix read for the only cross-currency pair
+        rate.assert_called_once_with("USD", "EUR")
+        assert stats["users"] == 3
+        assert stats["portfolios"] == 3
+        assert stats["positions"] == 5
+        assert stats["symbols"] == 4
+        assert stats["fx_pairs"] == 1
+        assert stats["updated"] == 4
+        assert stats["failed"] == 1
+        assert stats["duration_ms"] >= 0
+        db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_values(self, db, fx_matrix):
+        updater = GlobalPriceUpdater(db)
+
+        with patch.object(updater, "_resolve_prices", AsyncMock(return_value={"AAPL": 200.0, "ENI.MI": 15.0, "MSFT": 400.0})):
+            await updater.update_all_prices()
+
+        params = {p["id"]: p for p in db.execute.await_args_list[1].args[1]}
+        assert params[1]["market_value"] == Decimal("1800.0")
+        assert params[1]["unrealized_pnl"] == Decimal("450.0")
+        assert params[3]["market_value"] == Decimal("1500")
+        # avg_cost 0 leaves the percent untouched
+        assert "unrealized_pnl_percent" not in params[4]
+        assert params[2]["unrealized_pnl_percent"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_unknown_fx_pair_uses_fallback_rate(self, db, fx_matrix):
+        fx_matrix.publish([("GBP", "EUR", Decimal("1.17"))])
+        updater = GlobalPriceUpdater(db)
+
+        with patch.object(updater, "_resolve_prices", AsyncMock(return_value={"AAPL": 200.0, "ENI.MI": 15.0, "MSFT": 400.0})):
+            stats = await updater.update_all_prices()
+
+        params = {p["id"]: p for p in db.execute.await_args_list[1].args[1]}
+        assert params[1]["market_value"] == Decimal("1900.00")
+        assert params[1]["unrealized_pnl"] == Decimal("475.00")
+        assert stats["updated"] == 4
+        assert stats["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_run_global_price_update_maps_stats(self, db, fx_matrix):
+        with patch.object(
+            GlobalPriceUpdater, "_resolve_prices",
+            AsyncMock(return_value={"AAPL": 200.0, "ENI.MI": 15.0, "MSFT": 400.0}),
+        ):
+            stats = await run_global_price_update(db)
+
+        assert stats["positions_updated"] == 4
+        assert stats["positions_failed"] == 1
+        assert stats["users_processed"] == 3
+        assert "duration_ms" in stats
+
+    @pytest.mark.asyncio
+    async def test_failure_rolls_back(self, db):
+        db.execute = AsyncMock(side_effect=RuntimeError("db down"))
+
+        stats = await run_global_price_update(db)
+
+        db.rollback.assert_awaited_once()
+        assert stats["positions_updated"] == 0
@@ -0,0 +1,125 @@
+"""
+Unit Tests - Metrics
+Tests for the latency histogram, the metrics registry exposition and
+the provider health monitor percentiles.
+"""
+import numpy as np
+import pytest
+
+from app.core.metrics import LatencyHistogram, MetricsRegistry
+from app.data_providers.health_monitor import HealthMetrics, ProviderHealthMonitor
+
+
+class TestLatencyHistogram:
+    """Tests for LatencyHistogram."""
+
+    @pytest.mark.parametrize("q", [0.5, 0.95, 0.99])
+    def test_quantile_within_bucket_width(self, q):
+        rng = np.random.default_rng(7)
+        values = rng.lognormal(np.log(200), 0.8, 5000)
+        hist = LatencyHistogram()
+        for v in values:
+            hist.observe(v)
+
+        exact = np.quantile(values, q)
+        # Neighbouring bounds differ by sqrt(2)
+        assert exact / 1.42 <= hist.quantile(q) <= exact * 1.42
+        assert hist.count == 5000
+        assert hist.mean == pytest.approx(values.mean())
+
+    def test_remove_restores_previous_state(self):
+        hist = LatencyHistogram()
+        for v in (5, 50, 500):
+            hist.observe(v)
+        hist.observe(5000)
+        hist.remove(5000)
+
+        assert hist.count == 3
+        assert hist.sum == pytest.approx(555)
+        assert hist.quantile(1.0) <= 512
+
+    def test_empty_and_overflow(self):
+        hist = LatencyHistogram()
+        assert hist.quantile(0.95) == 0.0
+
+        hist.observe(10 ** 7)
+        assert hist.quantile(0.5) == hist.bounds[-1]
+        assert hist.cumulative_buckets()[-1] == ("+Inf", 1)
+
+
+class TestMetricsRegistry:
+    """Tests for MetricsRegistry exposition."""
+
+    def test_render_counters_and_histograms(self):
+        registry = MetricsRegistry()
+        registry.describe("requests_total", "Requests")
+        registry.inc("requests_total", provider="a")
+        registry.inc("requests_total", 2, provider="a")
+        registry.observe("latency_ms", 3.0, provider="a")
+
+        text = registry.render()
+
+        assert "# HELP requests_total Requests" in text
+        assert "# TYPE requests_total counter" in text
+        assert 'requests_total{provider="a"} 3' in text
+        assert "# TYPE latency_ms histogram" in text
+        assert 'latency_ms_bucket{provider="a",le="2"} 0' in text
+        assert 'latency_ms_bucket{provider="a",le="4"} 1' in text
+        assert 'latency_ms_bucket{provider="a",le="+Inf"} 1' in text
+        assert 'latency_ms_count{provider="a"} 1' in text
+        assert registry.get_counter("requests_total", provider="a") == 3
+
+    def test_collectors(self):
+        registry = MetricsRegistry()
+        registry.register_collector(lambda: [("queue_depth", "gauge", "Depth", [({"q": 'x"y'}, 4)])])
+
+        def broken():
+            raise RuntimeError("boom")
+        registry.register_collector(broken)
+
+        text = registry.render()
+
+        assert 'queue_depth{q="x\\"y"} 4' in text
+        assert "# collector broken failed: boom" in text
+
+
+class TestHealthMonitorLatency:
+    """Tests for the histogram-backed health metrics."""
+
+    def test_window_tracks_last_samples(self):
+        metrics = HealthMetrics(provider="test")
+        for _ in range(100):
+            metrics.add_latency(2000.0)
+        for _ in range(100):
+            metrics.add_latency(10.0)
+
+        assert metrics.latency_window.count == 100
+        assert metrics.avg_latency_ms == pytest.approx(10.0)
+        assert metrics.p95_latency_ms == 10.0
+        assert metrics.latency_quantile(0.95) <= 11.4
+
+    def test_status_latencies_are_exact(self):
+        metrics = HealthMetrics(provider="test")
+        for latency in [0.1, 1e6, 0.2] * 100 + list(range(1, 101)):
+            metrics.add_latency(float(latency))
+
+        assert metrics.avg_latency_ms == 50.5
+        assert metrics.p95_latency_ms == 96.0
+        # Kept in order on insert/evict, never re-sorted on read
+        assert metrics.sorted_latencies == sorted(metrics.latencies)
+
+    async def test_record_success_exports_histogram(self):
+        from app.core.metrics import metrics as registry
+
+        monitor = ProviderHealthMonitor()
+        for latency in (10, 20, 30, 40, 2000):
+            await monitor.record_success("metrics-test", latency, operation="quote")
+
+        hist = registry.histogram("provider_request_latency_ms", provider="metrics-test", operation="quote")
+        assert hist.count == 5
+        assert monitor.get_sample_count("metrics-test") == 5
+        assert monitor.get_latency_quantile("metrics-test", 0.5) < 45
+        assert monitor.get_latency_quantile("unknown", 0.5) is None
+        assert registry.get_counter(
+            "provider_requests_total", provider="metrics-test", operation="quote", outcome="success"
+        ) == 5
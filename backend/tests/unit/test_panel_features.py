@@ -0,0 +1,104 @@
+"""
+Unit Tests - Panel Features
+Tests for vectorized (date x symbol) technical features.
+"""
+import pytest
+import numpy as np
+import pandas as pd
+
+from app.ml.features import (
+    FeaturePipeline,
+    PipelineConfig,
+    TechnicalFeaturesCalculator,
+    compute_panel_features,
+    compute_panel_from_frames,
+)
+from app.ml.features.feature_store import FeatureStore
+
+
+def make_panel(T: int = 240, N: int = 3, seed: int = 11):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, (T, N)), axis=0))
+    high = close * (1 + rng.uniform(0, 0.02, (T, N)))
+    low = close * (1 - rng.uniform(0, 0.02, (T, N)))
+    volume = rng.integers(100_000, 1_000_000, (T, N)).astype(float)
+    return close, high, low, volume
+
+
+def assert_row_matches(panel, j, t, close, high, low, volume, start=0):
+    h = slice(start, t + 1)
+    batch = TechnicalFeaturesCalculator().calculate_all(
+        "X", "", close[h, j], high[h, j], low[h, j], volume[h, j]
+    ).to_dict()
+    for k, name in enumerate(panel.feature_names):
+        value = panel.values[t, j, k]
+        if name not in batch:
+            assert np.isnan(value), name
+        else:
+            assert value == pytest.approx(float(batch[name]), rel=1e-9, abs=1e-9), name
+
+
+class TestPanelFeatures:
+    """Tests for compute_panel_features."""
+
+    def test_matches_calculate_all_every_date(self):
+        close, high, low, volume = make_panel(T=230)
+        panel = compute_panel_features(close, high, low, volume, symbols=["A", "B", "C"])
+
+        assert panel.values.shape == (230, 3, len(TechnicalFeaturesCalculator.get_feature_names()))
+        for t in (0, 1, 13, 14, 24, 25, 199, 200, 201, 229):
+            for j in range(3):
+                assert_row_matches(panel, j, t, close, high, low, volume)
+
+    def test_late_listing_starts_from_own_history(self):
+        close, high, low, volume = make_panel(T=120)
+        for series in (close, high, low, volume):
+            series[:30, 2] = np.nan
+
+        panel = compute_panel_features(close, high, low, volume)
+
+        assert np.isnan(panel.values[:30, 2]).all()
+        for t in (30, 44, 60, 119):
+            assert_row_matches(panel, 2, t, close, high, low, volume, start=30)
+        # Other symbols unaffected
+        assert_row_matches(panel, 0, 119, close, high, low, volume)
+
+    def test_from_frames_and_feature_matrix(self):
+        close, high, low, volume = make_panel(T=60, N=2)
+        index = pd.date_range("2024-01-01", periods=60, freq="B")
+        frames = {
+            name: pd.DataFrame(values, index=index, columns=["AAA", "BBB"])
+            for name, values in zip(("close", "high", "low", "volume"), (close, high, low, volume))
+        }
+        # A missing bar is carried forward
+        frames["close"].iloc[40, 1] = np.nan
+
+        panel = compute_panel_from_frames(frames)
+        matrix = panel.to_frame()
+
+        assert matrix.shape == (120, len(panel.feature_names))
+        assert matrix.loc[(index[40], "BBB"), "momentum_10"] == pytest.approx(close[39, 1] - close[30, 1])
+        assert panel.latest()["AAA"].rsi_14 == pytest.approx(matrix.loc[(index[-1], "AAA"), "rsi_14"])
+
+
+class TestPipelinePanelMode:
+    """FeaturePipeline uses panel mode for aligned batches."""
+
+    async def test_process_batch_uses_panel(self):
+        close, high, low, volume = make_panel(T=150, N=2)
+        price_data = {
+            s: {"prices": list(close[:, j]), "highs": list(high[:, j]),
+                "lows": list(low[:, j]), "volumes": list(volume[:, j])}
+            for j, s in enumerate(["AAA", "BBB"])
+        }
+        pipeline = FeaturePipeline(PipelineConfig(), feature_store=FeatureStore())
+
+        result = await pipeline.process_batch(["AAA", "BBB"], price_data)
+
+        assert result.symbols_processed == 2
+        stored = pipeline.store.get_features("BBB")
+        expected = TechnicalFeaturesCalculator().calculate_all(
+            "BBB", "", close[:, 1], high[:, 1], low[:, 1], volume[:, 1]
+        )
+        assert stored.technical.rsi_14 == pytest.approx(expected.rsi_14)
+        assert stored.technical.sma_50 == pytest.approx(expected.sma_50)
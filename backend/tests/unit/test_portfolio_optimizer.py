@@ -2,6 +2,7 @@
 Unit tests for Portfolio Optimizer Service
 """
 
+import asyncio
 import pytest
 import numpy as np
 import pandas as pd
@@ -20,6 +21,8 @@ from app.core.optimizer.risk_models import (
     RiskModel,
     RiskModelType,
     RiskMetrics,
+    EWMACovarianceState,
+    covariance_cache,
     calculate_drawdown_series
 )
 from app.core.optimizer.strategies import (
@@ -29,7 +32,15 @@ from app.core.optimizer.strategies import (
     OptimizationConstraints,
     OptimizationObjective
 )
-from app.core.optimizer.screener import ScreenerConfig, get_screener_for_risk_profile
+from app.core.optimizer.screener import (
+    ScreenerConfig,
+    ScreenerCriteriaType,
+    ScreeningDataCache,
+    get_screener_for_risk_profile,
+    percentile_ranks,
+    score_matrix,
+    top_k_indices
+)
 from app.core.optimizer.proposal import ProposalType, ProposalStatus
 
 
@@ -85,7 +96,58 @@ class TestRiskModels:
         
         assert cov.shape == (5, 5)
         assert np.allclose(cov, cov.T)
-    
+
+    def test_ewma_matches_pairwise_definition(self, sample_returns):
+        """Matrix-product EWMA equals the weighted pairwise sums"""
+        risk_model = RiskModel(model_type=RiskModelType.EWMA, halflife=30, use_cache=False)
+        cov = risk_model.estimate_covariance(sample_returns).values
+
+        X = sample_returns.values - sample_returns.values.mean(axis=0)
+        alpha = 1 - np.exp(-np.log(2) / 30)
+        w = np.array([(1 - alpha) ** i for i in range(len(X))])[::-1]
+        w /= w.sum()
+        expected = np.array([[np.sum(w * X[:, i] * X[:, j]) for j in range(5)] for i in range(5)]) * 252
+
+        assert np.allclose(cov, expected, rtol=1e-10)
+
+    def test_incremental_ewma_matches_batch(self, sample_returns):
+        """Rolling the EWMA state forward equals re-estimating on the shifted window"""
+        state = EWMACovarianceState.from_returns(sample_returns.iloc[:-3], halflife=30)
+        for k in range(3):
+            state.update(sample_returns.iloc[-3 + k].values, drop=sample_returns.iloc[k].values)
+
+        batch = RiskModel(model_type=RiskModelType.EWMA, halflife=30, use_cache=False)
+        expected = batch.estimate_covariance(sample_returns.iloc[3:])
+
+        assert np.allclose(state.covariance().values, expected.values, rtol=1e-9)
+
+    def test_constant_correlation_covariance(self, sample_returns):
+        """Off-diagonal correlations are all equal, variances unchanged"""
+        risk_model = RiskModel(model_type=RiskModelType.CONSTANT_CORRELATION, use_cache=False)
+        cov = risk_model.estimate_covariance(sample_returns).values
+
+        vols = np.sqrt(np.diag(cov))
+        corr = cov / np.outer(vols, vols)
+        off_diag = corr[~np.eye(5, dtype=bool)]
+        assert np.allclose(off_diag, off_diag[0])
+        assert np.allclose(np.diag(cov), sample_returns.var().values * 252)
+
+    def test_covariance_cache(self, sample_returns):
+        """Same universe and dates reuse the estimate; copies are returned"""
+        covariance_cache.clear()
+        risk_model = RiskModel(model_type=RiskModelType.LEDOIT_WOLF)
+
+        first = risk_model.estimate_covariance(sample_returns)
+        first.iloc[0, 0] = -1.0
+        second = risk_model.estimate_covariance(sample_returns)
+
+        assert covariance_cache.get_stats()["hits"] == 1
+        assert second.iloc[0, 0] > 0
+
+        # A different universe is a different entry
+        risk_model.estimate_covariance(sample_returns[['AAPL', 'MSFT']])
+        assert covariance_cache.get_stats()["size"] == 2
+
     def test_expected_returns(self, sample_returns):
         """Test expected returns calculation"""
         risk_model = RiskModel()
@@ -320,6 +382,112 @@ class TestAssetScreener:
         
         assert len(results) <= 15
     
+    class FakeProvider:
+        """Provider that records calls and peak concurrency."""
+        
+        max_concurrency = 4
+        
+        def __init__(self):
+            self.in_flight = 0
+            self.peak = 0
+            self.history_calls = 0
+            self.prefetched = []
+        
+        async def prefetch_historical_prices(self, symbols, start, end):
+            self.prefetched.append(list(symbols))
+            return len(symbols)
+        
+        def clear_prefetched(self):
+            pass
+        
+        async def get_historical_prices(self, symbol, start, end):
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            self.history_calls += 1
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            close = 100 + np.cumsum(np.random.default_rng(len(symbol)).normal(0, 1, 200))
+            return pd.DataFrame({'close': close, 'volume': np.full(200, 2e6)})
+        
+        async def get_fundamentals(self, symbol):
+            return {'name': symbol, 'market_cap': 50e9, 'pe_ratio': 20}
+    
+    async def test_concurrent_fetch_is_bounded(self):
+        """Symbols are fetched in parallel within the provider limit"""
+        provider = self.FakeProvider()
+        screener = AssetScreener(provider, cache=ScreeningDataCache())
+        symbols = [f"S{i}" for i in range(20)]
+        
+        results = await screener.screen(ScreenerConfig(universe=symbols))
+        
+        assert len(results) == 20
+        assert provider.peak == 4
+        assert provider.prefetched == [symbols]
+        stats = screener.last_stats
+        assert stats['fetched'] == 20 and stats['concurrency'] == 4
+        for stage in ('cache', 'prefetch', 'fetch', 'filter', 'score', 'rank', 'total'):
+            assert f"{stage}_ms" in stats
+    
+    async def test_cache_shared_across_screeners(self):
+        """A fresh screener reuses data fetched by an earlier one"""
+        provider = self.FakeProvider()
+        cache = ScreeningDataCache(ttl_seconds=60)
+        symbols = ["AAA", "BBB", "CCC"]
+        
+        await AssetScreener(provider, cache=cache).screen(ScreenerConfig(universe=symbols))
+        second = AssetScreener(provider, cache=cache)
+        await second.screen(ScreenerConfig(universe=symbols + ["DDD"]))
+        
+        assert provider.history_calls == 4
+        assert provider.prefetched[-1] == ["DDD"]
+        assert second.last_stats['cache_hits'] == 3
+    
+    def test_percentile_ranks_match_pairwise_count(self):
+        """Sorted ranks equal the share of values <= each value"""
+        values = np.array([[3.0, 1.0], [1.0, np.nan], [3.0, 2.0], [2.0, 2.0]])
+        
+        ranks = percentile_ranks(values)
+        
+        np.testing.assert_allclose(ranks[:, 0], [1.0, 0.25, 1.0, 0.5])
+        np.testing.assert_allclose(ranks[[0, 2, 3], 1], [1 / 3, 1.0, 1.0])
+        assert np.isnan(ranks[1, 1])
+    
+    def test_score_matrix_bounds_inversion_and_weights(self):
+        """Out-of-range and missing values score 0; lower-is-better is inverted"""
+        values = np.array([[10.0, 0.1], [20.0, 0.2], [60.0, np.nan]])
+        criteria = [
+            ScreenerCriteria(ScreenerCriteriaType.VALUE, 'pe_ratio', max_value=50, weight=1.0),
+            ScreenerCriteria(ScreenerCriteriaType.QUALITY, 'roe', weight=3.0),
+        ]
+        
+        scores, total = score_matrix(values, ['pe_ratio', 'roe'], criteria)
+        
+        np.testing.assert_allclose(scores[:, 0], [2 / 3, 1 / 3, 0.0])
+        np.testing.assert_allclose(scores[:, 1], [0.5, 1.0, 0.0])
+        np.testing.assert_allclose(total, (scores @ [1.0, 3.0]) / 4)
+    
+    def test_top_k_matches_full_sort(self):
+        """argpartition selection equals a stable full sort"""
+        scores = np.random.default_rng(1).integers(0, 20, 500).astype(float)
+        
+        full = sorted(range(500), key=lambda i: scores[i], reverse=True)
+        
+        assert top_k_indices(scores).tolist() == full
+        assert scores[top_k_indices(scores, 25)].tolist() == scores[full[:25]].tolist()
+        assert len(top_k_indices(scores, 0)) == 0
+    
+    async def test_screen_ranks_top_n(self):
+        """screen() returns the top_n assets ranked 1..n by total score"""
+        screener = AssetScreener(self.FakeProvider(), cache=ScreeningDataCache())
+        config = ScreenerConfig(universe=[f"S{i}" for i in range(30)], top_n=5)
+        
+        results = await screener.screen(config)
+        
+        assert [a.rank for a in results] == [1, 2, 3, 4, 5]
+        totals = [a.total_score for a in results]
+        assert totals == sorted(totals, reverse=True)
+        assert set(results[0].scores) == {c.metric for c in screener._get_default_criteria()}
+    
     def test_screener_config_for_risk_profiles(self):
         """Test screener configs for different risk profiles"""
         prudent = get_screener_for_risk_profile('prudent', 12)
@@ -0,0 +1,144 @@
+"""
+Unit Tests - Portfolio Snapshots
+Tests for the incremental daily NAV roll-forward.
+"""
+import pytest
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.db.models.trade import TradeType
+from app.services.portfolio_snapshots import PortfolioSnapshotService, SnapshotState, build_snapshots
+
+
+def make_trade(day: date, trade_type: TradeType, symbol: str, qty: str, price: str, value: str,
+               commission: str = "1", currency: str = "USD"):
+    return SimpleNamespace(
+        executed_at=datetime.combine(day, datetime.min.time()).replace(hour=15),
+        trade_type=trade_type,
+        symbol=symbol,
+        quantity=Decimal(qty),
+        executed_quantity=Decimal(qty),
+        executed_price=Decimal(price),
+        total_value=Decimal(value),
+        commission=Decimal(commission),
+        native_currency=currency,
+    )
+
+
+@pytest.fixture
+def closes():
+    # Mon 2024-03-04 .. Fri 2024-03-08, no bar on Wednesday (holiday)
+    return {
+        "AAPL": [
+            (date(2024, 3, 1), 99.0),
+            (date(2024, 3, 4), 100.0),
+            (date(2024, 3, 5), 110.0),
+            (date(2024, 3, 7), 121.0),
+            (date(2024, 3, 8), 120.0),
+        ]
+    }
+
+
+class TestBuildSnapshots:
+    """Tests for build_snapshots."""
+
+    def test_inception_flow_and_returns(self, closes):
+        trades = [make_trade(date(2024, 3, 4), TradeType.BUY, "AAPL", "10", "100", "1000")]
+
+        rows = build_snapshots(
+            1, SnapshotState(), date(2024, 3, 4), date(2024, 3, 5), trades, closes,
+            {"USD": Decimal("1")}, inception_flow=Decimal("10000"),
+        )
+
+        first, second = rows
+        assert first["net_flow"] == Decimal("10000")
+        assert first["cash"] == Decimal("8999")
+        assert first["nav"] == Decimal("9999.00")
+        assert first["daily_return"] is None
+        assert first["trade_count"] == 1
+        assert second["nav"] == Decimal("10099.00")
+        assert second["daily_return"] == pytest.approx(100 / 9999)
+
+    def test_weekend_trades_count_on_monday(self, closes):
+        trades = [
+            make_trade(date(2024, 3, 2), TradeType.BUY, "AAPL", "5", "99", "495"),
+            make_trade(date(2024, 3, 3), TradeType.BUY, "AAPL", "5", "99", "495"),
+            make_trade(date(2024, 3, 4), TradeType.BUY, "AAPL", "1", "100", "100"),
+        ]
+
+        rows = build_snapshots(
+            1, SnapshotState(), date(2024, 3, 2), date(2024, 3, 4), trades, closes,
+            {"USD": Decimal("1")}, inception_flow=Decimal("10000"),
+        )
+
+        assert len(rows) == 1
+        assert rows[0]["snapshot_date"] == date(2024, 3, 4)
+        assert rows[0]["trade_count"] == 3
+        assert rows[0]["net_flow"] == Decimal("10000")
+
+    def test_append_from_snapshot_state(self, closes):
+        """The nightly path starts from stored cash/holdings, no trade replay."""
+        last = SimpleNamespace(cash=Decimal("8999"), nav=Decimal("10099"), holdings={"AAPL": ["10", "USD"]})
+
+        rows = build_snapshots(
+            1, SnapshotState.from_snapshot(last), date(2024, 3, 6), date(2024, 3, 7), [], closes,
+            {"USD": Decimal("1")},
+        )
+
+        # Wednesday carries Tuesday's close
+        assert rows[0]["positions_value"] == Decimal("1100.00")
+        assert rows[0]["daily_return"] == 0.0
+        assert rows[1]["positions_value"] == Decimal("1210.00")
+        assert rows[1]["holdings"] == {"AAPL": ["10", "USD"]}
+
+    def test_sell_closes_position_and_fx(self, closes):
+        state = SnapshotState(cash=Decimal("0"), holdings={"AAPL": (Decimal("10"), "USD")}, prev_nav=Decimal("900"))
+        trades = [make_trade(date(2024, 3, 8), TradeType.SELL, "AAPL", "10", "120", "1080", commission="0")]
+
+        rows = build_snapshots(
+            1, state, date(2024, 3, 7), date(2024, 3, 8), trades, closes, {"USD": Decimal("0.9")},
+        )
+
+        assert rows[0]["positions_value"] == Decimal("1089.00")
+        assert rows[1]["holdings"] == {}
+        assert rows[1]["cash"] == Decimal("1080")
+        assert rows[1]["positions_value"] == Decimal("0.00")
+
+    def test_weekends_skipped(self, closes):
+        rows = build_snapshots(
+            1, SnapshotState(), date(2024, 3, 8), date(2024, 3, 11), [], closes,
+            {}, inception_flow=Decimal("100"),
+        )
+        assert [r["snapshot_date"] for r in rows] == [date(2024, 3, 8), date(2024, 3, 11)]
+
+    def test_price_falls_back_to_fill(self):
+        trades = [make_trade(date(2024, 3, 4), TradeType.BUY, "NEW", "5", "20", "100", commission="0")]
+
+        rows = build_snapshots(
+            1, SnapshotState(), date(2024, 3, 4), date(2024, 3, 4), trades, {},
+            {"USD": Decimal("1")}, inception_flow=Decimal("1000"),
+        )
+
+        assert rows[0]["positions_value"] == Decimal("100.00")
+        assert rows[0]["nav"] == Decimal("1000.00")
+
+
+class TestUpdateAll:
+    """Tests for PortfolioSnapshotService.update_all."""
+
+    @pytest.mark.parametrize("through", [None, "today", "tomorrow"])
+    async def test_only_closed_days_are_materialized(self, through):
+        today = datetime.utcnow().date()
+        through = {None: None, "today": today, "tomorrow": today + timedelta(days=1)}[through]
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [SimpleNamespace(id=1)]
+        db = MagicMock(execute=AsyncMock(return_value=result), commit=AsyncMock())
+        service = PortfolioSnapshotService(db)
+
+        with patch.object(service, "_latest_snapshots", AsyncMock(return_value={})), \
+                patch.object(service, "_update_portfolio", AsyncMock(return_value=1)) as update:
+            await service.update_all(through=through)
+
+        assert update.await_args.args[2] == today - timedelta(days=1)
@@ -0,0 +1,159 @@
+"""
+Unit Tests - Provider Orchestrator
+Tests for in-flight request coalescing in ProviderOrchestrator.
+"""
+import asyncio
+import pytest
+from decimal import Decimal
+from datetime import datetime, timezone, date
+from unittest.mock import AsyncMock, patch
+
+from app.data_providers.adapters.base import Quote, ProviderError
+from app.data_providers.orchestrator import ProviderOrchestrator, OrchestratorConfig
+
+
+def make_quote(symbol: str, price: str = "100.00") -> Quote:
+    return Quote(
+        symbol=symbol,
+        price=Decimal(price),
+        timestamp=datetime.now(timezone.utc),
+        provider="test",
+    )
+
+
+@pytest.fixture
+def orchestrator():
+    """Orchestrator with caching disabled so every call reaches the provider."""
+    return ProviderOrchestrator(OrchestratorConfig(enable_cache=False))
+
+
+class TestSingleFlight:
+    """Tests for concurrent request coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_get_quote_shares_one_fetch(self, orchestrator):
+        """Concurrent callers for the same symbol should await a single provider call."""
+        calls = 0
+
+        async def execute(fetch, market_type, data_type, operation):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return make_quote("AAPL")
+
+        with patch(
+            "app.data_providers.orchestrator.failover_manager.execute_with_failover",
+            side_effect=execute,
+        ):
+            quotes = await asyncio.gather(*(orchestrator.get_quote("aapl") for _ in range(5)))
+
+        assert calls == 1
+        assert all(q.symbol == "AAPL" for q in quotes)
+        stats = orchestrator.get_dedup_stats()
+        assert stats["leader_requests"] == 1
+        assert stats["coalesced_requests"] == 4
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_error_propagates_to_all_waiters(self, orchestrator):
+        """A failed shared fetch should raise for every waiting caller."""
+        async def execute(fetch, market_type, data_type, operation):
+            await asyncio.sleep(0.01)
+            raise ProviderError("test", "boom")
+
+        with patch(
+            "app.data_providers.orchestrator.failover_manager.execute_with_failover",
+            side_effect=execute,
+        ):
+            results = await asyncio.gather(
+                *(orchestrator.get_quote("MSFT") for _ in range(3)),
+                return_exceptions=True,
+            )
+
+        assert all(isinstance(r, ProviderError) for r in results)
+        assert orchestrator.get_dedup_stats()["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_get_quote_joins_pending_batch(self, orchestrator):
+        """A single-symbol call should wait on a batch already fetching that symbol."""
+        calls = []
+
+        async def execute(fetch, market_type, data_type, operation):
+            calls.append(operation)
+            await asyncio.sleep(0.01)
+            return [make_quote("AAPL"), make_quote("MSFT")]
+
+        with patch(
+            "app.data_providers.orchestrator.failover_manager.execute_with_failover",
+            side_effect=execute,
+        ):
+            batch_task = asyncio.ensure_future(orchestrator.get_quotes(["AAPL", "MSFT"]))
+            await asyncio.sleep(0)
+            single = await orchestrator.get_quote("MSFT")
+            batch = await batch_task
+
+        assert len(calls) == 1
+        assert single is batch["MSFT"]
+        assert orchestrator.get_dedup_stats()["coalesced_requests"] == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_merges_with_pending_single_fetch(self, orchestrator):
+        """A batch should reuse a pending single-symbol fetch instead of refetching it."""
+        batches: list[str] = []
+
+        async def execute(fetch, market_type, data_type, operation):
+            await asyncio.sleep(0.01)
+            if operation.startswith("get_quotes"):
+                batches.append(operation)
+                return [make_quote("MSFT")]
+            return make_quote("AAPL")
+
+        with patch(
+            "app.data_providers.orchestrator.failover_manager.execute_with_failover",
+            side_effect=execute,
+        ):
+            single_task = asyncio.ensure_future(orchestrator.get_quote("AAPL"))
+            await asyncio.sleep(0)
+            batch = await orchestrator.get_quotes(["AAPL", "MSFT"])
+            await single_task
+
+        assert batches == ["get_quotes(1 symbols)"]
+        assert set(batch) == {"AAPL", "MSFT"}
+        assert orchestrator.get_dedup_stats()["batch_merged_symbols"] == 1
+
+    @pytest.mark.asyncio
+    async def test_historical_keyed_by_range(self, orchestrator):
+        """Different date ranges must not share a fetch."""
+        execute = AsyncMock(return_value=[])
+
+        with patch(
+            "app.data_providers.orchestrator.failover_manager.execute_with_failover",
+            execute,
+        ):
+            await asyncio.gather(
+                orchestrator.get_historical("AAPL", start_date=date(2024, 1, 1), end_date=date(2024, 6, 1)),
+                orchestrator.get_historical("AAPL", start_date=date(2024, 1, 1), end_date=date(2024, 6, 1)),
+                orchestrator.get_historical("AAPL", start_date=date(2023, 1, 1), end_date=date(2024, 6, 1)),
+            )
+
+        assert execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_coalescing_can_be_disabled(self):
+        """With coalescing off every caller reaches the provider."""
+        orchestrator = ProviderOrchestrator(
+            OrchestratorConfig(enable_cache=False, coalesce_requests=False)
+        )
+
+        async def execute(fetch, market_type, data_type, operation):
+            await asyncio.sleep(0.01)
+            return make_quote("AAPL")
+
+        mock = AsyncMock(side_effect=execute)
+        with patch(
+            "app.data_providers.orchestrator.failover_manager.execute_with_failover",
+            mock,
+        ):
+            await asyncio.gather(*(orchestrator.get_quote("AAPL") for _ in range(3)))
+
+        assert mock.await_count == 3
@@ -0,0 +1,145 @@
+"""
+Unit Tests - Rate Limiter
+Tests for the O(1) window counters and the Redis-shared limiter with local fallback.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.data_providers.rate_limiter import (
+    RateLimitConfig,
+    RateLimiter,
+    WindowCounter,
+    sliding_window_wait,
+)
+
+
+START = 1_700_000_040.0  # Multiple of 60
+
+
+class FakeClock:
+    def __init__(self, now: float = START):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+def shared_limiter(script: AsyncMock) -> RateLimiter:
+    redis = MagicMock()
+    redis.register_script.return_value = script
+    limiter = RateLimiter(redis=redis)
+    limiter.configure("polygon", RateLimitConfig(requests_per_minute=5, requests_per_day=100, burst_size=5))
+    return limiter
+
+
+class TestWindowCounter:
+    """Tests for the sliding window counter."""
+    
+    def test_constant_memory_and_limit(self):
+        clock = FakeClock()
+        counter = WindowCounter(limit=50_000, window_seconds=86400)
+        
+        with patch("app.data_providers.rate_limiter.time.time", clock):
+            for _ in range(50_000):
+                counter.record_request()
+            
+            assert counter.remaining() == 0
+            assert not counter.can_proceed()
+            assert vars(counter).keys() == {"limit", "window_seconds", "window_start", "current", "previous"}
+    
+    def test_previous_window_decays(self):
+        clock = FakeClock()
+        counter = WindowCounter(limit=10, window_seconds=60)
+        
+        with patch("app.data_providers.rate_limiter.time.time", clock):
+            counter.record_request(10)
+            assert counter.time_until_available() == pytest.approx(60 + 6)
+            
+            clock.now += 60 + 30  # Half of the previous window still counts
+            assert counter.remaining() == 5
+            clock.now += 60
+            assert counter.remaining() == 10
+    
+    def test_wait_matches_decay(self):
+        # 8 of 10 used in the previous window, 3 in the current one
+        wait = sliding_window_wait(10, 60, 0.0, current=3, previous=8, now=15.0)
+        
+        # At 15 + wait, 8 * (60 - t) / 60 + 3 + 1 == 10
+        t = 15.0 + wait
+        assert 8 * (60 - t) / 60 + 3 + 1 == pytest.approx(10)
+        assert sliding_window_wait(10, 60, 0.0, current=2, previous=0, now=15.0) == 0.0
+
+
+class TestSharedRateLimiter:
+    """Tests for RateLimiter with a Redis backend."""
+    
+    async def test_acquire_uses_script_state(self):
+        script = AsyncMock(return_value=[1, 0, 0, 4, 99])
+        limiter = shared_limiter(script)
+        
+        assert await limiter.acquire("polygon")
+        
+        keys = script.call_args.kwargs["keys"]
+        assert keys == ["ratelimit:polygon:gcra", "ratelimit:polygon:60", "ratelimit:polygon:86400"]
+        assert script.call_args.kwargs["args"] == [1, 5, 5 / 60, 5, 60, 100, 86400]
+        assert limiter.get_remaining("polygon") == {"per_minute": 4, "per_day": 99}
+        assert limiter.get_stats("polygon")["backend"] == "redis"
+        assert limiter.can_proceed("polygon")
+    
+    async def test_waits_until_shared_limit_allows(self):
+        script = AsyncMock(side_effect=[[0, 250, 250, 0, 50], [1, 0, 12000, 0, 49]])
+        limiter = shared_limiter(script)
+        
+        with patch("app.data_providers.rate_limiter.asyncio.sleep", AsyncMock()) as sleep:
+            assert await limiter.acquire("polygon")
+        
+        sleep.assert_awaited_once_with(0.25)
+        # Minute quota used up by all processes together
+        assert not limiter.can_proceed("polygon")
+        assert limiter.get_backend_stats()["shared_acquires"] == 1
+    
+    async def test_falls_back_to_local_when_redis_down(self):
+        script = AsyncMock(side_effect=RedisConnectionError("down"))
+        limiter = shared_limiter(script)
+        
+        for _ in range(3):
+            assert await limiter.acquire("polygon")
+        
+        assert script.await_count == 1
+        assert limiter.get_backend_stats() == {
+            "shared_acquires": 0, "local_acquires": 3, "redis_errors": 1, "backend": "local",
+        }
+        assert limiter.get_remaining("polygon") == {"per_minute": 2, "per_day": 97}
+    
+    async def test_unconfigured_provider_skips_redis(self):
+        script = AsyncMock()
+        limiter = shared_limiter(script)
+        
+        assert await limiter.acquire("unknown")
+        script.assert_not_awaited()
+    
+    async def test_instances_share_one_quota_through_script(self):
+        """Runs the real Lua script: two processes' limiters, one budget."""
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        redis = fakeredis.FakeAsyncRedis()
+        limiters = [RateLimiter(redis=redis), RateLimiter(redis=redis)]
+        for limiter in limiters:
+            limiter.configure("polygon", RateLimitConfig(requests_per_minute=5, requests_per_day=100, burst_size=5))
+        
+        for limiter in limiters[:1] * 3 + limiters[1:] * 2:
+            assert await limiter.acquire("polygon")
+        
+        # The sixth request would wait, whichever instance makes it
+        with patch(
+            "app.data_providers.rate_limiter.asyncio.sleep", AsyncMock(side_effect=RuntimeError("waited"))
+        ) as sleep:
+            with pytest.raises(RuntimeError):
+                await limiters[0].acquire("polygon")
+        
+        assert sleep.await_args.args[0] > 0
+        assert limiters[0].get_remaining("polygon")["per_day"] == 95
+        assert not limiters[0].can_proceed("polygon")
+        assert limiters[0].get_backend_stats()["redis_errors"] == 0
+        assert int(await redis.hget("ratelimit:polygon:86400", "curr")) == 5
@@ -0,0 +1,66 @@
+"""
+Unit Tests - Redis Client
+Tests for the batched (MGET / pipelined SETEX) access methods.
+"""
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.db.redis_client import RedisClient
+
+
+@pytest.fixture
+def client():
+    """RedisClient with a mocked connection."""
+    redis = RedisClient()
+    redis._client = MagicMock()
+    redis._client.mget = AsyncMock(side_effect=lambda keys: [f"v:{k}" if k.endswith("1") else None for k in keys])
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[])
+    redis._client.pipeline.return_value = pipe
+    return redis
+
+
+class TestBatchMethods:
+    """Tests for batched Redis access."""
+
+    @pytest.mark.asyncio
+    async def test_mget_chunks_requests(self, client):
+        client.BATCH_CHUNK_SIZE = 2
+        values = await client.mget(["a1", "b", "c1", "d", "e1"])
+
+        assert values == ["v:a1", None, "v:c1", None, "v:e1"]
+        assert client._client.mget.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_setex_many_uses_pipeline(self, client):
+        client.BATCH_CHUNK_SIZE = 2
+        await client.setex_many({"a": "1", "b": "2", "c": "3"}, ttl=60)
+
+        pipe = client._client.pipeline.return_value
+        assert pipe.setex.call_count == 3
+        assert pipe.execute.await_count == 2
+        pipe.setex.assert_any_call("c", 60, "3")
+
+    @pytest.mark.asyncio
+    async def test_set_quotes_serializes_json(self, client):
+        await client.set_quotes({"aapl": {"price": 190.5}}, ttl=30)
+
+        pipe = client._client.pipeline.return_value
+        key, ttl, value = pipe.setex.call_args.args
+        assert key == "quote:AAPL"
+        assert ttl == 30
+        assert json.loads(value) == {"price": 190.5}
+
+    @pytest.mark.asyncio
+    async def test_uninitialized_client_degrades(self):
+        redis = RedisClient()
+
+        assert await redis.mget(["a", "b"]) == [None, None]
+        assert await redis.setex_many({"a": "1"}, ttl=10) is False
+
+    @pytest.mark.asyncio
+    async def test_empty_inputs_skip_redis(self, client):
+        assert await client.mget([]) == []
+        assert await client.setex_many({}, ttl=10) is True
+        client._client.mget.assert_not_awaited()
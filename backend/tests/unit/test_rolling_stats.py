@@ -0,0 +1,94 @@
+"""
+Unit Tests - Rolling Statistics
+Tests the vectorized rolling engine against straightforward window loops.
+"""
+import numpy as np
+import pytest
+
+from app.core.analytics import rolling
+from app.core.analytics.performance import PerformanceAnalytics
+from app.core.analytics.benchmarking import BenchmarkService
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(7)
+    bench = rng.normal(0.0004, 0.011, 600)
+    port = 0.8 * bench + rng.normal(0.0002, 0.006, 600)
+    return port, bench
+
+
+def loop(values, window, fn):
+    return np.array([fn(values[i - window + 1:i + 1]) for i in range(window - 1, len(values))])
+
+
+class TestPrimitives:
+    """Tests for the single-series functions."""
+
+    @pytest.mark.parametrize("window", [1, 5, 60, 600])
+    def test_compound_and_std(self, series, window):
+        r = series[0]
+        np.testing.assert_allclose(
+            rolling.rolling_compound_return(r, window), loop(r, window, lambda w: np.prod(1 + w) - 1),
+            atol=1e-12,
+        )
+        np.testing.assert_allclose(rolling.rolling_std(r, window), loop(r, window, np.std), atol=1e-12)
+
+    def test_total_loss_falls_back_to_product(self):
+        r = np.array([0.1, -1.0, 0.2, 0.05])
+        np.testing.assert_allclose(rolling.rolling_compound_return(r, 2), [-1.0, -1.0, 0.26])
+
+    def test_flat_window_has_zero_volatility(self):
+        r = np.concatenate([np.random.default_rng(1).normal(0, 0.02, 50), np.full(30, 0.001)])
+        vol = rolling.rolling_std(r, 20)
+        assert np.all(vol[-10:] == 0.0)
+        assert np.all(rolling.rolling_sharpe(r, 20)[-10:] == 0.0)
+
+    @pytest.mark.parametrize("confidence", [0.9, 0.95, 0.99])
+    def test_historical_var_matches_percentile(self, series, confidence):
+        r = series[0]
+        expected = loop(r, 60, lambda w: -np.percentile(w, (1 - confidence) * 100))
+        np.testing.assert_allclose(rolling.rolling_historical_var(r, 60, confidence), expected, atol=1e-14)
+
+    def test_short_input_is_empty(self):
+        assert rolling.rolling_std([0.01, 0.02], 5).shape == (0,)
+        result = rolling.compute_rolling_metrics([0.01], 5)
+        assert set(result) == {"return", "volatility", "sharpe"}
+        assert all(len(v) == 0 for v in result.values())
+
+    def test_invalid_window(self):
+        with pytest.raises(ValueError):
+            rolling.rolling_sum([1.0, 2.0], 0)
+
+
+class TestServiceParity:
+    """The services must return what their former loops returned."""
+
+    def test_performance_rolling_metrics(self, series):
+        r = series[0]
+        analytics = PerformanceAnalytics()
+        result = analytics.calculate_rolling_metrics(r, window=20)
+
+        def sharpe(w):
+            ann_ret = (np.prod(1 + w) - 1) * (252 / 20)
+            ann_vol = np.std(w) * np.sqrt(252)
+            return (ann_ret - analytics.risk_free_rate) / ann_vol
+
+        np.testing.assert_allclose(result["sharpe"], loop(r, 20, sharpe), rtol=1e-9)
+        np.testing.assert_allclose(result["volatility"], loop(r, 20, lambda w: np.std(w) * np.sqrt(252)), rtol=1e-9)
+        assert len(result["return"]) == len(r) - 19
+
+    def test_benchmark_rolling_comparison(self, series):
+        port, bench = series
+        service = BenchmarkService()
+        result = service.calculate_rolling_comparison(
+            port, bench, window=60, metrics=["beta", "tracking_error", "information_ratio", "alpha"]
+        )
+
+        idx = range(59, len(port))
+        beta = [np.cov(port[i - 59:i + 1], bench[i - 59:i + 1])[0, 1] / np.var(bench[i - 59:i + 1]) for i in idx]
+        te = [np.std(port[i - 59:i + 1] - bench[i - 59:i + 1]) * np.sqrt(252) for i in idx]
+
+        np.testing.assert_allclose(result["beta"].values, beta, rtol=1e-9)
+        np.testing.assert_allclose(result["tracking_error"].values, te, rtol=1e-9)
+        assert len(result["alpha"].dates) == len(result["alpha"].values) == len(port) - 59
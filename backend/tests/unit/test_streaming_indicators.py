@@ -0,0 +1,102 @@
+"""
+Unit Tests - Streaming Indicators
+Tests for incremental indicator state against the batch calculator.
+"""
+import pytest
+import numpy as np
+
+from app.ml.features import (
+    IndicatorState,
+    StreamingIndicatorEngine,
+    TechnicalFeaturesCalculator,
+)
+
+
+def make_bars(n: int = 320, seed: int = 5):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, n)))
+    high = close * (1 + rng.uniform(0, 0.02, n))
+    low = close * (1 - rng.uniform(0, 0.02, n))
+    volume = rng.integers(100_000, 1_000_000, n).astype(float)
+    return close, high, low, volume
+
+
+def assert_matches_batch(features, close, high, low, volume):
+    batch = TechnicalFeaturesCalculator().calculate_all("AAA", "", close, high, low, volume).to_dict()
+    streamed = features.to_dict()
+    batch.pop("timestamp")
+    streamed.pop("timestamp")
+
+    assert streamed.keys() == batch.keys()
+    for name, value in batch.items():
+        if name == "symbol":
+            continue
+        assert streamed[name] == pytest.approx(value, rel=1e-9, abs=1e-9), name
+
+
+class FakeRedis:
+    """In-memory stand-in for the RedisClient batch methods."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def setex_many(self, items, ttl):
+        self.data.update(items)
+        return True
+
+    async def mget(self, keys):
+        return [self.data.get(k) for k in keys]
+
+
+class TestStreamingIndicators:
+    """Tests for StreamingIndicatorEngine."""
+
+    @pytest.mark.parametrize("n_bars", [1, 15, 30, 201, 320])
+    def test_matches_batch_calculator(self, n_bars):
+        close, high, low, volume = make_bars()
+        engine = StreamingIndicatorEngine()
+
+        for i in range(n_bars):
+            features = engine.update("AAA", f"2024-{i:04d}", close[i], high[i], low[i], volume[i])
+
+        n = slice(0, n_bars)
+        assert_matches_batch(features, close[n], high[n], low[n], volume[n])
+
+    def test_state_is_bounded(self):
+        close, high, low, volume = make_bars(1000)
+        engine = StreamingIndicatorEngine()
+        engine.warm_up("AAA", close, high, low, volume)
+
+        state = engine.get_state("AAA")
+        assert state.bars == 1000
+        assert len(state.closes) == 200
+        assert_matches_batch(state.snapshot("AAA"), close, high, low, volume)
+
+    def test_duplicate_bar_ignored(self):
+        close, high, low, volume = make_bars(30)
+        engine = StreamingIndicatorEngine()
+        for i in range(30):
+            engine.update("AAA", f"2024-{i:04d}", close[i], high[i], low[i], volume[i])
+
+        replay = engine.update("AAA", "2024-0029", 1.0, 1.0, 1.0, 1.0)
+
+        assert engine.get_state("AAA").bars == 30
+        assert engine.get_stats()["duplicates"] == 1
+        assert_matches_batch(replay, close, high, low, volume)
+
+    async def test_resume_from_redis(self):
+        close, high, low, volume = make_bars(260)
+        redis = FakeRedis()
+
+        first = StreamingIndicatorEngine(redis=redis)
+        first.warm_up("AAA", close[:250], high[:250], low[:250], volume[:250], timestamps=["2024-0249"])
+        assert await first.save() == 1
+        assert await first.save() == 0  # nothing changed since
+
+        second = StreamingIndicatorEngine(redis=redis)
+        assert await second.load(["AAA", "BBB"]) == 1
+        for i in range(250, 260):
+            features = second.update("AAA", f"2024-{i:04d}", close[i], high[i], low[i], volume[i])
+
+        assert isinstance(second.get_state("AAA"), IndicatorState)
+        assert_matches_batch(features, close, high, low, volume)
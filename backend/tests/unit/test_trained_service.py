@@ -0,0 +1,85 @@
+"""
+Unit Tests - Trained Model Service
+Tests for batched inference across many symbols.
+"""
+import pytest
+import numpy as np
+import pandas as pd
+
+from app.ml.trained_service import TrainedModelService
+
+
+def make_ohlcv(n: int = 300, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, n)))
+    index = pd.date_range("2023-01-02", periods=n, freq="B")
+    return pd.DataFrame({
+        "open": close * (1 + rng.normal(0, 0.003, n)),
+        "high": close * 1.01,
+        "low": close * 0.99,
+        "close": close,
+        "volume": rng.integers(1_000_000, 5_000_000, n).astype(float),
+    }, index=index)
+
+
+class CountingModel:
+    """predict_proba driven by the RSI column; counts calls."""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self.calls = 0
+
+    def predict_proba(self, X):
+        self.calls += 1
+        X = np.asarray(X, dtype=float)
+        up = 1 / (1 + np.exp(-(X[:, self.columns.index("rsi_14")] - 50) / 5))
+        return np.column_stack([1 - up, up])
+
+
+@pytest.fixture
+def service():
+    service = TrainedModelService()
+    columns = ["return_1d", "volume_ratio", "rsi_14", "volatility_20d"]
+    service.feature_columns = columns
+    service.rf_model = CountingModel(columns)
+    service.is_loaded = True
+    return service
+
+
+class TestPredictBatch:
+    """Tests for TrainedModelService.predict_batch."""
+
+    async def test_single_model_call(self, service):
+        symbols = ["AAA", "BBB", "CCC", "DDD"]
+        frames = {s: make_ohlcv(seed=i) for i, s in enumerate(symbols)}
+        prices = {s: float(frames[s]["close"].iloc[-1]) for s in symbols}
+
+        predictions = await service.predict_batch(frames, prices)
+
+        assert service.rf_model.calls == 1
+        assert list(predictions) == symbols
+        assert all(p.features_used == 4 for p in predictions.values())
+
+    async def test_matches_single_symbol_predict(self, service):
+        symbols = ["AAA", "BBB", "CCC"]
+        frames = {s: make_ohlcv(seed=10 + i) for i, s in enumerate(symbols)}
+        prices = {s: 50.0 + i for i, s in enumerate(symbols)}
+
+        batch = await service.predict_batch(frames, prices)
+
+        for symbol in symbols:
+            single = await service.predict(frames[symbol], symbol, prices[symbol])
+            assert single.signal == batch[symbol].signal
+            assert single.probability_up == batch[symbol].probability_up
+            assert single.price_target == batch[symbol].price_target
+
+    async def test_short_history_omitted(self, service):
+        frames = {"AAA": make_ohlcv(), "NEW": make_ohlcv(n=10)}
+
+        predictions = await service.predict_batch(frames, {"AAA": 10.0, "NEW": 10.0})
+
+        assert list(predictions) == ["AAA"]
+
+    async def test_no_model(self):
+        service = TrainedModelService()
+        assert await service.predict_batch({"AAA": make_ohlcv()}, {"AAA": 10.0}) == {}
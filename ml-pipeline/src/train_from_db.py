@@ -48,47 +48,101 @@ DATABASE_URL = os.getenv(
 )
 
 
-def load_data_from_db(min_bars: int = 500) -> pd.DataFrame:
+# Rows fetched per round trip from the server-side cursor
+FETCH_BATCH_SIZE = 50_000
+
+
+def load_data_from_db(
+    min_bars: int = 500,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None
+) -> pd.DataFrame:
     """
     Load historical price data from PostgreSQL database.
     
+    Qualifying symbols are resolved first, then all their bars are read in
+    one range query (symbol = ANY(...) plus a raw timestamp range, so the
+    (symbol, timeframe, timestamp) index is used) and streamed from a
+    server-side cursor straight into preallocated column arrays.
+    
     Args:
         min_bars: Minimum number of bars required per symbol
+        start_date: First bar timestamp (inclusive, default: all history)
+        end_date: Last bar timestamp (exclusive, default: all history)
         
     Returns:
         DataFrame with OHLCV data for all symbols
     """
     import psycopg2
     
+    start_ts = start_date or datetime(1900, 1, 1)
+    end_ts = end_date or datetime(9999, 1, 1)
+    
     logger.info("Connecting to database...")
     conn = psycopg2.connect(DATABASE_URL)
     
-    # Query to get symbols with enough data
-    query = """
-    WITH symbol_counts AS (
-        SELECT symbol, COUNT(*) as bar_count
-        FROM price_bars
-        WHERE timeframe = 'D1'
-        GROUP BY symbol
-        HAVING COUNT(*) >= %s
-    )
-    SELECT pb.symbol, pb.timestamp, pb.open, pb.high, pb.low, pb.close, pb.volume
-    FROM price_bars pb
-    INNER JOIN symbol_counts sc ON pb.symbol = sc.symbol
-    WHERE pb.timeframe = 'D1'
-    ORDER BY pb.symbol, pb.timestamp
-    """
-    
-    logger.info(f"Loading data (min {min_bars} bars per symbol)...")
-    df = pd.read_sql(query, conn, params=(min_bars,))
-    conn.close()
-    
-    # Convert timestamp to datetime
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df = df.rename(columns={'timestamp': 'date'})
-    
-    symbols = df['symbol'].nunique()
-    logger.info(f"Loaded {len(df):,} bars for {symbols} symbols")
+    try:
+        # Symbols with enough data in the range, and the total row count
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT symbol, COUNT(*)
+                FROM price_bars
+                WHERE timeframe = 'D1' AND timestamp >= %s AND timestamp < %s
+                GROUP BY symbol
+                HAVING COUNT(*) >= %s
+                """,
+                (start_ts, end_ts, min_bars)
+            )
+            counts = cur.fetchall()
+        
+        symbols = sorted(symbol for symbol, _ in counts)
+        n_rows = sum(count for _, count in counts)
+        
+        logger.info(f"Loading data (min {min_bars} bars per symbol)...")
+        
+        symbol_col = np.empty(n_rows, dtype=object)
+        date_col = np.empty(n_rows, dtype='datetime64[us]')
+        values = np.empty((n_rows, 5), dtype=np.float64)
+        
+        n = 0
+        if symbols:
+            # Named cursor = server-side, rows arrive in FETCH_BATCH_SIZE chunks
+            with conn.cursor(name='price_bars_stream') as cur:
+                cur.itersize = FETCH_BATCH_SIZE
+                cur.execute(
+                    """
+                    SELECT symbol, timestamp, open, high, low, close, volume
+                    FROM price_bars
+                    WHERE symbol = ANY(%s) AND timeframe = 'D1'
+                      AND timestamp >= %s AND timestamp < %s
+                    ORDER BY symbol, timestamp
+                    """,
+                    (symbols, start_ts, end_ts)
+                )
+                while True:
+                    batch = cur.fetchmany(FETCH_BATCH_SIZE)
+                    if not batch:
+                        break
+                    # Bars written between the two queries are ignored
+                    batch = batch[:n_rows - n]
+                    k = len(batch)
+                    symbol_col[n:n + k] = [row[0] for row in batch]
+                    date_col[n:n + k] = [row[1] for row in batch]
+                    values[n:n + k] = [
+                        [float('nan') if v is None else v for v in row[2:]] for row in batch
+                    ]
+                    n += k
+                    if n == n_rows:
+                        break
+    finally:
+        conn.close()
+    
+    df = pd.DataFrame(values[:n], columns=['open', 'high', 'low', 'close', 'volume'])
+    df.insert(0, 'date', pd.to_datetime(date_col[:n]))
+    df.insert(0, 'symbol', symbol_col[:n])
+    
+    logger.info(f"Loaded {len(df):,} bars for {len(symbols)} symbols")
     
     return df
 
@@ -343,6 +397,10 @@ def main():
     parser = argparse.ArgumentParser(description='Train ML model from database')
     parser.add_argument('--min-bars', type=int, default=500,
                         help='Minimum bars per symbol (default: 500)')
+    parser.add_argument('--start', type=str, default=None,
+                        help='First bar date YYYY-MM-DD (default: all history)')
+    parser.add_argument('--end', type=str, default=None,
+                        help='Last bar date YYYY-MM-DD, exclusive (default: all history)')
     parser.add_argument('--horizon', type=int, default=5,
                         help='Prediction horizon in days (default: 5)')
     parser.add_argument('--threshold', type=float, default=0.02,
@@ -362,7 +420,11 @@ def main():
     logger.info("=" * 60)
     
     # Load data from database
-    df = load_data_from_db(min_bars=args.min_bars)
+    df = load_data_from_db(
+        min_bars=args.min_bars,
+        start_date=datetime.strptime(args.start, '%Y-%m-%d') if args.start else None,
+        end_date=datetime.strptime(args.end, '%Y-%m-%d') if args.end else None
+    )
     
     # Prepare features
     X, y, feature_names, combined_df = prepare_training_data(